@@ -0,0 +1,102 @@
+import asyncio
+import json
+import random
+import time
+from core import runtime
+from core.arbitrage_engine import ArbitrageEngine
+from core.fee_calculator import FeeSchedule
+from core.loop_monitor import LoopLagMonitor
+
+PAIRS = [f"COIN{i}-USDT" for i in range(300)]
+EXCHANGES = ["binance", "okx", "bybit", "kucoin", "gateio"]
+
+class _BenchBot:
+    config = {"min_spread_percentage": 0.3, "trading_pairs": PAIRS, "max_opportunities": 20}
+    exchanges = {}
+    universe = None
+    scheduler = None
+    fee_schedule = FeeSchedule()
+
+def _bulk_payload() -> str:
+    """A bookTicker-sized JSON body like the ones parsed every cycle"""
+    return json.dumps([
+        {"symbol": f"COIN{i}USDT", "bidPrice": f"{random.uniform(1, 100):.6f}", "askPrice": f"{random.uniform(1, 100):.6f}"}
+        for i in range(2000)
+    ])
+
+async def _echo_round_trips(count: int) -> float:
+    """Local TCP request/response round trips, the path uvloop speeds up most"""
+    async def handle(reader, writer):
+        while data := await reader.read(1024):
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    start = time.perf_counter()
+    for _ in range(count):
+        writer.write(b"ping")
+        await writer.drain()
+        await reader.read(1024)
+    elapsed = time.perf_counter() - start
+    writer.close()
+    await writer.wait_closed()
+    await asyncio.sleep(0.01)  # let the server side see EOF and finish
+    server.close()
+    await server.wait_closed()
+    return elapsed
+
+async def _workload(cycles: int) -> dict:
+    monitor = LoopLagMonitor(interval=0.005, threshold=0.05)
+    monitor.start()
+    engine = ArbitrageEngine(_BenchBot())
+    engine.refresh_fee_matrix()
+    payload = _bulk_payload()
+
+    cycle_times = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        # Concurrent "connectors": parse a bulk payload, yield, parse again
+        async def connector():
+            json.loads(payload)
+            await asyncio.sleep(0)
+            return {pair: random.uniform(99, 101) for pair in PAIRS}
+        results = await asyncio.gather(*(connector() for _ in EXCHANGES))
+        exchange_prices = dict(zip(EXCHANGES, results))
+        for pair in PAIRS:
+            engine.analyze_pair(pair, exchange_prices)
+        await asyncio.sleep(0.001)
+        cycle_times.append(time.perf_counter() - start)
+
+    echo_time = await _echo_round_trips(5000)
+    monitor.stop()
+    stats = monitor.get_stats()
+    cycle_times.sort()
+    return {
+        "cycle_p50_ms": cycle_times[len(cycle_times) // 2] * 1000,
+        "cycle_p99_ms": cycle_times[int(len(cycle_times) * 0.99)] * 1000,
+        "echo_rtt_us": echo_time / 5000 * 1e6,
+        "lag_mean_ms": stats["mean_lag_ms"],
+        "lag_max_ms": stats["max_lag_ms"],
+    }
+
+def main(cycles: int = 50):
+    print("Benchmarking event loops...")
+    results = {"asyncio": runtime.run(_workload(cycles), "asyncio")}
+    if runtime.get_loop_factory("uvloop") is not None:
+        results["uvloop"] = runtime.run(_workload(cycles), "uvloop")
+
+    metrics = list(results["asyncio"])
+    print(f"\n{'metric':15}" + "".join(f"{name:>12}" for name in results) + ("        diff" if len(results) > 1 else ""))
+    print("-" * (15 + 12 * (len(results) + 1)))
+    for metric in metrics:
+        row = f"{metric:15}" + "".join(f"{values[metric]:12.3f}" for values in results.values())
+        if "uvloop" in results and results["asyncio"][metric]:
+            change = (results["uvloop"][metric] - results["asyncio"][metric]) / results["asyncio"][metric] * 100
+            row += f"{change:+11.1f}%"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import pickle
+import random
+import sys
+import time
+from core.arbitrage_engine import ArbitrageEngine
+from core.fee_calculator import FeeSchedule
+from core.sharded_engine import ShardedArbitrageEngine
+
+PAIRS = [f"COIN{i}-USDT" for i in range(2000)]
+EXCHANGES = ["binance", "okx", "bybit", "kucoin", "gateio"]
+
+class _BenchBot:
+    config = {"min_spread_percentage": 0.3, "trading_pairs": PAIRS, "max_opportunities": 20,
+              "spread_stats": {"enabled": False}}
+    exchanges = {}
+    universe = None
+    scheduler = None
+    fee_schedule = FeeSchedule()
+
+class _Feed:
+    """Synthetic bulk prices where `churn` of the quotes move each cycle.
+
+    Exchanges quote each pair within a few basis points of each other, so
+    (as in real markets) only the odd pair shows a spread worth reporting.
+    """
+
+    def __init__(self, churn: float):
+        self.churn = churn
+        self.base = {pair: random.uniform(0.01, 1000) for pair in PAIRS}
+        self.prices = {exchange: {pair: self._quote(pair) for pair in PAIRS} for exchange in EXCHANGES}
+
+    def _quote(self, pair: str) -> float:
+        return self.base[pair] * random.gauss(1, 0.001)
+
+    def next(self):
+        for prices in self.prices.values():
+            for pair in random.sample(PAIRS, int(len(PAIRS) * self.churn)):
+                prices[pair] = self._quote(pair)
+        return {exchange: dict(prices) for exchange, prices in self.prices.items()}
+
+def _bench_engine(base, feed: _Feed, **kwargs):
+    class BenchEngine(base):
+        async def collect_prices(self):
+            exchange_prices = feed.next()
+            for exchange_name, prices in exchange_prices.items():
+                self.price_meta[exchange_name] = {"fetched_at": time.time()}
+                self.quotes.update(exchange_name, prices, self.price_meta[exchange_name])
+            return exchange_prices
+    return BenchEngine(_BenchBot(), **kwargs)
+
+def _full_payload_bytes(engine: ShardedArbitrageEngine, exchange_prices) -> int:
+    """What shipping every shard its prices, fee columns and quotes each cycle would cost"""
+    total = 0
+    for shard in engine.shards:
+        shard_prices = {name: {pair: prices[pair] for pair in shard if pair in prices}
+                        for name, prices in exchange_prices.items()}
+        total += len(pickle.dumps((shard, shard_prices, engine.fee_matrix.subset(shard), engine.quotes.subset(shard)),
+                                  pickle.HIGHEST_PROTOCOL))
+    return total
+
+async def _workload(engine, cycles: int) -> dict:
+    await engine.find_opportunities()  # Warm-up: rebalance and start workers
+    cycle_times = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        await engine.find_opportunities()
+        cycle_times.append(time.perf_counter() - start)
+    cycle_times.sort()
+    return {
+        "cycle_p50_ms": cycle_times[len(cycle_times) // 2] * 1000,
+        "cycle_p99_ms": cycle_times[int(len(cycle_times) * 0.99)] * 1000,
+    }
+
+def main(cycles: int = 30, churn: float = 0.3, workers: int = 0):
+    workers = workers or os.cpu_count() or 1
+    print(f"Benchmarking {len(PAIRS)} pairs x {len(EXCHANGES)} exchanges, {churn:.0%} price churn, "
+          f"{workers} workers ({os.cpu_count()} CPUs)...")
+    random.seed(1)
+    results = {"single": asyncio.run(_workload(_bench_engine(ArbitrageEngine, _Feed(churn)), cycles))}
+
+    feed = _Feed(churn)
+    sharded = _bench_engine(ShardedArbitrageEngine, feed, workers=workers)
+    try:
+        results["sharded"] = asyncio.run(_workload(sharded, cycles))
+        exchange_prices = feed.next()
+        delta = sum(len(pickle.dumps(sharded._price_delta(i, exchange_prices), pickle.HIGHEST_PROTOCOL))
+                    for i in range(len(sharded.shards)))
+        full = _full_payload_bytes(sharded, exchange_prices)
+    finally:
+        sharded.shutdown()
+
+    print(f"\n{'metric':15}{'single':>12}{'sharded':>12}        diff")
+    print("-" * 51)
+    for metric in results["single"]:
+        single, shard = results["single"][metric], results["sharded"][metric]
+        print(f"{metric:15}{single:12.3f}{shard:12.3f}{(shard - single) / single * 100:+11.1f}%")
+    print(f"\nIPC per cycle: {delta / 1024:.1f} KB of price deltas (full snapshots would be {full / 1024:.1f} KB)")
+    if results["sharded"]["cycle_p50_ms"] >= results["single"]["cycle_p50_ms"]:
+        print("Sharding does not pay off here: keep \"sharding\": {\"enabled\": false}")
+
+if __name__ == "__main__":
+    main(workers=int(sys.argv[1]) if len(sys.argv) > 1 else 0)
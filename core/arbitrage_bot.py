@@ -1,22 +1,93 @@
 import asyncio
+import signal
 import time
 import json
+import os
 from typing import Dict, List
 from exchanges import BinanceAPI, CoinbaseAPI, KrakenAPI, KuCoinAPI, GateIOAPI, BybitAPI, OKXAPI
+from exchanges.remote_api import RemoteExchangeAPI
 from core.arbitrage_engine import ArbitrageEngine
+from core.sharded_engine import ShardedArbitrageEngine
+from core.universe import UniverseDiscovery
+from core.pair_scheduler import PairScheduler
+from core.fee_calculator import FeeSchedule
+from core.triangular_engine import TriangularArbitrageEngine
+from core.loop_monitor import LoopLagMonitor
+from core.profiler import SamplingProfiler
+from core.warmup import warm_connections
 from models.data_models import ArbitrageOpportunity
 from core.paper_trader import PaperTrader
 from core.live_trader import LiveTrader  # NEW
+from core.execution_scheduler import ExecutionScheduler
+from core.config_watcher import ConfigWatcher
+from core.state_snapshot import StateSnapshot
+from core.quote_bus import QuotePublisher, QuoteSubscriber
+
+# Market-data connector per exchange name
+EXCHANGE_CLASSES = {
+    "binance": BinanceAPI,
+    "coinbase": CoinbaseAPI,
+    "kraken": KrakenAPI,
+    "kucoin": KuCoinAPI,
+    "bybit": BybitAPI,
+    "okx": OKXAPI,
+    "gateio": GateIOAPI,
+}
 
 class ArbitrageBot:
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", role: str = ""):
+        self.started_at = time.perf_counter()
+        self.startup_metrics = {}
+        self.config_file = config_file
         self.config = self.load_config(config_file)
         self.exchanges = {}
         self.opportunities = []
+        self.engine = None
+        self.profiler = None
+        self.profile_cycles_pending = 0
+        self.profile_cycles = 0
+        self.loop_monitor = None
+        self.journal = None
+        # standalone: fetch and analyse; collector: fetch and publish; engine: subscribe and analyse
+        quote_bus = self.config.get("quote_bus", {})
+        self.role = role or quote_bus.get("role", "standalone")
+        self.quote_publisher = None
+        self.quote_subscriber = None
+        if self.role == "engine":
+            self.quote_subscriber = QuoteSubscriber(
+                quote_bus.get("subscribe", ["tcp://127.0.0.1:7700"]),
+                ping_interval=quote_bus.get("ping_interval", 5.0)
+            )
+        reload_settings = self.config.get("config_reload", {})
+        self.config_watcher = None
+        if reload_settings.get("enabled", True):
+            self.config_watcher = ConfigWatcher(config_file, reload_settings.get("interval", 2.0))
         self.setup_exchanges()
+        self.fee_schedule = FeeSchedule(self.config.get("fees", {}))
+        self.universe = UniverseDiscovery(self) if self.config.get("universe", {}).get("enabled", False) else None
+        scheduler_settings = self.config.get("scheduler", {})
+        self.scheduler = PairScheduler(scheduler_settings) if scheduler_settings.get("enabled", False) else None
+        self.triangular_engine = None
+        if self.config.get("triangular", {}).get("enabled", False):
+            self.triangular_engine = TriangularArbitrageEngine(self)
         self.paper_trader = PaperTrader(initial_balance=1000)
         self.live_trader = LiveTrader(self)  # NEW
         self.live_trader.is_live = self.config.get("live_trading", {}).get("enabled", False)
+        live_config = self.config.get("live_trading", {})
+        self.execution_scheduler = ExecutionScheduler(
+            self.live_trader,
+            max_in_flight=live_config.get("max_concurrent_trades", 3),
+            max_exposure=live_config.get("max_exposure", 300)
+        )
+        self.state = None
+        state_config = self.config.get("state", {})
+        # A collector has no ledger, and must not overwrite its engine's snapshot on a shared host
+        if state_config.get("enabled", True) and self.role != "collector":
+            self.state = StateSnapshot.from_config(state_config)
+            if self.state.restore(self):
+                self.startup_metrics['state_restore'] = time.perf_counter() - self.started_at
+                print(f"♻️  Restored trader state ({self.state.describe()}): "
+                      f"live P&L ${self.live_trader.total_pnl:.4f}, paper balance ${self.paper_trader.balance:.2f}")
         
     def load_config(self, config_file: str) -> Dict:
         """Load configuration from JSON file"""
@@ -28,7 +99,7 @@ class ArbitrageBot:
             return {
                 "exchanges": {
                     "binance": {"enabled": True, "api_key": "", "api_secret": ""},
-                    "coinbase": {"enabled": True, "api_key": "", "api_secret": ""},
+                    "coinbase": {"enabled": True, "api_key": "", "api_secret": "", "api_passphrase": ""},
                     "kraken": {"enabled": True, "api_key": "", "api_secret": ""},
                     "kucoin": {"enabled": True, "api_key": "", "api_secret": "", "api_passphrase": ""},
                     "bybit": {"enabled": True, "api_key": "", "api_secret": ""},
@@ -39,34 +110,309 @@ class ArbitrageBot:
                 "min_spread_percentage": 0.5,
                 "update_interval": 5,
                 "max_opportunities": 10,
+                "sharding": {
+                    "enabled": False,  # Experimental: slower than one process so far (see benchmark_sharding.py)
+                    "workers": 0  # 0 = one worker per CPU core
+                },
+                "universe": {
+                    "enabled": False,
+                    "min_exchanges": 2,
+                    "refresh_interval": 300,
+                    "max_pairs": 200,
+                    "quote_assets": ["USDT"]
+                },
+                "scheduler": {
+                    "enabled": False,
+                    "request_budget": 10,  # per-symbol requests per exchange per cycle
+                    "max_skip_cycles": 10,
+                    "decay": 0.2
+                },
+                "fees": {},  # per-exchange tiers/overrides, see FeeSchedule
+                "depth": {
+                    "enabled": False,
+                    "levels": 20,
+                    "min_net_profit_percentage": 0.1
+                },
+                "triangular": {
+                    "enabled": False,
+                    "cross_exchange": False,
+                    "transfer_cost_percentage": 0.1,
+                    "min_profit_percentage": 0.1,
+                    "start_assets": ["USDT"],
+                    "max_cycles": 10,
+                    "max_ticker_age": 15  # seconds before an exchange's tickers are dropped from the graph
+                },
+                "runtime": {
+                    "event_loop": "asyncio",  # or "uvloop"
+                    "warm_start": True,
+                    "loop_lag_monitor": True,
+                    "lag_threshold_ms": 100,
+                    "lag_sample_interval_ms": 50
+                },
+                "profiling": {
+                    "enabled": False,  # profile the first `cycles` cycles; SIGUSR1 starts a run any time
+                    "cycles": 20,
+                    "interval_ms": 5,
+                    "output_dir": "profiles"
+                },
+                "circuit_breaker": {
+                    "failure_threshold": 3,  # consecutive failures before backing off
+                    "base_delay": 1.0,
+                    "max_delay": 120.0,
+                    "request_timeout": 10.0,
+                    "exchange_timeout": 10.0  # max wait on one exchange per cycle
+                },
+                "market_data": {
+                    "filtered_requests": True,  # small subscriptions skip the full ticker dump
+                    "listing_refresh_interval": 300,  # full dump at least this often to refresh listings
+                    "filter_thresholds": {}  # per-exchange max symbols for filtered requests
+                },
+                "response_cache": {
+                    "ttl": 1.0  # seconds identical public requests are served from cache
+                },
+                "quotes": {
+                    "max_skew_ms": 2000,  # legs quoted further apart are not compared
+                    "max_age_ms": 5000  # older quotes are neither compared nor traded
+                },
+                "lifetimes": {
+                    "history": 1024  # closed opportunities kept for lifetime statistics
+                },
+                "state": {
+                    "enabled": True,  # snapshot ledgers and trackers so a restart resumes where it stopped
+                    "path": ".cache/state.bin",
+                    "interval": 10,  # seconds between snapshots (and after every trade)
+                    "max_trades": 1000,  # most recent trade records kept per trader
+                    "resume_window": 60  # open opportunities survive restarts shorter than this
+                },
+                "quote_bus": {
+                    "role": "standalone",  # "collector" publishes quotes, "engine" subscribes and analyses them
+                    "node": "",  # collector name shown to subscribers (default: its endpoint)
+                    "listen": "tcp://127.0.0.1:7700",  # collector endpoint, tcp://host:port or unix:///path
+                    "subscribe": ["tcp://127.0.0.1:7700"],  # engine: one endpoint per collector
+                    "ping_interval": 5,  # seconds between clock-offset probes
+                    "max_buffer_bytes": 1048576  # a subscriber further behind than this misses frames
+                },
+                "config_reload": {
+                    "enabled": True,  # apply config.json edits between cycles, without a restart
+                    "interval": 2.0
+                },
+                "journal": {
+                    "enabled": False,  # requires pyarrow
+                    "output_dir": "journal",
+                    "flush_interval": 30,  # seconds between Parquet row groups
+                    "roll_interval": 3600,  # seconds per file
+                    "record_quotes": True  # every quote of every cycle, not just opportunities
+                },
+                "spread_stats": {
+                    "enabled": True,  # requires numpy
+                    "window": 120,  # cycles of price history per pair and exchange
+                    "ewma_alpha": 0.1,
+                    "min_zscore": 0.0,  # > 0 only keeps spreads this unusual (once min_samples exist)
+                    "min_samples": 30
+                },
                 "live_trading": {  # NEW
                     "enabled": False,
                     "max_trade_size": 100,
                     "daily_loss_limit": 50,
-                    "manual_approval": True
+                    "manual_approval": True,
+                    "max_concurrent_trades": 3,  # non-conflicting trades run at once
+                    "max_exposure": 300,  # total notional in flight
+                    "user_streams": True,
+                    "fill_timeout": 5.0,
+                    "order_latency_budget": 2.0,  # seconds to retry an order whose outcome is unknown
+                    "order_lookup_grace": 1.0,  # seconds an unknown order is looked up before it counts as not placed
+                    "clock_sync_interval": 60,  # seconds between server-time samples
+                    "batch_window_ms": 5  # concurrent orders for one exchange within this window share a batch request
                 }
             }
     
+    def enabled_exchanges(self, config: Dict) -> List[str]:
+        return [name for name in EXCHANGE_CLASSES if config["exchanges"].get(name, {}).get("enabled", False)]
+    
     def setup_exchanges(self):
         """Initialize exchange connectors"""
-        if self.config["exchanges"]["binance"]["enabled"]:
-            self.exchanges["binance"] = BinanceAPI(self.config["exchanges"]["binance"])
-        if self.config["exchanges"]["coinbase"]["enabled"]:
-            self.exchanges["coinbase"] = CoinbaseAPI(self.config["exchanges"]["coinbase"])
-        if self.config["exchanges"]["kraken"]["enabled"]:
-            self.exchanges["kraken"] = KrakenAPI(self.config["exchanges"]["kraken"])
-        if self.config["exchanges"]["kucoin"]["enabled"]:
-            self.exchanges["kucoin"] = KuCoinAPI(self.config["exchanges"]["kucoin"])
-        if self.config["exchanges"]["bybit"]["enabled"]:
-            self.exchanges["bybit"] = BybitAPI(self.config["exchanges"]["bybit"])
-        if self.config["exchanges"]["okx"]["enabled"]:
-            self.exchanges["okx"] = OKXAPI(self.config["exchanges"]["okx"])
-        if self.config["exchanges"]["gateio"]["enabled"]:
-            self.exchanges["gateio"] = GateIOAPI(self.config["exchanges"]["gateio"])
+        for exchange_name in self.enabled_exchanges(self.config):
+            self.exchanges[exchange_name] = self.create_exchange(exchange_name, self.config)
+            self.configure_exchange(exchange_name, self.exchanges[exchange_name])
+    
+    def create_exchange(self, exchange_name: str, config: Dict):
+        """Market-data connector, or its quote-bus stand-in on an engine node"""
+        if self.quote_subscriber is not None:
+            return RemoteExchangeAPI(exchange_name, self.quote_subscriber, config["exchanges"][exchange_name])
+        return EXCHANGE_CLASSES[exchange_name](config["exchanges"][exchange_name])
+    
+    def configure_exchange(self, exchange_name: str, exchange):
+        """Apply the tunable connector settings (safe to repeat on a live connector)"""
+        breaker_config = self.config.get("circuit_breaker", {})
+        market_data = self.config.get("market_data", {})
+        exchange.breaker.failure_threshold = breaker_config.get("failure_threshold", 3)
+        exchange.breaker.base_delay = breaker_config.get("base_delay", 1.0)
+        exchange.breaker.max_delay = breaker_config.get("max_delay", 120.0)
+        exchange.request_timeout = breaker_config.get("request_timeout", 10.0)
+        exchange.response_cache.ttl = self.config.get("response_cache", {}).get("ttl", 1.0)
+        exchange.listing_refresh_interval = market_data.get("listing_refresh_interval", 300)
+        if not market_data.get("filtered_requests", True):
+            exchange.filter_threshold = 0
+        else:
+            exchange.filter_threshold = market_data.get("filter_thresholds", {}).get(exchange_name, exchange.FILTER_THRESHOLD)
+    
+    def apply_reloaded_config(self, old_config: Dict, new_config: Dict, sections: List[str], restart: List[str],
+                              added: Dict, removed: Dict):
+        """The synchronous half of reload_config: swap the config and retune every component"""
+        config = dict(new_config)
+        for section in restart:
+            # Restart-only settings keep their running values
+            if section in old_config:
+                config[section] = old_config[section]
+            elif section in config:
+                del config[section]
+        if "live_trading.enabled" in restart:
+            config["live_trading"] = dict(new_config.get("live_trading", {}),
+                                          enabled=old_config.get("live_trading", {}).get("enabled", False))
+        if self.universe:
+            # Keep the discovered pairs until the next universe refresh; manual pairs come from the file
+            discovered = [pair for pair in old_config["trading_pairs"] if pair not in self.universe.manual_pairs]
+            manual = list(new_config["trading_pairs"])
+            config["trading_pairs"] = manual + [pair for pair in discovered if pair not in set(manual)]
+        self.config = config
+        
+        for exchange_name in removed:
+            del self.exchanges[exchange_name]
+        for exchange_name, exchange in added.items():
+            self.exchanges[exchange_name] = exchange
+        for exchange_name, exchange in self.exchanges.items():
+            self.configure_exchange(exchange_name, exchange)
+        
+        if "fees" in sections:
+            old_fees, new_fees = old_config.get("fees", {}), config.get("fees", {})
+            for exchange_name in set(old_fees) | set(new_fees):
+                if old_fees.get(exchange_name) != new_fees.get(exchange_name):
+                    self.fee_schedule.configure_exchange(exchange_name, new_fees.get(exchange_name, {}))
+        if "universe" in sections:
+            self.universe = UniverseDiscovery(self) if config.get("universe", {}).get("enabled", False) else None
+        elif self.universe and "trading_pairs" in sections:
+            self.universe.manual_pairs = list(new_config["trading_pairs"])
+            self.universe.last_refresh = 0.0
+        if self.config_watcher:
+            self.config_watcher.interval = config.get("config_reload", {}).get("interval", 2.0)
+        if "scheduler" in sections:
+            settings = config.get("scheduler", {})
+            self.scheduler = PairScheduler(settings) if settings.get("enabled", False) else None
+        
+        if self.engine:
+            self.engine.apply_config(old_config)
+        self.live_trader.apply_config()
+        live_config = config.get("live_trading", {})
+        self.execution_scheduler.max_in_flight = live_config.get("max_concurrent_trades", 3)
+        self.execution_scheduler.max_exposure = live_config.get("max_exposure", 300)
+    
+    def rollback_config(self, old_config: Dict, sections: List[str], saved: tuple):
+        """Put back the config and components a failed apply_reloaded_config may have changed"""
+        failed_config = self.config
+        exchanges, self.universe, self.scheduler, universe_state = saved
+        self.config = old_config
+        self.exchanges.clear()
+        self.exchanges.update(exchanges)
+        if self.universe and universe_state:
+            self.universe.manual_pairs, self.universe.last_refresh = universe_state
+        for exchange_name, exchange in self.exchanges.items():
+            self.configure_exchange(exchange_name, exchange)
+        if "fees" in sections:
+            old_fees = old_config.get("fees", {})
+            for exchange_name in set(old_fees) | set(failed_config.get("fees", {})):
+                self.fee_schedule.configure_exchange(exchange_name, old_fees.get(exchange_name, {}))
+        if self.config_watcher:
+            self.config_watcher.interval = old_config.get("config_reload", {}).get("interval", 2.0)
+        if self.engine:
+            self.engine.apply_config(failed_config)
+        self.live_trader.apply_config()
+        live_config = old_config.get("live_trading", {})
+        self.execution_scheduler.max_in_flight = live_config.get("max_concurrent_trades", 3)
+        self.execution_scheduler.max_exposure = live_config.get("max_exposure", 300)
+    
+    async def reload_config(self, new_config: Dict):
+        """Apply an edited config in place, keeping sessions, quotes and trading state.
+
+        Connectors are only created or closed for exchanges that were
+        enabled or disabled; everything else is retuned on the live objects.
+        New connectors are built (and can fail) before anything is swapped,
+        and the swap itself has no awaits, so a cycle never sees half a config.
+        A config that fails validation is refused, and one that fails while
+        being applied is rolled back to the running one.
+        """
+        problems = ConfigWatcher.validate(new_config)
+        if problems:
+            print(f"❌ Reload refused, keeping the running config: {'; '.join(problems)}")
+            return
+        old_config = self.config
+        sections = ConfigWatcher.changed_sections(old_config, new_config)
+        if not sections:
+            return
+        restart = ConfigWatcher.needs_restart(sections, old_config, new_config)
+        
+        old_exchanges = set(self.exchanges)
+        new_exchanges = set(self.enabled_exchanges(new_config))
+        added = {}
+        for exchange_name in new_exchanges - old_exchanges:
+            try:
+                added[exchange_name] = self.create_exchange(exchange_name, new_config)
+            except Exception as e:
+                print(f"❌ Reload: could not create {exchange_name} connector, keeping it disabled: {e}")
+        removed = {name: self.exchanges[name] for name in old_exchanges - new_exchanges}
+        
+        # Swap: no awaits from here until the connectors are in place
+        saved = (dict(self.exchanges), self.universe, self.scheduler,
+                 (self.universe.manual_pairs, self.universe.last_refresh) if self.universe else None)
+        try:
+            self.apply_reloaded_config(old_config, new_config, sections, restart, added, removed)
+        except Exception as e:
+            print(f"❌ Reload failed, rolling back to the running config: {type(e).__name__}: {e}")
+            self.rollback_config(old_config, sections, saved)
+            for exchange_name, exchange in added.items():
+                try:
+                    await exchange.close_session()
+                except Exception as close_error:
+                    print(f"❌ Error closing {exchange_name}: {close_error}")
+            return
+        
+        print(f"🔄 Config reloaded: {', '.join(sections)}")
+        if added or removed:
+            print(f"   Exchanges: +{sorted(added) or '[]'} -{sorted(removed) or '[]'}")
+        if restart:
+            print(f"   ⚠️  Restart required for: {', '.join(restart)}")
+        
+        # Retired sessions close and new ones warm up after the swap
+        for exchange_name, exchange in removed.items():
+            try:
+                await exchange.close_session()
+            except Exception as e:
+                print(f"❌ Error closing {exchange_name}: {e}")
+        if added:
+            results = await asyncio.gather(*(exchange.warm_up() for exchange in added.values()), return_exceptions=True)
+            for exchange_name, result in zip(added, results):
+                if isinstance(result, Exception):
+                    print(f"   ❌ {exchange_name} warm-up: {result}")
+    
+    def create_engine(self) -> ArbitrageEngine:
+        """Build the arbitrage engine, sharded across processes if configured"""
+        sharding = self.config.get("sharding", {})
+        if sharding.get("enabled", False):
+            # Shards only pay for their IPC when they really run in parallel (see benchmark_sharding.py)
+            if min(sharding.get("workers", 0) or os.cpu_count() or 1, os.cpu_count() or 1) < 2:
+                print("⚠️  Sharding needs at least 2 workers on 2 CPU cores, using the single-process engine")
+                return ArbitrageEngine(self)
+            engine = ShardedArbitrageEngine(self, workers=sharding.get("workers", 0))
+            print(f"🔀 Sharded mode: {engine.workers} worker processes")
+            return engine
+        return ArbitrageEngine(self)
     
     async def run(self):
         """Main execution loop with live trading"""
-        engine = ArbitrageEngine(self)
+        if self.role == "collector":
+            return await self.run_collector()
+        self.engine = engine = self.create_engine()
+        if self.state:
+            self.state.restore_engine(engine)
         
         mode = "LIVE TRADING 🚀" if self.live_trader.is_live else "PAPER TRADING 💰"
         print(f"Arbitrage Bot Started! {mode}")
@@ -77,26 +423,72 @@ class ArbitrageBot:
             print("💰 Starting with safety limits:")
             print(f"   Max trade size: ${self.live_trader.max_trade_size}")
             print(f"   Daily loss limit: ${self.live_trader.daily_loss_limit}")
-            print("   Manual approval required for each trade")
+            if self.config.get("live_trading", {}).get("manual_approval", True):
+                print("   Manual approval required for each trade")
+            else:
+                print(f"   Up to {self.execution_scheduler.max_in_flight} concurrent trades, "
+                      f"${self.execution_scheduler.max_exposure} max exposure")
+        
+        runtime = self.config.get("runtime", {})
+        if runtime.get("loop_lag_monitor", True):
+            self.loop_monitor = LoopLagMonitor(
+                interval=runtime.get("lag_sample_interval_ms", 50) / 1000,
+                threshold=runtime.get("lag_threshold_ms", 100) / 1000
+            )
+            self.loop_monitor.start()
+        
+        if runtime.get("warm_start", True):
+            await warm_connections(self)
+        if self.live_trader.is_live:
+            self.live_trader.start_clock_sync()
+            self.live_trader.start_user_streams()
+        self.startup_metrics['warm_start'] = time.perf_counter() - self.started_at
+        
+        self.start_journal()
+        if self.quote_subscriber:
+            self.quote_subscriber.start()
+        
+        profiling = self.config.get("profiling", {})
+        if profiling.get("enabled", False):
+            self.request_profile()
+        try:
+            # `kill -USR1 <pid>` profiles the next cycles without a restart
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.request_profile)
+        except (AttributeError, NotImplementedError, RuntimeError):
+            pass
         
         try:
             cycle_count = 0
             while True:
                 start_time = time.time()
                 cycle_count += 1
+                # Config edits are applied here, between cycles, all at once
+                if self.config_watcher:
+                    new_config = self.config_watcher.poll()
+                    if new_config is not None:
+                        await self.reload_config(new_config)
+                self.begin_profiled_cycle(cycle_count)
                 
                 opportunities = await engine.find_opportunities()
+                self.record_startup_latency(cycle_count, opportunities)
+                if self.journal:
+                    self.journal.record_opportunities(engine.last_scan)
+                    self.journal.record_quote_snapshot(engine.quotes, start_time)
                 self.display_opportunities(opportunities)
                 
+                if self.triangular_engine:
+                    # Reuses the bulk tickers downloaded by find_opportunities
+                    self.display_triangular(self.triangular_engine.find_opportunities())
+                
                 if opportunities and self.live_trader.is_live:
-                    # Execute live trades for high-confidence opportunities
-                    best_opportunity = opportunities[0]  # Highest profit opportunity
-                    if best_opportunity.actual_profit_percentage >= 0.3:
-                        await self.live_trader.execute_live_trade(best_opportunity, manual_approval=True)
+                    # Execute every high-confidence opportunity that fits the balances and limits
+                    manual_approval = self.config.get("live_trading", {}).get("manual_approval", True)
+                    await self.execution_scheduler.schedule(opportunities, manual_approval=manual_approval)
                 
                 elif opportunities:  # Paper trading
                     for opportunity in opportunities[:2]:  # Top 2 opportunities
-                        if opportunity.actual_profit_percentage >= 0.3:
+                        # A spread persisting over many cycles is one trade, not one per cycle
+                        if opportunity.actual_profit_percentage >= 0.3 and engine.lifetimes.claim(opportunity):
                             self.paper_trader.execute_trade(opportunity, trade_amount=100)
                 
                 # Show performance every 10 cycles
@@ -105,8 +497,19 @@ class ArbitrageBot:
                         self.show_live_performance()
                     else:
                         self.show_paper_performance()
+                    if self.loop_monitor:
+                        self.loop_monitor.print_report()
+                    self.show_market_data_usage()
+                    self.show_spread_stats()
+                    engine.lifetimes.print_report()
+                    if self.quote_subscriber:
+                        self.quote_subscriber.print_report()
+                
+                if self.state:
+                    await self.state.maybe_save(self)
                 
                 processing_time = time.time() - start_time
+                self.end_profiled_cycle(processing_time)
                 sleep_time = max(0, self.config["update_interval"] - processing_time)
                 await asyncio.sleep(sleep_time)
                 
@@ -120,6 +523,147 @@ class ArbitrageBot:
         finally:
             await self.cleanup()
     
+    async def run_collector(self):
+        """Collector node: fetch quotes with the local connectors and publish them, no analysis"""
+        quote_bus = self.config.get("quote_bus", {})
+        self.quote_publisher = QuotePublisher(
+            quote_bus.get("listen", "tcp://127.0.0.1:7700"),
+            node=quote_bus.get("node", ""),
+            max_buffer=quote_bus.get("max_buffer_bytes", 1024 * 1024)
+        )
+        await self.quote_publisher.start()
+        print(f"📡 Collector {self.quote_publisher.node}: publishing {', '.join(self.exchanges)} "
+              f"quotes on {self.quote_publisher.endpoint}")
+        print("=" * 80)
+        
+        # The engine's fetch path brings breakers, timeouts, the scheduler and universe refreshes
+        self.engine = engine = ArbitrageEngine(self)
+        engine.spread_stats = None
+        if self.config.get("runtime", {}).get("warm_start", True):
+            await warm_connections(self)
+        
+        try:
+            cycle_count = 0
+            while True:
+                start_time = time.time()
+                cycle_count += 1
+                if self.config_watcher:
+                    new_config = self.config_watcher.poll()
+                    if new_config is not None:
+                        await self.reload_config(new_config)
+                
+                exchange_prices = await engine.collect_prices()
+                for exchange_name, prices in exchange_prices.items():
+                    if prices:
+                        self.quote_publisher.publish(exchange_name, prices, engine.price_meta.get(exchange_name))
+                
+                if cycle_count % 10 == 0:
+                    publisher = self.quote_publisher
+                    print(f"\n📡 Published {publisher.frames_sent} frames (seq {publisher.seq}) to "
+                          f"{len(publisher.clients)} subscribers, {publisher.frames_dropped} dropped for slow readers")
+                    self.show_market_data_usage()
+                
+                processing_time = time.time() - start_time
+                await asyncio.sleep(max(0, self.config["update_interval"] - processing_time))
+        except KeyboardInterrupt:
+            print("\n🛑 Collector stopped by user")
+        finally:
+            await self.cleanup()
+    
+    def start_journal(self):
+        """Record opportunities and quotes to Parquet if configured (needs pyarrow)"""
+        journal_config = self.config.get("journal", {})
+        if not journal_config.get("enabled", False):
+            return
+        try:
+            from core.journal import ColumnarJournal
+        except ImportError:
+            print("⚠️  pyarrow is not installed (pip install pyarrow), journal disabled")
+            return
+        self.journal = ColumnarJournal.from_config(journal_config)
+        self.journal.start()
+        print(f"📓 Journaling opportunities{' and quotes' if self.journal.record_quotes else ''} "
+              f"to {self.journal.output_dir}/")
+    
+    def request_profile(self, cycles: int = 0):
+        """Profile the next `cycles` cycles (config profiling.cycles by default)"""
+        self.profile_cycles_pending = cycles or self.config.get("profiling", {}).get("cycles", 20)
+        print(f"🔬 Profiling the next {self.profile_cycles_pending} cycles")
+    
+    def begin_profiled_cycle(self, cycle_count: int):
+        if self.profiler is None and self.profile_cycles_pending:
+            profiling = self.config.get("profiling", {})
+            self.profiler = SamplingProfiler(
+                interval=profiling.get("interval_ms", 5) / 1000,
+                output_dir=profiling.get("output_dir", "profiles")
+            )
+            self.profile_cycles = self.profile_cycles_pending
+            self.profile_cycles_pending = 0
+            self.profiler.start()
+        if self.profiler:
+            self.profiler.begin_cycle(cycle_count)
+    
+    def end_profiled_cycle(self, processing_time: float):
+        if self.profiler is None:
+            return
+        self.profiler.end_cycle(processing_time)
+        if self.profiler.cycles_profiled >= self.profile_cycles:
+            self.finish_profile()
+    
+    def finish_profile(self):
+        """Stop the sampler, print the hotspot summary and write the report files"""
+        profiler, self.profiler = self.profiler, None
+        profiler.stop()
+        profiler.print_summary()
+        folded_path, summary_path = profiler.write_reports()
+        print(f"   Collapsed stacks: {folded_path} (flamegraph.pl / speedscope)")
+        print(f"   Summary: {summary_path}")
+    
+    def record_startup_latency(self, cycle_count: int, opportunities: List[ArbitrageOpportunity]):
+        """Track time from construction to the first cycle and the first opportunity"""
+        elapsed = time.perf_counter() - self.started_at
+        if cycle_count == 1:
+            self.startup_metrics['first_cycle'] = elapsed
+            print(f"⚡ First cycle complete {elapsed * 1000:.0f}ms after startup "
+                  f"(warm-up {self.startup_metrics.get('warm_start', 0) * 1000:.0f}ms)")
+        if opportunities and 'first_opportunity' not in self.startup_metrics:
+            self.startup_metrics['first_opportunity'] = elapsed
+            print(f"⚡ Time to first opportunity: {elapsed * 1000:.0f}ms")
+    
+    def show_market_data_usage(self):
+        """Bytes and rate-limit weight spent on market data in the last cycle"""
+        if not self.engine or not self.engine.cycle_transfer:
+            return
+        print(f"\n📦 MARKET DATA (last cycle):")
+        total_bytes = total_wire = total_weight = 0
+        for exchange_name, usage in self.engine.cycle_transfer.items():
+            mode = self.exchanges[exchange_name].last_fetch_mode or "per-symbol"
+            print(f"   {exchange_name:10} {mode:10} {usage['requests']:3} req | "
+                  f"{usage['wire_bytes'] / 1024:8.1f} KB wire ({usage['bytes'] / 1024:.1f} KB decoded) | weight {usage['weight']}")
+            total_bytes += usage['bytes']
+            total_wire += usage['wire_bytes']
+            total_weight += usage['weight']
+        print(f"   {'total':10} {'':10}     | {total_wire / 1024:8.1f} KB wire ({total_bytes / 1024:.1f} KB decoded) | weight {total_weight}")
+        rejected = self.engine.quotes.rejected
+        if rejected:
+            print(f"   Misaligned quote pairs skipped: {rejected['skew']} skewed, {rejected['stale']} stale (since start)")
+        print("-" * 50)
+    
+    def show_spread_stats(self):
+        """Spreads furthest above their rolling mean right now"""
+        stats = self.engine.spread_stats if self.engine else None
+        if stats is None:
+            return
+        unusual = stats.most_unusual(top=5, min_samples=self.engine.zscore_min_samples)
+        if not unusual:
+            return
+        print(f"\n📈 MOST UNUSUAL SPREADS (last {min(stats.updates, stats.window)} cycles):")
+        for pair, buy_exchange, sell_exchange, zscore in unusual:
+            spread = stats.stats(pair, buy_exchange, sell_exchange)
+            print(f"   {pair:12} {buy_exchange}→{sell_exchange}: {spread['last']:+.4f}% "
+                  f"(mean {spread['mean']:+.4f}%, std {spread['std']:.4f}%, z {zscore:+.2f})")
+        print("-" * 50)
+    
     def show_paper_performance(self):
         """Show paper trading performance"""
         stats = self.paper_trader.get_performance_stats()
@@ -171,6 +715,9 @@ class ArbitrageBot:
     
     def display_opportunities(self, opportunities: List[ArbitrageOpportunity]):
         """Display found arbitrage opportunities with profit info"""
+        if self.engine and self.engine.skipped_exchanges:
+            skipped = ", ".join(f"{name} {self.exchanges[name].breaker.describe()}" for name in self.engine.skipped_exchanges)
+            print(f"⛔ Skipped backed-off exchanges: {skipped}")
         if not opportunities:
             print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - No PROFITABLE arbitrage opportunities found")
             return
@@ -191,15 +738,58 @@ class ArbitrageBot:
             print(f"   SELL: {opp.sell_exchange:10} @ ${opp.sell_price:{price_format}} (fee: {opp.sell_fee*100:.2f}%)")
             print(f"   GROSS Spread: {opp.spread_percentage:.4f}%")
             print(f"   NET Profit: {opp.actual_profit_percentage:.4f}% ✅")
+            if opp.spread_zscore is not None:
+                print(f"   Spread z-score: {opp.spread_zscore:+.2f}")
+            if opp.quote_time:
+                print(f"   Quote Age: buy {opp.buy_quote_age * 1000:.0f}ms | sell {opp.sell_quote_age * 1000:.0f}ms "
+                      f"(skew {opp.quote_skew * 1000:.0f}ms)")
             print(f"   Total Fees: {(opp.buy_fee + opp.sell_fee)*100:.2f}%")
+            if opp.executable_notional > 0:
+                print(f"   Executable Size: {opp.executable_size:.6f} (${opp.executable_notional:.2f}) | Expected: ${opp.expected_profit:.4f}")
             
             # Show live trading indicator for top opportunity
             if i == 1 and self.live_trader.is_live and opp.actual_profit_percentage >= 0.3:
                 print(f"   🎯 LIVE TRADE CANDIDATE - Will prompt for execution")
             print()
     
+    def display_triangular(self, opportunities: List[ArbitrageOpportunity]):
+        """Display multi-hop cycles found by the triangular engine"""
+        if not opportunities:
+            return
+        
+        print(f"\n🔺 Found {len(opportunities)} triangular cycles:")
+        print("-" * 80)
+        for i, opp in enumerate(opportunities, 1):
+            print(f"{i}. {opp.pair}  GROSS {opp.spread_percentage:.4f}% | NET {opp.actual_profit_percentage:.4f}%")
+            for leg in opp.route:
+                print(f"   {leg}")
+        print()
+    
     async def cleanup(self):
         """Clean up resources properly"""
+        if self.profiler:
+            self.finish_profile()
+        if self.loop_monitor:
+            self.loop_monitor.stop()
+            self.loop_monitor.print_report()
+        if isinstance(self.engine, ShardedArbitrageEngine):
+            self.engine.shutdown()
+        await self.execution_scheduler.drain()
+        await self.live_trader.cleanup()
+        if self.state:
+            await self.state.save(self)
+            if self.state.saves:
+                print(f"✅ State saved to {self.state.path}")
+        if self.quote_publisher:
+            await self.quote_publisher.close()
+        if self.quote_subscriber:
+            await self.quote_subscriber.close()
+        if self.journal:
+            try:
+                await self.journal.close()
+                print(f"✅ Journal flushed ({self.journal.rows_written} rows)")
+            except Exception as e:
+                print(f"❌ Error flushing journal: {e}")
         print("Closing exchange sessions...")
         for exchange_name, exchange in self.exchanges.items():
             try:
@@ -1,120 +1,296 @@
 import asyncio
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 from models.data_models import ArbitrageOpportunity
+from core.fee_calculator import FeeCalculator
+from core.opportunity_ranker import OpportunityRanker
+from core.depth_sizer import max_executable_size
+from core.quote_snapshot import QuoteSnapshot
+from core.opportunity_tracker import OpportunityTracker
 
 class ArbitrageEngine:
     def __init__(self, bot):
         self.bot = bot
         self.min_spread = bot.config["min_spread_percentage"]
+        self.fee_matrix = None
+        self.ranker = OpportunityRanker(
+            k=bot.config["max_opportunities"],
+            default_size=bot.config.get("live_trading", {}).get("max_trade_size", 100)
+        )
+        # Opportunities not refreshed for this long drop out of the ranking
+        self.ranking_max_age = 3 * bot.config.get("update_interval", 5)
+        # Latest L2 snapshot per (exchange, pair)
+        self.order_books = {}
+        # Upper bound on one exchange's share of a cycle; open circuits are skipped outright
+        self.exchange_timeout = bot.config.get("circuit_breaker", {}).get("exchange_timeout", 10.0)
+        self.skipped_exchanges = []
+        # Per-exchange staleness of the last prices: fetched_at, age, from_cache
+        self.price_meta = {}
+        # Per-exchange network cost of the last collect: requests, bytes, wire_bytes, weight
+        self.cycle_transfer = {}
+        # Per-quote timestamps: legs are only compared when observed close together
+        self.quotes = QuoteSnapshot.from_config(bot.config.get("quotes", {}))
+        # Open/close history of each (pair, buy, sell) opportunity
+        self.lifetimes = OpportunityTracker(bot.config.get("lifetimes", {}).get("history", 1024))
+        # Rolling per-spread statistics (needs NumPy), see create_spread_stats
+        stats_config = bot.config.get("spread_stats", {})
+        self.spread_stats = self.create_spread_stats(stats_config)
+        self.min_zscore = stats_config.get("min_zscore", 0.0)
+        self.zscore_min_samples = stats_config.get("min_samples", 30)
+        # Opportunities detected by the last scan (the ranking also holds older ones)
+        self.last_scan: List[ArbitrageOpportunity] = []
     
-    async def find_opportunities(self) -> List[ArbitrageOpportunity]:
-        opportunities = []
+    def apply_config(self, old_config: Dict):
+        """Retune from bot.config after a reload, dropping state for removed exchanges and pairs"""
+        config = self.bot.config
+        self.min_spread = config["min_spread_percentage"]
+        self.ranker.k = config["max_opportunities"]
+        self.ranker.default_size = config.get("live_trading", {}).get("max_trade_size", 100)
+        self.ranking_max_age = 3 * config.get("update_interval", 5)
+        self.exchange_timeout = config.get("circuit_breaker", {}).get("exchange_timeout", 10.0)
+        quotes = config.get("quotes", {})
+        self.quotes.max_skew = quotes.get("max_skew_ms", 2000) / 1000
+        self.quotes.max_age = quotes.get("max_age_ms", 5000) / 1000
+        
+        stats_config = config.get("spread_stats", {})
+        old_stats = old_config.get("spread_stats", {})
+        if (stats_config.get("enabled", True), stats_config.get("window"), stats_config.get("ewma_alpha")) != \
+                (old_stats.get("enabled", True), old_stats.get("window"), old_stats.get("ewma_alpha")):
+            self.spread_stats = self.create_spread_stats(stats_config)
+        self.min_zscore = stats_config.get("min_zscore", 0.0)
+        self.zscore_min_samples = stats_config.get("min_samples", 30)
+        
+        for exchange_name in set(self.quotes.quotes) - set(self.bot.exchanges):
+            del self.quotes.quotes[exchange_name]
+            self.price_meta.pop(exchange_name, None)
+        self.order_books = {key: book for key, book in self.order_books.items() if key[0] in self.bot.exchanges}
+        removed_pairs = set(old_config["trading_pairs"]) - set(config["trading_pairs"])
+        for pair in removed_pairs:
+            self.ranker.replace_pair(pair, ())
+        if removed_pairs:
+            self.lifetimes.observe(removed_pairs, [])
+        # The ranking may still hold opportunities on removed exchanges
+        for opportunity in self.ranker.top():
+            if opportunity.buy_exchange not in self.bot.exchanges or opportunity.sell_exchange not in self.bot.exchanges:
+                self.ranker.remove(self.ranker.key(opportunity))
+        # Fee and spread tables are rebuilt lazily from the new exchange/pair sets
+        # (refresh_fee_matrix and SpreadStats.ensure compare them every cycle)
+    
+    def create_spread_stats(self, config: Dict):
+        if not config.get("enabled", True):
+            return None
+        try:
+            from core.spread_stats import SpreadStats
+        except ImportError:
+            print("⚠️  numpy is not installed (pip install numpy), spread statistics disabled")
+            return None
+        return SpreadStats.from_config(self.bot.exchanges, self.bot.config["trading_pairs"], config)
+    
+    def apply_spread_stats(self, opportunities: List[ArbitrageOpportunity]) -> List[ArbitrageOpportunity]:
+        """Attach each opportunity's spread z-score and drop ordinary spreads when min_zscore is set"""
+        if self.spread_stats is None:
+            return opportunities
+        kept = []
+        for opp in opportunities:
+            opp.spread_zscore = self.spread_stats.zscore(opp.pair, opp.buy_exchange, opp.sell_exchange,
+                                                         opp.spread_percentage, self.zscore_min_samples)
+            # Spreads without enough history are judged by the fixed thresholds alone
+            if self.min_zscore and opp.spread_zscore is not None and opp.spread_zscore < self.min_zscore:
+                continue
+            kept.append(opp)
+        return kept
+    
+    def refresh_fee_matrix(self):
+        """Recompile the fee matrix only if the schedule, exchanges or pairs changed"""
+        schedule = self.bot.fee_schedule
+        exchanges = tuple(self.bot.exchanges)
+        pairs = tuple(self.bot.config["trading_pairs"])
+        matrix = self.fee_matrix
+        if (matrix is None or matrix.version != schedule.version
+                or matrix.exchanges != exchanges or matrix.pairs != pairs):
+            self.fee_matrix = schedule.compile(exchanges, pairs)
+    
+    async def collect_prices(self) -> Dict[str, Dict[str, float]]:
+        """Fetch prices from every exchange concurrently"""
         exchange_prices = {}
         
-        # Get prices from all exchanges
+        # A universe rebuild needs every listing, so take full dumps on that cycle
+        full_dump = bool(self.bot.universe and self.bot.universe.refresh_due())
+        
+        # Get prices from all exchanges, without waiting on ones that are backed off
         tasks = []
+        self.skipped_exchanges = []
+        transfer_before = {}
         for exchange_name, exchange in self.bot.exchanges.items():
-            tasks.append(self.get_exchange_prices(exchange_name, exchange))
+            if exchange.breaker.is_open():
+                self.skipped_exchanges.append(exchange_name)
+                continue
+            exchange.force_full_dump = full_dump
+            transfer_before[exchange_name] = dict(exchange.transfer)
+            tasks.append(self.get_exchange_prices_bounded(exchange_name, exchange))
         
         results = await asyncio.gather(*tasks)
         
+        self.cycle_transfer = {
+            exchange_name: {key: self.bot.exchanges[exchange_name].transfer[key] - value for key, value in before.items()}
+            for exchange_name, before in transfer_before.items()
+        }
+        
         # Organize prices by exchange
         for exchange_name, prices in results:
             exchange_prices[exchange_name] = prices
+            self.quotes.update(exchange_name, prices, self.price_meta.get(exchange_name))
+        # Exchanges skipped this cycle keep no quotes to pair against
+        for exchange_name in self.skipped_exchanges:
+            self.quotes.quotes.pop(exchange_name, None)
         
-        # Find arbitrage opportunities for each pair
-        for pair in self.bot.config["trading_pairs"]:
-            pair_opportunities = self.analyze_pair(pair, exchange_prices)
-            opportunities.extend(pair_opportunities)
+        if self.spread_stats is not None:
+            self.spread_stats.ensure(self.bot.exchanges, self.bot.config["trading_pairs"])
+            self.spread_stats.update(exchange_prices, time.time())
         
-        # Sort by highest spread percentage
-        opportunities.sort(key=lambda x: x.spread_percentage, reverse=True)
+        # Bulk payloads carry every listed symbol, keep the universe in sync
+        if self.bot.universe:
+            self.bot.universe.refresh_if_due()
         
-        return opportunities[:self.bot.config["max_opportunities"]]
-    
-    async def get_exchange_prices(self, exchange_name: str, exchange):
-        prices = await exchange.get_prices(self.bot.config["trading_pairs"])
-        return (exchange_name, prices)
-    
-    import asyncio
-import time
-from typing import Dict, List
-from models.data_models import ArbitrageOpportunity
-
-class ArbitrageEngine:
-    def __init__(self, bot):
-        self.bot = bot
-        self.min_spread = bot.config["min_spread_percentage"]
+        return exchange_prices
     
     async def find_opportunities(self) -> List[ArbitrageOpportunity]:
         opportunities = []
-        exchange_prices = {}
-        
-        # Get prices from all exchanges
-        tasks = []
-        for exchange_name, exchange in self.bot.exchanges.items():
-            tasks.append(self.get_exchange_prices(exchange_name, exchange))
+        exchange_prices = await self.collect_prices()
+        self.refresh_fee_matrix()
         
-        results = await asyncio.gather(*tasks)
-        
-        # Organize prices by exchange
-        for exchange_name, prices in results:
-            exchange_prices[exchange_name] = prices
+        pairs = self.bot.config["trading_pairs"]
+        if self.bot.scheduler:
+            pairs = self.bot.scheduler.pairs_to_scan(pairs)
         
         # Find arbitrage opportunities for each pair
-        for pair in self.bot.config["trading_pairs"]:
-            pair_opportunities = self.analyze_pair(pair, exchange_prices)
+        for pair in pairs:
+            pair_opportunities = self.analyze_pair(pair, exchange_prices, self.quotes)
             opportunities.extend(pair_opportunities)
+        opportunities = self.apply_spread_stats(opportunities)
+        self.last_scan = opportunities
+        
+        if self.bot.scheduler:
+            self.bot.scheduler.observe(exchange_prices, pairs, {opp.pair for opp in opportunities})
+        self.lifetimes.observe(pairs, opportunities)
         
-        # Sort by highest spread percentage
-        opportunities.sort(key=lambda x: x.spread_percentage, reverse=True)
+        ranked = self.rank_opportunities(pairs, opportunities)
+        return await self.apply_depth(ranked)
+    
+    def rank_opportunities(self, scanned_pairs: List[str], opportunities: List[ArbitrageOpportunity]) -> List[ArbitrageOpportunity]:
+        """Stream a scan into the top-K ranker and return the current best by expected profit"""
+        by_pair = {}
+        for opportunity in opportunities:
+            by_pair.setdefault(opportunity.pair, []).append(opportunity)
+        
+        # Expire first: entries about to go must not evict fresh candidates on the way out
+        cutoff = time.time() - self.ranking_max_age
+        self.ranker.expire(cutoff)
+        self.ranker.replace_pairs({
+            pair: [opp for opp in by_pair.get(pair, ()) if opp.timestamp >= cutoff] for pair in scanned_pairs
+        })
         
-        return opportunities[:self.bot.config["max_opportunities"]]
+        return self.ranker.top()
+    
+    async def apply_depth(self, opportunities: List[ArbitrageOpportunity]) -> List[ArbitrageOpportunity]:
+        """Size ranked opportunities against L2 depth and re-rank by sized profit"""
+        depth = self.bot.config.get("depth", {})
+        if not depth.get("enabled", False) or not opportunities:
+            return opportunities
+        
+        levels = depth.get("levels", 20)
+        min_net = depth.get("min_net_profit_percentage", 0.1)
+        max_notional = self.bot.config.get("live_trading", {}).get("max_trade_size", float("inf"))
+        
+        # Only the books the current top K actually needs
+        keys = set()
+        for opp in opportunities:
+            keys.add((opp.buy_exchange, opp.pair))
+            keys.add((opp.sell_exchange, opp.pair))
+        keys = [key for key in keys if not self.bot.exchanges[key[0]].breaker.is_open()]
+        books = await asyncio.gather(
+            *(self.bot.exchanges[exchange_name].get_order_book(pair, levels) for exchange_name, pair in keys),
+            return_exceptions=True
+        )
+        for key, book in zip(keys, books):
+            if book is not None and not isinstance(book, Exception):
+                self.order_books[key] = book
+            else:
+                self.order_books.pop(key, None)
+        
+        for opp in opportunities:
+            buy_book = self.order_books.get((opp.buy_exchange, opp.pair))
+            sell_book = self.order_books.get((opp.sell_exchange, opp.pair))
+            if buy_book is None or sell_book is None:
+                continue  # No depth available, keep the top-of-book estimate
+            size = max_executable_size(buy_book, sell_book, opp.buy_fee, opp.sell_fee, min_net, max_notional)
+            if size.quantity <= 0:
+                # Not enough liquidity above the threshold at any size
+                self.ranker.remove(self.ranker.key(opp))
+                continue
+            opp.executable_size = size.quantity
+            opp.executable_notional = size.notional
+            self.ranker.push(opp)
+        
+        return self.ranker.top()
+    
+    async def get_exchange_prices_bounded(self, exchange_name: str, exchange):
+        """get_exchange_prices capped at exchange_timeout; a hang counts as a breaker failure"""
+        try:
+            return await asyncio.wait_for(self.get_exchange_prices(exchange_name, exchange), self.exchange_timeout)
+        except asyncio.TimeoutError:
+            exchange._record_failure(f"{self.exchange_timeout:.0f}s cycle timeout")
+            self.price_meta.pop(exchange_name, None)
+            return (exchange_name, {})
     
     async def get_exchange_prices(self, exchange_name: str, exchange):
-        prices = await exchange.get_prices(self.bot.config["trading_pairs"])
+        pairs = self.bot.config["trading_pairs"]
+        # Per-symbol connectors only poll the pairs the scheduler picks this cycle
+        if self.bot.scheduler and exchange.per_symbol_requests:
+            pairs = self.bot.scheduler.pairs_to_poll(exchange_name, pairs)
+            prices, self.price_meta[exchange_name] = await exchange.get_prices_with_meta(pairs)
+            self.bot.scheduler.observe_poll(exchange_name, pairs, prices)
+            return (exchange_name, prices)
+        prices, self.price_meta[exchange_name] = await exchange.get_prices_with_meta(pairs)
         return (exchange_name, prices)
     
-    def analyze_pair(self, pair: str, exchange_prices: Dict) -> List[ArbitrageOpportunity]:
+    def analyze_pair(self, pair: str, exchange_prices: Dict, quotes: Optional[QuoteSnapshot] = None) -> List[ArbitrageOpportunity]:
+        """Cross-exchange opportunities for one pair; with `quotes`, only between time-aligned legs"""
         opportunities = []
+        now = time.time()
         exchanges_with_price = []
         
-        # Import your existing FeeCalculator
-        from core.fee_calculator import FeeCalculator
+        # Taker fees come from the precomputed matrix when the pair is in it
+        fees = self.fee_matrix
+        pair_index = fees.pair_index.get(pair) if fees else None
         
         # Collect all exchanges that have this pair
         for exchange_name, prices in exchange_prices.items():
             if pair in prices and prices[pair] > 0:
-                exchanges_with_price.append((exchange_name, prices[pair]))
+                offset = fees.exchange_offset.get(exchange_name) if pair_index is not None else None
+                if offset is not None:
+                    fee = fees.taker[offset + pair_index]
+                else:
+                    fee = FeeCalculator.get_exchange_fee(exchange_name)
+                exchanges_with_price.append((exchange_name, prices[pair], fee))
         
         if len(exchanges_with_price) < 2:
             return opportunities
         
-        # DEBUG: Show exact prices for this pair
-        if pair == "ONE-USDT":  # Only debug the problematic pair
-            print(f"🔍 DEBUG {pair} exact prices:")
-            for exchange, price in exchanges_with_price:
-                print(f"  {exchange}: ${price:.8f}")
-        
         # Find best buy (lowest price) and best sell (highest price)
-        for i, (buy_exchange, buy_price) in enumerate(exchanges_with_price):
-            for j, (sell_exchange, sell_price) in enumerate(exchanges_with_price):
+        for i, (buy_exchange, buy_price, buy_fee) in enumerate(exchanges_with_price):
+            for j, (sell_exchange, sell_price, sell_fee) in enumerate(exchanges_with_price):
                 if i != j and sell_price > buy_price:
+                    alignment = None
+                    if quotes is not None:
+                        alignment = quotes.align(pair, buy_exchange, sell_exchange, now)
+                        if alignment is None:
+                            continue  # Spread between quotes taken too far apart
                     spread = sell_price - buy_price
                     spread_percentage = (spread / buy_price) * 100
                     
-                    # USE EXISTING FEE CALCULATOR
-                    net_profit_percentage = FeeCalculator.calculate_net_profit(
-                        buy_exchange, sell_exchange, spread_percentage
-                    )
-                    buy_fee = FeeCalculator.get_exchange_fee(buy_exchange)
-                    sell_fee = FeeCalculator.get_exchange_fee(sell_exchange)
-                    
-                    # DEBUG: Show calculation for problematic pairs
-                    if pair == "ONE-USDT" and spread_percentage >= 0.1:
-                        print(f"  💰 {buy_exchange}→{sell_exchange}: {buy_price:.8f}→{sell_price:.8f} = {spread:.8f} ({spread_percentage:.4f}%)")
-                        print(f"  📊 Fees: {buy_fee*100:.2f}% + {sell_fee*100:.2f}% = {(buy_fee+sell_fee)*100:.2f}% | Net: {net_profit_percentage:.4f}%")
+                    # Same formula as FeeCalculator.calculate_net_profit
+                    net_profit_percentage = spread_percentage - (buy_fee + sell_fee) * 100
                     
                     # Only consider opportunities with actual profit (0.1% minimum net profit)
                     if net_profit_percentage >= 0.1:  # Minimum 0.1% net profit after fees
@@ -130,8 +306,11 @@ class ArbitrageEngine:
                             sell_fee=sell_fee,
                             net_spread_percentage=net_profit_percentage,
                             actual_profit_percentage=net_profit_percentage,
-                            timestamp=time.time()
+                            timestamp=now
                         )
+                        if alignment is not None:
+                            opportunity.buy_quote_age, opportunity.sell_quote_age, opportunity.quote_skew = alignment
+                            opportunity.quote_time = now - max(opportunity.buy_quote_age, opportunity.sell_quote_age)
                         opportunities.append(opportunity)
         
         return opportunities
\ No newline at end of file
@@ -0,0 +1,96 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+class ConfigWatcher:
+    """Notices edits to config.json so the bot can apply them between cycles.
+
+    poll() is called once per cycle and costs one stat() at most every
+    `interval` seconds. A changed file is only returned once it parses and
+    passes validate(), so a half-saved or broken edit leaves the running
+    config untouched.
+    """
+
+    # Sections the bot applies in place; anything else needs a restart
+    RELOADABLE = ("exchanges", "trading_pairs", "min_spread_percentage", "update_interval", "max_opportunities",
+                  "fees", "circuit_breaker", "market_data", "response_cache", "quotes", "spread_stats", "universe",
+                  "scheduler", "depth", "config_reload")
+    # Keys every config needs, and the sections read with .get() that must be objects if present
+    REQUIRED = {"exchanges": dict, "trading_pairs": list, "min_spread_percentage": (int, float),
+                "update_interval": (int, float), "max_opportunities": int}
+    SECTIONS = ("fees", "circuit_breaker", "market_data", "response_cache", "quotes", "spread_stats", "universe",
+                "scheduler", "depth", "config_reload", "live_trading", "sharding")
+
+    def __init__(self, path: str, interval: float = 2.0):
+        self.path = path
+        self.interval = interval
+        self.last_check = 0.0
+        self.mtime = self._mtime()
+        self.reloads = 0
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def poll(self) -> Optional[Dict]:
+        """The new config if the file changed and is valid JSON, else None"""
+        now = time.monotonic()
+        if now - self.last_check < self.interval:
+            return None
+        self.last_check = now
+        mtime = self._mtime()
+        if mtime is None or mtime == self.mtime:
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ignoring invalid {self.path}: {e}")
+            self.mtime = mtime  # Wait for the next save
+            return None
+        self.mtime = mtime
+        problems = self.validate(config)
+        if problems:
+            print(f"⚠️  Ignoring invalid {self.path}: {'; '.join(problems)}")
+            return None
+        self.reloads += 1
+        return config
+
+    @classmethod
+    def validate(cls, config) -> List[str]:
+        """What is wrong with a config's shape (missing keys, wrong types); empty if usable"""
+        if not isinstance(config, dict):
+            return ["not a JSON object"]
+        problems = []
+        for key, expected in cls.REQUIRED.items():
+            value = config.get(key)
+            if key not in config:
+                problems.append(f"{key} is missing")
+            elif not isinstance(value, expected) or isinstance(value, bool):
+                problems.append(f"{key} has the wrong type ({type(value).__name__})")
+        if isinstance(config.get("exchanges"), dict):
+            problems.extend(f"exchanges.{name} must be an object"
+                            for name, settings in config["exchanges"].items() if not isinstance(settings, dict))
+        if isinstance(config.get("trading_pairs"), list) and not all(isinstance(pair, str) for pair in config["trading_pairs"]):
+            problems.append("trading_pairs must be a list of strings")
+        problems.extend(f"{section} must be an object"
+                        for section in cls.SECTIONS if section in config and not isinstance(config[section], dict))
+        return problems
+
+    @staticmethod
+    def changed_sections(old: Dict, new: Dict) -> List[str]:
+        """Top-level keys whose value differs between two configs"""
+        return [key for key in sorted(set(old) | set(new)) if old.get(key) != new.get(key)]
+
+    @classmethod
+    def needs_restart(cls, sections: List[str], old: Dict, new: Dict) -> List[str]:
+        """Changed settings that only take effect after a restart"""
+        fixed = [section for section in sections if section not in cls.RELOADABLE and section != "live_trading"]
+        old_live, new_live = old.get("live_trading", {}), new.get("live_trading", {})
+        # Going live (or back) must be a deliberate restart
+        if old_live.get("enabled", False) != new_live.get("enabled", False):
+            fixed.append("live_trading.enabled")
+        return fixed
@@ -0,0 +1,65 @@
+from typing import NamedTuple
+from models.order_book import OrderBook
+
+class ExecutableSize(NamedTuple):
+    quantity: float   # base asset units
+    notional: float   # quote spent on the buy leg
+    buy_vwap: float
+    sell_vwap: float
+
+NO_SIZE = ExecutableSize(0.0, 0.0, 0.0, 0.0)
+
+def max_executable_size(buy_book: OrderBook, sell_book: OrderBook, buy_fee: float, sell_fee: float,
+                        min_net_percentage: float, max_notional: float = float("inf")) -> ExecutableSize:
+    """Largest quantity whose buy-VWAP vs sell-VWAP spread stays above the net threshold.
+
+    Walks the buy book's asks and the sell book's bids together. Within a
+    segment where both marginal prices are constant the net margin
+        revenue * (1 - sell_fee) - cost * (1 + buy_fee + threshold)
+    is linear in quantity, so the exact crossing point is solved directly.
+    Marginal prices only get worse deeper in the books, so once the margin
+    starts shrinking the first zero crossing is the answer. O(levels).
+    """
+    threshold = min_net_percentage / 100
+    buy_factor = 1 + buy_fee + threshold
+    sell_factor = 1 - sell_fee
+
+    asks, ask_sizes = buy_book.ask_prices, buy_book.ask_sizes
+    bids, bid_sizes = sell_book.bid_prices, sell_book.bid_sizes
+    i = j = 0
+    ask_left = ask_sizes[0] if asks else 0.0
+    bid_left = bid_sizes[0] if bids else 0.0
+    quantity = cost = revenue = 0.0
+
+    while i < len(asks) and j < len(bids):
+        ask, bid = asks[i], bids[j]
+        slope = bid * sell_factor - ask * buy_factor
+        margin = revenue * sell_factor - cost * buy_factor
+        step = min(ask_left, bid_left)
+        limited = False
+        if slope < 0 and margin / -slope < step:
+            # Margin shrinks from here on: take only what the slack allows
+            step, limited = margin / -slope, True
+        if (max_notional - cost) / ask < step:
+            step, limited = (max_notional - cost) / ask, True
+        if step <= 0:
+            break
+
+        quantity += step
+        cost += step * ask
+        revenue += step * bid
+        if limited:
+            break
+
+        ask_left -= step
+        bid_left -= step
+        if ask_left <= 0:
+            i += 1
+            ask_left = ask_sizes[i] if i < len(asks) else 0.0
+        if bid_left <= 0:
+            j += 1
+            bid_left = bid_sizes[j] if j < len(bids) else 0.0
+
+    if quantity <= 0:
+        return NO_SIZE
+    return ExecutableSize(quantity, cost, cost / quantity, revenue / quantity)
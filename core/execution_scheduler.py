@@ -0,0 +1,123 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+from models.data_models import ArbitrageOpportunity
+
+class BalanceReservations:
+    """Inventory earmarked by in-flight trades, per (exchange, asset)"""
+
+    def __init__(self):
+        self.reserved: Dict[Tuple[str, str], float] = defaultdict(float)
+
+    def available(self, exchange_name: str, asset: str, balance: float) -> float:
+        return balance - self.reserved.get((exchange_name, asset), 0.0)
+
+    def reserve(self, exchange_name: str, asset: str, amount: float):
+        self.reserved[(exchange_name, asset)] += amount
+
+    def release(self, exchange_name: str, asset: str, amount: float):
+        key = (exchange_name, asset)
+        self.reserved[key] -= amount
+        if self.reserved[key] <= 1e-12:
+            del self.reserved[key]
+
+
+class ExecutionScheduler:
+    """Runs several non-conflicting live opportunities at once.
+
+    Each cycle the ranked opportunities are admitted greedily, best first,
+    while global limits hold (max in-flight trades, max total notional in
+    flight). An opportunity is skipped if one of its (exchange, pair) legs
+    is already trading, or if the quote it spends on the buy exchange or
+    the base it sells on the sell exchange is not available after the
+    reservations of trades already in flight. Admitted trades reserve that
+    inventory until they finish, so concurrent trades never oversubscribe
+    a balance. With manual approval trades run one at a time.
+    """
+
+    def __init__(self, trader, max_in_flight: int = 3, max_exposure: float = 300.0,
+                 min_profit_percentage: float = 0.3):
+        self.trader = trader
+        self.max_in_flight = max_in_flight
+        self.max_exposure = max_exposure
+        self.min_profit_percentage = min_profit_percentage
+        self.reservations = BalanceReservations()
+        self.in_flight: Dict[asyncio.Task, Tuple[ArbitrageOpportunity, float]] = {}
+        self.busy_legs: Set[Tuple[str, str]] = set()
+        self.exposure = 0.0
+
+    @staticmethod
+    def legs(opportunity: ArbitrageOpportunity) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+        return (opportunity.buy_exchange, opportunity.pair), (opportunity.sell_exchange, opportunity.pair)
+
+    async def schedule(self, opportunities: List[ArbitrageOpportunity], manual_approval: bool = True) -> int:
+        """Admit as many opportunities as limits and balances allow; returns how many started"""
+        started = 0
+        for opportunity in opportunities:
+            if len(self.in_flight) >= self.max_in_flight:
+                break
+            if opportunity.actual_profit_percentage < self.min_profit_percentage:
+                continue
+            if any(leg in self.busy_legs for leg in self.legs(opportunity)):
+                continue
+            # Ranked opportunities can outlive their quotes: never reserve for stale ones
+            if not self.trader.quotes_fresh(opportunity, quiet=True):
+                continue
+
+            trade_size = self.trader.trade_size_for(opportunity)
+            if self.exposure + trade_size > self.max_exposure:
+                continue
+            reservation = await self.reserve(opportunity, trade_size)
+            if reservation is None:
+                continue
+
+            task = asyncio.create_task(self._execute(opportunity, trade_size, reservation, manual_approval))
+            self.in_flight[task] = (opportunity, trade_size)
+            self.busy_legs.update(self.legs(opportunity))
+            self.exposure += trade_size
+            started += 1
+
+            if manual_approval:
+                # input() blocks the loop anyway: one trade at a time
+                await task
+        return started
+
+    async def reserve(self, opportunity: ArbitrageOpportunity, trade_size: float):
+        """Reserve quote on the buy exchange and base on the sell exchange, or None if short"""
+        base, quote = opportunity.pair.split("-", 1)
+        quantity = trade_size / opportunity.buy_price
+        quote_balance, base_balance = await asyncio.gather(
+            self.trader.check_balance(opportunity.buy_exchange, quote),
+            self.trader.check_balance(opportunity.sell_exchange, base)
+        )
+        # Balances were read concurrently with other admissions: check against current reservations
+        if self.reservations.available(opportunity.buy_exchange, quote, quote_balance) < trade_size:
+            print(f"   ⏭️  {opportunity.pair}: not enough {quote} on {opportunity.buy_exchange} after trades in flight")
+            return None
+        if self.reservations.available(opportunity.sell_exchange, base, base_balance) < quantity:
+            print(f"   ⏭️  {opportunity.pair}: not enough {base} on {opportunity.sell_exchange} after trades in flight")
+            return None
+
+        reservation = ((opportunity.buy_exchange, quote, trade_size), (opportunity.sell_exchange, base, quantity))
+        for exchange_name, asset, amount in reservation:
+            self.reservations.reserve(exchange_name, asset, amount)
+        return reservation
+
+    async def _execute(self, opportunity: ArbitrageOpportunity, trade_size: float, reservation, manual_approval: bool):
+        try:
+            return await self.trader.execute_live_trade(opportunity, manual_approval=manual_approval, trade_size=trade_size)
+        except Exception as e:
+            print(f"❌ Scheduled trade {opportunity.pair} failed: {e}")
+            return False
+        finally:
+            for exchange_name, asset, amount in reservation:
+                self.reservations.release(exchange_name, asset, amount)
+            self.busy_legs.difference_update(self.legs(opportunity))
+            self.exposure -= trade_size
+            self.in_flight.pop(asyncio.current_task(), None)
+
+    async def drain(self):
+        """Wait for every trade in flight to finish"""
+        if self.in_flight:
+            print(f"⏳ Waiting for {len(self.in_flight)} live trades in flight...")
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
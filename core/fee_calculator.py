@@ -1,3 +1,6 @@
+from array import array
+from typing import Dict, List, Tuple
+
 class FeeCalculator:
     """Calculate trading fees for each exchange"""
     
@@ -31,4 +34,134 @@ class FeeCalculator:
     @classmethod
     def get_exchange_fee(cls, exchange_name: str) -> float:
         """Get fee for a specific exchange"""
-        return cls.EXCHANGE_FEES.get(exchange_name, 0.002)  # Default 0.2%
\ No newline at end of file
+        return cls.EXCHANGE_FEES.get(exchange_name, 0.002)  # Default 0.2%
+
+class FeeMatrix:
+    """Dense maker/taker fee table compiled from a FeeSchedule.
+
+    Fees live in flat arrays indexed by exchange_offset[exchange] + pair index,
+    so the scan loop pays one dict lookup per exchange and one array read per fee.
+    """
+    
+    def __init__(self, version: int, exchanges: Tuple[str, ...], pairs: Tuple[str, ...]):
+        self.version = version
+        self.exchanges = exchanges
+        self.pairs = pairs
+        self.pair_index = {pair: i for i, pair in enumerate(pairs)}
+        self.exchange_offset = {exchange: i * len(pairs) for i, exchange in enumerate(exchanges)}
+        self.maker = array('d', bytes(8 * len(exchanges) * len(pairs)))
+        self.taker = array('d', bytes(8 * len(exchanges) * len(pairs)))
+    
+    def taker_fee(self, exchange_name: str, pair: str) -> float:
+        return self.taker[self.exchange_offset[exchange_name] + self.pair_index[pair]]
+    
+    def maker_fee(self, exchange_name: str, pair: str) -> float:
+        return self.maker[self.exchange_offset[exchange_name] + self.pair_index[pair]]
+    
+    def subset(self, pairs: List[str]) -> "FeeMatrix":
+        """Smaller matrix covering only `pairs` (e.g. one engine shard)"""
+        matrix = FeeMatrix(self.version, self.exchanges, tuple(pairs))
+        for exchange in self.exchanges:
+            source, target = self.exchange_offset[exchange], matrix.exchange_offset[exchange]
+            for i, pair in enumerate(matrix.pairs):
+                matrix.maker[target + i] = self.maker[source + self.pair_index[pair]]
+                matrix.taker[target + i] = self.taker[source + self.pair_index[pair]]
+        return matrix
+
+
+class FeeSchedule:
+    """Per-account maker/taker tiers, per-pair overrides and discount-token options
+    
+    Config layout (all keys optional, missing exchanges fall back to EXCHANGE_FEES):
+        "fees": {
+            "binance": {
+                "volume_30d": 2500000,
+                "tiers": [[0, 0.0010, 0.0010], [1000000, 0.0009, 0.0010]],
+                "use_discount_token": true,
+                "pair_overrides": {"BTC-USDT": {"maker": 0.0, "taker": 0.0}}
+            }
+        }
+    Every mutation bumps `version`, which is what tells engines to recompile.
+    """
+    
+    # Fee discount for paying fees in the exchange's own token
+    DISCOUNT_TOKENS = {
+        "binance": ("BNB", 0.25),
+        "kucoin": ("KCS", 0.20),
+    }
+    
+    def __init__(self, config: Dict = None):
+        self.version = 0
+        self.accounts = {}
+        for exchange_name, settings in (config or {}).items():
+            self.configure_exchange(exchange_name, settings)
+    
+    def configure_exchange(self, exchange_name: str, settings: Dict):
+        """Replace the fee settings of one exchange"""
+        default = FeeCalculator.get_exchange_fee(exchange_name)
+        tiers = sorted(tuple(tier) for tier in settings.get("tiers", [[0, default, default]]))
+        self.accounts[exchange_name] = {
+            "tiers": tiers,
+            "volume_30d": settings.get("volume_30d", 0),
+            "use_discount_token": settings.get("use_discount_token", False),
+            "discount_rate": settings.get("discount_rate", self.DISCOUNT_TOKENS.get(exchange_name, ("", 0.0))[1]),
+            "pair_overrides": dict(settings.get("pair_overrides", {})),
+        }
+        self.version += 1
+    
+    def set_volume(self, exchange_name: str, volume_30d: float):
+        """Update the 30-day volume that selects the fee tier"""
+        self._account(exchange_name)["volume_30d"] = volume_30d
+        self.version += 1
+    
+    def set_discount_token(self, exchange_name: str, enabled: bool):
+        self._account(exchange_name)["use_discount_token"] = enabled
+        self.version += 1
+    
+    def set_pair_override(self, exchange_name: str, pair: str, maker: float, taker: float):
+        self._account(exchange_name)["pair_overrides"][pair] = {"maker": maker, "taker": taker}
+        self.version += 1
+    
+    def _account(self, exchange_name: str) -> Dict:
+        if exchange_name not in self.accounts:
+            self.configure_exchange(exchange_name, {})
+        return self.accounts[exchange_name]
+    
+    def get_fees(self, exchange_name: str, pair: str) -> Tuple[float, float]:
+        """(maker, taker) fee for one exchange and pair - slow path used to compile"""
+        account = self.accounts.get(exchange_name)
+        if account is None:
+            default = FeeCalculator.get_exchange_fee(exchange_name)
+            return default, default
+        
+        override = account["pair_overrides"].get(pair)
+        if override is not None:
+            maker, taker = override.get("maker", 0.0), override.get("taker", 0.0)
+        else:
+            maker, taker = account["tiers"][0][1], account["tiers"][0][2]
+            for min_volume, tier_maker, tier_taker in account["tiers"]:
+                if account["volume_30d"] >= min_volume:
+                    maker, taker = tier_maker, tier_taker
+        
+        if account["use_discount_token"]:
+            discount = 1 - account["discount_rate"]
+            maker, taker = maker * discount, taker * discount
+        return maker, taker
+    
+    def compile(self, exchanges: Tuple[str, ...], pairs: Tuple[str, ...]) -> FeeMatrix:
+        """Build the dense fee matrix for the given exchanges and pairs"""
+        matrix = FeeMatrix(self.version, exchanges, pairs)
+        for exchange_name in exchanges:
+            offset = matrix.exchange_offset[exchange_name]
+            account = self.accounts.get(exchange_name)
+            overrides = account["pair_overrides"] if account else {}
+            # Pairs without overrides share the account-level rate
+            base_maker, base_taker = self.get_fees(exchange_name, "")
+            for i, pair in enumerate(pairs):
+                if pair in overrides:
+                    maker, taker = self.get_fees(exchange_name, pair)
+                else:
+                    maker, taker = base_maker, base_taker
+                matrix.maker[offset + i] = maker
+                matrix.taker[offset + i] = taker
+        return matrix
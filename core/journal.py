@@ -0,0 +1,214 @@
+import asyncio
+import math
+import os
+import time
+from array import array
+from typing import Dict, List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from models.data_models import ArbitrageOpportunity
+
+class _Columns:
+    """Append-only column buffers: numbers in typed arrays, strings as dictionary codes.
+
+    Appending a row stores raw values into the arrays; no per-row Python
+    object survives the call.
+    """
+
+    def __init__(self, float_columns, code_columns):
+        self.floats = {name: array('d') for name in float_columns}
+        self.codes = {name: array('i') for name in code_columns}
+        self.rows = 0
+
+    def __len__(self):
+        return self.rows
+
+
+class _RollingWriter:
+    """One Parquet file per period in the stream's own directory (journal/<stream>/YYYYmmdd-HHMMSS.parquet)"""
+
+    def __init__(self, output_dir: str, stream: str, roll_interval: float):
+        self.output_dir = os.path.join(output_dir, stream)
+        self.stream = stream
+        self.roll_interval = roll_interval
+        self.writer: Optional[pq.ParquetWriter] = None
+        self.period: Optional[int] = None
+        self.path = ""
+
+    def write(self, table: pa.Table, now: float):
+        period = int(now // self.roll_interval)
+        if self.writer is not None and (period != self.period or not self.writer.schema.equals(table.schema)):
+            self.close()
+        if self.writer is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(period * self.roll_interval))
+            path = os.path.join(self.output_dir, f"{stamp}.parquet")
+            suffix = 1
+            while os.path.exists(path):  # Restarted within the same period
+                path = os.path.join(self.output_dir, f"{stamp}.{suffix}.parquet")
+                suffix += 1
+            self.writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            self.period = period
+            self.path = path
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()  # Writes the footer: the file is readable from here on
+            self.writer = None
+
+
+class ColumnarJournal:
+    """Batches opportunities and per-cycle quotes into Arrow record batches on rolling Parquet files.
+
+    The cycle only appends numbers and dictionary codes to typed arrays.
+    Every flush_interval seconds a background task swaps the buffers out,
+    wraps them as Arrow arrays without copying, and writes a row group in a
+    worker thread, so compression and disk I/O never block the event loop.
+    Files roll every roll_interval seconds; a file becomes readable once it
+    is rolled or the bot shuts down (the Parquet footer is written then).
+
+        import pyarrow.dataset as ds
+        ds.dataset("journal/opportunities", format="parquet").to_table(filter=...)
+    """
+
+    OPPORTUNITY_FLOATS = ("timestamp", "buy_price", "sell_price", "spread_percentage", "net_profit_percentage",
+                          "buy_fee", "sell_fee", "executable_notional", "buy_quote_age", "sell_quote_age",
+                          "quote_skew", "spread_zscore")
+    OPPORTUNITY_CODES = ("pair", "buy_exchange", "sell_exchange")
+    QUOTE_FLOATS = ("cycle_time", "price", "received_at", "exchange_time")
+    QUOTE_CODES = ("exchange", "pair")
+
+    def __init__(self, output_dir: str = "journal", flush_interval: float = 30.0, roll_interval: float = 3600.0,
+                 record_quotes: bool = True):
+        self.output_dir = output_dir
+        self.flush_interval = flush_interval
+        self.record_quotes = record_quotes
+        # Dictionary encoding shared by every string column: value -> code
+        self.dictionary: Dict[str, int] = {}
+        self.values: List[str] = []
+        self.opportunities = self._new_opportunities()
+        self.quotes = self._new_quotes()
+        self.writers = {
+            "opportunities": _RollingWriter(output_dir, "opportunities", roll_interval),
+            "quotes": _RollingWriter(output_dir, "quotes", roll_interval),
+        }
+        self.rows_written = 0
+        self.task: Optional[asyncio.Task] = None
+        # A flush cancelled mid-write keeps writing in its thread: serialise writers
+        self._write_lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ColumnarJournal":
+        return cls(
+            output_dir=config.get("output_dir", "journal"),
+            flush_interval=config.get("flush_interval", 30),
+            roll_interval=config.get("roll_interval", 3600),
+            record_quotes=config.get("record_quotes", True)
+        )
+
+    def _new_opportunities(self) -> _Columns:
+        return _Columns(self.OPPORTUNITY_FLOATS, self.OPPORTUNITY_CODES)
+
+    def _new_quotes(self) -> _Columns:
+        return _Columns(self.QUOTE_FLOATS, self.QUOTE_CODES)
+
+    def _code(self, value: str) -> int:
+        code = self.dictionary.get(value)
+        if code is None:
+            code = self.dictionary[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def record_opportunities(self, opportunities: List[ArbitrageOpportunity]):
+        columns = self.opportunities
+        floats, codes = columns.floats, columns.codes
+        for opp in opportunities:
+            floats["timestamp"].append(opp.timestamp)
+            floats["buy_price"].append(opp.buy_price)
+            floats["sell_price"].append(opp.sell_price)
+            floats["spread_percentage"].append(opp.spread_percentage)
+            floats["net_profit_percentage"].append(opp.actual_profit_percentage)
+            floats["buy_fee"].append(opp.buy_fee)
+            floats["sell_fee"].append(opp.sell_fee)
+            floats["executable_notional"].append(opp.executable_notional)
+            floats["buy_quote_age"].append(opp.buy_quote_age)
+            floats["sell_quote_age"].append(opp.sell_quote_age)
+            floats["quote_skew"].append(opp.quote_skew)
+            floats["spread_zscore"].append(math.nan if opp.spread_zscore is None else opp.spread_zscore)
+            codes["pair"].append(self._code(opp.pair))
+            codes["buy_exchange"].append(self._code(opp.buy_exchange))
+            codes["sell_exchange"].append(self._code(opp.sell_exchange))
+        columns.rows += len(opportunities)
+
+    def record_quote_snapshot(self, quotes, cycle_time: float):
+        """Append every quote of a QuoteSnapshot, tagged with the cycle it belongs to"""
+        if not self.record_quotes:
+            return
+        columns = self.quotes
+        floats, codes = columns.floats, columns.codes
+        for exchange_name, exchange_quotes in quotes.quotes.items():
+            exchange_code = self._code(exchange_name)
+            for pair, quote in exchange_quotes.items():
+                floats["cycle_time"].append(cycle_time)
+                floats["price"].append(quote.price)
+                floats["received_at"].append(quote.received_at)
+                floats["exchange_time"].append(quote.exchange_time or math.nan)
+                codes["exchange"].append(exchange_code)
+                codes["pair"].append(self._code(pair))
+            columns.rows += len(exchange_quotes)
+
+    def _table(self, columns: _Columns, dictionary: pa.Array) -> pa.Table:
+        arrays, names = [], []
+        for name, values in columns.codes.items():
+            indices = pa.Array.from_buffers(pa.int32(), len(values), [None, pa.py_buffer(values)])
+            arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+            names.append(name)
+        for name, values in columns.floats.items():
+            # Zero-copy view of the array's buffer
+            arrays.append(pa.Array.from_buffers(pa.float64(), len(values), [None, pa.py_buffer(values)]))
+            names.append(name)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def _write(self, batches, now: float):
+        for stream, table in batches:
+            self.writers[stream].write(table, now)
+
+    async def flush(self):
+        """Swap the buffers and write them out in a worker thread"""
+        batches = []
+        dictionary = pa.array(self.values, type=pa.string())
+        for stream, columns in (("opportunities", self.opportunities), ("quotes", self.quotes)):
+            if len(columns):
+                batches.append((stream, self._table(columns, dictionary)))
+                self.rows_written += len(columns)
+        self.opportunities = self._new_opportunities()
+        self.quotes = self._new_quotes()
+        if batches:
+            async with self._write_lock:
+                await asyncio.to_thread(self._write, batches, time.time())
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Journal write failed: {e}")
+
+    async def close(self):
+        """Flush what is buffered and finalise the open Parquet files"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await self.flush()
+        async with self._write_lock:
+            await asyncio.to_thread(lambda: [writer.close() for writer in self.writers.values()])
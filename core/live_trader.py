@@ -1,66 +1,168 @@
 import asyncio
+import importlib
 import time
 import json
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from models.data_models import ArbitrageOpportunity
+from core.order_tracker import OrderTracker
+from order_execution.user_stream import TERMINAL_STATUSES
+from exchanges.circuit_breaker import CircuitBreaker
 
-# Import the order executors
-from order_execution.binance_order import BinanceOrderExecutor
-from order_execution.kucoin_order import KuCoinOrderExecutor
-# Add other executors as you implement them:
-# from order_execution.bybit_order import BybitOrderExecutor
-# from order_execution.okx_order import OKXOrderExecutor
-# from order_execution.gateio_order import GateIOOrderExecutor
+# Order executors are imported and built lazily, only for exchanges we trade:
+# exchange -> (module, class name, needs passphrase)
+ORDER_EXECUTORS = {
+    "binance": ("order_execution.binance_order", "BinanceOrderExecutor", False),
+    "kucoin": ("order_execution.kucoin_order", "KuCoinOrderExecutor", True),
+    "bybit": ("order_execution.bybit_order", "BybitOrderExecutor", False),
+    "okx": ("order_execution.okx_order", "OKXOrderExecutor", True),
+    "gateio": ("order_execution.gateio_order", "GateIOOrderExecutor", False),
+    "kraken": ("order_execution.kraken_order", "KrakenOrderExecutor", False),
+    "coinbase": ("order_execution.coinbase_order", "CoinbaseOrderExecutor", True),
+}
 
 class LiveTrader:
     def __init__(self, bot):
         self.bot = bot
         self.trade_history = []
         self.is_live = False
-        self.max_trade_size = 100  # $100 max per trade to start
-        self.daily_loss_limit = 50  # $50 max daily loss
+        live_config = self.bot.config.get("live_trading", {})
+        self.max_trade_size = live_config.get("max_trade_size", 100)  # $ max per trade
+        self.daily_loss_limit = live_config.get("daily_loss_limit", 50)  # $ max daily loss
         self.total_pnl = 0.0
+        # Realised P&L of the current UTC day, checked against daily_loss_limit
+        self.daily_pnl = 0.0
+        self.pnl_day = self.current_day()
         
-        # Initialize order executors
+        # Order executors are created on first use
         self.order_executors = {}
+        self.executor_configs = {}
         self._setup_order_executors()
         
+        # Fills and balances are pushed over private user-data streams
+        self.use_user_streams = live_config.get("user_streams", True)
+        self.order_latency_budget = live_config.get("order_latency_budget", 2.0)
+        self.order_lookup_grace = live_config.get("order_lookup_grace", 1.0)
+        self.clock_sync_interval = live_config.get("clock_sync_interval", 60.0)
+        # Orders for one exchange placed within this window by concurrent trades go out as one batch
+        self.batch_window = live_config.get("batch_window_ms", 5) / 1000
+        self.pending_orders: Dict[str, List[Tuple[Dict, asyncio.Future]]] = {}
+        self.batch_tasks = set()
+        # Opportunities whose older quote is past this age are never executed
+        self.max_quote_age = self.bot.config.get("quotes", {}).get("max_age_ms", 5000) / 1000
+        self.order_tracker = OrderTracker(fill_timeout=live_config.get("fill_timeout", 5.0))
+        self.order_tracker.add_listener(self.on_user_event)
+        
     def _setup_order_executors(self):
-        """Setup order executors for each enabled exchange"""
-        print("🔄 Setting up order executors...")
+        """Register executor credentials for each enabled exchange (built lazily)"""
         for exchange_name, config in self.bot.config["exchanges"].items():
             if config["enabled"] and config.get("api_key"):
-                try:
-                    if exchange_name == "binance":
-                        self.order_executors[exchange_name] = BinanceOrderExecutor(
-                            config["api_key"], config["api_secret"]
-                        )
-                        print(f"   ✅ Binance order executor ready")
-                    elif exchange_name == "kucoin":
-                        self.order_executors[exchange_name] = KuCoinOrderExecutor(
-                            config["api_key"], config["api_secret"], config.get("api_passphrase", "")
-                        )
-                        print(f"   ✅ KuCoin order executor ready")
-                    # Add other exchanges as you implement them
-                    # elif exchange_name == "bybit":
-                    #     self.order_executors[exchange_name] = BybitOrderExecutor(
-                    #         config["api_key"], config["api_secret"]
-                    #     )
-                    # elif exchange_name == "okx":
-                    #     self.order_executors[exchange_name] = OKXOrderExecutor(
-                    #         config["api_key"], config["api_secret"], config.get("api_passphrase", "")
-                    #     )
-                    # elif exchange_name == "gateio":
-                    #     self.order_executors[exchange_name] = GateIOOrderExecutor(
-                    #         config["api_key"], config["api_secret"]
-                    #     )
-                    else:
-                        print(f"   ⚠️  Order executor not implemented for {exchange_name}")
-                        
-                except Exception as e:
-                    print(f"   ❌ Failed to setup {exchange_name} order executor: {e}")
-        
-    async def execute_live_trade(self, opportunity: ArbitrageOpportunity, manual_approval: bool = True):
+                if exchange_name in ORDER_EXECUTORS:
+                    self.executor_configs[exchange_name] = config
+                else:
+                    print(f"   ⚠️  Order executor not implemented for {exchange_name}")
+    
+    def apply_config(self):
+        """Pick up reloaded live_trading settings and executors for newly enabled exchanges"""
+        live_config = self.bot.config.get("live_trading", {})
+        self.max_trade_size = live_config.get("max_trade_size", 100)
+        self.daily_loss_limit = live_config.get("daily_loss_limit", 50)
+        self.order_latency_budget = live_config.get("order_latency_budget", 2.0)
+        self.order_lookup_grace = live_config.get("order_lookup_grace", 1.0)
+        self.clock_sync_interval = live_config.get("clock_sync_interval", 60.0)
+        self.batch_window = live_config.get("batch_window_ms", 5) / 1000
+        self.max_quote_age = self.bot.config.get("quotes", {}).get("max_age_ms", 5000) / 1000
+        self.order_tracker.fill_timeout = live_config.get("fill_timeout", 5.0)
+        for exchange_name, config in self.bot.config["exchanges"].items():
+            if (config.get("enabled") and config.get("api_key") and exchange_name in ORDER_EXECUTORS
+                    and not self.has_executor(exchange_name)):
+                self.executor_configs[exchange_name] = config
+    
+    def has_executor(self, exchange_name: str) -> bool:
+        return exchange_name in self.order_executors or exchange_name in self.executor_configs
+    
+    def get_executor(self, exchange_name: str):
+        """Return the order executor for an exchange, importing and building it on first use"""
+        executor = self.order_executors.get(exchange_name)
+        if executor is not None or exchange_name not in self.executor_configs:
+            return executor
+        
+        config = self.executor_configs[exchange_name]
+        module_name, class_name, needs_passphrase = ORDER_EXECUTORS[exchange_name]
+        try:
+            executor_class = getattr(importlib.import_module(module_name), class_name)
+            if needs_passphrase:
+                executor = executor_class(config["api_key"], config["api_secret"], config.get("api_passphrase", ""))
+            else:
+                executor = executor_class(config["api_key"], config["api_secret"])
+        except Exception as e:
+            print(f"   ❌ Failed to setup {exchange_name} order executor: {e}")
+            del self.executor_configs[exchange_name]
+            return None
+        
+        breaker_config = self.bot.config.get("circuit_breaker", {})
+        executor.breaker = CircuitBreaker.from_config(breaker_config)
+        executor.request_timeout = breaker_config.get("request_timeout", 10.0)
+        self.order_executors[exchange_name] = executor
+        print(f"   ✅ {exchange_name} order executor ready")
+        return executor
+    
+    def tradable_exchanges(self):
+        """Exchanges with both market data and order execution configured"""
+        return [name for name in self.executor_configs if name in self.bot.exchanges]
+    
+    def start_user_streams(self):
+        """Subscribe to order and balance events for every tradable exchange"""
+        if not self.use_user_streams:
+            return
+        for exchange_name in self.tradable_exchanges():
+            executor = self.get_executor(exchange_name)
+            if executor is not None and self.order_tracker.start_stream(exchange_name, executor):
+                print(f"   📡 {exchange_name} user-data stream started")
+            else:
+                print(f"   ⚠️  No user-data stream for {exchange_name}, fills confirmed over REST")
+    
+    def start_clock_sync(self):
+        """Track each exchange's clock offset in the background for request signing"""
+        for exchange_name in self.tradable_exchanges():
+            executor = self.get_executor(exchange_name)
+            if executor is not None and executor.start_clock_sync(self.clock_sync_interval):
+                print(f"   🕒 {exchange_name} clock: {executor.clock.describe()}")
+    
+    def on_user_event(self, event: Dict):
+        """Pushed order/balance updates from the user-data streams"""
+        if event['type'] != 'order':
+            return
+        if event['status'] == 'PARTIALLY_FILLED':
+            print(f"   ⏳ {event['exchange']} {event['side'].upper()} {event['symbol']} partial fill: "
+                  f"{event['last_fill_quantity']:.6f} @ {event['last_fill_price']:.6f} "
+                  f"(total {event['filled_quantity']:.6f})")
+        elif event['status'] == 'FILLED':
+            print(f"   ✅ {event['exchange']} {event['side'].upper()} {event['symbol']} filled: {event['filled_quantity']:.6f}")
+    
+    async def confirm_fill(self, exchange_name: str, result: Dict) -> float:
+        """Wait for an order's final state and return the quantity actually filled"""
+        state = await self.order_tracker.wait_for_fill(
+            exchange_name,
+            self.get_executor(exchange_name),
+            result['order_id'],
+            result['symbol']
+        )
+        if state is None:
+            print(f"   ⚠️  Could not confirm {exchange_name} order {result['order_id']}")
+            return 0.0
+        if state['status'] not in TERMINAL_STATUSES:
+            print(f"   ⚠️  {exchange_name} order {result['order_id']} could not be cancelled and may still fill")
+        return state['filled_quantity']
+        
+    def trade_size_for(self, opportunity: ArbitrageOpportunity) -> float:
+        """Never trade more than the book can absorb at a profit"""
+        trade_size = self.max_trade_size
+        if opportunity.executable_notional > 0:
+            trade_size = min(trade_size, opportunity.executable_notional)
+        return trade_size
+    
+    async def execute_live_trade(self, opportunity: ArbitrageOpportunity, manual_approval: bool = True,
+                                 trade_size: Optional[float] = None):
         """Execute a live arbitrage trade with REAL orders"""
         
         if not self.is_live:
@@ -71,31 +173,38 @@ class LiveTrader:
         if not await self.safety_checks(opportunity):
             return False
         
+        if trade_size is None:
+            trade_size = self.trade_size_for(opportunity)
+        
         # Manual approval for first trades
         if manual_approval:
             print(f"\n🎯 LIVE TRADE OPPORTUNITY:")
             print(f"   {opportunity.pair}: {opportunity.buy_exchange} → {opportunity.sell_exchange}")
             print(f"   Net Profit: {opportunity.actual_profit_percentage:.4f}%")
-            print(f"   Trade Amount: ${self.max_trade_size}")
-            print(f"   Estimated Profit: ${(self.max_trade_size * opportunity.actual_profit_percentage / 100):.4f}")
+            print(f"   Trade Amount: ${trade_size}")
+            print(f"   Estimated Profit: ${(trade_size * opportunity.actual_profit_percentage / 100):.4f}")
             
             approve = input("Execute this REAL trade? (y/N): ").strip().lower()
             if approve != 'y':
                 print("❌ Trade cancelled by user")
                 return False
+            # The prompt may have taken longer than the quotes stay valid
+            if not self.quotes_fresh(opportunity):
+                return False
         
         print(f"🚀 EXECUTING REAL LIVE TRADE...")
         
         try:
-            # 1. Check REAL balances using order executors
-            buy_balance = await self.check_balance(opportunity.buy_exchange, 'USDT')
-            if buy_balance < self.max_trade_size:
-                print(f"❌ Insufficient REAL balance on {opportunity.buy_exchange}: ${buy_balance:.2f}")
+            # 1. Check REAL balances using order executors (the pair's quote asset, as the scheduler reserves it)
+            quote_asset = opportunity.pair.split('-')[1]
+            buy_balance = await self.check_balance(opportunity.buy_exchange, quote_asset)
+            if buy_balance < trade_size:
+                print(f"❌ Insufficient REAL balance on {opportunity.buy_exchange}: {buy_balance:.2f} {quote_asset}")
                 return False
             
             # 2. Execute REAL BUY order using order executor
             print(f"📥 Placing REAL BUY order on {opportunity.buy_exchange}...")
-            buy_quantity = self.max_trade_size / opportunity.buy_price
+            buy_quantity = trade_size / opportunity.buy_price
             buy_result = await self.place_real_order(
                 opportunity.buy_exchange, 
                 opportunity.pair, 
@@ -107,26 +216,41 @@ class LiveTrader:
                 print(f"❌ REAL BUY order failed: {buy_result.get('error')}")
                 return False
             
+            # Only sell what was actually bought
+            filled_quantity = await self.confirm_fill(opportunity.buy_exchange, buy_result)
+            if filled_quantity <= 0:
+                print(f"❌ REAL BUY order on {opportunity.buy_exchange} was not filled")
+                return False
+            if filled_quantity < buy_quantity:
+                print(f"⚠️  BUY partially filled: {filled_quantity:.6f} of {buy_quantity:.6f}")
+            
             # 3. Execute REAL SELL order using order executor
             print(f"📤 Placing REAL SELL order on {opportunity.sell_exchange}...")
             sell_result = await self.place_real_order(
                 opportunity.sell_exchange,
                 opportunity.pair,
                 'sell', 
-                buy_quantity  # Use same quantity from buy
+                filled_quantity
             )
             
+            sold_quantity = 0.0
+            if sell_result.get('success'):
+                sold_quantity = await self.confirm_fill(opportunity.sell_exchange, sell_result)
+                if sold_quantity < filled_quantity:
+                    print(f"⚠️  SELL filled {sold_quantity:.6f} of {filled_quantity:.6f}")
+            
             if sell_result.get('success'):
-                profit = self.max_trade_size * opportunity.actual_profit_percentage / 100
-                self.total_pnl += profit
+                profit = filled_quantity * opportunity.buy_price * opportunity.actual_profit_percentage / 100
+                self.record_pnl(profit)
                 
                 trade_record = {
                     'timestamp': time.time(),
                     'pair': opportunity.pair,
                     'buy_exchange': opportunity.buy_exchange,
                     'sell_exchange': opportunity.sell_exchange,
-                    'amount': self.max_trade_size,
-                    'quantity': buy_quantity,
+                    'amount': trade_size,
+                    'quantity': filled_quantity,
+                    'sold_quantity': sold_quantity,
                     'estimated_profit': profit,
                     'actual_profit_percentage': opportunity.actual_profit_percentage,
                     'buy_order_id': buy_result.get('order_id'),
@@ -149,32 +273,90 @@ class LiveTrader:
     
     async def place_real_order(self, exchange_name: str, pair: str, side: str, quantity: float) -> Dict:
         """Place REAL order using the order executor"""
-        if exchange_name not in self.order_executors:
+        executor = self.get_executor(exchange_name)
+        if executor is None:
             return {
                 'success': False, 
                 'error': f'No order executor available for {exchange_name}. Please implement it in order_execution/ folder.'
             }
         
-        executor = self.order_executors[exchange_name]
-        
         # Convert pair to exchange-specific format using the existing API
         exchange_api = self.bot.exchanges[exchange_name]
         symbol = exchange_api.normalize_pair(pair)
         
         print(f"   🔄 Executing {side.upper()} {quantity:.6f} {symbol} on {exchange_name}")
-        return await executor.place_market_order(symbol, side, quantity)
+        # One client order id per order: timeouts are retried only after checking it did not land
+        if executor.BATCH_LIMIT > 1 and self.batch_window > 0 and len(self.bot.execution_scheduler.in_flight) > 1:
+            result = await self.queue_order(exchange_name, executor, {'symbol': symbol, 'side': side, 'quantity': quantity})
+        else:
+            result = await executor.place_order_idempotent(symbol, side, quantity, latency_budget=self.order_latency_budget,
+                                                           lookup_grace=self.order_lookup_grace)
+        if result.get('success'):
+            result['order_id'] = str(result['order_id'])
+            result['symbol'] = symbol
+            self.order_tracker.record_result(exchange_name, result, symbol, side)
+        return result
+    
+    async def queue_order(self, exchange_name: str, executor, order: Dict) -> Dict:
+        """Join the exchange's pending batch, opening one (flushed after batch_window) if there is none"""
+        future = asyncio.get_running_loop().create_future()
+        pending = self.pending_orders.get(exchange_name)
+        if pending is None:
+            pending = self.pending_orders[exchange_name] = []
+            task = asyncio.create_task(self.flush_orders(exchange_name, executor))
+            self.batch_tasks.add(task)
+            task.add_done_callback(self.batch_tasks.discard)
+        pending.append((order, future))
+        return await future
+    
+    async def flush_orders(self, exchange_name: str, executor):
+        await asyncio.sleep(self.batch_window)
+        pending = self.pending_orders.pop(exchange_name)
+        orders = [order for order, _ in pending]
+        try:
+            if len(orders) == 1:
+                results = [await executor.place_order_idempotent(orders[0]['symbol'], orders[0]['side'], orders[0]['quantity'],
+                                                                 latency_budget=self.order_latency_budget,
+                                                                 lookup_grace=self.order_lookup_grace)]
+            else:
+                print(f"   📦 Batching {len(orders)} orders on {exchange_name}")
+                results = await executor.place_orders_idempotent(orders, latency_budget=self.order_latency_budget,
+                                                                 lookup_grace=self.order_lookup_grace)
+        except Exception as e:
+            results = [{'success': False, 'error': str(e), 'ambiguous': True} for _ in orders]
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def cancel_real_orders(self, exchange_name: str, orders: List[Tuple[str, str]]) -> List[bool]:
+        """Cancel (order_id, symbol) pairs on one exchange, batched where the exchange allows it"""
+        executor = self.get_executor(exchange_name)
+        if executor is None:
+            return [False] * len(orders)
+        return await executor.cancel_orders(orders)
     
     async def check_balance(self, exchange_name: str, asset: str) -> float:
         """Check REAL balance using order executor"""
-        if exchange_name not in self.order_executors:
+        executor = self.get_executor(exchange_name)
+        if executor is None:
             print(f"   ⚠️  No order executor for {exchange_name}, using simulated balance")
             return 1000.0  # Fallback to simulated balance
         
-        executor = self.order_executors[exchange_name]
-        balance = await executor.get_balance(asset)
+        balance = self.order_tracker.get_balance(exchange_name, asset)
+        if balance is None:
+            balance = await executor.get_balance(asset)
         print(f"   💰 REAL Balance on {exchange_name}: ${balance:.2f} {asset}")
         return balance
     
+    def quotes_fresh(self, opportunity: ArbitrageOpportunity, quiet: bool = False) -> bool:
+        """False once the opportunity's older quote is older than max_quote_age"""
+        age = opportunity.quote_age(time.time())
+        if age > self.max_quote_age:
+            if not quiet:
+                print(f"❌ Quotes for {opportunity.pair} are {age:.1f}s old, skipping trade")
+            return False
+        return True
+    
     async def safety_checks(self, opportunity: ArbitrageOpportunity) -> bool:
         """Perform safety checks before trading"""
         
@@ -183,15 +365,26 @@ class LiveTrader:
             print("❌ Profit too low for live trading")
             return False
         
+        # Both legs must still be priced off recent quotes
+        if not self.quotes_fresh(opportunity):
+            return False
+        
         # Check if order executors are available for both exchanges
-        if opportunity.buy_exchange not in self.order_executors:
+        if not self.has_executor(opportunity.buy_exchange):
             print(f"❌ No order executor available for {opportunity.buy_exchange}")
             return False
             
-        if opportunity.sell_exchange not in self.order_executors:
+        if not self.has_executor(opportunity.sell_exchange):
             print(f"❌ No order executor available for {opportunity.sell_exchange}")
             return False
         
+        # Never trade into an exchange we are currently backing off from
+        for exchange_name in (opportunity.buy_exchange, opportunity.sell_exchange):
+            executor = self.order_executors.get(exchange_name)
+            if self.bot.exchanges[exchange_name].breaker.is_open() or (executor and executor.breaker.is_open()):
+                print(f"❌ {exchange_name} circuit is open, skipping trade")
+                return False
+        
         # Exchange connectivity check
         if not await self.exchange_health_check(opportunity.buy_exchange):
             return False
@@ -199,12 +392,29 @@ class LiveTrader:
             return False
             
         # Daily loss limit check
-        if self.total_pnl < -self.daily_loss_limit:
+        self.roll_day()
+        if self.daily_pnl < -self.daily_loss_limit:
             print("❌ Daily loss limit reached")
             return False
         
         return True
     
+    @staticmethod
+    def current_day() -> int:
+        """Days since the epoch (UTC): the daily loss limit resets at midnight UTC"""
+        return int(time.time() // 86400)
+    
+    def roll_day(self):
+        day = self.current_day()
+        if day != self.pnl_day:
+            self.pnl_day = day
+            self.daily_pnl = 0.0
+    
+    def record_pnl(self, profit: float):
+        self.roll_day()
+        self.total_pnl += profit
+        self.daily_pnl += profit
+    
     async def exchange_health_check(self, exchange_name: str) -> bool:
         """Check if exchange is healthy"""
         try:
@@ -217,6 +427,7 @@ class LiveTrader:
     
     async def cleanup(self):
         """Clean up order executor sessions"""
+        await self.order_tracker.stop()
         print("Closing order executor sessions...")
         for exchange_name, executor in self.order_executors.items():
             try:
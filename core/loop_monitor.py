@@ -0,0 +1,133 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class LoopLagMonitor:
+    """Measures event-loop scheduling delay and names whatever is blocking it.
+
+    A sampler task sleeps for `interval` and records how late it wakes up into
+    a log-spaced histogram. A watchdog thread watches the sampler's heartbeat;
+    when the loop has been stuck for longer than `threshold` it grabs the loop
+    thread's current Python stack, so the blocking callback (an input(), a
+    giant json.loads, a print storm...) is named while it is still running.
+    No asyncio debug mode is needed.
+    """
+
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self.histogram = [0] * (len(self.BUCKETS_MS) + 1)
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.slow_callbacks = Counter()
+        self.slow_callback_time: Dict[str, float] = defaultdict(float)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self):
+        """Start sampling on the running loop"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._running = True
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._heartbeat = time.monotonic()
+            self.record_lag(max(0.0, loop.time() - expected))
+
+    def record_lag(self, lag: float):
+        lag_ms = lag * 1000
+        bucket = 0
+        while bucket < len(self.BUCKETS_MS) and lag_ms > self.BUCKETS_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self):
+        stalled_since = None
+        blamed = None
+        while self._running:
+            time.sleep(self.threshold / 2)
+            stalled = time.monotonic() - self._heartbeat
+            if stalled < self.threshold + self.interval:
+                if stalled_since is not None and blamed:
+                    self.slow_callback_time[blamed] += time.monotonic() - stalled_since
+                stalled_since = blamed = None
+                continue
+            if stalled_since is None:
+                stalled_since = self._heartbeat + self.interval
+                frame = sys._current_frames().get(self._loop_thread_id)
+                blamed = self.describe(frame)
+                self.slow_callbacks[blamed] += 1
+                print(f"⏱️  Event loop blocked >{self.threshold * 1000:.0f}ms in {blamed}")
+
+    @staticmethod
+    def describe(frame) -> str:
+        """Innermost project frame of a stack, falling back to the innermost frame"""
+        innermost = None
+        while frame is not None:
+            code = frame.f_code
+            location = f"{os.path.relpath(code.co_filename, PROJECT_ROOT)}:{frame.f_lineno} {code.co_name}"
+            if innermost is None:
+                innermost = location
+            if code.co_filename.startswith(PROJECT_ROOT) and "site-packages" not in code.co_filename:
+                return location
+            frame = frame.f_back
+        return innermost or "<unknown>"
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound (ms) of the histogram bucket holding the given percentile"""
+        if not self.samples:
+            return 0.0
+        target = fraction * self.samples
+        running = 0
+        for bucket, count in enumerate(self.histogram):
+            running += count
+            if running >= target:
+                return self.BUCKETS_MS[bucket] if bucket < len(self.BUCKETS_MS) else self.max_lag * 1000
+        return self.max_lag * 1000
+
+    def get_stats(self) -> Dict:
+        return {
+            'samples': self.samples,
+            'mean_lag_ms': (self.total_lag / self.samples * 1000) if self.samples else 0.0,
+            'p50_lag_ms': self.percentile(0.50),
+            'p99_lag_ms': self.percentile(0.99),
+            'max_lag_ms': self.max_lag * 1000,
+            'histogram': dict(zip([f"<={b}ms" for b in self.BUCKETS_MS] + ["more"], self.histogram)),
+            'slow_callbacks': self.slow_callbacks.most_common(10),
+        }
+
+    def print_report(self):
+        stats = self.get_stats()
+        print(f"\n⏱️  EVENT LOOP LAG ({stats['samples']} samples):")
+        print(f"   Mean: {stats['mean_lag_ms']:.2f}ms | p50 ≤{stats['p50_lag_ms']:.0f}ms | "
+              f"p99 ≤{stats['p99_lag_ms']:.0f}ms | Max: {stats['max_lag_ms']:.1f}ms")
+        for name, count in stats['slow_callbacks']:
+            print(f"   🐢 {count}x {name} ({self.slow_callback_time.get(name, 0.0):.2f}s blocked)")
+        print("-" * 50)
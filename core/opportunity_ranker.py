@@ -0,0 +1,115 @@
+import heapq
+import itertools
+from typing import Dict, Iterable, List, Set, Tuple
+from models.data_models import ArbitrageOpportunity
+
+class OpportunityRanker:
+    """Bounded top-K of opportunities ranked by expected dollar profit.
+
+    Expected profit is net profit percentage x executable size. Entries live in
+    a min-heap of size ~K so inserting, updating or evicting an opportunity is
+    O(log K) no matter how many candidates the scan produces. Updated and
+    removed entries are deleted lazily and the heap is compacted when dead
+    entries pile up.
+    """
+
+    def __init__(self, k: int, default_size: float = 100):
+        self.k = k
+        self.default_size = default_size
+        self._heap: List[list] = []  # [expected_profit, seq, key, opportunity or None]
+        self._entries: Dict[Tuple[str, str, str], list] = {}
+        self._by_pair: Dict[str, Set[Tuple[str, str, str]]] = {}
+        self._seq = itertools.count()
+
+    @staticmethod
+    def key(opportunity: ArbitrageOpportunity) -> Tuple[str, str, str]:
+        return (opportunity.pair, opportunity.buy_exchange, opportunity.sell_exchange)
+
+    def expected_profit(self, opportunity: ArbitrageOpportunity) -> float:
+        size = opportunity.executable_notional or self.default_size
+        return opportunity.actual_profit_percentage / 100 * size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, opportunity: ArbitrageOpportunity) -> bool:
+        """Insert or update an opportunity. Returns True if it made the top K."""
+        opportunity.expected_profit = self.expected_profit(opportunity)
+        key = self.key(opportunity)
+        self.remove(key)
+
+        if len(self._entries) >= self.k:
+            self._drop_dead()
+            if not self._heap or opportunity.expected_profit <= self._heap[0][0]:
+                return False
+            self._unlink(heapq.heappop(self._heap)[2])
+
+        entry = [opportunity.expected_profit, next(self._seq), key, opportunity]
+        heapq.heappush(self._heap, entry)
+        self._entries[key] = entry
+        self._by_pair.setdefault(key[0], set()).add(key)
+        if len(self._heap) > 2 * self.k + 16:
+            self._compact()
+        return True
+
+    def remove(self, key: Tuple[str, str, str]):
+        """Drop an opportunity whose quotes no longer support it"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[3] = None
+            self._unlink(key)
+
+    def replace_pair(self, pair: str, opportunities: Iterable[ArbitrageOpportunity]):
+        """Apply a fresh scan of one pair: stale routes are evicted, new ones pushed"""
+        self.replace_pairs({pair: opportunities})
+
+    def replace_pairs(self, scans: Dict[str, Iterable[ArbitrageOpportunity]]):
+        """Apply a fresh scan of several pairs (pair -> its opportunities).
+
+        Stale routes of every scanned pair are evicted before anything is
+        pushed. Doing it pair by pair would let a stale entry of a pair later
+        in the scan evict a fresh candidate, which would not come back once
+        that stale entry was dropped.
+        """
+        fresh = {}
+        for opportunities in scans.values():
+            for opportunity in opportunities:
+                fresh[self.key(opportunity)] = opportunity
+        for pair in scans:
+            for key in list(self._by_pair.get(pair, ())):
+                if key not in fresh:
+                    self.remove(key)
+        for opportunity in fresh.values():
+            self.push(opportunity)
+
+    def expire(self, before_timestamp: float):
+        """Drop entries that have not been refreshed since `before_timestamp`"""
+        for key, entry in list(self._entries.items()):
+            if entry[3].timestamp < before_timestamp:
+                self.remove(key)
+
+    def top(self) -> List[ArbitrageOpportunity]:
+        """Current top K, best first"""
+        live = sorted((entry for entry in self._entries.values()), key=lambda e: (-e[0], e[1]))
+        return [entry[3] for entry in live]
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+        self._by_pair.clear()
+
+    def _unlink(self, key: Tuple[str, str, str]):
+        self._entries.pop(key, None)
+        keys = self._by_pair.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_pair[key[0]]
+
+    def _drop_dead(self):
+        while self._heap and self._heap[0][3] is None:
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[3] is not None]
+        heapq.heapify(self._heap)
@@ -0,0 +1,201 @@
+import struct
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.data_models import ArbitrageOpportunity
+
+OpportunityKey = Tuple[str, str, str]  # (pair, buy exchange, sell exchange)
+
+class _Episode:
+    """One continuous run of cycles in which an opportunity was seen"""
+    __slots__ = ("opened_at", "last_seen", "peak_spread", "peak_time", "last_spread", "observations", "executed")
+
+    def __init__(self, spread: float, now: float):
+        self.opened_at = now
+        self.last_seen = now
+        self.peak_spread = spread
+        self.peak_time = now
+        self.last_spread = spread
+        self.observations = 1
+        self.executed = False
+
+
+class OpportunityTracker:
+    """How long cross-exchange opportunities last, keyed by (pair, buy, sell).
+
+    An opportunity opens the first cycle it is seen and closes the first
+    cycle its pair is scanned without it; pairs the scheduler skipped do
+    not close anything. Closed episodes go into fixed-size ring buffers
+    (open time, lifetime, peak net spread, decay rate from the peak to the
+    close in %/s), so memory stays flat however long the bot runs and the
+    distributions describe the recent market. Lifetimes are measured at
+    cycle resolution: a spread that lives less than one update_interval is
+    seen once, with lifetime 0, if at all.
+
+    claim() lets each episode be executed once, so a spread that persists
+    for many cycles is not traded again every cycle.
+    """
+
+    _HEADER = struct.Struct("<IQQI")  # capacity, closed, duplicates skipped, open episodes
+    _EPISODE = struct.Struct("<dddddI?H")  # _Episode fields, then the length of the key
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.active: Dict[OpportunityKey, _Episode] = {}
+        self.opened = array('d', [0.0] * capacity)
+        self.lifetimes = array('d', [0.0] * capacity)
+        self.peaks = array('d', [0.0] * capacity)
+        self.decay_rates = array('d', [0.0] * capacity)
+        self.closed = 0  # total closed episodes; the next slot is closed % capacity
+        self.duplicates_skipped = 0
+
+    @staticmethod
+    def key(opportunity: ArbitrageOpportunity) -> OpportunityKey:
+        return (opportunity.pair, opportunity.buy_exchange, opportunity.sell_exchange)
+
+    def observe(self, scanned_pairs: Iterable[str], opportunities: List[ArbitrageOpportunity],
+                now: Optional[float] = None):
+        """Feed one cycle: the pairs analysed and the opportunities found among them"""
+        now = now or time.time()
+        seen = set()
+        for opportunity in opportunities:
+            key = self.key(opportunity)
+            seen.add(key)
+            spread = opportunity.actual_profit_percentage
+            episode = self.active.get(key)
+            if episode is None:
+                self.active[key] = _Episode(spread, now)
+                continue
+            episode.last_seen = now
+            episode.last_spread = spread
+            episode.observations += 1
+            if spread > episode.peak_spread:
+                episode.peak_spread = spread
+                episode.peak_time = now
+
+        scanned = set(scanned_pairs)
+        for key in [key for key in self.active if key[0] in scanned and key not in seen]:
+            self._close(self.active.pop(key), now)
+
+    def _close(self, episode: _Episode, closed_at: float):
+        slot = self.closed % self.capacity
+        self.opened[slot] = episode.opened_at
+        self.lifetimes[slot] = closed_at - episode.opened_at
+        self.peaks[slot] = episode.peak_spread
+        # The spread fell below the engine's threshold by closed_at
+        self.decay_rates[slot] = episode.peak_spread / max(closed_at - episode.peak_time, 1e-9)
+        self.closed += 1
+
+    def claim(self, opportunity: ArbitrageOpportunity) -> bool:
+        """True the first time an episode is claimed for execution, False for repeats"""
+        episode = self.active.get(self.key(opportunity))
+        if episode is None:
+            return False  # Already closed: only a stale ranking still holds it
+        if episode.executed:
+            self.duplicates_skipped += 1
+            return False
+        episode.executed = True
+        return True
+
+    def age(self, opportunity: ArbitrageOpportunity, now: Optional[float] = None) -> float:
+        """Seconds since the opportunity's current episode opened (0 if not open)"""
+        episode = self.active.get(self.key(opportunity))
+        return (now or time.time()) - episode.opened_at if episode else 0.0
+
+    def _filled(self, buffer: array) -> List[float]:
+        return sorted(buffer[:min(self.closed, self.capacity)])
+
+    @staticmethod
+    def _quantile(values: List[float], q: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(int(q * len(values)), len(values) - 1)]
+
+    def distribution(self) -> Dict:
+        """Quantiles of lifetime (s), peak spread (%) and decay rate (%/s) over the buffered episodes"""
+        lifetimes = self._filled(self.lifetimes)
+        peaks = self._filled(self.peaks)
+        decay_rates = self._filled(self.decay_rates)
+        return {
+            'episodes': len(lifetimes),
+            'active': len(self.active),
+            'lifetime': {q: self._quantile(lifetimes, q) for q in (0.1, 0.5, 0.9, 0.99)},
+            'peak_spread': {q: self._quantile(peaks, q) for q in (0.5, 0.9)},
+            'decay_rate': {q: self._quantile(decay_rates, q) for q in (0.5, 0.9)},
+            'duplicates_skipped': self.duplicates_skipped,
+        }
+
+    def reaction_budget(self, coverage: float = 0.9) -> float:
+        """Detection-to-fill time that still catches `coverage` of opportunities alive.
+
+        The (1 - coverage) lifetime quantile: react faster than this and
+        only the shortest-lived tenth (for 0.9) is missed.
+        """
+        return self._quantile(self._filled(self.lifetimes), 1 - coverage)
+
+    def dump_state(self) -> bytes:
+        """Ring buffers, counters and open episodes as bytes (see load_state)"""
+        parts = [self._HEADER.pack(self.capacity, self.closed, self.duplicates_skipped, len(self.active))]
+        for buffer in (self.opened, self.lifetimes, self.peaks, self.decay_rates):
+            parts.append(buffer.tobytes())
+        for key, episode in self.active.items():
+            name = "\x1f".join(key).encode()
+            parts.append(self._EPISODE.pack(episode.opened_at, episode.last_seen, episode.peak_spread,
+                                            episode.peak_time, episode.last_spread, episode.observations,
+                                            episode.executed, len(name)))
+            parts.append(name)
+        return b"".join(parts)
+
+    def load_state(self, data: bytes, open_episodes: bool = True):
+        """Restore a dump_state() snapshot; a different capacity keeps the most recent episodes.
+
+        open_episodes=False drops the episodes that were open, for snapshots
+        old enough that they would now be measuring the downtime.
+        """
+        capacity, closed, duplicates_skipped, active = self._HEADER.unpack_from(data)
+        offset = self._HEADER.size
+        buffers = []
+        for _ in range(4):
+            buffer = array('d')
+            buffer.frombytes(data[offset:offset + capacity * buffer.itemsize])
+            offset += capacity * buffer.itemsize
+            buffers.append(buffer)
+        if capacity == self.capacity:
+            self.opened, self.lifetimes, self.peaks, self.decay_rates = buffers
+            self.closed = closed
+        else:
+            # Re-lay the most recent episodes oldest first from slot 0
+            keep = min(closed, capacity, self.capacity)
+            for target, index in enumerate(range(closed - keep, closed)):
+                slot = index % capacity
+                self.opened[target], self.lifetimes[target], self.peaks[target], self.decay_rates[target] = (
+                    buffers[0][slot], buffers[1][slot], buffers[2][slot], buffers[3][slot])
+            self.closed = keep
+        self.duplicates_skipped = duplicates_skipped
+        self.active = {}
+        for _ in range(active):
+            *fields, executed, length = self._EPISODE.unpack_from(data, offset)
+            offset += self._EPISODE.size
+            key = tuple(data[offset:offset + length].decode().split("\x1f"))
+            offset += length
+            if open_episodes and len(key) == 3:
+                episode = _Episode(fields[2], fields[0])
+                episode.last_seen, episode.peak_time, episode.last_spread, episode.observations = (
+                    fields[1], fields[3], fields[4], fields[5])
+                episode.executed = executed
+                self.active[key] = episode
+
+    def print_report(self):
+        stats = self.distribution()
+        if not stats['episodes']:
+            return
+        lifetime = stats['lifetime']
+        print(f"\n⏱️  OPPORTUNITY LIFETIMES ({stats['episodes']} closed, {stats['active']} open):")
+        print(f"   Lifetime p10 {lifetime[0.1]:.1f}s | p50 {lifetime[0.5]:.1f}s | "
+              f"p90 {lifetime[0.9]:.1f}s | p99 {lifetime[0.99]:.1f}s")
+        print(f"   Peak net spread p50 {stats['peak_spread'][0.5]:.3f}% | p90 {stats['peak_spread'][0.9]:.3f}%")
+        print(f"   Decay from peak p50 {stats['decay_rate'][0.5]:.3f}%/s | p90 {stats['decay_rate'][0.9]:.3f}%/s")
+        print(f"   React within {self.reaction_budget():.1f}s to catch 90% of opportunities alive")
+        if stats['duplicates_skipped']:
+            print(f"   Repeat executions skipped: {stats['duplicates_skipped']}")
+        print("-" * 50)
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from order_execution.user_stream import TERMINAL_STATUSES
+
+class OrderTracker:
+    """Order and balance state fed by private user-data streams.
+
+    Fill, partial-fill and balance events are pushed as they happen; REST
+    lookups are only used to reconcile orders the stream has not settled
+    within the fill timeout, and polled (with backoff) on exchanges without
+    a stream. Orders still open at the fill timeout are cancelled.
+    """
+
+    def __init__(self, fill_timeout: float = 5.0, balance_max_age: float = 60.0, max_orders: int = 1000,
+                 poll_interval: float = 0.05, max_poll_interval: float = 1.0):
+        self.fill_timeout = fill_timeout
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.balance_max_age = balance_max_age
+        self.max_orders = max_orders
+        self.streams = {}
+        # (exchange, order_id) -> latest normalised order event
+        self.orders: Dict[Tuple[str, str], Dict] = {}
+        self.waiters: Dict[Tuple[str, str], List[asyncio.Future]] = {}
+        # (exchange, asset) -> (free, received_at)
+        self.balances: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self.listeners: List[Callable[[Dict], None]] = []
+        self.stats = {"stream_fills": 0, "rest_reconciliations": 0, "timeout_cancels": 0}
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        self.listeners.append(listener)
+
+    def start_stream(self, exchange_name: str, executor) -> bool:
+        """Open the exchange's user-data stream if it has one"""
+        if exchange_name in self.streams:
+            return True
+        stream = executor.create_user_stream(exchange_name, self.handle_event)
+        if stream is None:
+            return False
+        self.streams[exchange_name] = stream
+        stream.start()
+        return True
+
+    async def stop(self):
+        for stream in self.streams.values():
+            await stream.stop()
+        self.streams.clear()
+        for futures in self.waiters.values():
+            for future in futures:
+                future.cancel()
+        self.waiters.clear()
+
+    def handle_event(self, event: Dict):
+        if event['type'] == 'order':
+            key = (event['exchange'], event['order_id'])
+            previous = self.orders.get(key)
+            # Events can arrive out of order; never step back from a terminal state
+            if previous and previous['status'] in TERMINAL_STATUSES and event['status'] not in TERMINAL_STATUSES:
+                return
+            self.orders.pop(key, None)
+            self.orders[key] = event
+            if len(self.orders) > self.max_orders:
+                del self.orders[next(iter(self.orders))]
+            if event['status'] in TERMINAL_STATUSES:
+                for future in self.waiters.pop(key, []):
+                    if not future.done():
+                        future.set_result(event)
+        elif event['type'] == 'balance':
+            self.balances[(event['exchange'], event['asset'])] = (event['free'], time.time())
+
+        for listener in self.listeners:
+            listener(event)
+
+    def get_balance(self, exchange_name: str, asset: str) -> Optional[float]:
+        """Last pushed free balance, or None if unknown or older than balance_max_age"""
+        entry = self.balances.get((exchange_name, asset.upper()))
+        if entry is None or time.time() - entry[1] > self.balance_max_age:
+            return None
+        return entry[0]
+
+    def record_result(self, exchange_name: str, result: Dict, symbol: str, side: str):
+        """Seed state from a place-order response (market orders often come back already filled)"""
+        status = str(result.get('status', '')).upper()
+        if status not in TERMINAL_STATUSES:
+            return
+        self.handle_event({
+            'type': 'order',
+            'exchange': exchange_name,
+            'order_id': str(result['order_id']),
+            'client_order_id': '',
+            'symbol': symbol,
+            'side': side,
+            'status': status,
+            'filled_quantity': result.get('executed_quantity', 0.0),
+            'last_fill_quantity': 0.0,
+            'last_fill_price': 0.0,
+            'timestamp': time.time()
+        })
+
+    async def wait_for_fill(self, exchange_name: str, executor, order_id: str, symbol: str,
+                            timeout: Optional[float] = None) -> Optional[Dict]:
+        """Final state of an order: pushed by the stream or polled over REST until the timeout.
+
+        An order still open at the timeout is cancelled, so it cannot fill
+        after we stop watching it, and its state after the cancel (with
+        whatever filled up to then) is returned.
+        """
+        key = (exchange_name, order_id)
+        state = self.orders.get(key)
+        if state and state['status'] in TERMINAL_STATUSES:
+            self.stats["stream_fills"] += 1
+            return state
+        deadline = time.monotonic() + (timeout or self.fill_timeout)
+
+        if exchange_name in self.streams:
+            future = asyncio.get_running_loop().create_future()
+            self.waiters.setdefault(key, []).append(future)
+            try:
+                state = await asyncio.wait_for(future, max(deadline - time.monotonic(), 0))
+                self.stats["stream_fills"] += 1
+                return state
+            except asyncio.TimeoutError:
+                futures = self.waiters.get(key, [])
+                if future in futures:
+                    futures.remove(future)
+                if not futures:
+                    self.waiters.pop(key, None)
+
+        # No stream, or the stream did not settle it: poll with backoff
+        self.stats["rest_reconciliations"] += 1
+        delay = self.poll_interval
+        while True:
+            self._reconcile(exchange_name, await executor.fetch_order_state(order_id, symbol))
+            state = self.orders.get(key)
+            if state and state['status'] in TERMINAL_STATUSES:
+                return state
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.max_poll_interval)
+
+        self.stats["timeout_cancels"] += 1
+        print(f"   ⚠️  {exchange_name} order {order_id} still open after the fill timeout, cancelling")
+        self._reconcile(exchange_name, await executor.cancel_and_fetch(order_id, symbol))
+        return self.orders.get(key)
+
+    def _reconcile(self, exchange_name: str, state: Optional[Dict]):
+        """Feed a REST order state through handle_event, skipping repeats of what we already have"""
+        if state is None:
+            return
+        state['exchange'] = exchange_name
+        previous = self.orders.get((exchange_name, state['order_id']))
+        if previous and (previous['status'], previous['filled_quantity']) == (state['status'], state['filled_quantity']):
+            return
+        self.handle_event(state)
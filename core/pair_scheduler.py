@@ -0,0 +1,128 @@
+import math
+from typing import Dict, Iterable, List, Set, Tuple
+
+class _PairStats:
+    __slots__ = ("last_spread", "volatility", "frequency", "liquidity", "last_scan")
+
+    def __init__(self):
+        self.last_spread = None
+        self.volatility = 0.0
+        self.frequency = 0.0
+        self.liquidity = 0.0
+        self.last_scan = -1
+
+class PairScheduler:
+    """Scores pairs by recent activity and spends polling/scanning effort on the hot ones.
+
+    Score = weighted spread volatility + opportunity frequency + liquidity, all
+    tracked as EWMAs. Per-symbol connectors (Kraken, Coinbase) get a fixed
+    request budget per cycle that is shared out by score with stride
+    scheduling, so no cold pair is starved for more than `max_skip_cycles`.
+    """
+
+    def __init__(self, settings: Dict):
+        self.request_budget = settings.get("request_budget", 10)
+        self.max_skip_cycles = settings.get("max_skip_cycles", 10)
+        self.decay = settings.get("decay", 0.2)
+        weights = settings.get("weights", {})
+        self.volatility_weight = weights.get("volatility", 1.0)
+        self.frequency_weight = weights.get("frequency", 2.0)
+        self.liquidity_weight = weights.get("liquidity", 0.5)
+        self.cycle = 0
+        self.stats: Dict[str, _PairStats] = {}
+        self.poll_credit: Dict[Tuple[str, str], float] = {}
+        self.last_poll: Dict[Tuple[str, str], int] = {}
+        # Consecutive polls of (exchange, pair) that came back without a price
+        self.misses: Dict[Tuple[str, str], int] = {}
+
+    def _stats(self, pair: str) -> _PairStats:
+        stats = self.stats.get(pair)
+        if stats is None:
+            stats = self.stats[pair] = _PairStats()
+        return stats
+
+    def score(self, pair: str) -> float:
+        stats = self.stats.get(pair)
+        if stats is None or stats.last_scan < 0:
+            return 1.0  # Unknown pairs start hot until we have seen them
+        return (self.volatility_weight * stats.volatility
+                + self.frequency_weight * stats.frequency
+                + self.liquidity_weight * stats.liquidity
+                + 1e-3)
+
+    def pairs_to_poll(self, exchange_name: str, pairs: List[str]) -> List[str]:
+        """Pick the pairs a per-symbol connector should request this cycle"""
+        if len(pairs) <= self.request_budget:
+            return list(pairs)
+
+        scores = {pair: self.score(pair) for pair in pairs}
+        total = sum(scores.values())
+        forced, candidates = [], []
+        for pair in pairs:
+            key = (exchange_name, pair)
+            # Pairs the exchange keeps not returning are backed off further
+            skip_limit = self.max_skip_cycles * (1 + min(self.misses.get(key, 0), 5))
+            if self.cycle - self.last_poll.get(key, -skip_limit) >= skip_limit:
+                forced.append(pair)
+                continue
+            credit = self.poll_credit.get(key, 0.0) + self.request_budget * scores[pair] / total
+            self.poll_credit[key] = min(credit, float(self.request_budget))
+            candidates.append(pair)
+
+        candidates.sort(key=lambda pair: self.poll_credit[(exchange_name, pair)], reverse=True)
+        selected = forced[:self.request_budget]
+        for pair in candidates:
+            if len(selected) >= self.request_budget:
+                break
+            if self.poll_credit[(exchange_name, pair)] >= 1.0:
+                selected.append(pair)
+
+        for pair in selected:
+            key = (exchange_name, pair)
+            self.poll_credit[key] = max(self.poll_credit.get(key, 0.0) - 1.0, 0.0)
+            self.last_poll[key] = self.cycle
+        return selected
+
+    def observe_poll(self, exchange_name: str, requested: Iterable[str], prices: Dict[str, float]):
+        """Track which requested pairs the exchange does not actually quote"""
+        for pair in requested:
+            key = (exchange_name, pair)
+            if pair in prices:
+                self.misses.pop(key, None)
+            else:
+                self.misses[key] = self.misses.get(key, 0) + 1
+
+    def pairs_to_scan(self, pairs: List[str]) -> List[str]:
+        """Hot pairs are analysed every cycle, cold ones every few cycles"""
+        scores = [self.score(pair) for pair in pairs]
+        top = max(scores, default=0.0) or 1.0
+        selected = []
+        for pair, score in zip(pairs, scores):
+            interval = min(self.max_skip_cycles, max(1, round(top / score)))
+            stats = self._stats(pair)
+            if stats.last_scan < 0 or self.cycle - stats.last_scan >= interval:
+                selected.append(pair)
+        return selected
+
+    def observe(self, exchange_prices: Dict[str, Dict[str, float]], scanned: Iterable[str],
+                opportunity_pairs: Set[str]):
+        """Fold one cycle of quotes and results into the pair scores"""
+        exchange_count = max(len(exchange_prices), 1)
+        for pair in scanned:
+            stats = self._stats(pair)
+            stats.last_scan = self.cycle
+            quotes = [prices[pair] for prices in exchange_prices.values() if prices.get(pair, 0) > 0]
+
+            stats.liquidity += self.decay * (len(quotes) / exchange_count - stats.liquidity)
+            hit = 1.0 if pair in opportunity_pairs else 0.0
+            stats.frequency += self.decay * (hit - stats.frequency)
+
+            if len(quotes) >= 2:
+                low = min(quotes)
+                spread = (max(quotes) - low) / low * 100
+                if stats.last_spread is not None:
+                    change = (spread - stats.last_spread) ** 2
+                    variance = stats.volatility ** 2
+                    stats.volatility = math.sqrt(variance + self.decay * (change - variance))
+                stats.last_spread = spread
+        self.cycle += 1
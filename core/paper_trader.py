@@ -15,6 +15,10 @@ class PaperTrader:
     def execute_trade(self, opportunity: ArbitrageOpportunity, trade_amount: float = 100):
         """Simulate executing an arbitrage trade"""
         
+        # Cap the simulated size at what the order books could absorb
+        if opportunity.executable_notional > 0:
+            trade_amount = min(trade_amount, opportunity.executable_notional)
+        
         # Calculate quantities
         buy_quantity = trade_amount / opportunity.buy_price
         sell_revenue = buy_quantity * opportunity.sell_price
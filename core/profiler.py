@@ -0,0 +1,177 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+from core.loop_monitor import PROJECT_ROOT
+
+class SamplingProfiler:
+    """Low-overhead sampling profiler for bot cycles.
+
+    A background thread reads the loop thread's Python stack every `interval`
+    seconds (sys._current_frames, no tracing hooks), but only while a cycle
+    is in progress so the inter-cycle sleep is not counted. Each sample is
+    attributed to a category from its innermost recognisable project frame;
+    samples parked in the event loop's selector are network/idle waiting.
+    Samples are weighted by the wall time since the previous one, because
+    CPU-bound stretches only hand the GIL to the sampler every switch
+    interval and would otherwise be under-counted.
+    """
+
+    ANALYSIS_FILES = ("core/arbitrage_engine.py", "core/sharded_engine.py", "core/triangular_engine.py",
+                      "core/depth_sizer.py", "core/opportunity_ranker.py", "core/fee_calculator.py",
+                      "core/pair_scheduler.py", "core/universe.py")
+    TRADING_FILES = ("core/paper_trader.py", "core/live_trader.py", "core/order_tracker.py")
+
+    def __init__(self, interval: float = 0.005, output_dir: str = "profiles"):
+        self.interval = interval
+        self.output_dir = output_dir
+        # All weights are seconds of wall time
+        self.stacks = Counter()
+        self.self_time = Counter()
+        self.categories = Counter()
+        self.cycle_categories: Dict[int, Counter] = defaultdict(Counter)
+        self.total_time = 0.0
+        self.cycle_times: Dict[int, float] = {}
+        self.samples = 0
+        self.cycles_profiled = 0
+        self._cycle: Optional[int] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.started_at = 0.0
+
+    def start(self):
+        """Start sampling the calling (event-loop) thread"""
+        self._loop_thread_id = threading.get_ident()
+        self._running = True
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._cycle = None
+        if self._thread:
+            self._thread.join()
+
+    def begin_cycle(self, cycle: int):
+        self._cycle = cycle
+
+    def end_cycle(self, elapsed: float):
+        if self._cycle is not None:
+            self.cycle_times[self._cycle] = elapsed
+            self.cycles_profiled += 1
+        self._cycle = None
+
+    def _sample(self):
+        last_sample = None
+        while self._running:
+            time.sleep(self.interval)
+            cycle = self._cycle
+            now = time.perf_counter()
+            if cycle is None:
+                last_sample = None
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            weight = now - last_sample if last_sample is not None else self.interval
+            last_sample = now
+            stack = self._walk(frame)
+            category = self.classify(stack)
+            self.samples += 1
+            self.total_time += weight
+            self.stacks[";".join(label for label, _ in reversed(stack))] += weight
+            self.self_time[stack[0][0]] += weight
+            self.categories[category] += weight
+            self.cycle_categories[cycle][category] += weight
+
+    @staticmethod
+    def _walk(frame) -> List[Tuple[str, str]]:
+        """(label, project-relative file) pairs, innermost first"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename.startswith(PROJECT_ROOT) and "site-packages" not in code.co_filename:
+                filename = os.path.relpath(code.co_filename, PROJECT_ROOT).replace(os.sep, "/")
+            else:
+                filename = ""
+            label = f"{filename or os.path.basename(code.co_filename)}:{code.co_name}"
+            stack.append((label, filename))
+            frame = frame.f_back
+        return stack
+
+    # Innermost Python frame while the loop is idle: the selector for asyncio,
+    # run_until_complete for uvloop (whose loop is C code)
+    LOOP_IDLE_FRAMES = ("select", "poll", "_run_once", "run_forever", "run_until_complete")
+
+    def classify(self, stack: List[Tuple[str, str]]) -> str:
+        if not stack[0][1] and stack[0][0].rsplit(":", 1)[1] in self.LOOP_IDLE_FRAMES:
+            return "waiting"  # on the network or timers
+        for label, filename in stack:
+            if not filename:
+                continue
+            name = label.rsplit(":", 1)[1]
+            if filename.startswith(("exchanges/", "order_execution/")):
+                return "connectors"
+            if name in ("analyze_pair", "_analyze_shard"):
+                return "analyze_pair"
+            if name.startswith(("display_", "show_", "print_")):
+                return "display"
+            if filename in self.TRADING_FILES:
+                return "trading"
+            if filename in self.ANALYSIS_FILES:
+                return "analysis"
+        return "other"
+
+    def summary(self, top: int = 15) -> Dict:
+        total = self.total_time or 1.0
+        slowest = sorted(self.cycle_times.items(), key=lambda item: item[1], reverse=True)[:5]
+        return {
+            'samples': self.samples,
+            'cycles': self.cycles_profiled,
+            'categories': [(name, seconds / total * 100) for name, seconds in self.categories.most_common()],
+            'hotspots': [(label, seconds / total * 100) for label, seconds in self.self_time.most_common(top)],
+            'slowest_cycles': [
+                (cycle, elapsed, {name: seconds * 1000 for name, seconds in self.cycle_categories[cycle].most_common()})
+                for cycle, elapsed in slowest
+            ],
+        }
+
+    def write_reports(self) -> Tuple[str, str]:
+        """Write collapsed stacks (flamegraph.pl / speedscope input) and the hotspot summary"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))
+        folded_path = os.path.join(self.output_dir, f"profile-{stamp}.folded")
+        summary_path = os.path.join(self.output_dir, f"profile-{stamp}.txt")
+        with open(folded_path, 'w') as f:
+            # Collapsed-stack counts must be integers: use microseconds
+            for stack, seconds in self.stacks.most_common():
+                f.write(f"{stack} {int(seconds * 1e6)}\n")
+        with open(summary_path, 'w') as f:
+            f.write("\n".join(self.format_summary()) + "\n")
+        return folded_path, summary_path
+
+    def format_summary(self) -> List[str]:
+        stats = self.summary()
+        lines = [f"🔬 PROFILE: {stats['samples']} samples over {stats['cycles']} cycles "
+                 f"({self.interval * 1000:.0f}ms interval)"]
+        lines.append("   Time by category:")
+        for name, share in stats['categories']:
+            lines.append(f"     {name:13} {share:5.1f}%")
+        lines.append("   Hotspots (self time):")
+        for label, share in stats['hotspots']:
+            lines.append(f"     {share:5.1f}%  {label}")
+        lines.append("   Slowest cycles:")
+        for cycle, elapsed, breakdown in stats['slowest_cycles']:
+            parts = ", ".join(f"{name} {ms:.0f}ms" for name, ms in breakdown.items())
+            lines.append(f"     #{cycle}: {elapsed * 1000:.0f}ms ({parts})")
+        return lines
+
+    def print_summary(self):
+        print()
+        for line in self.format_summary():
+            print(line)
+        print("-" * 50)
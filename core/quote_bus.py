@@ -0,0 +1,344 @@
+import asyncio
+import math
+import struct
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from core.quote_snapshot import Quote
+from order_execution.clock_sync import ClockSync
+
+# Wire format: every frame is a fixed 24-byte little-endian header
+#   u32 length of the rest of the frame, u8 version, u8 kind,
+#   u16 record count, u64 sequence number, f64 sender wall time
+# followed by `count` records of the kind's layout:
+#   SYMBOLS  u16 id, u8 length, UTF-8 name (exchanges and pairs share one table)
+#   QUOTES   u16 exchange id, u16 pair id, f64 price, f64 received_at, f64 exchange_time (NaN if unknown)
+#   HELLO    UTF-8 node name (count = its length)
+#   PING     f64 subscriber send time (subscriber -> publisher)
+#   PONG     f64 the PING's send time, echoed; the header time is the publisher's clock
+# Only QUOTES frames are sequenced; the rest carry sequence 0.
+VERSION = 1
+HEADER = struct.Struct("<IBBHQd")
+SYMBOL = struct.Struct("<HB")
+QUOTE = struct.Struct("<HHddd")
+TIMESTAMP = struct.Struct("<d")
+QUOTES, SYMBOLS, HELLO, PING, PONG = 1, 2, 3, 4, 5
+MAX_SYMBOLS = 0xFFFF
+MAX_FRAME = 4 * 1024 * 1024
+
+
+def encode_frame(kind: int, count: int, seq: int, sent_at: float, payload: bytes = b"") -> bytes:
+    return HEADER.pack(HEADER.size - 4 + len(payload), VERSION, kind, count, seq, sent_at) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, int, int, float, bytes]:
+    """(kind, count, seq, sent_at, payload) of the next frame; raises IncompleteReadError at EOF"""
+    header = await reader.readexactly(HEADER.size)
+    length, version, kind, count, seq, sent_at = HEADER.unpack(header)
+    if version != VERSION or not HEADER.size - 4 <= length <= MAX_FRAME:
+        raise ValueError(f"bad frame (version {version}, length {length})")
+    payload = await reader.readexactly(length - (HEADER.size - 4))
+    return kind, count, seq, sent_at, payload
+
+
+async def open_endpoint(endpoint: str):
+    """Connect to tcp://host:port or unix:///path"""
+    if endpoint.startswith("unix://"):
+        return await asyncio.open_unix_connection(endpoint[len("unix://"):])
+    host, port = endpoint[len("tcp://"):].rsplit(":", 1)
+    return await asyncio.open_connection(host, int(port))
+
+
+async def serve_endpoint(endpoint: str, handler):
+    """Listen on tcp://host:port or unix:///path"""
+    if endpoint.startswith("unix://"):
+        return await asyncio.start_unix_server(handler, endpoint[len("unix://"):])
+    host, port = endpoint[len("tcp://"):].rsplit(":", 1)
+    return await asyncio.start_server(handler, host, int(port))
+
+
+class QuotePublisher:
+    """Fans normalised quotes out to every connected subscriber.
+
+    A collector node calls publish() with each exchange's fetch; the
+    quotes go out as one sequenced QUOTES frame. Names are sent once as
+    SYMBOLS frames (and replayed to each new subscriber), so a quote costs
+    28 bytes on the wire. Writes never wait on a subscriber: one whose
+    socket buffer is past max_buffer misses the frame, which its sequence
+    check reports as a gap.
+    """
+
+    def __init__(self, endpoint: str, node: str = "", max_buffer: int = 1024 * 1024):
+        self.endpoint = endpoint
+        self.node = node or endpoint
+        self.max_buffer = max_buffer
+        self.symbols: Dict[str, int] = {}
+        self.seq = 0
+        self.server = None
+        self.clients: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self.frames_sent = 0
+        self.frames_dropped = 0
+
+    async def start(self):
+        self.server = await serve_endpoint(self.endpoint, self._accept)
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        name = self.node.encode()
+        writer.write(encode_frame(HELLO, len(name), 0, time.time(), name))
+        if self.symbols:
+            writer.write(self._symbols_frame(list(self.symbols.items())))
+        self.clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                kind, _, _, _, payload = await read_frame(reader)
+                if kind == PING:
+                    writer.write(encode_frame(PONG, 1, 0, time.time(), payload[:TIMESTAMP.size]))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    def _symbols_frame(self, entries: List[Tuple[str, int]]) -> bytes:
+        payload = b"".join(SYMBOL.pack(code, len(name.encode())) + name.encode() for name, code in entries)
+        return encode_frame(SYMBOLS, len(entries), 0, time.time(), payload)
+
+    def _code(self, name: str, new: List[Tuple[str, int]]) -> Optional[int]:
+        code = self.symbols.get(name)
+        if code is None:
+            if len(self.symbols) >= MAX_SYMBOLS:
+                return None  # u16 ids: far beyond any exchange's listings
+            code = self.symbols[name] = len(self.symbols)
+            new.append((name, code))
+        return code
+
+    def _broadcast(self, frame: bytes, sequenced: bool):
+        for writer in list(self.clients):
+            if writer.is_closing():
+                continue
+            if sequenced and writer.transport.get_write_buffer_size() > self.max_buffer:
+                self.frames_dropped += 1
+                continue
+            writer.write(frame)
+
+    def publish(self, exchange_name: str, prices: Dict[str, float], meta: Optional[Dict] = None):
+        """Send one exchange's prices with the receive/exchange times from get_prices_with_meta"""
+        meta = meta or {}
+        fetched_at = meta.get("fetched_at", time.time())
+        quote_times = meta.get("quote_times", {})
+        exchange_times = meta.get("exchange_times", {})
+        new = []
+        exchange_code = self._code(exchange_name, new)
+        if exchange_code is None:
+            return
+        records = []
+        for pair, price in prices.items():
+            pair_code = self._code(pair, new)
+            if pair_code is not None:
+                records.append(QUOTE.pack(exchange_code, pair_code, price, quote_times.get(pair, fetched_at),
+                                          exchange_times.get(pair) or math.nan))
+        if new:
+            self._broadcast(self._symbols_frame(new), sequenced=False)
+        self.seq += 1
+        self._broadcast(encode_frame(QUOTES, len(records), self.seq, time.time(), b"".join(records)), sequenced=True)
+        self.frames_sent += 1
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            handlers = list(self.clients.values())
+            for writer in list(self.clients):
+                writer.close()  # The handler sees EOF and exits
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self.server.wait_closed()
+            self.server = None
+
+
+class _Hop:
+    """Recent one-way latencies of one hop, in seconds"""
+
+    def __init__(self, size: int = 1024):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, latency: float):
+        self.samples.append(latency)
+
+    def quantile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class _Feed:
+    """Subscriber-side state of one publisher connection"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.node = endpoint
+        self.connected = False
+        self.symbols: Dict[int, str] = {}
+        self.expected_seq: Optional[int] = None
+        self.frames = 0
+        self.gaps = 0  # frames missed
+        self.resets = 0  # publisher restarts (sequence went backwards)
+        # Publisher clock minus ours, from PING/PONG round trips
+        self.clock = ClockSync(window=8)
+        self.hops = {"exchange": _Hop(), "collector": _Hop(), "network": _Hop()}
+
+
+class QuoteSubscriber:
+    """Receives quotes from one or more publishers and keeps the latest per (exchange, pair).
+
+    Each endpoint gets a reconnecting reader task. Sequence numbers are
+    checked per publisher: skipped numbers count as gaps, a sequence that
+    goes backwards as a publisher restart. The publisher's clock offset is
+    estimated with the NTP filter of ClockSync over periodic PING/PONG
+    round trips and removed from its timestamps, which gives one-way
+    latency for each hop of a quote's path:
+
+      exchange   exchange timestamp -> collector received it (needs exchange_time)
+      collector  collector received it -> collector published it
+      network    collector published it -> this node read the frame
+
+    Quote receive times are converted to this node's clock, so quote ages
+    and skews in the engine stay comparable across collectors.
+    """
+
+    def __init__(self, endpoints: List[str], ping_interval: float = 5.0, retry_delay: float = 1.0,
+                 max_retry_delay: float = 30.0):
+        self.feeds = {endpoint: _Feed(endpoint) for endpoint in endpoints}
+        self.ping_interval = ping_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.quotes: Dict[str, Dict[str, Quote]] = {}
+        self.updated = asyncio.Event()
+        self.tasks: List[asyncio.Task] = []
+
+    def start(self):
+        if not self.tasks:
+            self.tasks = [asyncio.create_task(self._run(feed)) for feed in self.feeds.values()]
+
+    async def _run(self, feed: _Feed):
+        delay = self.retry_delay
+        while True:
+            try:
+                reader, writer = await open_endpoint(feed.endpoint)
+            except OSError as e:
+                print(f"⚠️  Quote feed {feed.endpoint} unavailable ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            delay = self.retry_delay
+            # expected_seq survives reconnects: frames published meanwhile count as gaps
+            feed.connected = True
+            pinger = asyncio.create_task(self._ping(feed, writer))
+            try:
+                while True:
+                    self._handle(feed, writer, *await read_frame(reader))
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+                print(f"⚠️  Quote feed {feed.node} disconnected: {type(e).__name__}")
+            finally:
+                feed.connected = False
+                pinger.cancel()
+                writer.close()
+            await asyncio.sleep(self.retry_delay)
+
+    async def _ping(self, feed: _Feed, writer: asyncio.StreamWriter):
+        # A quick burst seeds the offset estimate, then one ping per interval
+        for interval in (0.05, 0.05, 0.05):
+            writer.write(encode_frame(PING, 1, 0, time.time(), TIMESTAMP.pack(time.time())))
+            await asyncio.sleep(interval)
+        while True:
+            writer.write(encode_frame(PING, 1, 0, time.time(), TIMESTAMP.pack(time.time())))
+            await asyncio.sleep(self.ping_interval)
+
+    def _handle(self, feed: _Feed, writer, kind: int, count: int, seq: int, sent_at: float, payload: bytes):
+        arrived = time.time()
+        if kind == QUOTES:
+            self._check_seq(feed, seq)
+            feed.frames += 1
+            offset = feed.clock.offset
+            feed.hops["network"].add(arrived - (sent_at - offset))
+            newest, exchange_latency, stamped = 0.0, 0.0, 0
+            for index in range(count):
+                exchange_code, pair_code, price, received_at, exchange_time = QUOTE.unpack_from(payload, index * QUOTE.size)
+                exchange_name = feed.symbols.get(exchange_code)
+                pair = feed.symbols.get(pair_code)
+                if exchange_name is None or pair is None:
+                    continue
+                newest = max(newest, received_at)
+                if math.isnan(exchange_time):
+                    exchange_time = None
+                else:
+                    exchange_latency += received_at - exchange_time
+                    stamped += 1
+                    exchange_time -= offset
+                self.quotes.setdefault(exchange_name, {})[pair] = Quote(price, received_at - offset, exchange_time)
+            # One sample per frame and hop: the freshest quote, the mean exchange delay
+            if newest:
+                feed.hops["collector"].add(sent_at - newest)
+            if stamped:
+                feed.hops["exchange"].add(exchange_latency / stamped)
+            self.updated.set()
+        elif kind == SYMBOLS:
+            offset = 0
+            for _ in range(count):
+                code, length = SYMBOL.unpack_from(payload, offset)
+                offset += SYMBOL.size
+                feed.symbols[code] = payload[offset:offset + length].decode()
+                offset += length
+        elif kind == PONG:
+            (pinged_at,) = TIMESTAMP.unpack_from(payload)
+            feed.clock.observe(pinged_at, arrived, sent_at)
+        elif kind == HELLO:
+            feed.node = payload.decode() or feed.endpoint
+            feed.symbols = {}  # The publisher replays its table next
+            print(f"📡 Subscribed to quotes from {feed.node} ({feed.endpoint})")
+
+    def _check_seq(self, feed: _Feed, seq: int):
+        if feed.expected_seq is not None:
+            if seq > feed.expected_seq:
+                feed.gaps += seq - feed.expected_seq
+            elif seq < feed.expected_seq:
+                feed.resets += 1
+        feed.expected_seq = seq + 1
+
+    def exchanges(self) -> List[str]:
+        return list(self.quotes)
+
+    def prices_with_meta(self, exchange_name: str, pairs: List[str]) -> Tuple[Dict[str, float], Dict]:
+        """Latest prices for `pairs` with metadata shaped like BaseExchangeAPI.get_prices_with_meta"""
+        quotes = self.quotes.get(exchange_name, {})
+        prices, quote_times, exchange_times = {}, {}, {}
+        for pair in pairs:
+            quote = quotes.get(pair)
+            if quote is None:
+                continue
+            prices[pair] = quote.price
+            quote_times[pair] = quote.received_at
+            if quote.exchange_time:
+                exchange_times[pair] = quote.exchange_time
+        now = time.time()
+        fetched_at = min(quote_times.values(), default=now)
+        meta = {"fetched_at": fetched_at, "from_cache": False, "requests": 0, "quote_times": quote_times,
+                "exchange_times": exchange_times, "age": now - fetched_at}
+        return prices, meta
+
+    def print_report(self):
+        print("\n📡 QUOTE FEEDS (one-way latency p50/p99 ms):")
+        for feed in self.feeds.values():
+            state = "up" if feed.connected else "DOWN"
+            hops = " | ".join(
+                f"{name} {hop.quantile(0.5) * 1000:.1f}/{hop.quantile(0.99) * 1000:.1f}"
+                for name, hop in feed.hops.items() if hop.samples
+            )
+            print(f"   {feed.node} [{state}]: {feed.frames} frames, {feed.gaps} missed, {feed.resets} restarts | "
+                  f"offset {feed.clock.offset * 1000:+.1f}ms | {hops or 'no data'}")
+        print("-" * 50)
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
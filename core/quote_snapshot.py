@@ -0,0 +1,77 @@
+import time
+from collections import Counter
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+class Quote(NamedTuple):
+    price: float
+    received_at: float  # local time the payload carrying it was answered
+    exchange_time: Optional[float] = None  # exchange's own quote timestamp, when the API gives one
+
+    @property
+    def time(self) -> float:
+        """Best estimate of when the quote was valid"""
+        return self.exchange_time or self.received_at
+
+
+class QuoteSnapshot:
+    """Latest quote per (exchange, pair) with the time it was observed.
+
+    Bulk payloads stamp all their pairs with one receive time, while
+    sequential per-symbol connectors stamp each pair as it arrives, so a
+    Coinbase quote can be seconds older than a Binance one taken in the
+    same cycle. align() only pairs two quotes when they were observed
+    within max_skew of each other and neither is older than max_age;
+    anything else is a time-skew artefact, not an opportunity.
+    """
+
+    def __init__(self, max_skew: float = 2.0, max_age: float = 5.0):
+        self.max_skew = max_skew
+        self.max_age = max_age
+        self.quotes: Dict[str, Dict[str, Quote]] = {}
+        self.rejected = Counter()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "QuoteSnapshot":
+        return cls(
+            max_skew=config.get("max_skew_ms", 2000) / 1000,
+            max_age=config.get("max_age_ms", 5000) / 1000
+        )
+
+    def update(self, exchange_name: str, prices: Dict[str, float], meta: Optional[Dict]):
+        """Replace an exchange's quotes with the prices (and metadata) of its latest fetch"""
+        meta = meta or {}
+        fetched_at = meta.get("fetched_at", time.time())
+        quote_times = meta.get("quote_times", {})
+        exchange_times = meta.get("exchange_times", {})
+        self.quotes[exchange_name] = {
+            pair: Quote(price, quote_times.get(pair, fetched_at), exchange_times.get(pair))
+            for pair, price in prices.items()
+        }
+
+    def align(self, pair: str, buy_exchange: str, sell_exchange: str,
+              now: Optional[float] = None) -> Optional[Tuple[float, float, float]]:
+        """(buy age, sell age, skew) in seconds if the two quotes are aligned, else None"""
+        buy = self.quotes.get(buy_exchange, {}).get(pair)
+        sell = self.quotes.get(sell_exchange, {}).get(pair)
+        if buy is None or sell is None:
+            return None
+        now = now or time.time()
+        buy_age, sell_age = now - buy.time, now - sell.time
+        skew = abs(buy.time - sell.time)
+        if max(buy_age, sell_age) > self.max_age:
+            self.rejected["stale"] += 1
+            return None
+        if skew > self.max_skew:
+            self.rejected["skew"] += 1
+            return None
+        return buy_age, sell_age, skew
+
+    def subset(self, pairs: Iterable[str]) -> "QuoteSnapshot":
+        """Copy holding only `pairs`, for shipping to a shard worker"""
+        pairs = set(pairs)
+        snapshot = QuoteSnapshot(self.max_skew, self.max_age)
+        snapshot.quotes = {
+            exchange_name: {pair: quote for pair, quote in quotes.items() if pair in pairs}
+            for exchange_name, quotes in self.quotes.items()
+        }
+        return snapshot
@@ -0,0 +1,18 @@
+import asyncio
+from typing import Coroutine
+
+def get_loop_factory(event_loop: str = "asyncio"):
+    """Return a loop factory for the configured event loop, or None for asyncio's default"""
+    if event_loop == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            print("⚠️  uvloop is not installed (pip install uvloop), falling back to asyncio")
+            return None
+        return uvloop.new_event_loop
+    return None
+
+def run(main: Coroutine, event_loop: str = "asyncio"):
+    """asyncio.run() with a selectable event loop implementation"""
+    with asyncio.Runner(loop_factory=get_loop_factory(event_loop)) as runner:
+        return runner.run(main)
@@ -0,0 +1,231 @@
+import asyncio
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from core.arbitrage_engine import ArbitrageEngine
+from core.fee_calculator import FeeMatrix
+from models.data_models import ArbitrageOpportunity
+
+class _ShardBot:
+    """Minimal stand-in for ArbitrageBot inside worker processes"""
+    def __init__(self, config: Dict):
+        self.config = config
+        self.exchanges = {}
+        self.universe = None
+        self.scheduler = None
+        self.fee_schedule = None
+
+# One engine per worker process holding its shard's fees, prices and quotes
+# between cycles; only what changed is shipped to it
+_worker_engine = None
+_worker_pairs: List[str] = []
+_worker_prices: Dict[str, Dict[str, float]] = {}
+
+def _init_worker(config: Dict, pairs: List[str], fee_matrix: FeeMatrix):
+    global _worker_engine, _worker_pairs
+    _worker_engine = ArbitrageEngine(_ShardBot(config))
+    _worker_engine.fee_matrix = fee_matrix
+    _worker_pairs = pairs
+
+def _scan_shard(delta: Dict[str, Tuple], scan: Optional[List[str]],
+                fee_matrix: Optional[FeeMatrix]) -> Tuple[List[ArbitrageOpportunity], Dict[str, int]]:
+    """Apply a price delta and run analyze_pair over the shard (or `scan`).
+
+    delta maps every exchange quoted this cycle to (changed prices, quote
+    metadata); a None price means the pair is no longer quoted. Exchanges
+    missing from it are dropped.
+    """
+    if fee_matrix is not None:
+        _worker_engine.fee_matrix = fee_matrix
+    quotes = _worker_engine.quotes
+    for exchange_name in list(_worker_prices):
+        if exchange_name not in delta:
+            del _worker_prices[exchange_name]
+            quotes.quotes.pop(exchange_name, None)
+    for exchange_name, (changed, meta) in delta.items():
+        prices = _worker_prices.setdefault(exchange_name, {})
+        for pair, price in changed.items():
+            if price is None:
+                prices.pop(pair, None)
+            else:
+                prices[pair] = price
+        quotes.update(exchange_name, prices, meta)
+
+    quotes.rejected.clear()
+    opportunities = []
+    for pair in _worker_pairs if scan is None else scan:
+        opportunities.extend(_worker_engine.analyze_pair(pair, _worker_prices, quotes))
+    return opportunities, dict(quotes.rejected)
+
+class ShardedArbitrageEngine(ArbitrageEngine):
+    """ArbitrageEngine that splits the pair universe across worker processes.
+
+    Each shard has its own single-process pool, so its pair list and fee
+    columns stay resident in that worker (set by the pool initializer) and
+    every cycle only ships the prices that changed since the last one.
+    A shard whose worker fails is scanned in-process for that cycle and
+    all workers are restarted on the next.
+    """
+
+    def __init__(self, bot, workers: int = 0):
+        super().__init__(bot)
+        self.workers = workers or os.cpu_count() or 1
+        self.pools: List[ProcessPoolExecutor] = []
+        self.shards: List[List[str]] = []
+        self._shard_fee_source = None
+        self._sharded_pairs: Tuple[str, ...] = ()
+        # Per shard: exchange -> {pair: price} as last shipped to its worker
+        self._sent_prices: List[Dict[str, Dict[str, float]]] = []
+
+    def _worker_config(self) -> Dict:
+        return {
+            "min_spread_percentage": self.bot.config["min_spread_percentage"],
+            "trading_pairs": [],
+            "max_opportunities": self.bot.config["max_opportunities"],
+            "quotes": self.bot.config.get("quotes", {}),
+            # Statistics are kept and applied by the parent engine
+            "spread_stats": {"enabled": False},
+        }
+
+    def apply_config(self, old_config: Dict):
+        super().apply_config(old_config)
+        # Workers hold a copy of the thresholds: restart them on the next cycle
+        self._sharded_pairs = ()
+
+    def rebalance(self, pairs: List[str], exchange_prices: Dict):
+        """Assign pairs to shards so every worker gets a similar amount of work.
+
+        analyze_pair is quadratic in the number of exchanges quoting a pair, so
+        pairs are weighted by that and placed greedily on the lightest shard.
+        Workers are restarted with their new pair lists and fee columns.
+        """
+        def weight(pair: str) -> int:
+            quoted = sum(1 for prices in exchange_prices.values() if pair in prices)
+            return max(quoted, 1) ** 2
+
+        shard_count = min(self.workers, max(len(pairs), 1))
+        loads = [(0, i) for i in range(shard_count)]
+        shards = [[] for _ in range(shard_count)]
+        for pair in sorted(pairs, key=weight, reverse=True):
+            load, index = heapq.heappop(loads)
+            shards[index].append(pair)
+            heapq.heappush(loads, (load + weight(pair), index))
+
+        self.shutdown()
+        self.shards = [shard for shard in shards if shard]
+        config = self._worker_config()
+        self.pools = [
+            ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                initargs=(config, shard, self.fee_matrix.subset(shard)))
+            for shard in self.shards
+        ]
+        self._shard_fee_source = self.fee_matrix
+        self._sent_prices = [{} for _ in self.shards]
+        self._sharded_pairs = tuple(pairs)
+        print(f"🔀 Rebalanced {len(pairs)} pairs across {len(self.shards)} shards")
+
+    def _price_delta(self, index: int, exchange_prices: Dict) -> Dict[str, Tuple]:
+        """Changed prices (and quote metadata) of one shard since it was last shipped"""
+        shard, sent_prices = self.shards[index], self._sent_prices[index]
+        delta = {}
+        for exchange_name, prices in exchange_prices.items():
+            sent = sent_prices.get(exchange_name, {})
+            changed = {}
+            for pair in shard:
+                price = prices.get(pair)
+                if sent.get(pair) != price:
+                    changed[pair] = price
+            meta = self.price_meta.get(exchange_name) or {}
+            # Bulk payloads share one fetch time; only per-symbol connectors stamp pairs
+            shard_meta = {"fetched_at": meta.get("fetched_at", time.time())}
+            for key in ("quote_times", "exchange_times"):
+                times = meta.get(key)
+                if times:
+                    shard_meta[key] = {pair: times[pair] for pair in shard if pair in times}
+            delta[exchange_name] = (changed, shard_meta)
+        return delta
+
+    def _commit_delta(self, index: int, delta: Dict[str, Tuple]):
+        """Record a delta as applied once its worker has returned a result"""
+        sent_prices = self._sent_prices[index]
+        for exchange_name in list(sent_prices):
+            if exchange_name not in delta:
+                del sent_prices[exchange_name]
+        for exchange_name, (changed, _) in delta.items():
+            sent = sent_prices.setdefault(exchange_name, {})
+            for pair, price in changed.items():
+                if price is None:
+                    sent.pop(pair, None)
+                else:
+                    sent[pair] = price
+
+    @staticmethod
+    async def _run_shard(pool: ProcessPoolExecutor, args: Tuple):
+        # Submitting to a broken pool raises straight away: keep that inside the task
+        return await asyncio.get_running_loop().run_in_executor(pool, _scan_shard, *args)
+
+    async def find_opportunities(self) -> List[ArbitrageOpportunity]:
+        exchange_prices = await self.collect_prices()
+        self.refresh_fee_matrix()
+
+        # Rebalance automatically whenever the pair universe changes
+        pairs = self.bot.config["trading_pairs"]
+        if tuple(pairs) != self._sharded_pairs:
+            self.rebalance(pairs, exchange_prices)
+
+        # Fee columns only travel again when the schedule was recompiled
+        fees_changed = self._shard_fee_source is not self.fee_matrix
+        self._shard_fee_source = self.fee_matrix
+
+        scanned = pairs
+        if self.bot.scheduler:
+            scanned = self.bot.scheduler.pairs_to_scan(pairs)
+        scan_set = set(scanned)
+
+        dispatched = []
+        shard_tasks = []
+        for index, (shard, pool) in enumerate(zip(self.shards, self.pools)):
+            scan = None if scanned is pairs else [pair for pair in shard if pair in scan_set]
+            if scan == []:
+                continue
+            delta = self._price_delta(index, exchange_prices)
+            dispatched.append((index, delta, shard if scan is None else scan))
+            args = (delta, scan, self.fee_matrix.subset(shard) if fees_changed else None)
+            shard_tasks.append(self._run_shard(pool, args))
+
+        shard_results = await asyncio.gather(*shard_tasks, return_exceptions=True)
+        opportunities = []
+        failed = False
+        for (index, delta, shard_scan), result in zip(dispatched, shard_results):
+            if isinstance(result, BaseException):
+                failed = True
+                print(f"⚠️  Shard {index} failed ({type(result).__name__}: {result}), scanning it in-process")
+                for pair in shard_scan:
+                    opportunities.extend(self.analyze_pair(pair, exchange_prices, self.quotes))
+                continue
+            # Only now is it certain the worker holds these prices
+            self._commit_delta(index, delta)
+            shard_opportunities, rejected = result
+            opportunities.extend(shard_opportunities)
+            self.quotes.rejected.update(rejected)
+        if failed:
+            # Restart every worker with fresh state on the next cycle
+            self._sharded_pairs = ()
+        opportunities = self.apply_spread_stats(opportunities)
+        self.last_scan = opportunities
+
+        if self.bot.scheduler:
+            self.bot.scheduler.observe(exchange_prices, scanned, {opp.pair for opp in opportunities})
+        self.lifetimes.observe(scanned, opportunities)
+
+        # All shards feed the same top-K ranker, giving one global ranking
+        ranked = self.rank_opportunities(scanned, opportunities)
+        return await self.apply_depth(ranked)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        for pool in self.pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.pools = []
@@ -0,0 +1,183 @@
+import json
+import math
+import struct
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+class SpreadStats:
+    """Rolling statistics of every cross-exchange spread, updated in O(1) per quote.
+
+    Prices live in one preallocated (pair, exchange, slot) ring buffer with
+    a shared head, one slot per cycle (NaN where an exchange had no quote).
+    For each pair and ordered (buy, sell) exchange pair the spread
+    (sell - buy) / buy in percent is tracked with:
+
+      * windowed Welford mean/variance over the last `window` cycles: the
+        new spread is added and the one leaving the window (recomputed from
+        the evicted price slot) is removed, so nothing is rescanned;
+      * an EWMA mean/variance with smoothing `alpha`, for a faster view;
+      * the latest spread, giving z-scores on demand.
+
+    All updates are vectorised over pairs x exchanges x exchanges.
+    """
+
+    _HEADER = struct.Struct("<IIQI")  # window, head, updates, length of the JSON names
+    _ARRAYS = ("prices", "times", "count", "mean", "m2", "ewma", "ewm_var", "last")
+
+    def __init__(self, exchanges, pairs, window: int = 120, alpha: float = 0.1):
+        self.window = window
+        self.alpha = alpha
+        self.exchanges: Tuple[str, ...] = ()
+        self.pairs: Tuple[str, ...] = ()
+        self.resize(exchanges, pairs)
+
+    @classmethod
+    def from_config(cls, exchanges, pairs, config: Dict) -> "SpreadStats":
+        return cls(exchanges, pairs, window=config.get("window", 120), alpha=config.get("ewma_alpha", 0.1))
+
+    def resize(self, exchanges, pairs):
+        """(Re)allocate for a new exchange/pair set; history and statistics restart"""
+        self.exchanges = tuple(exchanges)
+        self.pairs = tuple(pairs)
+        self.exchange_index = {name: i for i, name in enumerate(self.exchanges)}
+        self.pair_index = {pair: i for i, pair in enumerate(self.pairs)}
+        p, e = len(self.pairs), len(self.exchanges)
+        self.prices = np.full((p, e, self.window), np.nan)
+        self.times = np.zeros(self.window)
+        self.head = 0
+        self.updates = 0
+        self.count = np.zeros((p, e, e))
+        self.mean = np.zeros((p, e, e))
+        self.m2 = np.zeros((p, e, e))
+        self.ewma = np.full((p, e, e), np.nan)
+        self.ewm_var = np.zeros((p, e, e))
+        self.last = np.full((p, e, e), np.nan)
+        self._off_diagonal = ~np.eye(e, dtype=bool)[None, :, :]
+
+    def ensure(self, exchanges, pairs):
+        if tuple(exchanges) != self.exchanges or tuple(pairs) != self.pairs:
+            self.resize(exchanges, pairs)
+
+    def dump_state(self) -> bytes:
+        """Price history and statistics as raw float64 buffers (see load_state)"""
+        names = json.dumps([self.exchanges, self.pairs]).encode()
+        parts = [self._HEADER.pack(self.window, self.head, self.updates, len(names)), names]
+        parts.extend(getattr(self, name).tobytes() for name in self._ARRAYS)
+        return b"".join(parts)
+
+    def load_state(self, data: bytes) -> bool:
+        """Restore a dump_state() snapshot taken with the same exchanges, pairs and window"""
+        window, head, updates, length = self._HEADER.unpack_from(data)
+        offset = self._HEADER.size
+        exchanges, pairs = json.loads(data[offset:offset + length])
+        offset += length
+        if window != self.window or tuple(exchanges) != self.exchanges or tuple(pairs) != self.pairs:
+            return False
+        for name in self._ARRAYS:
+            current = getattr(self, name)
+            restored = np.frombuffer(data, dtype=np.float64, count=current.size, offset=offset)
+            setattr(self, name, restored.reshape(current.shape).copy())
+            offset += current.nbytes
+        self.head, self.updates = head, updates
+        return True
+
+    def _spreads(self, prices: np.ndarray) -> np.ndarray:
+        """(pair, buy, sell) spread percentages from a (pair, exchange) price slice"""
+        buy = prices[:, :, None]
+        sell = prices[:, None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spreads = (sell - buy) / buy * 100
+        spreads[~np.isfinite(spreads)] = np.nan
+        return np.where(self._off_diagonal, spreads, np.nan)
+
+    def update(self, exchange_prices: Dict[str, Dict[str, float]], now: float = 0.0):
+        """Push one cycle of quotes and update every spread's statistics"""
+        current = np.full((len(self.pairs), len(self.exchanges)), np.nan)
+        for exchange_name, prices in exchange_prices.items():
+            column = self.exchange_index.get(exchange_name)
+            if column is None:
+                continue
+            for pair, price in prices.items():
+                row = self.pair_index.get(pair)
+                if row is not None and price > 0:
+                    current[row, column] = price
+
+        # Remove the spread leaving the window before overwriting its slot
+        if self.updates >= self.window:
+            old = self._spreads(self.prices[:, :, self.head])
+            leaving = ~np.isnan(old)
+            count = self.count - leaving
+            delta = np.where(leaving, old - self.mean, 0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = np.where(count > 0, self.mean - delta / count, 0.0)
+            self.m2 = np.where(count > 0, np.maximum(self.m2 - delta * np.where(leaving, old - mean, 0.0), 0.0), 0.0)
+            self.mean, self.count = mean, count
+
+        self.prices[:, :, self.head] = current
+        self.times[self.head] = now
+        self.head = (self.head + 1) % self.window
+        self.updates += 1
+
+        spreads = self._spreads(current)
+        arriving = ~np.isnan(spreads)
+        self.count += arriving
+        delta = np.where(arriving, spreads - self.mean, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.mean += np.where(arriving, delta / self.count, 0.0)
+        self.m2 += delta * np.where(arriving, spreads - self.mean, 0.0)
+
+        first = arriving & np.isnan(self.ewma)
+        ewma_delta = np.where(arriving & ~first, spreads - self.ewma, 0.0)
+        self.ewma = np.where(first, spreads, np.where(arriving, self.ewma + self.alpha * ewma_delta, self.ewma))
+        self.ewm_var = np.where(arriving, (1 - self.alpha) * (self.ewm_var + self.alpha * ewma_delta ** 2), self.ewm_var)
+        self.last = np.where(arriving, spreads, self.last)
+
+    def _index(self, pair: str, buy_exchange: str, sell_exchange: str) -> Optional[Tuple[int, int, int]]:
+        row = self.pair_index.get(pair)
+        buy = self.exchange_index.get(buy_exchange)
+        sell = self.exchange_index.get(sell_exchange)
+        if row is None or buy is None or sell is None:
+            return None
+        return row, buy, sell
+
+    def zscore(self, pair: str, buy_exchange: str, sell_exchange: str, spread: Optional[float] = None,
+               min_samples: int = 10) -> Optional[float]:
+        """How many window standard deviations `spread` (default: the latest) sits above the mean"""
+        index = self._index(pair, buy_exchange, sell_exchange)
+        if index is None or self.count[index] < max(min_samples, 2):
+            return None
+        std = math.sqrt(self.m2[index] / (self.count[index] - 1))
+        if spread is None:
+            spread = self.last[index]
+        if std <= 0 or math.isnan(spread):
+            return None
+        return float((spread - self.mean[index]) / std)
+
+    def stats(self, pair: str, buy_exchange: str, sell_exchange: str) -> Optional[Dict]:
+        """Current statistics for one spread (percentages), None if it is not tracked"""
+        index = self._index(pair, buy_exchange, sell_exchange)
+        if index is None:
+            return None
+        count = int(self.count[index])
+        return {
+            'samples': count,
+            'last': float(self.last[index]),
+            'mean': float(self.mean[index]) if count else math.nan,
+            'std': math.sqrt(self.m2[index] / (count - 1)) if count > 1 else math.nan,
+            'ewma': float(self.ewma[index]),
+            'ewm_std': math.sqrt(self.ewm_var[index]),
+            'zscore': self.zscore(pair, buy_exchange, sell_exchange, min_samples=2),
+        }
+
+    def most_unusual(self, top: int = 5, min_samples: int = 10):
+        """(pair, buy, sell, zscore) of the spreads furthest above their window mean"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(self.m2 / (self.count - 1))
+            z = (self.last - self.mean) / std
+        z[(self.count < max(min_samples, 2)) | ~np.isfinite(z)] = -np.inf
+        flat = np.argsort(z, axis=None)[::-1][:top]
+        results = []
+        for row, buy, sell in zip(*np.unravel_index(flat, z.shape)):
+            if np.isfinite(z[row, buy, sell]):
+                results.append((self.pairs[row], self.exchanges[buy], self.exchanges[sell], float(z[row, buy, sell])))
+        return results
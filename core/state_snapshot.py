@@ -0,0 +1,208 @@
+import asyncio
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Dict, Optional
+
+class StateSnapshot:
+    """Crash-safe binary snapshots of trader, ledger and tracker state for warm restarts.
+
+    File layout: a fixed header (magic, format version, save time, CRC32
+    and length of the body) followed by a zlib-compressed body of tagged
+    sections, each a 4-byte tag, a length and the payload:
+
+      LIVE  live trader ledger: total P&L, today's P&L and its UTC day
+      PAPR  paper trader balance and trade counts
+      TRDS  the most recent live and paper trade records (JSON)
+      TRCK  OpportunityTracker.dump_state()
+      SPRD  SpreadStats.dump_state()
+
+    A save packs the state on the event loop (a handful of struct packs and
+    buffer copies), then compresses, writes, fsyncs and os.replace()s the
+    file in a worker thread, so a crash at any point leaves either the old
+    or the new snapshot, never a torn one. Unknown tags are skipped, and a
+    file with a bad magic, version or checksum is ignored.
+    """
+
+    MAGIC = b"ARBS"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHdII")
+    SECTION = struct.Struct("<4sI")
+    LIVE = struct.Struct("<ddi")
+    PAPER = struct.Struct("<ddII")
+
+    def __init__(self, path: str = ".cache/state.bin", interval: float = 10.0, max_trades: int = 1000,
+                 resume_window: float = 60.0):
+        self.path = path
+        self.interval = interval
+        self.max_trades = max_trades
+        # Open opportunity episodes only survive restarts shorter than this
+        self.resume_window = resume_window
+        self.last_save = time.monotonic()
+        self.last_trades = None
+        self.saves = 0
+        self.saved_at: Optional[float] = None
+        # Engine sections wait in here until the engine is built
+        self.pending: Dict[bytes, bytes] = {}
+        self._write_lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "StateSnapshot":
+        return cls(
+            path=config.get("path", ".cache/state.bin"),
+            interval=config.get("interval", 10),
+            max_trades=config.get("max_trades", 1000),
+            resume_window=config.get("resume_window", 60)
+        )
+
+    # --- encoding ---------------------------------------------------------
+
+    def _section(self, tag: bytes, payload: bytes) -> bytes:
+        return self.SECTION.pack(tag, len(payload)) + payload
+
+    def collect(self, bot) -> bytes:
+        """The uncompressed body for the bot's current state"""
+        live, paper = bot.live_trader, bot.paper_trader
+        parts = [
+            self._section(b"LIVE", self.LIVE.pack(live.total_pnl, live.daily_pnl, live.pnl_day)),
+            self._section(b"PAPR", self.PAPER.pack(paper.initial_balance, paper.balance,
+                                                   paper.total_trades, paper.profitable_trades)),
+            self._section(b"TRDS", json.dumps({
+                'live': live.trade_history[-self.max_trades:],
+                'paper': paper.trade_history[-self.max_trades:],
+            }, default=str).encode()),
+        ]
+        engine = bot.engine
+        if engine is not None:
+            parts.append(self._section(b"TRCK", engine.lifetimes.dump_state()))
+            if engine.spread_stats is not None:
+                parts.append(self._section(b"SPRD", engine.spread_stats.dump_state()))
+        else:
+            # Not built yet: keep what was restored rather than dropping it
+            parts.extend(self._section(tag, payload) for tag, payload in self.pending.items())
+        return b"".join(parts)
+
+    def _write(self, body: bytes, saved_at: float):
+        compressed = zlib.compress(body, 1)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, saved_at, zlib.crc32(compressed), len(compressed)))
+            f.write(compressed)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        try:
+            # Make the rename itself durable
+            fd = os.open(directory or ".", os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    async def save(self, bot):
+        body = self.collect(bot)
+        saved_at = time.time()
+        self.last_save = time.monotonic()
+        self.last_trades = self._trade_counts(bot)
+        try:
+            async with self._write_lock:
+                await asyncio.to_thread(self._write, body, saved_at)
+            self.saves += 1
+            self.saved_at = saved_at
+        except OSError as e:
+            print(f"⚠️  Could not save state to {self.path}: {e}")
+
+    @staticmethod
+    def _trade_counts(bot):
+        return len(bot.live_trader.trade_history), bot.paper_trader.total_trades
+
+    async def maybe_save(self, bot):
+        """Save every `interval` seconds, and straight after any trade so the ledger is never behind"""
+        if (time.monotonic() - self.last_save >= self.interval
+                or self._trade_counts(bot) != self.last_trades):
+            await self.save(bot)
+
+    # --- decoding ---------------------------------------------------------
+
+    def read(self) -> Optional[Dict[bytes, bytes]]:
+        """Sections of the snapshot on disk, None if there is no usable one"""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"⚠️  Could not read state from {self.path}: {e}")
+            return None
+        try:
+            magic, version, saved_at, checksum, length = self.HEADER.unpack_from(data)
+            compressed = data[self.HEADER.size:self.HEADER.size + length]
+            if magic != self.MAGIC or version != self.VERSION or len(compressed) != length:
+                raise ValueError("unrecognised format")
+            if zlib.crc32(compressed) != checksum:
+                raise ValueError("checksum mismatch")
+            body = zlib.decompress(compressed)
+        except (struct.error, zlib.error, ValueError) as e:
+            print(f"⚠️  Ignoring state snapshot {self.path}: {e}")
+            return None
+        sections = {}
+        offset = 0
+        while offset + self.SECTION.size <= len(body):
+            tag, size = self.SECTION.unpack_from(body, offset)
+            offset += self.SECTION.size
+            sections[tag] = body[offset:offset + size]
+            offset += size
+        self.saved_at = saved_at
+        return sections
+
+    def restore(self, bot) -> bool:
+        """Load the trader ledgers now; tracker and spread statistics wait for restore_engine()"""
+        sections = self.read()
+        if sections is None:
+            return False
+        live, paper = bot.live_trader, bot.paper_trader
+        try:
+            if b"LIVE" in sections:
+                total_pnl, daily_pnl, pnl_day = self.LIVE.unpack(sections[b"LIVE"])
+                live.total_pnl = total_pnl
+                # Yesterday's losses do not count against today's limit
+                if pnl_day == live.current_day():
+                    live.daily_pnl = daily_pnl
+            if b"PAPR" in sections:
+                (paper.initial_balance, paper.balance,
+                 paper.total_trades, paper.profitable_trades) = self.PAPER.unpack(sections[b"PAPR"])
+            if b"TRDS" in sections:
+                trades = json.loads(sections[b"TRDS"])
+                live.trade_history = trades.get('live', [])
+                paper.trade_history = trades.get('paper', [])
+        except (struct.error, ValueError) as e:
+            print(f"⚠️  Ignoring state snapshot {self.path}: {e}")
+            return False
+        self.pending = {tag: sections[tag] for tag in (b"TRCK", b"SPRD") if tag in sections}
+        self.last_trades = self._trade_counts(bot)
+        return True
+
+    def restore_engine(self, engine):
+        """Hand the restored opportunity lifetimes and spread statistics to a new engine"""
+        pending, self.pending = self.pending, {}
+        try:
+            if b"TRCK" in pending:
+                fresh = self.saved_at is not None and time.time() - self.saved_at <= self.resume_window
+                engine.lifetimes.load_state(pending[b"TRCK"], open_episodes=fresh)
+            if b"SPRD" in pending and engine.spread_stats is not None:
+                if not engine.spread_stats.load_state(pending[b"SPRD"]):
+                    print("   Spread statistics not restored: exchanges, pairs or window changed")
+        except (struct.error, ValueError) as e:
+            print(f"⚠️  Could not restore engine state: {e}")
+
+    def describe(self) -> str:
+        if self.saved_at is None:
+            return "no snapshot"
+        return f"snapshot from {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.saved_at))}"
@@ -0,0 +1,300 @@
+import math
+import time
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Tuple
+from models.data_models import ArbitrageOpportunity
+
+class LogPriceGraph:
+    """Directed graph of conversion rates with weights -log(rate).
+
+    A profitable cycle is a negative-weight cycle. Distances from a virtual
+    source (0-weight edge to every node) are kept between updates as
+    potentials: while they are feasible, raising an edge weight cannot create a
+    negative cycle and cannot violate them, so only nodes whose outgoing edges
+    got cheaper need to be re-relaxed. A full pass is only needed after a
+    cycle was found, since cycle relaxation leaves the potentials inconsistent.
+    """
+
+    def __init__(self):
+        self.node_ids: Dict[Hashable, int] = {}
+        self.nodes: List[Hashable] = []
+        self.edges: List[Dict[int, list]] = []  # u -> {v: [weight, meta]}
+        self.dist: List[float] = []
+        self.pending = set()
+        self.needs_full = True
+
+    def node(self, key: Hashable) -> int:
+        node_id = self.node_ids.get(key)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.node_ids[key] = node_id
+            self.nodes.append(key)
+            self.edges.append({})
+            self.dist.append(0.0)
+        return node_id
+
+    def set_edge(self, source: Hashable, target: Hashable, weight: float, meta=None):
+        u, v = self.node(source), self.node(target)
+        edge = self.edges[u].get(v)
+        if edge is None:
+            self.edges[u][v] = [weight, meta]
+            self.pending.add(u)
+        else:
+            if weight < edge[0]:
+                self.pending.add(u)
+            edge[0] = weight
+            edge[1] = meta
+
+    def remove_edge(self, source: Hashable, target: Hashable):
+        # Removing an edge never invalidates the potentials
+        u, v = self.node_ids.get(source), self.node_ids.get(target)
+        if u is not None and v is not None:
+            self.edges[u].pop(v, None)
+
+    def find_negative_cycles(self, max_cycles: int = 10) -> List[List[int]]:
+        """Incremental SPFA returning up to `max_cycles` distinct negative cycles"""
+        n = len(self.nodes)
+        if self.needs_full:
+            self.dist = [0.0] * n
+            queue = deque(range(n))
+        else:
+            queue = deque(self.pending)
+        self.pending = set()
+
+        dist, edges = self.dist, self.edges
+        pred = [-1] * n
+        length = [0] * n
+        queued = [False] * n
+        for u in queue:
+            queued[u] = True
+        blocked = [False] * n
+        cycles, seen = [], set()
+
+        while queue and len(cycles) < max_cycles:
+            u = queue.popleft()
+            queued[u] = False
+            if blocked[u]:
+                continue
+            du = dist[u]
+            for v, (weight, _) in edges[u].items():
+                if du + weight < dist[v] - 1e-12 and not blocked[v]:
+                    dist[v] = du + weight
+                    pred[v] = u
+                    length[v] = length[u] + 1
+                    if length[v] >= n:
+                        cycle = self._extract_cycle(pred, v, n)
+                        if cycle:
+                            for node_id in cycle:
+                                blocked[node_id] = True
+                            signature = frozenset(cycle)
+                            if signature not in seen and self.cycle_weight(cycle) < 0:
+                                seen.add(signature)
+                                cycles.append(cycle)
+                        continue
+                    if not queued[v]:
+                        queued[v] = True
+                        queue.append(v)
+
+        # Potentials are only trustworthy if the search converged cycle-free
+        self.needs_full = bool(cycles) or bool(queue)
+        return cycles
+
+    def _extract_cycle(self, pred: List[int], start: int, n: int) -> Optional[List[int]]:
+        node_id = start
+        for _ in range(n):
+            node_id = pred[node_id]
+            if node_id < 0:
+                return None
+        cycle = [node_id]
+        current = pred[node_id]
+        while current != node_id:
+            if current < 0 or len(cycle) > n:
+                return None
+            cycle.append(current)
+            current = pred[current]
+        cycle.reverse()
+        return cycle
+
+    def cycle_weight(self, cycle: List[int]) -> float:
+        total = 0.0
+        for i, u in enumerate(cycle):
+            edge = self.edges[u].get(cycle[(i + 1) % len(cycle)])
+            if edge is None:
+                return math.inf
+            total += edge[0]
+        return total
+
+class TriangularArbitrageEngine:
+    """Finds multi-hop cycles (e.g. USDT -> BTC -> ETH -> USDT) on one or more exchanges.
+
+    Nodes are (exchange, asset). Every bulk-ticker symbol BASE-QUOTE adds a
+    QUOTE->BASE edge at the ask and a BASE->QUOTE edge at the bid, both net of
+    the taker fee. With cross_exchange enabled the same asset on two exchanges
+    is linked by a transfer edge carrying `transfer_cost_percentage`.
+
+    Symbols missing from an exchange's latest snapshot lose their edges, and
+    an exchange whose tickers are older than `max_ticker_age` seconds (fetch
+    failing, circuit open) is dropped from the graph until it refreshes, so
+    stale rates cannot form phantom cycles.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        settings = bot.config.get("triangular", {})
+        self.cross_exchange = settings.get("cross_exchange", False)
+        self.transfer_cost = settings.get("transfer_cost_percentage", 0.1) / 100
+        self.min_profit = settings.get("min_profit_percentage", 0.1)
+        self.start_assets = set(settings.get("start_assets", ["USDT"]))
+        self.max_cycles = settings.get("max_cycles", 10)
+        self.max_ticker_age = settings.get("max_ticker_age", 3 * bot.config.get("update_interval", 5))
+        self.graph = LogPriceGraph()
+        self._symbols: Dict[str, Dict[str, Optional[Tuple[str, str]]]] = {}
+        self._fees: Dict[Tuple[str, str], float] = {}
+        self._fee_version = -1
+        self._ticker_times: Dict[str, float] = {}
+        # exchange -> {symbol: (base, quote)} currently contributing edges
+        self._edge_symbols: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        self._linked_assets = set()
+
+        for exchange in bot.exchanges.values():
+            exchange.keep_book_tickers = True
+
+    def _split_symbol(self, exchange, symbol: str) -> Optional[Tuple[str, str]]:
+        cache = self._symbols.setdefault(exchange.name, {})
+        if symbol not in cache:
+            pair = exchange.denormalize_symbol(symbol)
+            cache[symbol] = tuple(pair.split("-", 1)) if pair else None
+        return cache[symbol]
+
+    def _taker_fee(self, exchange_name: str, pair: str) -> float:
+        schedule = self.bot.fee_schedule
+        if schedule.version != self._fee_version:
+            self._fees.clear()
+            self._fee_version = schedule.version
+        fee = self._fees.get((exchange_name, pair))
+        if fee is None:
+            fee = self._fees[(exchange_name, pair)] = schedule.get_fees(exchange_name, pair)[1]
+        return fee
+
+    def update_graph(self):
+        """Fold the latest bulk tickers into the graph; unchanged exchanges are skipped"""
+        graph = self.graph
+        assets_by_exchange = {}
+        now = time.time()
+        for exchange_name in list(self._edge_symbols):
+            exchange = self.bot.exchanges.get(exchange_name)
+            if exchange is None or now - exchange.book_tickers_time > self.max_ticker_age:
+                self._drop_exchange(exchange_name)
+
+        for exchange_name, exchange in self.bot.exchanges.items():
+            if (not exchange.book_tickers or now - exchange.book_tickers_time > self.max_ticker_age
+                    or self._ticker_times.get(exchange_name) == exchange.book_tickers_time):
+                continue
+            self._ticker_times[exchange_name] = exchange.book_tickers_time
+            assets = assets_by_exchange.setdefault(exchange_name, set())
+            previous = self._edge_symbols.get(exchange_name, {})
+            current = {}
+
+            for symbol, (bid, ask) in exchange.book_tickers.items():
+                split = self._split_symbol(exchange, symbol)
+                if split is None:
+                    continue
+                base, quote = split
+                fee = self._taker_fee(exchange_name, f"{base}-{quote}")
+                buy_rate, sell_rate = 1 / ask, bid
+                graph.set_edge((exchange_name, quote), (exchange_name, base), -math.log(buy_rate * (1 - fee)),
+                               (exchange_name, symbol, "buy", ask, buy_rate, fee))
+                graph.set_edge((exchange_name, base), (exchange_name, quote), -math.log(sell_rate * (1 - fee)),
+                               (exchange_name, symbol, "sell", bid, sell_rate, fee))
+                current[symbol] = split
+                assets.add(base)
+                assets.add(quote)
+
+            # Delisted, halted or filtered symbols must not keep their last rates
+            for symbol in previous.keys() - current.keys():
+                base, quote = previous[symbol]
+                graph.remove_edge((exchange_name, quote), (exchange_name, base))
+                graph.remove_edge((exchange_name, base), (exchange_name, quote))
+            self._edge_symbols[exchange_name] = current
+
+        if self.cross_exchange:
+            self._link_exchanges(assets_by_exchange)
+
+    def _drop_exchange(self, exchange_name: str):
+        """Remove an exchange's market and transfer edges; they come back with its next fresh snapshot"""
+        graph = self.graph
+        for base, quote in self._edge_symbols.pop(exchange_name).values():
+            graph.remove_edge((exchange_name, quote), (exchange_name, base))
+            graph.remove_edge((exchange_name, base), (exchange_name, quote))
+        self._ticker_times.pop(exchange_name, None)
+        for linked_exchange, asset in list(self._linked_assets):
+            if linked_exchange == exchange_name:
+                self._linked_assets.discard((exchange_name, asset))
+                for other in self.bot.exchanges:
+                    graph.remove_edge((exchange_name, asset), (other, asset))
+                    graph.remove_edge((other, asset), (exchange_name, asset))
+        print(f"⚠️  {exchange_name} tickers are stale, dropped from the triangular graph")
+
+    def _link_exchanges(self, assets_by_exchange: Dict[str, set]):
+        weight = -math.log(1 - self.transfer_cost)
+        for exchange_name, assets in assets_by_exchange.items():
+            for asset in assets:
+                if (exchange_name, asset) in self._linked_assets:
+                    continue
+                self._linked_assets.add((exchange_name, asset))
+                for other in self.bot.exchanges:
+                    if other != exchange_name and (other, asset) in self.graph.node_ids:
+                        meta = ("transfer", asset, exchange_name, other, self.transfer_cost)
+                        self.graph.set_edge((exchange_name, asset), (other, asset), weight, meta)
+                        self.graph.set_edge((other, asset), (exchange_name, asset), weight,
+                                            ("transfer", asset, other, exchange_name, self.transfer_cost))
+
+    def find_opportunities(self) -> List[ArbitrageOpportunity]:
+        self.update_graph()
+        opportunities = []
+        for cycle in self.graph.find_negative_cycles(self.max_cycles):
+            opportunity = self._to_opportunity(cycle)
+            if opportunity and opportunity.actual_profit_percentage >= self.min_profit:
+                opportunities.append(opportunity)
+        opportunities.sort(key=lambda x: x.actual_profit_percentage, reverse=True)
+        return opportunities
+
+    def _to_opportunity(self, cycle: List[int]) -> Optional[ArbitrageOpportunity]:
+        nodes = [self.graph.nodes[node_id] for node_id in cycle]
+        # Rotate so the cycle starts and ends in a configured start asset
+        start = next((i for i, (_, asset) in enumerate(nodes) if asset in self.start_assets), None)
+        if start is None:
+            return None
+        cycle = cycle[start:] + cycle[:start]
+        nodes = nodes[start:] + nodes[:start]
+
+        gross, net = 1.0, 1.0
+        legs, fees = [], []
+        for i, u in enumerate(cycle):
+            weight, meta = self.graph.edges[u][cycle[(i + 1) % len(cycle)]]
+            net *= math.exp(-weight)
+            if meta[0] == "transfer":
+                legs.append(f"transfer {meta[1]} {meta[2]}→{meta[3]}")
+                fees.append(meta[4])
+            else:
+                exchange_name, symbol, side, price, rate, fee = meta
+                gross *= rate
+                legs.append(f"{exchange_name}:{side.upper()} {symbol} @ {price}")
+                fees.append(fee)
+
+        path = "→".join(asset for _, asset in nodes) + f"→{nodes[0][1]}"
+        return ArbitrageOpportunity(
+            pair=path,
+            buy_exchange=nodes[0][0],
+            sell_exchange=nodes[-1][0],
+            buy_price=1.0,
+            sell_price=gross,
+            spread=gross - 1,
+            spread_percentage=(gross - 1) * 100,
+            buy_fee=fees[0],
+            sell_fee=fees[-1],
+            net_spread_percentage=(net - 1) * 100,
+            actual_profit_percentage=(net - 1) * 100,
+            timestamp=time.time(),
+            route=legs
+        )
@@ -0,0 +1,140 @@
+import time
+from typing import Dict, Iterable, List
+
+class UniverseIndex:
+    """Bitset index of which exchanges list which canonical pairs.
+
+    Every pair gets a stable integer id and every exchange is one Python int
+    used as a bitmask over those ids, so intersections and "listed on at least
+    N exchanges" queries are a handful of big-int operations.
+    """
+
+    def __init__(self):
+        self.pair_ids: Dict[str, int] = {}
+        self.pairs: List[str] = []
+        self.listings: Dict[str, int] = {}
+
+    def _pair_id(self, pair: str) -> int:
+        pair_id = self.pair_ids.get(pair)
+        if pair_id is None:
+            pair_id = len(self.pairs)
+            self.pair_ids[pair] = pair_id
+            self.pairs.append(pair)
+        return pair_id
+
+    def update_exchange(self, exchange_name: str, pairs: Iterable[str]):
+        """Replace the listing bitmask of one exchange"""
+        ids = [self._pair_id(pair) for pair in pairs]
+        bits = bytearray((len(self.pairs) + 7) // 8)
+        for pair_id in ids:
+            bits[pair_id >> 3] |= 1 << (pair_id & 7)
+        self.listings[exchange_name] = int.from_bytes(bits, "little")
+
+    def remove_exchange(self, exchange_name: str):
+        self.listings.pop(exchange_name, None)
+
+    def listed_on_all(self, exchange_names: Iterable[str]) -> List[str]:
+        """Pairs listed on every one of the given exchanges"""
+        mask = -1
+        for exchange_name in exchange_names:
+            mask &= self.listings.get(exchange_name, 0)
+        return self._decode(mask) if mask != -1 else []
+
+    def listed_on_at_least(self, min_exchanges: int) -> List[str]:
+        """Pairs listed on at least `min_exchanges` exchanges"""
+        if min_exchanges <= 0:
+            return list(self.pairs)
+        # levels[k] holds the pairs seen on at least k exchanges so far
+        levels = [-1] + [0] * min_exchanges
+        for mask in self.listings.values():
+            for k in range(min_exchanges, 0, -1):
+                levels[k] |= levels[k - 1] & mask
+        return self._decode(levels[min_exchanges])
+
+    def exchange_count(self, pair: str) -> int:
+        pair_id = self.pair_ids.get(pair)
+        if pair_id is None:
+            return 0
+        return sum(1 for mask in self.listings.values() if mask >> pair_id & 1)
+
+    def _decode(self, mask: int) -> List[str]:
+        pairs = []
+        data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        for byte_index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                pairs.append(self.pairs[(byte_index << 3) + low.bit_length() - 1])
+                byte ^= low
+        return pairs
+
+class UniverseDiscovery:
+    """Periodically rebuilds trading_pairs from the bulk ticker listings"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        settings = bot.config.get("universe", {})
+        self.min_exchanges = settings.get("min_exchanges", 2)
+        self.refresh_interval = settings.get("refresh_interval", 300)
+        self.max_pairs = settings.get("max_pairs", 200)
+        self.quote_assets = set(settings.get("quote_assets", ["USDT"]))
+        self.index = UniverseIndex()
+        # Hand-picked pairs always stay in the universe
+        self.manual_pairs = list(bot.config["trading_pairs"])
+        self.last_refresh = 0.0
+        self._canonical_cache: Dict[str, Dict[str, str]] = {}
+
+    def _canonical_pairs(self, exchange) -> List[str]:
+        cache = self._canonical_cache.setdefault(exchange.name, {})
+        pairs = []
+        for symbol in exchange.listed_symbols:
+            pair = cache.get(symbol)
+            if pair is None:
+                pair = cache[symbol] = exchange.denormalize_symbol(symbol) or ""
+            if pair:
+                pairs.append(pair)
+        return pairs
+
+    def refresh_due(self) -> bool:
+        return time.time() - self.last_refresh >= self.refresh_interval
+
+    def refresh_if_due(self) -> bool:
+        """Rebuild the universe if the refresh interval has elapsed"""
+        now = time.time()
+        if now - self.last_refresh < self.refresh_interval:
+            return False
+
+        listing_exchanges = 0
+        for exchange_name, exchange in self.bot.exchanges.items():
+            if exchange.listed_symbols:
+                self.index.update_exchange(exchange_name, self._canonical_pairs(exchange))
+                listing_exchanges += 1
+        for exchange_name in list(self.index.listings):
+            if exchange_name not in self.bot.exchanges:
+                self.index.remove_exchange(exchange_name)
+
+        # Wait until bulk payloads have actually been downloaded
+        if listing_exchanges < self.min_exchanges:
+            return False
+        self.last_refresh = now
+
+        discovered = [
+            pair for pair in self.index.listed_on_at_least(self.min_exchanges)
+            if pair.split("-", 1)[1] in self.quote_assets
+        ]
+        # Prefer pairs listed on the most exchanges when capping
+        discovered.sort(key=lambda pair: (-self.index.exchange_count(pair), pair))
+
+        universe = list(self.manual_pairs)
+        seen = set(universe)
+        for pair in discovered:
+            if len(universe) >= self.max_pairs:
+                break
+            if pair not in seen:
+                universe.append(pair)
+                seen.add(pair)
+
+        if universe != self.bot.config["trading_pairs"]:
+            self.bot.config["trading_pairs"] = universe
+            print(f"🌐 Universe refreshed: {len(universe)} pairs "
+                  f"({len(discovered)} listed on {self.min_exchanges}+ exchanges)")
+        return True
@@ -0,0 +1,34 @@
+import asyncio
+import time
+from typing import Dict
+
+async def warm_connections(bot) -> Dict[str, float]:
+    """Pre-warm every market-data host, plus order hosts for exchanges we trade, in parallel.
+
+    Each warm-up resolves DNS, completes TCP + TLS and leaves a keep-alive
+    connection in the session pool, so the first real cycle pays steady-state
+    latency. Coinbase also loads its product catalog from the disk cache here.
+    """
+    tasks = {}
+    for exchange_name, exchange in bot.exchanges.items():
+        tasks[f"data:{exchange_name}"] = exchange.warm_up()
+
+    if bot.live_trader.is_live:
+        for exchange_name in bot.live_trader.tradable_exchanges():
+            executor = bot.live_trader.get_executor(exchange_name)
+            if executor is not None:
+                tasks[f"order:{exchange_name}"] = executor.warm_up()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    total = time.perf_counter() - start
+
+    timings = {}
+    print(f"🔥 Warmed {len(tasks)} connections in {total * 1000:.0f}ms")
+    for name, result in zip(tasks, results):
+        if isinstance(result, Exception):
+            print(f"   ❌ {name}: {result}")
+        else:
+            timings[name] = result
+            print(f"   ✅ {name}: {result * 1000:.0f}ms")
+    return timings
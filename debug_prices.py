@@ -39,9 +39,11 @@ async def debug_arbitrage_engine():
         # Get all prices
         exchange_prices = {}
         for exchange_name, exchange in bot.exchanges.items():
-            prices = await exchange.get_prices(bot.config["trading_pairs"])
+            # Usually served from the cache filled by find_opportunities above
+            prices, meta = await exchange.get_prices_with_meta(bot.config["trading_pairs"])
             exchange_prices[exchange_name] = prices
-            print(f"\n{exchange_name}: {len(prices)} pairs found")
+            source = "cached" if meta["from_cache"] else "fresh"
+            print(f"\n{exchange_name}: {len(prices)} pairs found ({source}, {meta['age']:.1f}s old)")
         
         # Check each pair
         for pair in bot.config["trading_pairs"]:
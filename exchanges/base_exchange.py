@@ -1,19 +1,149 @@
 import aiohttp
-from typing import Dict, List
+import asyncio
+import contextvars
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from models.order_book import OrderBook
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .response_cache import ResponseCache
+
+# Staleness of the responses used by the current get_prices_with_meta call (per task)
+_fetch_meta: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar("fetch_meta", default=None)
+# When the response most recently returned by _get_json in this task was answered
+_response_time: contextvars.ContextVar[float] = contextvars.ContextVar("response_time", default=0.0)
 
 class BaseExchangeAPI:
+    # Quote assets used to split concatenated symbols such as BTCUSDT (longest first)
+    KNOWN_QUOTES = ("FDUSD", "USDT", "USDC", "BUSD", "TUSD", "DAI", "BTC", "ETH", "BNB", "EUR", "TRY")
+    # Subscriptions up to this many symbols use filtered requests instead of the
+    # full ticker dump (0 = connector has no filtered path)
+    FILTER_THRESHOLD = 0
+    
     def __init__(self, config: Dict):
         self.name = ""
         self.base_url = ""
         self.api_key = config.get("api_key", "")
         self.api_secret = config.get("api_secret", "")
         self.session = None
+        # Cheap public endpoint used to pre-warm connections (and read server time)
+        self.server_time_url = ""
+        # True for connectors that need one request per pair (no bulk ticker endpoint)
+        self.per_symbol_requests = False
+        # Every symbol seen in the last bulk ticker payload (exchange format)
+        self.listed_symbols = set()
+        self.listings_time = 0.0
+        # Full dumps are still taken periodically (and on demand) to refresh listings
+        self.filter_threshold = self.FILTER_THRESHOLD
+        self.listing_refresh_interval = 300.0
+        self.force_full_dump = False
+        self.last_fetch_mode = ""
+        # Cumulative network accounting: requests, decoded bytes, bytes on the wire, rate-limit weight
+        self.transfer = {"requests": 0, "bytes": 0, "wire_bytes": 0, "weight": 0}
+        # Full symbol -> (bid, ask) map from bulk payloads, only kept when a
+        # consumer such as the triangular engine asks for it
+        self.keep_book_tickers = False
+        self.book_tickers = {}
+        self.book_tickers_time = 0.0
+        # Failing or rate-limited exchanges are backed off instead of retried every cycle
+        self.breaker = CircuitBreaker()
+        self.request_timeout = 10.0
+        # Concurrent identical GETs share one fetch; answers are reused for a short TTL
+        self.response_cache = ResponseCache()
         
     async def get_session(self) -> aiohttp.ClientSession:
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            # Keep DNS answers and idle keep-alive connections across cycles
+            connector = aiohttp.TCPConnector(ttl_dns_cache=300, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            # Ticker JSON compresses ~10x; aiohttp decompresses transparently
+            headers = {"Accept-Encoding": "gzip, deflate"}
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers)
         return self.session
     
+    def use_filtered_request(self, symbol_count: int) -> bool:
+        """Pick a filtered/batched request over the full dump for this subscription.
+
+        The full dump is kept whenever something needs every listing: the
+        triangular engine (keep_book_tickers), a due universe refresh
+        (force_full_dump), or listings that are unknown or older than
+        listing_refresh_interval.
+        """
+        if symbol_count > self.filter_threshold or self.keep_book_tickers or self.force_full_dump:
+            return False
+        return bool(self.listed_symbols) and time.time() - self.listings_time < self.listing_refresh_interval
+    
+    def listed(self, pairs: List[str]) -> List[str]:
+        """Pairs whose exchange symbol appeared in the last full dump"""
+        return [pair for pair in pairs if self.normalize_pair(pair) in self.listed_symbols]
+    
+    async def _get_json(self, url: str, params: Optional[Dict] = None, ttl: Optional[float] = None,
+                        weight: int = 1) -> Tuple[int, Any]:
+        """GET through the response cache and circuit breaker, returning (status, json).
+
+        json is None unless the status is 200. Identical concurrent requests
+        are coalesced and 200 responses are served from cache for `ttl`
+        seconds (the cache default when None). `weight` is the request's
+        rate-limit cost, counted only when it actually goes to the network.
+        """
+        key = (url, tuple(sorted(params.items())) if params else ())
+        response = await self.response_cache.get(key, lambda: self._fetch_json(url, params, weight), ttl)
+        meta = _fetch_meta.get()
+        if meta is not None:
+            meta["fetched_at"] = min(meta["fetched_at"], response.fetched_at)
+            meta["from_cache"] = meta["from_cache"] and response.from_cache
+            meta["requests"] += 1
+        _response_time.set(response.fetched_at)
+        return response.status, response.data
+    
+    async def _fetch_json(self, url: str, params: Optional[Dict] = None, weight: int = 1) -> Tuple[int, Any]:
+        """GET through the circuit breaker.
+
+        429/5xx responses, timeouts and transport errors count as failures;
+        other statuses mean the exchange answered and count as success.
+        Raises CircuitOpenError while the circuit is open.
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"{self.name} circuit {self.breaker.describe()}")
+        
+        session = await self.get_session()
+        try:
+            async with session.get(url, params=params) as response:
+                body = await response.read()
+                self.transfer["requests"] += 1
+                self.transfer["weight"] += weight
+                self.transfer["bytes"] += len(body)
+                # Content-Length is the compressed size; chunked responses only give the decoded one
+                self.transfer["wire_bytes"] += response.content_length or len(body)
+                if response.status == 429 or response.status >= 500:
+                    self._record_failure(f"HTTP {response.status}", response.headers.get("Retry-After"))
+                    return response.status, None
+                data = json.loads(body) if response.status == 200 else None
+                self.breaker.record_success()
+                return response.status, data
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            self._record_failure(type(e).__name__)
+            raise
+    
+    def _record_failure(self, reason: str, retry_after: Optional[str] = None):
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        if self.breaker.record_failure(retry_after):
+            print(f"⛔ {self.name} circuit open after {reason}, retrying in {self.breaker.retry_in():.1f}s")
+    
+    async def warm_up(self) -> float:
+        """Resolve, connect and TLS-handshake a pooled connection before the first cycle"""
+        session = await self.get_session()
+        start = time.perf_counter()
+        async with session.get(self.server_time_url or self.base_url) as response:
+            await response.read()
+        return time.perf_counter() - start
+    
     async def close_session(self):
         if self.session:
             await self.session.close()
@@ -21,6 +151,84 @@ class BaseExchangeAPI:
     async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
         raise NotImplementedError("Subclasses must implement this method")
     
+    async def get_filtered_prices(self, pairs: List[str]) -> Dict[str, float]:
+        """Prices for just `pairs`, by default one concurrent per-symbol request each"""
+        self.last_fetch_mode = "filtered"
+        results = await asyncio.gather(*(self.get_symbol_price(pair) for pair in pairs), return_exceptions=True)
+        prices = {}
+        for pair, result in zip(pairs, results):
+            if isinstance(result, Exception):
+                print(f"{self.name} error for {pair}: {result}")
+            elif result is not None:
+                prices[pair] = result
+        return prices
+    
+    async def get_symbol_price(self, pair: str) -> Optional[float]:
+        """Single-symbol ticker used by get_filtered_prices"""
+        raise NotImplementedError("Subclasses with a FILTER_THRESHOLD must implement this method")
+    
+    async def get_prices_with_meta(self, pairs: List[str]) -> Tuple[Dict[str, float], Dict]:
+        """get_prices plus staleness metadata for the payloads it used.
+
+        fetched_at is when the oldest payload was answered, age is measured
+        from that, and from_cache is True only if nothing went to the network.
+        quote_times/exchange_times hold per-pair receive and exchange
+        timestamps for connectors that stamp them (see stamp_quote); other
+        pairs are as old as fetched_at.
+        """
+        meta = {"fetched_at": time.time(), "from_cache": True, "requests": 0, "quote_times": {}, "exchange_times": {}}
+        token = _fetch_meta.set(meta)
+        try:
+            prices = await self.get_prices(pairs)
+        finally:
+            _fetch_meta.reset(token)
+        if meta["requests"] == 0:
+            meta["from_cache"] = False
+        meta["age"] = time.time() - meta["fetched_at"]
+        return prices, meta
+    
+    def stamp_quote(self, pair: str, exchange_time: Optional[float] = None):
+        """Record when `pair`'s quote was received (the last _get_json response) and, if known, the exchange's timestamp"""
+        meta = _fetch_meta.get()
+        if meta is None:
+            return
+        meta["quote_times"][pair] = _response_time.get() or time.time()
+        if exchange_time:
+            meta["exchange_times"][pair] = exchange_time
+    
+    async def get_order_book(self, pair: str, depth: int = 20) -> Optional[OrderBook]:
+        """Fetch an L2 snapshot of `depth` levels per side"""
+        raise NotImplementedError("Subclasses must implement this method")
+    
     def normalize_pair(self, pair: str) -> str:
         """Normalize trading pair format for specific exchange"""
-        return pair
\ No newline at end of file
+        return pair
+    
+    def denormalize_symbol(self, symbol: str) -> Optional[str]:
+        """Convert an exchange symbol back to the canonical BASE-QUOTE format"""
+        for separator in ("-", "_", "/"):
+            if separator in symbol:
+                base, quote = symbol.split(separator, 1)
+                return f"{base}-{quote}".upper()
+        for quote in self.KNOWN_QUOTES:
+            if symbol.endswith(quote) and len(symbol) > len(quote):
+                return f"{symbol[:-len(quote)]}-{quote}"
+        return None
+    
+    def record_listings(self, symbols: Iterable[str]):
+        """Remember which symbols the exchange listed in its latest bulk payload"""
+        self.listed_symbols = set(symbols)
+        self.listings_time = time.time()
+    
+    def record_book_tickers(self, rows: Iterable):
+        """Store (symbol, bid, ask) rows from a bulk payload, skipping empty quotes"""
+        book_tickers = {}
+        for symbol, bid, ask in rows:
+            try:
+                bid, ask = float(bid), float(ask)
+            except (TypeError, ValueError):
+                continue
+            if bid > 0 and ask > 0:
+                book_tickers[symbol] = (bid, ask)
+        self.book_tickers = book_tickers
+        self.book_tickers_time = time.time()
\ No newline at end of file
@@ -1,35 +1,82 @@
 import aiohttp
-from typing import Dict, List
+import json
+from typing import Dict, List, Optional
+from models.order_book import OrderBook
 from .base_exchange import BaseExchangeAPI
 
 class BinanceAPI(BaseExchangeAPI):
+    # bookTicker takes a `symbols` list, so one batched request covers the subscription
+    FILTER_THRESHOLD = 100
+    
     def __init__(self, config: Dict):
         super().__init__(config)
         self.name = "binance"
         self.base_url = "https://api.binance.com/api/v3"
+        self.server_time_url = f"{self.base_url}/time"
     
     def normalize_pair(self, pair: str) -> str:
         # Convert BTC-USDT to BTCUSDT
         return pair.replace("-", "")
     
     async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
-        prices = {}
-        session = await self.get_session()
+        if self.use_filtered_request(len(pairs)):
+            return await self.get_filtered_prices(self.listed(pairs))
         
+        prices = {}
+        self.last_fetch_mode = "full"
         try:
-            async with session.get(f"{self.base_url}/ticker/bookTicker") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # Convert to dict for easy lookup
-                    price_dict = {item['symbol']: float(item['bidPrice']) for item in data}
+            status, data = await self._get_json(f"{self.base_url}/ticker/bookTicker", weight=4)
+            if status == 200:
+                # Convert to dict for easy lookup
+                price_dict = {item['symbol']: float(item['bidPrice']) for item in data}
+                self.record_listings(price_dict)
+                if self.keep_book_tickers:
+                    self.record_book_tickers((item['symbol'], item['bidPrice'], item['askPrice']) for item in data)
                     
-                    for pair in pairs:
-                        normalized = self.normalize_pair(pair)
-                        if normalized in price_dict:
-                            prices[pair] = price_dict[normalized]
-                else:
-                    print(f"Binance API error: {response.status}")
+                for pair in pairs:
+                    normalized = self.normalize_pair(pair)
+                    if normalized in price_dict:
+                        prices[pair] = price_dict[normalized]
+            else:
+                print(f"Binance API error: {status}")
+        except Exception as e:
+            print(f"Binance error: {e}")
+        
+        return prices
+    
+    async def get_filtered_prices(self, pairs: List[str]) -> Dict[str, float]:
+        prices = {}
+        self.last_fetch_mode = "filtered"
+        if not pairs:
+            return prices
+        
+        try:
+            symbols = json.dumps([self.normalize_pair(pair) for pair in pairs], separators=(",", ":"))
+            status, data = await self._get_json(f"{self.base_url}/ticker/bookTicker", params={"symbols": symbols}, weight=4)
+            if status == 200:
+                price_dict = {item['symbol']: float(item['bidPrice']) for item in data}
+                for pair in pairs:
+                    normalized = self.normalize_pair(pair)
+                    if normalized in price_dict:
+                        prices[pair] = price_dict[normalized]
+            else:
+                print(f"Binance API error: {status}")
+                # One delisted symbol fails the whole batch: re-read listings next cycle
+                self.listings_time = 0.0
         except Exception as e:
             print(f"Binance error: {e}")
         
-        return prices
\ No newline at end of file
+        return prices
+    
+    async def get_order_book(self, pair: str, depth: int = 20) -> Optional[OrderBook]:
+        try:
+            params = {"symbol": self.normalize_pair(pair), "limit": depth}
+            status, data = await self._get_json(f"{self.base_url}/depth", params=params)
+            if status == 200:
+                return OrderBook.from_levels(self.name, pair, data["bids"], data["asks"])
+            else:
+                print(f"Binance depth error for {pair}: {status}")
+        except Exception as e:
+            print(f"Binance depth error for {pair}: {e}")
+        
+        return None
\ No newline at end of file
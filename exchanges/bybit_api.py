@@ -1,61 +1,100 @@
 import aiohttp
-from typing import Dict, List
+from typing import Dict, List, Optional
+from models.order_book import OrderBook
 from .base_exchange import BaseExchangeAPI
 
 class BybitAPI(BaseExchangeAPI):
+    # Per-symbol tickers beat the full spot dump for small subscriptions
+    FILTER_THRESHOLD = 10
+    
     def __init__(self, config: Dict):
         super().__init__(config)
         self.name = "bybit"
         self.base_url = "https://api.bybit.com"
+        self.server_time_url = f"{self.base_url}/v5/market/time"
     
     def normalize_pair(self, pair: str) -> str:
         # Convert BTC-USDT to BTCUSDT
         return pair.replace("-", "")
     
     async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
-        prices = {}
-        session = await self.get_session()
+        if self.use_filtered_request(len(pairs)):
+            return await self.get_filtered_prices(self.listed(pairs))
         
+        prices = {}
+        self.last_fetch_mode = "full"
         try:
             # Get all spot tickers
             url = f"{self.base_url}/v5/market/tickers?category=spot"
             
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data['retCode'] == 0:
-                        # Build ticker dictionary with EXACT matching
-                        all_tickers = {}
-                        for item in data['result']['list']:
-                            symbol = item['symbol']
-                            bid_price = item.get('bid1Price')
-                            if bid_price and bid_price.strip():
-                                try:
-                                    all_tickers[symbol] = float(bid_price)
-                                except (ValueError, TypeError):
-                                    continue
+            status, data = await self._get_json(url)
+            if status == 200:
+                if data['retCode'] == 0:
+                    # Build ticker dictionary with EXACT matching
+                    all_tickers = {}
+                    for item in data['result']['list']:
+                        symbol = item['symbol']
+                        bid_price = item.get('bid1Price')
+                        if bid_price and bid_price.strip():
+                            try:
+                                all_tickers[symbol] = float(bid_price)
+                            except (ValueError, TypeError):
+                                continue
+                    self.record_listings(all_tickers)
+                    if self.keep_book_tickers:
+                        self.record_book_tickers(
+                            (item['symbol'], item.get('bid1Price'), item.get('ask1Price'))
+                            for item in data['result']['list']
+                        )
                         
-                        # Debug: Show exact matches for our pairs
-                       # print(f"🔍 Bybit exact pair matching:")
+                    # Debug: Show exact matches for our pairs
+                   # print(f"🔍 Bybit exact pair matching:")
                         
-                        for pair in pairs:
-                            exact_symbol = self.normalize_pair(pair)  # BTC-USDT → BTCUSDT
+                    for pair in pairs:
+                        exact_symbol = self.normalize_pair(pair)  # BTC-USDT → BTCUSDT
                             
-                            if exact_symbol in all_tickers:
-                                prices[pair] = all_tickers[exact_symbol]
-                                #print(f"✅ Bybit {pair} → {exact_symbol}: ${prices[pair]:.4f}")
-                            else:
-                                # If exact match not found, skip this pair
-                                #print(f"❌ Bybit {pair}: {exact_symbol} not found in available pairs")
-                                continue
-                                # DO NOT try to match with similar symbols - this causes wrong matches!
+                        if exact_symbol in all_tickers:
+                            prices[pair] = all_tickers[exact_symbol]
+                            #print(f"✅ Bybit {pair} → {exact_symbol}: ${prices[pair]:.4f}")
+                        else:
+                            # If exact match not found, skip this pair
+                            #print(f"❌ Bybit {pair}: {exact_symbol} not found in available pairs")
+                            continue
+                            # DO NOT try to match with similar symbols - this causes wrong matches!
                     
-                    else:
-                        print(f"❌ Bybit API error: {data['retMsg']}")
                 else:
-                    print(f"❌ Bybit HTTP error {response.status}")
+                    print(f"❌ Bybit API error: {data['retMsg']}")
+            else:
+                print(f"❌ Bybit HTTP error {status}")
                     
         except Exception as e:
             print(f"❌ Bybit exception: {e}")
         
-        return prices
\ No newline at end of file
+        return prices
+    
+    async def get_symbol_price(self, pair: str) -> Optional[float]:
+        params = {"category": "spot", "symbol": self.normalize_pair(pair)}
+        status, data = await self._get_json(f"{self.base_url}/v5/market/tickers", params=params)
+        if status == 200 and data['retCode'] == 0 and data['result']['list']:
+            bid_price = data['result']['list'][0].get('bid1Price')
+            if bid_price and bid_price.strip():
+                return float(bid_price)
+        return None
+    
+    async def get_order_book(self, pair: str, depth: int = 20) -> Optional[OrderBook]:
+        try:
+            url = f"{self.base_url}/v5/market/orderbook"
+            params = {"category": "spot", "symbol": self.normalize_pair(pair), "limit": depth}
+            status, data = await self._get_json(url, params=params)
+            if status == 200:
+                if data['retCode'] == 0:
+                    result = data['result']
+                    return OrderBook.from_levels(self.name, pair, result['b'], result['a'],
+                                                 timestamp=result['ts'] / 1000)
+                print(f"❌ Bybit depth error for {pair}: {data['retMsg']}")
+            else:
+                print(f"❌ Bybit depth HTTP error {status}")
+        except Exception as e:
+            print(f"❌ Bybit depth exception: {e}")
+        
+        return None
\ No newline at end of file
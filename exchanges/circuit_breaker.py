@@ -0,0 +1,94 @@
+import random
+import time
+from typing import Dict, Optional
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while an exchange's circuit is open"""
+    pass
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker with exponential backoff and jitter.
+
+    Closed: requests flow; `failure_threshold` consecutive failures trip it.
+    Open: requests are refused until the backoff expires. Each consecutive
+    trip doubles the delay (capped at `max_delay`), jittered so recovering
+    exchanges are not probed in lock-step.
+    Half-open: a single trial request is let through; success closes the
+    circuit, failure re-opens it with a longer delay.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 3, base_delay: float = 1.0, max_delay: float = 120.0):
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.trial_in_flight = False
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "CircuitBreaker":
+        return cls(
+            failure_threshold=config.get("failure_threshold", 3),
+            base_delay=config.get("base_delay", 1.0),
+            max_delay=config.get("max_delay", 120.0)
+        )
+
+    def is_open(self) -> bool:
+        """True while requests would be refused (does not consume the half-open trial)"""
+        if self.state == self.OPEN:
+            return time.monotonic() < self.open_until
+        return self.state == self.HALF_OPEN and self.trial_in_flight
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() < self.open_until:
+                return False
+            self.state = self.HALF_OPEN
+        if self.trial_in_flight:
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.trial_in_flight = False
+
+    def record_failure(self, retry_after: Optional[float] = None) -> bool:
+        """Count a failure; returns True if it tripped the circuit open"""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._trip(retry_after)
+            return True
+        return False
+
+    def release(self):
+        """Give up a half-open trial that ended without an outcome (e.g. cancelled)"""
+        self.trial_in_flight = False
+
+    def _trip(self, retry_after: Optional[float]):
+        self.trips += 1
+        delay = min(self.max_delay, self.base_delay * 2 ** (self.trips - 1))
+        delay = random.uniform(delay / 2, delay)
+        if retry_after:
+            delay = max(delay, retry_after)
+        self.state = self.OPEN
+        self.open_until = time.monotonic() + delay
+        self.trial_in_flight = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.open_until - time.monotonic()) if self.state == self.OPEN else 0.0
+
+    def describe(self) -> str:
+        if self.state == self.OPEN:
+            return f"open ({self.retry_in():.1f}s)"
+        return self.state
@@ -1,12 +1,22 @@
 import aiohttp
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
+from models.order_book import OrderBook
 from .base_exchange import BaseExchangeAPI
+from .circuit_breaker import CircuitOpenError
+from .metadata_cache import load_metadata, save_metadata
 
 class CoinbaseAPI(BaseExchangeAPI):
     def __init__(self, config: Dict):
         super().__init__(config)
         self.name = "coinbase"
         self.base_url = "https://api.exchange.coinbase.com"  # correct base
+        self.server_time_url = f"{self.base_url}/time"
+        self.per_symbol_requests = True
+        # The product catalog rarely changes: keep it in memory and on disk
+        self.supported_pairs = set()
+        self.supported_pairs_time = 0.0
+        self.products_ttl = 3600
     
     def normalize_pair(self, pair: str) -> str:
         """
@@ -18,19 +28,40 @@ class CoinbaseAPI(BaseExchangeAPI):
     async def get_supported_pairs(self) -> set:
         """
         Fetch and return all supported product pairs from Coinbase Exchange.
+        Cached for `products_ttl` seconds.
         """
-        session = await self.get_session()
+        if self.supported_pairs and time.time() - self.supported_pairs_time < self.products_ttl:
+            return self.supported_pairs
+        
         try:
-            async with session.get(f"{self.base_url}/products") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {item["id"].upper() for item in data}
-                else:
-                    print(f"Error fetching supported pairs: {response.status}")
-                    return set()
+            status, data = await self._get_json(f"{self.base_url}/products")
+            if status == 200:
+                self.supported_pairs = {item["id"].upper() for item in data}
+                self.supported_pairs_time = time.time()
+                save_metadata("coinbase_products", sorted(self.supported_pairs))
+                return self.supported_pairs
+            else:
+                print(f"Error fetching supported pairs: {status}")
+                return self.supported_pairs
         except Exception as e:
             print(f"Error loading supported pairs: {e}")
-            return set()
+            return self.supported_pairs
+    
+    def load_cached_products(self, max_age: float = 86400) -> bool:
+        """Seed the product catalog from the on-disk cache"""
+        cached = load_metadata("coinbase_products", max_age)
+        if not cached:
+            return False
+        self.supported_pairs = set(cached)
+        self.supported_pairs_time = time.time()
+        return True
+    
+    async def warm_up(self) -> float:
+        """Warm the connection and make sure the product catalog is loaded"""
+        elapsed = await super().warm_up()
+        if not self.load_cached_products():
+            await self.get_supported_pairs()
+        return elapsed
 
     async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
         """
@@ -38,7 +69,6 @@ class CoinbaseAPI(BaseExchangeAPI):
         Automatically falls back from USDT -> USD if USDT pair not listed.
         """
         prices = {}
-        session = await self.get_session()
         supported = await self.get_supported_pairs()  # load all pairs once
         
         for pair in pairs:
@@ -58,14 +88,37 @@ class CoinbaseAPI(BaseExchangeAPI):
                     #print(f"{pair} not listed on Coinbase.")
                     continue
 
-                async with session.get(f"{self.base_url}/products/{target}/ticker") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        prices[pair] = float(data["price"])
-                    else:
-                        print(f"Coinbase API error for {pair}: {response.status}")
+                status, data = await self._get_json(f"{self.base_url}/products/{target}/ticker")
+                if status == 200:
+                    prices[pair] = float(data["price"])
+                    self.stamp_quote(pair)  # Sequential requests: each pair has its own age
+                else:
+                    print(f"Coinbase API error for {pair}: {status}")
 
+            except CircuitOpenError:
+                break  # Stop polling until the exchange recovers
             except Exception as e:
                 print(f"Coinbase error for {pair}: {e}")
         
         return prices
+
+    async def get_order_book(self, pair: str, depth: int = 20) -> Optional[OrderBook]:
+        """Fetch the aggregated level 2 book, with the same USDT -> USD fallback as prices"""
+        supported = await self.get_supported_pairs()
+
+        try:
+            normalized = self.normalize_pair(pair)
+            alt_pair = normalized.replace("-USDT", "-USD") if normalized.endswith("-USDT") else None
+            target = normalized if normalized in supported else alt_pair if alt_pair in supported else None
+            if not target:
+                return None
+
+            status, data = await self._get_json(f"{self.base_url}/products/{target}/book?level=2")
+            if status == 200:
+                return OrderBook.from_levels(self.name, pair, data["bids"][:depth], data["asks"][:depth])
+            else:
+                print(f"Coinbase depth error for {pair}: {status}")
+        except Exception as e:
+            print(f"Coinbase depth error for {pair}: {e}")
+
+        return None
@@ -1,42 +1,71 @@
 import aiohttp
-from typing import Dict, List
+from typing import Dict, List, Optional
+from models.order_book import OrderBook
 from .base_exchange import BaseExchangeAPI
 
 class GateIOAPI(BaseExchangeAPI):
+    # currency_pair-filtered tickers beat the full spot dump for small subscriptions
+    FILTER_THRESHOLD = 10
+    
     def __init__(self, config: Dict):
         super().__init__(config)
         self.name = "gateio"
         self.base_url = "https://api.gateio.ws/api/v4"
+        self.server_time_url = f"{self.base_url}/spot/time"
     
     def normalize_pair(self, pair: str) -> str:
         # Convert BTC-USDT to BTC_USDT (Gate.io uses underscores)
         return pair.replace("-", "_")
     
     async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
-        prices = {}
-        session = await self.get_session()
+        if self.use_filtered_request(len(pairs)):
+            return await self.get_filtered_prices(self.listed(pairs))
         
+        prices = {}
+        self.last_fetch_mode = "full"
         try:
             # Gate.io tickers endpoint
-            async with session.get(f"{self.base_url}/spot/tickers") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # Create lookup dictionary
-                    tickers = {}
-                    for item in data:
-                        if item['lowest_ask']:  # Use lowest ask as approximate bid
-                            try:
-                                tickers[item['currency_pair']] = float(item['lowest_ask'])
-                            except (ValueError, TypeError):
-                                continue
+            status, data = await self._get_json(f"{self.base_url}/spot/tickers")
+            if status == 200:
+                # Create lookup dictionary
+                tickers = {}
+                for item in data:
+                    if item['lowest_ask']:  # Use lowest ask as approximate bid
+                        try:
+                            tickers[item['currency_pair']] = float(item['lowest_ask'])
+                        except (ValueError, TypeError):
+                            continue
+                self.record_listings(tickers)
+                if self.keep_book_tickers:
+                    self.record_book_tickers((item['currency_pair'], item['highest_bid'], item['lowest_ask']) for item in data)
                     
-                    for pair in pairs:
-                        normalized = self.normalize_pair(pair)
-                        if normalized in tickers:
-                            prices[pair] = tickers[normalized]
-                else:
-                    print(f"Gate.io API error: {response.status}")
+                for pair in pairs:
+                    normalized = self.normalize_pair(pair)
+                    if normalized in tickers:
+                        prices[pair] = tickers[normalized]
+            else:
+                print(f"Gate.io API error: {status}")
         except Exception as e:
             print(f"Gate.io error: {e}")
         
-        return prices
\ No newline at end of file
+        return prices
+    
+    async def get_symbol_price(self, pair: str) -> Optional[float]:
+        status, data = await self._get_json(f"{self.base_url}/spot/tickers", params={"currency_pair": self.normalize_pair(pair)})
+        # Same field as the full dump
+        if status == 200 and data and data[0]['lowest_ask']:
+            return float(data[0]['lowest_ask'])
+        return None
+    
+    async def get_order_book(self, pair: str, depth: int = 20) -> Optional[OrderBook]:
+        try:
+            params = {"currency_pair": self.normalize_pair(pair), "limit": depth}
+            status, data = await self._get_json(f"{self.base_url}/spot/order_book", params=params)
+            if status == 200:
+                return OrderBook.from_levels(self.name, pair, data['bids'], data['asks'])
+            else:
+                print(f"Gate.io depth error for {pair}: {status}")
+        except Exception as e:
+            print(f"Gate.io depth error for {pair}: {e}")
+        
+        return None
\ No newline at end of file
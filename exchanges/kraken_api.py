@@ -1,12 +1,16 @@
 import aiohttp
-from typing import Dict, List
+from typing import Dict, List, Optional
+from models.order_book import OrderBook
 from .base_exchange import BaseExchangeAPI
+from .circuit_breaker import CircuitOpenError
 
 class KrakenAPI(BaseExchangeAPI):
     def __init__(self, config: Dict):
         super().__init__(config)
         self.name = "kraken"
         self.base_url = "https://api.kraken.com/0/public"
+        self.server_time_url = f"{self.base_url}/Time"
+        self.per_symbol_requests = True
     
     def normalize_pair(self, pair: str) -> str:
         # Kraken uses different naming, e.g. BTC/USDT → XBTUSDT
@@ -19,30 +23,46 @@ class KrakenAPI(BaseExchangeAPI):
 
     async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
         prices = {}
-        session = await self.get_session()
 
         for pair in pairs:
             try:
                 normalized = self.normalize_pair(pair)
                 url = f"{self.base_url}/Ticker?pair={normalized}"
 
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
+                status, data = await self._get_json(url)
+                if status == 200:
+                    # Kraken returns dynamic keys
+                    result = data.get("result", {})
+                    if not result:
+                        #print(f"{pair} not listed on Kraken.")
+                        continue
 
-                        # Kraken returns dynamic keys
-                        result = data.get("result", {})
-                        if not result:
-                            #print(f"{pair} not listed on Kraken.")
-                            continue
-
-                        first_key = next(iter(result))
-                        ticker_info = result[first_key]
-                        prices[pair] = float(ticker_info["b"][0])  # bid price
-                    else:
-                        print(f"Kraken API error for {pair}: {response.status}")
+                    first_key = next(iter(result))
+                    ticker_info = result[first_key]
+                    prices[pair] = float(ticker_info["b"][0])  # bid price
+                    self.stamp_quote(pair)  # Sequential requests: each pair has its own age
+                else:
+                    print(f"Kraken API error for {pair}: {status}")
 
+            except CircuitOpenError:
+                break  # Stop polling until the exchange recovers
             except Exception as e:
                 print(f"Kraken error for {pair}: {e}")
 
         return prices
+
+    async def get_order_book(self, pair: str, depth: int = 20) -> Optional[OrderBook]:
+        try:
+            url = f"{self.base_url}/Depth?pair={self.normalize_pair(pair)}&count={depth}"
+            status, data = await self._get_json(url)
+            if status == 200:
+                result = data.get("result", {})
+                if result:
+                    book = result[next(iter(result))]
+                    return OrderBook.from_levels(self.name, pair, book["bids"], book["asks"])
+            else:
+                print(f"Kraken depth error for {pair}: {status}")
+        except Exception as e:
+            print(f"Kraken depth error for {pair}: {e}")
+
+        return None
@@ -1,5 +1,6 @@
 import aiohttp
-from typing import Dict, List
+from typing import Dict, List, Optional
+from models.order_book import OrderBook
 from .base_exchange import BaseExchangeAPI
 
 class KuCoinAPI(BaseExchangeAPI):
@@ -7,6 +8,7 @@ class KuCoinAPI(BaseExchangeAPI):
         super().__init__(config)
         self.name = "kucoin"
         self.base_url = "https://api.kucoin.com/api/v1"
+        self.server_time_url = f"{self.base_url}/timestamp"
     
     def normalize_pair(self, pair: str) -> str:
         # Convert BTC-USDT to BTC-USDT (KuCoin uses dashes)
@@ -14,31 +16,52 @@ class KuCoinAPI(BaseExchangeAPI):
     
     async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
         prices = {}
-        session = await self.get_session()
         
         try:
             # KuCoin all tickers endpoint
-            async with session.get(f"{self.base_url}/market/allTickers") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data['code'] == '200000':  # KuCoin success code
-                        # FIXED: Filter out items with None prices
-                        tickers = {}
-                        for item in data['data']['ticker']:
-                            if item['last'] is not None:  # 👈 KEY FIX
-                                try:
-                                    tickers[item['symbol']] = float(item['last'])
-                                except (ValueError, TypeError):
-                                    # Skip if price can't be converted to float
-                                    continue
+            status, data = await self._get_json(f"{self.base_url}/market/allTickers")
+            if status == 200:
+                if data['code'] == '200000':  # KuCoin success code
+                    # FIXED: Filter out items with None prices
+                    tickers = {}
+                    for item in data['data']['ticker']:
+                        if item['last'] is not None:  # 👈 KEY FIX
+                            try:
+                                tickers[item['symbol']] = float(item['last'])
+                            except (ValueError, TypeError):
+                                # Skip if price can't be converted to float
+                                continue
+                    self.record_listings(tickers)
+                    if self.keep_book_tickers:
+                        self.record_book_tickers((item['symbol'], item['buy'], item['sell']) for item in data['data']['ticker'])
                         
-                        for pair in pairs:
-                            normalized = self.normalize_pair(pair)
-                            if normalized in tickers:
-                                prices[pair] = tickers[normalized]
-                else:
-                    print(f"KuCoin API error: {response.status}")
+                    snapshot_time = data['data'].get('time', 0) / 1000
+                    for pair in pairs:
+                        normalized = self.normalize_pair(pair)
+                        if normalized in tickers:
+                            prices[pair] = tickers[normalized]
+                            self.stamp_quote(pair, snapshot_time)
+            else:
+                print(f"KuCoin API error: {status}")
         except Exception as e:
             print(f"KuCoin error: {e}")
         
-        return prices
\ No newline at end of file
+        return prices
+    
+    async def get_order_book(self, pair: str, depth: int = 20) -> Optional[OrderBook]:
+        try:
+            # KuCoin only serves fixed 20 or 100 level snapshots publicly
+            levels = 20 if depth <= 20 else 100
+            params = {"symbol": self.normalize_pair(pair)}
+            status, data = await self._get_json(f"{self.base_url}/market/orderbook/level2_{levels}", params=params)
+            if status == 200:
+                if data['code'] == '200000':
+                    book = data['data']
+                    return OrderBook.from_levels(self.name, pair, book['bids'][:depth], book['asks'][:depth],
+                                                 timestamp=book['time'] / 1000)
+            else:
+                print(f"KuCoin depth error for {pair}: {status}")
+        except Exception as e:
+            print(f"KuCoin depth error for {pair}: {e}")
+        
+        return None
\ No newline at end of file
@@ -0,0 +1,29 @@
+import json
+import os
+import time
+from typing import Any, Optional
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+
+def load_metadata(name: str, max_age: float) -> Optional[Any]:
+    """Load cached instrument metadata if it exists and is younger than max_age seconds"""
+    path = os.path.join(CACHE_DIR, f"{name}.json")
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_metadata(name: str, data: Any):
+    """Atomically write instrument metadata to the on-disk cache"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = os.path.join(CACHE_DIR, f"{name}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Could not cache {name}: {e}")
@@ -1,43 +1,77 @@
 import aiohttp
-from typing import Dict, List
+from typing import Dict, List, Optional
+from models.order_book import OrderBook
 from .base_exchange import BaseExchangeAPI
 
 class OKXAPI(BaseExchangeAPI):
+    # Per-instrument tickers beat the ~700-row SPOT dump for small subscriptions
+    FILTER_THRESHOLD = 10
+    
     def __init__(self, config: Dict):
         super().__init__(config)
         self.name = "okx"
         self.base_url = "https://www.okx.com/api/v5"
+        self.server_time_url = f"{self.base_url}/public/time"
     
     def normalize_pair(self, pair: str) -> str:
         # Convert BTC-USDT to BTC-USDT (OKX uses dashes)
         return pair.replace("-", "-")
     
     async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
-        prices = {}
-        session = await self.get_session()
+        if self.use_filtered_request(len(pairs)):
+            return await self.get_filtered_prices(self.listed(pairs))
         
+        prices = {}
+        self.last_fetch_mode = "full"
         try:
             # OKX tickers endpoint
-            async with session.get(f"{self.base_url}/market/tickers?instType=SPOT") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data['code'] == '0':  # OKX success code
-                        # Create lookup dictionary
-                        tickers = {}
-                        for item in data['data']:
-                            if item['bidPx']:  # Use bid price
-                                try:
-                                    tickers[item['instId']] = float(item['bidPx'])
-                                except (ValueError, TypeError):
-                                    continue
+            status, data = await self._get_json(f"{self.base_url}/market/tickers?instType=SPOT")
+            if status == 200:
+                if data['code'] == '0':  # OKX success code
+                    # Create lookup dictionary
+                    tickers = {}
+                    for item in data['data']:
+                        if item['bidPx']:  # Use bid price
+                            try:
+                                tickers[item['instId']] = float(item['bidPx'])
+                            except (ValueError, TypeError):
+                                continue
+                    self.record_listings(tickers)
+                    if self.keep_book_tickers:
+                        self.record_book_tickers((item['instId'], item['bidPx'], item['askPx']) for item in data['data'])
                         
-                        for pair in pairs:
-                            normalized = self.normalize_pair(pair)
-                            if normalized in tickers:
-                                prices[pair] = tickers[normalized]
-                else:
-                    print(f"OKX API error: {response.status}")
+                    ticker_times = {item['instId']: item.get('ts') for item in data['data']}
+                    for pair in pairs:
+                        normalized = self.normalize_pair(pair)
+                        if normalized in tickers:
+                            prices[pair] = tickers[normalized]
+                            if ticker_times.get(normalized):
+                                self.stamp_quote(pair, int(ticker_times[normalized]) / 1000)
+            else:
+                print(f"OKX API error: {status}")
         except Exception as e:
             print(f"OKX error: {e}")
         
-        return prices
\ No newline at end of file
+        return prices
+    
+    async def get_symbol_price(self, pair: str) -> Optional[float]:
+        status, data = await self._get_json(f"{self.base_url}/market/ticker", params={"instId": self.normalize_pair(pair)})
+        if status == 200 and data['code'] == '0' and data['data'] and data['data'][0]['bidPx']:
+            return float(data['data'][0]['bidPx'])
+        return None
+    
+    async def get_order_book(self, pair: str, depth: int = 20) -> Optional[OrderBook]:
+        try:
+            params = {"instId": self.normalize_pair(pair), "sz": depth}
+            status, data = await self._get_json(f"{self.base_url}/market/books", params=params)
+            if status == 200:
+                if data['code'] == '0' and data['data']:
+                    book = data['data'][0]
+                    return OrderBook.from_levels(self.name, pair, book['bids'], book['asks'],
+                                                 timestamp=int(book['ts']) / 1000)
+            else:
+                print(f"OKX depth error for {pair}: {status}")
+        except Exception as e:
+            print(f"OKX depth error for {pair}: {e}")
+        
+        return None
\ No newline at end of file
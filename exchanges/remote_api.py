@@ -0,0 +1,26 @@
+from typing import Dict, List, Tuple
+from .base_exchange import BaseExchangeAPI
+
+class RemoteExchangeAPI(BaseExchangeAPI):
+    """Stands in for an exchange connector on an engine node: prices come from a QuoteSubscriber.
+
+    The collector that fetched the quotes applied its own circuit breaker,
+    caching and listings; here get_prices only reads the latest quotes
+    received, so a cycle never touches the network for market data.
+    """
+
+    def __init__(self, name: str, subscriber, config: Dict = None):
+        super().__init__(config or {})
+        self.name = name
+        self.subscriber = subscriber
+        self.last_fetch_mode = "remote"
+
+    async def get_prices(self, pairs: List[str]) -> Dict[str, float]:
+        prices, _ = self.subscriber.prices_with_meta(self.name, pairs)
+        return prices
+
+    async def get_prices_with_meta(self, pairs: List[str]) -> Tuple[Dict[str, float], Dict]:
+        return self.subscriber.prices_with_meta(self.name, pairs)
+
+    async def warm_up(self) -> float:
+        return 0.0
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+class CachedResponse(NamedTuple):
+    status: int
+    data: Any
+    fetched_at: float  # wall-clock time the exchange answered
+    from_cache: bool
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+class ResponseCache:
+    """Single-flight request coalescing plus a short-TTL cache for public GETs.
+
+    Concurrent callers asking for the same key share one in-flight fetch, and
+    successful responses are reused for `ttl` seconds, so a burst of callers
+    (engine, health checks, debug tools) costs one request.
+    """
+
+    def __init__(self, ttl: float = 1.0, max_entries: int = 512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: Dict[Hashable, CachedResponse] = {}
+        self.in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {"hits": 0, "coalesced": 0, "fetches": 0}
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Tuple[int, Any]]],
+                  ttl: Optional[float] = None) -> CachedResponse:
+        ttl = self.ttl if ttl is None else ttl
+        entry = self.entries.get(key)
+        if entry is not None and time.time() - entry.fetched_at < ttl:
+            self.stats["hits"] += 1
+            return entry._replace(from_cache=True)
+
+        task = self.in_flight.get(key)
+        if task is None:
+            self.stats["fetches"] += 1
+            task = asyncio.ensure_future(self._fetch(key, fetch, ttl))
+            # Consume the exception if every waiter has gone away
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self.in_flight[key] = task
+        else:
+            self.stats["coalesced"] += 1
+        # One caller timing out must not cancel the fetch the others are waiting on
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Tuple[int, Any]]], ttl: float) -> CachedResponse:
+        try:
+            status, data = await fetch()
+            response = CachedResponse(status, data, time.time(), False)
+            if status == 200 and ttl > 0:
+                self.entries.pop(key, None)
+                self.entries[key] = response
+                if len(self.entries) > self.max_entries:
+                    del self.entries[next(iter(self.entries))]
+            return response
+        finally:
+            self.in_flight.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
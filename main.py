@@ -1,8 +1,10 @@
 import asyncio
 import json
 import os
+import sys
 from dotenv import load_dotenv
 from core.arbitrage_bot import ArbitrageBot
+from core import runtime
 
 # Load environment variables
 load_dotenv()
@@ -19,7 +21,8 @@ def create_config_template():
             "coinbase": {
                 "enabled": True,
                 "api_key": os.getenv('COINBASE_API_KEY', ''),
-                "api_secret": os.getenv('COINBASE_API_SECRET', '')
+                "api_secret": os.getenv('COINBASE_API_SECRET', ''),
+                "api_passphrase": os.getenv('COINBASE_API_PASSPHRASE', '')
             },
             "kraken": {
                 "enabled": True,
@@ -91,7 +94,114 @@ def create_config_template():
         ],
         "min_spread_percentage": 0.3,
         "update_interval": 3,
-        "max_opportunities": 20
+        "max_opportunities": 20,
+        "sharding": {
+            "enabled": False,
+            "workers": 0
+        },
+        "universe": {
+            "enabled": False,
+            "min_exchanges": 2,
+            "refresh_interval": 300,
+            "max_pairs": 200,
+            "quote_assets": ["USDT"]
+        },
+        "scheduler": {
+            "enabled": False,
+            "request_budget": 10,
+            "max_skip_cycles": 10,
+            "decay": 0.2
+        },
+        "fees": {
+            "binance": {
+                "volume_30d": 0,
+                "tiers": [[0, 0.0010, 0.0010], [1000000, 0.0009, 0.0010], [5000000, 0.0008, 0.0010]],
+                "use_discount_token": False,
+                "pair_overrides": {}
+            }
+        },
+        "depth": {
+            "enabled": False,
+            "levels": 20,
+            "min_net_profit_percentage": 0.1
+        },
+        "triangular": {
+            "enabled": False,
+            "cross_exchange": False,
+            "transfer_cost_percentage": 0.1,
+            "min_profit_percentage": 0.1,
+            "start_assets": ["USDT"],
+            "max_cycles": 10,
+            "max_ticker_age": 15
+        },
+        "runtime": {
+            "event_loop": "asyncio",
+            "warm_start": True,
+            "loop_lag_monitor": True,
+            "lag_threshold_ms": 100,
+            "lag_sample_interval_ms": 50
+        },
+        "circuit_breaker": {
+            "failure_threshold": 3,
+            "base_delay": 1.0,
+            "max_delay": 120.0,
+            "request_timeout": 10.0,
+            "exchange_timeout": 10.0
+        },
+        "profiling": {
+            "enabled": False,
+            "cycles": 20,
+            "interval_ms": 5,
+            "output_dir": "profiles"
+        },
+        "market_data": {
+            "filtered_requests": True,
+            "listing_refresh_interval": 300,
+            "filter_thresholds": {}
+        },
+        "response_cache": {
+            "ttl": 1.0
+        },
+        "quotes": {
+            "max_skew_ms": 2000,
+            "max_age_ms": 5000
+        },
+        "lifetimes": {
+            "history": 1024
+        },
+        "state": {
+            "enabled": True,
+            "path": ".cache/state.bin",
+            "interval": 10,
+            "max_trades": 1000,
+            "resume_window": 60
+        },
+        "quote_bus": {
+            "role": "standalone",
+            "node": "",
+            "listen": "tcp://127.0.0.1:7700",
+            "subscribe": ["tcp://127.0.0.1:7700"],
+            "ping_interval": 5,
+            "max_buffer_bytes": 1048576
+        },
+        "config_reload": {
+            "enabled": True,
+            "interval": 2.0
+        },
+        "journal": {
+            "enabled": False,
+            "output_dir": "journal",
+            "flush_interval": 30,
+            "roll_interval": 3600,
+            "record_quotes": True
+        },
+        "spread_stats": {
+            "enabled": True,
+            "window": 120,
+            "ewma_alpha": 0.1,
+            "min_zscore": 0.0,
+            "min_samples": 30
+        }
     }
     
     with open('config.json', 'w') as f:
@@ -136,9 +246,11 @@ async def debug_arbitrage_engine():
         # Get all prices
         exchange_prices = {}
         for exchange_name, exchange in bot.exchanges.items():
-            prices = await exchange.get_prices(bot.config["trading_pairs"])
+            # Usually served from the cache filled by find_opportunities above
+            prices, meta = await exchange.get_prices_with_meta(bot.config["trading_pairs"])
             exchange_prices[exchange_name] = prices
-            print(f"\n{exchange_name}: {len(prices)} pairs found")
+            source = "cached" if meta["from_cache"] else "fresh"
+            print(f"\n{exchange_name}: {len(prices)} pairs found ({source}, {meta['age']:.1f}s old)")
         
         # Check each pair
         for pair in bot.config["trading_pairs"]:
@@ -174,6 +286,13 @@ async def main():
         print("Please edit .env file with your API keys before running the bot.")
         return
     
+    role = role_from_argv()
+    if role:
+        # Distributed nodes run unattended
+        bot = ArbitrageBot(role=role)
+        await bot.run()
+        return
+    
     print("🤖 ARBITRAGE BOT - Choose Mode:")
     print("1. 🔍 Debug - Show all exchange prices")
     print("2. 🎯 Debug - Test arbitrage engine") 
@@ -188,6 +307,9 @@ async def main():
         await debug_arbitrage_engine()
     elif choice == "3":
         bot = ArbitrageBot()
+        profile_cycles = profile_cycles_from_argv()
+        if profile_cycles is not None:
+            bot.request_profile(profile_cycles)
         await bot.run()
     elif choice == "4":
         bot = ArbitrageBot()
@@ -195,5 +317,29 @@ async def main():
     else:
         print("Invalid choice")
 
+def profile_cycles_from_argv():
+    """`python main.py --profile [N]` profiles the first N cycles (config default when N is omitted)"""
+    if "--profile" not in sys.argv:
+        return None
+    index = sys.argv.index("--profile")
+    if index + 1 < len(sys.argv) and sys.argv[index + 1].isdigit():
+        return int(sys.argv[index + 1])
+    return 0
+
+def role_from_argv() -> str:
+    """`python main.py --role collector|engine` overrides quote_bus.role in config.json"""
+    if "--role" not in sys.argv:
+        return ""
+    index = sys.argv.index("--role")
+    return sys.argv[index + 1] if index + 1 < len(sys.argv) else ""
+
+def configured_event_loop() -> str:
+    """Event loop implementation selected in config.json (asyncio or uvloop)"""
+    try:
+        with open('config.json', 'r') as f:
+            return json.load(f).get("runtime", {}).get("event_loop", "asyncio")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return "asyncio"
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    runtime.run(main(), configured_event_loop())
\ No newline at end of file
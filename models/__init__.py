@@ -1,3 +1,4 @@
 from .data_models import ArbitrageOpportunity
+from .order_book import OrderBook
 
-__all__ = ['ArbitrageOpportunity']
\ No newline at end of file
+__all__ = ['ArbitrageOpportunity', 'OrderBook']
\ No newline at end of file
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 @dataclass
 class ArbitrageOpportunity:
@@ -16,4 +16,23 @@ class ArbitrageOpportunity:
     sell_fee: float = 0.0
     net_spread_percentage: float = 0.0
     actual_profit_percentage: float = 0.0
+    # Net profit percentage x executable size, used for ranking
+    expected_profit: float = 0.0
+    # Depth-checked size: base quantity and quote cost of the buy leg (0 = not sized)
+    executable_size: float = 0.0
+    executable_notional: float = 0.0
+    # Legs of a multi-hop (triangular) opportunity, None for plain cross-exchange ones
+    route: Optional[List[str]] = None
+    # Quote ages at detection and the gap between the legs' quotes (seconds);
+    # quote_time is when the older leg's quote was observed (0 = unknown)
+    buy_quote_age: float = 0.0
+    sell_quote_age: float = 0.0
+    quote_skew: float = 0.0
+    quote_time: float = 0.0
+    # Standard deviations above this spread's rolling mean (None = not enough history)
+    spread_zscore: Optional[float] = None
+
+    def quote_age(self, now: float) -> float:
+        """Age of the older leg's quote at `now` (0 when not tracked)"""
+        return now - self.quote_time if self.quote_time else 0.0
     
\ No newline at end of file
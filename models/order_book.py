@@ -0,0 +1,45 @@
+import time
+from array import array
+from typing import Iterable, Optional, Sequence
+
+class OrderBook:
+    """L2 order book stored as flat sorted arrays (bids descending, asks ascending)"""
+
+    __slots__ = ("exchange", "pair", "bid_prices", "bid_sizes", "ask_prices", "ask_sizes", "timestamp")
+
+    def __init__(self, exchange: str, pair: str, timestamp: Optional[float] = None):
+        self.exchange = exchange
+        self.pair = pair
+        self.bid_prices = array('d')
+        self.bid_sizes = array('d')
+        self.ask_prices = array('d')
+        self.ask_sizes = array('d')
+        self.timestamp = timestamp or time.time()
+
+    @classmethod
+    def from_levels(cls, exchange: str, pair: str, bids: Iterable[Sequence], asks: Iterable[Sequence],
+                    timestamp: Optional[float] = None) -> "OrderBook":
+        """Build a book from raw [price, size, ...] levels as returned by REST APIs"""
+        book = cls(exchange, pair, timestamp)
+        bid_levels = sorted(((float(level[0]), float(level[1])) for level in bids), reverse=True)
+        ask_levels = sorted((float(level[0]), float(level[1])) for level in asks)
+        for price, size in bid_levels:
+            if size > 0:
+                book.bid_prices.append(price)
+                book.bid_sizes.append(size)
+        for price, size in ask_levels:
+            if size > 0:
+                book.ask_prices.append(price)
+                book.ask_sizes.append(size)
+        return book
+
+    @property
+    def best_bid(self) -> float:
+        return self.bid_prices[0] if self.bid_prices else 0.0
+
+    @property
+    def best_ask(self) -> float:
+        return self.ask_prices[0] if self.ask_prices else 0.0
+
+    def __len__(self) -> int:
+        return max(len(self.bid_prices), len(self.ask_prices))
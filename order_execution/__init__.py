@@ -1,15 +1,17 @@
 from .binance_order import BinanceOrderExecutor
 from .kucoin_order import KuCoinOrderExecutor
-
-# Add other executors as you implement them
-# from .bybit_order import BybitOrderExecutor
-# from .okx_order import OKXOrderExecutor  
-# from .gateio_order import GateIOOrderExecutor
+from .bybit_order import BybitOrderExecutor
+from .okx_order import OKXOrderExecutor
+from .gateio_order import GateIOOrderExecutor
+from .kraken_order import KrakenOrderExecutor
+from .coinbase_order import CoinbaseOrderExecutor
 
 __all__ = [
     'BinanceOrderExecutor',
     'KuCoinOrderExecutor',
-    # 'BybitOrderExecutor',
-    # 'OKXOrderExecutor', 
-    # 'GateIOOrderExecutor'
-]
\ No newline at end of file
+    'BybitOrderExecutor',
+    'OKXOrderExecutor',
+    'GateIOOrderExecutor',
+    'KrakenOrderExecutor',
+    'CoinbaseOrderExecutor'
+]
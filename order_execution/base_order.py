@@ -1,31 +1,306 @@
 import abc
 import aiohttp
+import asyncio
 import time
 import hmac
 import hashlib
-from typing import Dict, Optional
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from exchanges.circuit_breaker import CircuitBreaker, CircuitOpenError
+from .clock_sync import ClockSync
 
 class BaseOrderExecutor(abc.ABC):
     """Abstract base class for all exchange order execution"""
     
+    # Client order id constraints (length and allowed characters differ per exchange)
+    CLIENT_ID_MAX_LENGTH = 32
+    CLIENT_ID_PREFIX = "arb"
+    # Orders per native batch request; 0 = no batch endpoint, batches fan out concurrently
+    BATCH_LIMIT = 0
+    CANCEL_BATCH_LIMIT = 0
+    
     def __init__(self, api_key: str, api_secret: str, passphrase: str = ""):
         self.api_key = api_key
         self.api_secret = api_secret
         self.passphrase = passphrase
         self.session = None
+        # Public endpoint on the order host used to pre-warm connections
+        self.server_time_url = ""
+        self.breaker = CircuitBreaker()
+        self.request_timeout = 10.0
+        # Signed requests are timestamped with the exchange's clock, not ours
+        self.clock = ClockSync()
+    
+    def timestamp_ms(self) -> int:
+        """Server-corrected millisecond timestamp for signing (no I/O)"""
+        return self.clock.now_ms()
+    
+    def parse_server_time(self, data: Any) -> Optional[float]:
+        """Server time in seconds from the server_time_url payload, None if unsupported"""
+        return None
+    
+    async def fetch_server_time(self) -> Optional[float]:
+        """Query server_time_url outside the circuit breaker (clock sync must not trip it)"""
+        if not self.server_time_url:
+            return None
+        session = await self.get_session()
+        async with session.get(self.server_time_url) as response:
+            if response.status != 200:
+                return None
+            return self.parse_server_time(await response.json(content_type=None))
+    
+    def start_clock_sync(self, interval: float = 60.0) -> bool:
+        """Keep the clock offset fresh in the background; False if there is no time endpoint"""
+        if not self.server_time_url:
+            return False
+        self.clock.interval = interval
+        self.clock.start(self.fetch_server_time)
+        return True
     
     async def get_session(self) -> aiohttp.ClientSession:
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(ttl_dns_cache=300, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
         return self.session
     
+    async def _request_json(self, method: str, url: str, **kwargs) -> Tuple[int, Any]:
+        """Send a request through the circuit breaker and return (status, json body).
+
+        429/5xx responses, timeouts and transport errors count as failures.
+        Raises CircuitOpenError while the circuit is open.
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"order API circuit {self.breaker.describe()}")
+        
+        session = await self.get_session()
+        try:
+            sent = time.time()
+            async with session.request(method, url, **kwargs) as response:
+                # Coarse clock samples for free until the time endpoint has answered
+                self.clock.observe_date_header(sent, time.time(), response.headers.get("Date"))
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = {}
+                if response.status == 429 or response.status >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                return response.status, data
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+    
+    async def warm_up(self) -> float:
+        """Open and TLS-handshake a pooled connection to the order host.
+
+        The warm-up request hits the server-time endpoint, so it also seeds
+        the clock offset (with a pessimistic round trip that includes the
+        handshake).
+        """
+        session = await self.get_session()
+        start = time.perf_counter()
+        sent = time.time()
+        async with session.get(self.server_time_url or self.base_url) as response:
+            body = await response.read()
+            received = time.time()
+            server_time = None
+            if self.server_time_url and response.status == 200:
+                try:
+                    server_time = self.parse_server_time(json.loads(body))
+                except ValueError:
+                    pass
+            if server_time is not None:
+                self.clock.observe(sent, received, server_time)
+            else:
+                self.clock.observe_date_header(sent, received, response.headers.get("Date"))
+        return time.perf_counter() - start
+    
     async def close_session(self):
+        await self.clock.stop()
         if self.session:
             await self.session.close()
     
+    def generate_client_order_id(self) -> str:
+        """Unique alphanumeric id: prefix + millisecond time (base 36) + 64 random bits"""
+        millis = int(time.time() * 1000)
+        stamp = ""
+        while millis:
+            millis, digit = divmod(millis, 36)
+            stamp = "0123456789abcdefghijklmnopqrstuvwxyz"[digit] + stamp
+        return f"{self.CLIENT_ID_PREFIX}{stamp}{os.urandom(8).hex()}"[:self.CLIENT_ID_MAX_LENGTH]
+    
+    async def place_order_idempotent(self, symbol: str, side: str, quantity: float,
+                                     latency_budget: float = 2.0, retry_delay: float = 0.1,
+                                     client_order_id: str = "", lookup_grace: float = 1.0) -> Dict:
+        """Place a market order under one client order id, retrying within latency_budget.
+
+        A result marked 'ambiguous' (timeout, transport error, 5xx) means the
+        order may or may not exist, so before every resubmission the order is
+        looked up by its client id for up to lookup_grace seconds (a request
+        cut off by a timeout can still land after the first lookup); if it
+        landed, that order is returned instead of placing a second one. If the
+        lookup itself cannot answer, the order is reported as ambiguous rather
+        than risking a double fill. No attempt runs past the budget.
+        """
+        client_order_id = client_order_id or self.generate_client_order_id()
+        deadline = time.monotonic() + latency_budget
+        result = await self._place_with_deadline(symbol, side, quantity, client_order_id, deadline)
+        return await self._settle(symbol, side, quantity, client_order_id, result, deadline, retry_delay, lookup_grace)
+    
+    async def _place_with_deadline(self, symbol: str, side: str, quantity: float, client_order_id: str,
+                                   deadline: float) -> Dict:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return {'success': False, 'error': 'Latency budget spent before the order was sent', 'ambiguous': False}
+        try:
+            return await asyncio.wait_for(
+                self.place_market_order(symbol, side, quantity, client_order_id=client_order_id),
+                remaining
+            )
+        except asyncio.TimeoutError:
+            return {'success': False, 'error': 'Order request timed out', 'ambiguous': True}
+    
+    async def _find_landed(self, client_order_id: str, symbol: str, grace: float) -> Optional[Dict]:
+        """Look an order up by client id until it shows up or `grace` seconds pass (raises if unanswerable)"""
+        give_up = time.monotonic() + grace
+        delay = 0.05
+        while True:
+            existing = await self.get_order_by_client_id(client_order_id, symbol)
+            remaining = give_up - time.monotonic()
+            if existing is not None or remaining <= 0:
+                return existing
+            await asyncio.sleep(min(delay, remaining))
+            delay *= 2
+    
+    async def _settle(self, symbol: str, side: str, quantity: float, client_order_id: str, result: Dict,
+                      deadline: float, retry_delay: float, lookup_grace: float) -> Dict:
+        """Resolve an ambiguous placement: look the order up, resubmit under the same id until the deadline"""
+        attempt = 1
+        while True:
+            result['client_order_id'] = client_order_id
+            result['attempts'] = attempt
+            if result.get('success') or not result.get('ambiguous'):
+                return result
+            
+            try:
+                existing = await self._find_landed(client_order_id, symbol, lookup_grace)
+            except Exception as e:
+                print(f"⚠️  Could not verify order {client_order_id}: {e}")
+                return result
+            if existing is not None:
+                print(f"   ♻️  Order {client_order_id} already landed, not resubmitting")
+                return {
+                    'success': True,
+                    'order_id': existing['order_id'],
+                    'status': existing['status'],
+                    'executed_quantity': existing['filled_quantity'],
+                    'client_order_id': client_order_id,
+                    'attempts': attempt
+                }
+            
+            if time.monotonic() + retry_delay >= deadline:
+                result['ambiguous'] = False
+                result['error'] = f"Order not placed within the latency budget ({attempt} attempts): {result.get('error')}"
+                return result
+            await asyncio.sleep(retry_delay)
+            retry_delay *= 2
+            attempt += 1
+            result = await self._place_with_deadline(symbol, side, quantity, client_order_id, deadline)
+    
+    async def place_market_orders(self, orders: List[Dict]) -> List[Dict]:
+        """Place several market orders ({'symbol', 'side', 'quantity'[, 'client_order_id']}) at once.
+
+        Uses the exchange's batch endpoint in chunks of BATCH_LIMIT where
+        there is one, otherwise sends the orders concurrently. Results come
+        back in input order, shaped like place_market_order's, each with its
+        'client_order_id'.
+        """
+        for order in orders:
+            order.setdefault('client_order_id', self.generate_client_order_id())
+        if self.BATCH_LIMIT > 1 and len(orders) > 1:
+            chunks = [orders[i:i + self.BATCH_LIMIT] for i in range(0, len(orders), self.BATCH_LIMIT)]
+            batches = await asyncio.gather(*(self._place_batch_safely(chunk) for chunk in chunks))
+            results = [result for batch in batches for result in batch]
+        else:
+            results = await asyncio.gather(*(
+                self.place_market_order(order['symbol'], order['side'], order['quantity'],
+                                        client_order_id=order['client_order_id'])
+                for order in orders
+            ))
+        for order, result in zip(orders, results):
+            result['client_order_id'] = order['client_order_id']
+        return list(results)
+    
+    async def _place_batch_safely(self, orders: List[Dict]) -> List[Dict]:
+        try:
+            return await self._place_batch(orders)
+        except CircuitOpenError as e:
+            return [{'success': False, 'error': str(e)} for _ in orders]
+        except Exception as e:
+            print(f"❌ Batch order error: {e}")
+            # The request may have reached the exchange: every order in it is unknown
+            return [{'success': False, 'error': str(e), 'ambiguous': True} for _ in orders]
+    
+    async def _place_batch(self, orders: List[Dict]) -> List[Dict]:
+        """One native batch request for up to BATCH_LIMIT orders, one result per order"""
+        raise NotImplementedError("Batch orders not implemented for this exchange")
+    
+    async def place_orders_idempotent(self, orders: List[Dict], latency_budget: float = 2.0,
+                                      retry_delay: float = 0.1, lookup_grace: float = 1.0) -> List[Dict]:
+        """place_market_orders with place_order_idempotent's handling of ambiguous outcomes.
+
+        The batch goes out once; only the orders whose outcome is unknown are
+        then looked up and, if absent, resubmitted individually under their
+        original client ids within what is left of latency_budget.
+        """
+        deadline = time.monotonic() + latency_budget
+        for order in orders:
+            order.setdefault('client_order_id', self.generate_client_order_id())
+        try:
+            results = await asyncio.wait_for(self.place_market_orders(orders), latency_budget)
+        except asyncio.TimeoutError:
+            results = [{'success': False, 'error': 'Batch request timed out', 'ambiguous': True} for _ in orders]
+        return list(await asyncio.gather(*(
+            self._settle(order['symbol'], order['side'], order['quantity'], order['client_order_id'],
+                         result, deadline, retry_delay, lookup_grace)
+            for order, result in zip(orders, results)
+        )))
+    
+    async def cancel_orders(self, orders: List[Tuple[str, str]]) -> List[bool]:
+        """Cancel (order_id, symbol) pairs, natively in chunks of CANCEL_BATCH_LIMIT or concurrently"""
+        if self.CANCEL_BATCH_LIMIT > 1 and len(orders) > 1:
+            limit = self.CANCEL_BATCH_LIMIT
+            batches = await asyncio.gather(*(self._cancel_batch_safely(orders[i:i + limit])
+                                             for i in range(0, len(orders), limit)))
+            return [cancelled for batch in batches for cancelled in batch]
+        results = await asyncio.gather(*(self.cancel_order(order_id, symbol) for order_id, symbol in orders),
+                                       return_exceptions=True)
+        return [result is True for result in results]
+    
+    async def _cancel_batch_safely(self, orders: List[Tuple[str, str]]) -> List[bool]:
+        try:
+            return await self._cancel_batch(orders)
+        except Exception as e:
+            print(f"❌ Batch cancel error: {e}")
+            return [False] * len(orders)
+    
+    async def _cancel_batch(self, orders: List[Tuple[str, str]]) -> List[bool]:
+        """One native batch cancel for up to CANCEL_BATCH_LIMIT orders"""
+        raise NotImplementedError("Batch cancel not implemented for this exchange")
+    
     @abc.abstractmethod
-    async def place_market_order(self, symbol: str, side: str, quantity: float) -> Dict:
-        """Place a market order - must be implemented by subclasses"""
+    async def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = "") -> Dict:
+        """Place a market order - must be implemented by subclasses.
+
+        Failed results set 'ambiguous' when the order may have reached the
+        exchange (timeouts, transport errors, 5xx responses).
+        """
         pass
     
     @abc.abstractmethod
@@ -34,10 +309,40 @@ class BaseOrderExecutor(abc.ABC):
         pass
     
     @abc.abstractmethod
-    async def get_order_status(self, order_id: str) -> Dict:
+    async def get_order_status(self, order_id: str, symbol: str = "") -> Dict:
         """Check order status - must be implemented by subclasses"""
         pass
     
-    async def cancel_order(self, order_id: str) -> bool:
+    def create_user_stream(self, exchange_name: str, on_event):
+        """Private WebSocket stream pushing order and balance events - optional to implement"""
+        return None
+    
+    async def fetch_order_state(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        """REST order lookup normalised like a user-stream order event (reconciliation fallback)"""
+        return None
+    
+    async def get_order_by_client_id(self, client_order_id: str, symbol: str = "") -> Optional[Dict]:
+        """Normalised order for a client id, None if the exchange has no such order.
+
+        Raises when the exchange cannot answer, since "unknown" must not be
+        mistaken for "not placed".
+        """
+        raise NotImplementedError("Client order id lookup not implemented for this exchange")
+    
+    async def cancel_order(self, order_id: str, symbol: str = "") -> bool:
         """Cancel an order - optional to implement"""
-        raise NotImplementedError("Cancel order not implemented for this exchange")
\ No newline at end of file
+        raise NotImplementedError("Cancel order not implemented for this exchange")
+    
+    async def cancel_and_fetch(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        """Cancel an order and return its normalised state afterwards (None if unknown).
+
+        The cancel fails harmlessly for an order that has filled meanwhile;
+        either way the state carries the quantity filled before it stopped.
+        Exchanges whose cancel response is the order itself override this to
+        skip the lookup.
+        """
+        try:
+            await self.cancel_order(order_id, symbol)
+        except NotImplementedError:
+            pass
+        return await self.fetch_order_state(order_id, symbol)
\ No newline at end of file
@@ -1,16 +1,24 @@
 import aiohttp
-import time
 import hmac
 import hashlib
-from typing import Dict
+from typing import Dict, Optional
+from exchanges.circuit_breaker import CircuitOpenError
 from .base_order import BaseOrderExecutor
+from .user_stream import BinanceUserStream
 
 class BinanceOrderExecutor(BaseOrderExecutor):
     """Binance order execution implementation"""
     
+    # newClientOrderId: ^[.A-Z:/a-z0-9_-]{1,36}$
+    CLIENT_ID_MAX_LENGTH = 36
+    
     def __init__(self, api_key: str, api_secret: str):
         super().__init__(api_key, api_secret)
         self.base_url = "https://api.binance.com/api/v3"
+        self.server_time_url = f"{self.base_url}/time"
+    
+    def parse_server_time(self, data) -> Optional[float]:
+        return data['serverTime'] / 1000 if 'serverTime' in data else None
     
     def _generate_signature(self, params: Dict) -> str:
         """Generate HMAC SHA256 signature for Binance"""
@@ -21,97 +29,176 @@ class BinanceOrderExecutor(BaseOrderExecutor):
             hashlib.sha256
         ).hexdigest()
     
-    async def place_market_order(self, symbol: str, side: str, quantity: float) -> Dict:
+    async def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = "") -> Dict:
         """Place a market order on Binance"""
         try:
-            timestamp = int(time.time() * 1000)
+            timestamp = self.timestamp_ms()
             params = {
                 'symbol': symbol,
                 'side': side.upper(),
                 'type': 'MARKET',
                 'quantity': quantity,
+                'newClientOrderId': client_order_id or self.generate_client_order_id(),
                 'timestamp': timestamp
             }
             
             params['signature'] = self._generate_signature(params)
             
-            session = await self.get_session()
-            async with session.post(
+            status, data = await self._request_json(
+                "POST",
                 f"{self.base_url}/order",
                 params=params,
                 headers={'X-MBX-APIKEY': self.api_key}
-            ) as response:
-                data = await response.json()
-                
-                if response.status == 200:
-                    print(f"✅ Binance {side} order executed: {quantity} {symbol}")
-                    return {
-                        'success': True,
-                        'order_id': data.get('orderId'),
-                        'status': data.get('status'),
-                        'executed_quantity': float(data.get('executedQty', 0)),
-                        'fills': data.get('fills', [])
-                    }
-                else:
-                    print(f"❌ Binance order failed: {data}")
-                    return {
-                        'success': False,
-                        'error': data.get('msg', 'Unknown error')
-                    }
+            )
+            if status == 200:
+                print(f"✅ Binance {side} order executed: {quantity} {symbol}")
+                return {
+                    'success': True,
+                    'order_id': data.get('orderId'),
+                    'status': data.get('status'),
+                    'executed_quantity': float(data.get('executedQty', 0)),
+                    'fills': data.get('fills', [])
+                }
+            else:
+                print(f"❌ Binance order failed: {data}")
+                return {
+                    'success': False,
+                    'error': data.get('msg', 'Unknown error'),
+                    # Binance: 5xx means the execution status is unknown
+                    'ambiguous': status >= 500
+                }
                     
+        except CircuitOpenError as e:
+            return {'success': False, 'error': str(e)}
         except Exception as e:
             print(f"❌ Binance order error: {e}")
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), 'ambiguous': True}
     
     async def get_balance(self, asset: str) -> float:
         """Get account balance from Binance"""
         try:
-            timestamp = int(time.time() * 1000)
+            timestamp = self.timestamp_ms()
             params = {'timestamp': timestamp}
             params['signature'] = self._generate_signature(params)
             
-            session = await self.get_session()
-            async with session.get(
+            status, data = await self._request_json(
+                "GET",
                 f"{self.base_url}/account",
                 params=params,
                 headers={'X-MBX-APIKEY': self.api_key}
-            ) as response:
-                data = await response.json()
-                
-                if response.status == 200:
-                    balances = data.get('balances', [])
-                    asset_balance = next(
-                        (float(b['free']) for b in balances if b['asset'] == asset.upper()), 
-                        0.0
-                    )
-                    return asset_balance
-                else:
-                    print(f"❌ Binance balance check failed: {data}")
-                    return 0.0
+            )
+            if status == 200:
+                balances = data.get('balances', [])
+                asset_balance = next(
+                    (float(b['free']) for b in balances if b['asset'] == asset.upper()), 
+                    0.0
+                )
+                return asset_balance
+            else:
+                print(f"❌ Binance balance check failed: {data}")
+                return 0.0
                     
         except Exception as e:
             print(f"❌ Binance balance error: {e}")
             return 0.0
     
-    async def get_order_status(self, order_id: str) -> Dict:
+    async def get_order_status(self, order_id: str, symbol: str = "") -> Dict:
         """Check order status on Binance"""
         try:
-            timestamp = int(time.time() * 1000)
+            timestamp = self.timestamp_ms()
             params = {
+                'symbol': symbol,
                 'orderId': order_id,
                 'timestamp': timestamp
             }
             params['signature'] = self._generate_signature(params)
             
-            session = await self.get_session()
-            async with session.get(
+            status, data = await self._request_json(
+                "GET",
                 f"{self.base_url}/order",
                 params=params,
                 headers={'X-MBX-APIKEY': self.api_key}
-            ) as response:
-                data = await response.json()
-                return data
+            )
+            return data
                 
         except Exception as e:
             print(f"❌ Binance order status error: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    async def _delete_order(self, order_id: str, symbol: str):
+        params = {
+            'symbol': symbol,
+            'orderId': order_id,
+            'timestamp': self.timestamp_ms()
+        }
+        params['signature'] = self._generate_signature(params)
+        return await self._request_json(
+            "DELETE",
+            f"{self.base_url}/order",
+            params=params,
+            headers={'X-MBX-APIKEY': self.api_key}
+        )
+    
+    async def cancel_order(self, order_id: str, symbol: str = "") -> bool:
+        """Cancel an order on Binance (no spot batch endpoint: batches fan out)"""
+        try:
+            status, data = await self._delete_order(order_id, symbol)
+            if status == 200:
+                return True
+            print(f"❌ Binance cancel failed: {data}")
+            return False
+        except Exception as e:
+            print(f"❌ Binance cancel error: {e}")
+            return False
+    
+    async def cancel_and_fetch(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        # A successful cancel answers with the order, executedQty included
+        try:
+            status, data = await self._delete_order(order_id, symbol)
+            if status == 200:
+                return self._normalize_order(data)
+        except Exception as e:
+            print(f"❌ Binance cancel error: {e}")
+        return await self.fetch_order_state(order_id, symbol)
+    
+    def create_user_stream(self, exchange_name: str, on_event):
+        return BinanceUserStream(exchange_name, self, on_event)
+    
+    async def fetch_order_state(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        data = await self.get_order_status(order_id, symbol)
+        if 'status' not in data:
+            return None
+        return self._normalize_order(data)
+    
+    async def get_order_by_client_id(self, client_order_id: str, symbol: str = "") -> Optional[Dict]:
+        params = {
+            'symbol': symbol,
+            'origClientOrderId': client_order_id,
+            'timestamp': self.timestamp_ms()
+        }
+        params['signature'] = self._generate_signature(params)
+        status, data = await self._request_json(
+            "GET",
+            f"{self.base_url}/order",
+            params=params,
+            headers={'X-MBX-APIKEY': self.api_key}
+        )
+        if status == 200:
+            return self._normalize_order(data)
+        if data.get('code') == -2013:  # Order does not exist
+            return None
+        raise RuntimeError(f"Binance order lookup failed ({status}): {data}")
+    
+    def _normalize_order(self, data: Dict) -> Dict:
+        return {
+            'type': 'order',
+            'order_id': str(data['orderId']),
+            'client_order_id': data.get('clientOrderId', ''),
+            'symbol': data['symbol'],
+            'side': data['side'].lower(),
+            'status': data['status'],
+            'filled_quantity': float(data.get('executedQty', 0)),
+            'last_fill_quantity': 0.0,
+            'last_fill_price': 0.0,
+            'timestamp': data.get('updateTime', 0) / 1000
+        }
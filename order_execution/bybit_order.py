@@ -0,0 +1,198 @@
+import hashlib
+import hmac
+import json
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from exchanges.circuit_breaker import CircuitOpenError
+from .base_order import BaseOrderExecutor
+
+class BybitOrderExecutor(BaseOrderExecutor):
+    """Bybit (v5 unified account) spot order execution implementation"""
+
+    # orderLinkId: up to 36 characters
+    CLIENT_ID_MAX_LENGTH = 36
+    # Spot batch create/cancel take up to 10 orders per request
+    BATCH_LIMIT = 10
+    CANCEL_BATCH_LIMIT = 10
+    RECV_WINDOW = "5000"
+
+    def __init__(self, api_key: str, api_secret: str):
+        super().__init__(api_key, api_secret)
+        self.base_url = "https://api.bybit.com/v5"
+        self.server_time_url = f"{self.base_url}/market/time"
+
+    def parse_server_time(self, data) -> Optional[float]:
+        return int(data['time']) / 1000 if 'time' in data else None
+
+    def _generate_bybit_headers(self, payload: str) -> Dict:
+        """Sign timestamp + key + recv window + query string (GET) or JSON body (POST)"""
+        timestamp = str(self.timestamp_ms())
+        signature = hmac.new(
+            self.api_secret.encode('utf-8'),
+            (timestamp + self.api_key + self.RECV_WINDOW + payload).encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+        return {
+            "X-BAPI-API-KEY": self.api_key,
+            "X-BAPI-SIGN": signature,
+            "X-BAPI-TIMESTAMP": timestamp,
+            "X-BAPI-RECV-WINDOW": self.RECV_WINDOW,
+            "Content-Type": "application/json"
+        }
+
+    async def _get(self, endpoint: str, params: Dict):
+        query = urlencode(params)
+        return await self._request_json("GET", f"{self.base_url}{endpoint}?{query}",
+                                        headers=self._generate_bybit_headers(query))
+
+    async def _post(self, endpoint: str, body: Dict):
+        payload = json.dumps(body)
+        return await self._request_json("POST", f"{self.base_url}{endpoint}", data=payload,
+                                        headers=self._generate_bybit_headers(payload))
+
+    @staticmethod
+    def _order_body(order: Dict) -> Dict:
+        return {
+            "symbol": order['symbol'],
+            "side": order['side'].capitalize(),
+            "orderType": "Market",
+            "qty": str(order['quantity']),
+            "marketUnit": "baseCoin",  # Spot market buys are sized in quote coin otherwise
+            "orderLinkId": order['client_order_id']
+        }
+
+    async def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = "") -> Dict:
+        """Place a market order on Bybit"""
+        try:
+            order = {'symbol': symbol, 'side': side, 'quantity': quantity,
+                     'client_order_id': client_order_id or self.generate_client_order_id()}
+            status, data = await self._post("/order/create", dict(self._order_body(order), category="spot"))
+            if data.get('retCode') == 0:
+                print(f"✅ Bybit {side} order executed: {quantity} {symbol}")
+                return {
+                    'success': True,
+                    'order_id': data['result'].get('orderId'),
+                    'status': 'NEW'  # Bybit only acknowledges; the fill is confirmed by polling
+                }
+            print(f"❌ Bybit order failed: {data}")
+            return {
+                'success': False,
+                'error': data.get('retMsg', 'Unknown error'),
+                'ambiguous': status >= 500
+            }
+        except CircuitOpenError as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            print(f"❌ Bybit order error: {e}")
+            return {'success': False, 'error': str(e), 'ambiguous': True}
+
+    async def _place_batch(self, orders: List[Dict]) -> List[Dict]:
+        status, data = await self._post("/order/create-batch", {
+            "category": "spot",
+            "request": [self._order_body(order) for order in orders]
+        })
+        if data.get('retCode') != 0:
+            print(f"❌ Bybit batch order failed: {data}")
+            return [{'success': False, 'error': data.get('retMsg', 'Unknown error'), 'ambiguous': status >= 500}
+                    for _ in orders]
+        # result.list and retExtInfo.list are in request order
+        placed = data['result'].get('list', [])
+        codes = data.get('retExtInfo', {}).get('list', [])
+        results = []
+        for index, order in enumerate(orders):
+            code = codes[index] if index < len(codes) else {}
+            if code.get('code') == 0 and index < len(placed):
+                results.append({'success': True, 'order_id': placed[index].get('orderId'), 'status': 'NEW'})
+            else:
+                results.append({'success': False, 'error': code.get('msg', 'Missing from batch response'),
+                                'ambiguous': not code})
+        print(f"✅ Bybit batch of {len(orders)} orders: {sum(r['success'] for r in results)} accepted")
+        return results
+
+    async def get_balance(self, asset: str) -> float:
+        """Get wallet balance from Bybit"""
+        try:
+            status, data = await self._get("/account/wallet-balance", {'accountType': 'UNIFIED', 'coin': asset.upper()})
+            if data.get('retCode') == 0:
+                accounts = data['result'].get('list', [])
+                coins = accounts[0].get('coin', []) if accounts else []
+                return next((float(c.get('walletBalance') or 0) - float(c.get('locked') or 0)
+                             for c in coins if c['coin'] == asset.upper()), 0.0)
+            print(f"❌ Bybit balance check failed: {data}")
+            return 0.0
+        except Exception as e:
+            print(f"❌ Bybit balance error: {e}")
+            return 0.0
+
+    async def _find_order(self, params: Dict) -> Tuple[int, Dict, Optional[Dict]]:
+        """Open orders first, then history (filled market orders leave the open list at once)"""
+        for endpoint in ("/order/realtime", "/order/history"):
+            status, data = await self._get(endpoint, dict(params, category="spot"))
+            if data.get('retCode') != 0:
+                return status, data, None
+            orders = data['result'].get('list', [])
+            if orders:
+                return status, data, orders[0]
+        return status, data, None
+
+    async def get_order_status(self, order_id: str, symbol: str = "") -> Dict:
+        """Check order status on Bybit"""
+        try:
+            _, data, order = await self._find_order({'symbol': symbol, 'orderId': order_id})
+            return order or data
+        except Exception as e:
+            print(f"❌ Bybit order status error: {e}")
+            return {}
+
+    async def fetch_order_state(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        order = await self.get_order_status(order_id, symbol)
+        if 'orderStatus' not in order:
+            return None
+        return self._normalize_order(order)
+
+    async def get_order_by_client_id(self, client_order_id: str, symbol: str = "") -> Optional[Dict]:
+        status, data, order = await self._find_order({'symbol': symbol, 'orderLinkId': client_order_id})
+        if order is not None:
+            return self._normalize_order(order)
+        if data.get('retCode') == 0:
+            return None
+        raise RuntimeError(f"Bybit order lookup failed ({status}): {data}")
+
+    async def cancel_order(self, order_id: str, symbol: str = "") -> bool:
+        """Cancel an order on Bybit"""
+        try:
+            status, data = await self._post("/order/cancel", {'category': 'spot', 'symbol': symbol, 'orderId': order_id})
+            if data.get('retCode') == 0:
+                return True
+            print(f"❌ Bybit cancel failed: {data}")
+            return False
+        except Exception as e:
+            print(f"❌ Bybit cancel error: {e}")
+            return False
+
+    async def _cancel_batch(self, orders: List[Tuple[str, str]]) -> List[bool]:
+        status, data = await self._post("/order/cancel-batch", {
+            "category": "spot",
+            "request": [{'symbol': symbol, 'orderId': order_id} for order_id, symbol in orders]
+        })
+        if data.get('retCode') != 0:
+            print(f"❌ Bybit batch cancel failed: {data}")
+            return [False] * len(orders)
+        codes = data.get('retExtInfo', {}).get('list', [])
+        return [index < len(codes) and codes[index].get('code') == 0 for index in range(len(orders))]
+
+    def _normalize_order(self, order: Dict) -> Dict:
+        statuses = {'New': 'NEW', 'PartiallyFilled': 'PARTIALLY_FILLED', 'Filled': 'FILLED',
+                    'Cancelled': 'CANCELED', 'PartiallyFilledCanceled': 'CANCELED', 'Rejected': 'REJECTED'}
+        return {
+            'type': 'order',
+            'order_id': order['orderId'],
+            'client_order_id': order.get('orderLinkId', ''),
+            'symbol': order['symbol'],
+            'side': order['side'].lower(),
+            'status': statuses.get(order.get('orderStatus'), 'NEW'),
+            'filled_quantity': float(order.get('cumExecQty') or 0),
+            'last_fill_quantity': 0.0,
+            'last_fill_price': float(order.get('avgPrice') or 0),
+            'timestamp': int(order.get('updatedTime') or 0) / 1000
+        }
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Callable, Deque, Optional, Tuple
+
+class ClockSync:
+    """Estimates an exchange's clock offset so signed requests use server time.
+
+    Each sample brackets a server timestamp between the local send and
+    receive times: offset = server - (send + receive) / 2, accurate to
+    within half the round trip. Of the last `window` samples the one with
+    the smallest round trip wins (the NTP clock filter), so a single slow
+    or queued response cannot drag the estimate. Samples come from the
+    server-time endpoint, polled in the background, and from the HTTP Date
+    header of ordinary responses; Date only has one-second resolution, so
+    those samples carry a 1s round-trip penalty and are used only until a
+    precise sample exists. now_ms() is pure arithmetic: signing never waits
+    on the network.
+    """
+
+    DATE_HEADER_PENALTY = 1.0
+
+    def __init__(self, window: int = 8, interval: float = 60.0, max_age: float = 600.0):
+        self.window = window
+        self.interval = interval
+        self.max_age = max_age
+        # (offset seconds, round trip seconds, local time of the sample)
+        self.samples: Deque[Tuple[float, float, float]] = deque(maxlen=window)
+        self.offset = 0.0
+        self.rtt: Optional[float] = None
+        self.updated_at = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+    def now(self) -> float:
+        """Estimated server time in seconds"""
+        return time.time() + self.offset
+
+    def now_ms(self) -> int:
+        """Estimated server time in milliseconds, as used in request signatures"""
+        return int((time.time() + self.offset) * 1000)
+
+    def observe(self, sent: float, received: float, server_time: float):
+        """Add a sample: local send/receive times and the server's time (all seconds)"""
+        self._add(server_time - (sent + received) / 2, received - sent, received)
+
+    def observe_date_header(self, sent: float, received: float, date_header: Optional[str]):
+        """Add a coarse sample from an HTTP Date header (whole seconds)"""
+        if not date_header or self.synced:
+            return
+        try:
+            server_time = parsedate_to_datetime(date_header).timestamp()
+        except (TypeError, ValueError):
+            return
+        # The header truncates to the second: the true time is up to 1s later
+        self._add(server_time + 0.5 - (sent + received) / 2, received - sent + self.DATE_HEADER_PENALTY, received)
+
+    def _add(self, offset: float, rtt: float, at: float):
+        self.samples.append((offset, rtt, at))
+        fresh = [sample for sample in self.samples if at - sample[2] <= self.max_age] or [self.samples[-1]]
+        self.offset, self.rtt, _ = min(fresh, key=lambda sample: sample[1])
+        self.updated_at = at
+
+    @property
+    def synced(self) -> bool:
+        """True once a precise (server-time endpoint) sample is in the window"""
+        return self.rtt is not None and self.rtt < self.DATE_HEADER_PENALTY
+
+    def start(self, fetch_server_time: Callable):
+        """Poll `fetch_server_time` (returns server seconds or None) every interval"""
+        if self.task is None:
+            self.task = asyncio.create_task(self._run(fetch_server_time))
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self, fetch_server_time: Callable):
+        while True:
+            sent = time.time()
+            try:
+                server_time = await fetch_server_time()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Clock sync failed: {e}")
+                server_time = None
+            if server_time is not None:
+                self.observe(sent, time.time(), server_time)
+            # Take a few quick samples after startup, then settle to the interval
+            precise = sum(1 for _, rtt, _ in self.samples if rtt < self.DATE_HEADER_PENALTY)
+            await asyncio.sleep(self.interval if precise >= self.window // 2 else 1.0)
+
+    def describe(self) -> str:
+        if self.rtt is None:
+            return "unsynced (local clock)"
+        return f"offset {self.offset * 1000:+.0f}ms, rtt {self.rtt * 1000:.0f}ms"
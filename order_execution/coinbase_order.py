@@ -0,0 +1,155 @@
+import base64
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+from exchanges.circuit_breaker import CircuitOpenError
+from .base_order import BaseOrderExecutor
+
+class CoinbaseOrderExecutor(BaseOrderExecutor):
+    """Coinbase Exchange order execution implementation (the API the market-data connector uses).
+
+    The Exchange API has no batch endpoint for individual orders, so
+    batches fan out concurrently.
+    """
+
+    def __init__(self, api_key: str, api_secret: str, passphrase: str):
+        super().__init__(api_key, api_secret, passphrase)
+        self.base_url = "https://api.exchange.coinbase.com"
+        self.server_time_url = f"{self.base_url}/time"
+
+    def parse_server_time(self, data) -> Optional[float]:
+        return float(data['epoch']) if 'epoch' in data else None
+
+    def generate_client_order_id(self) -> str:
+        # client_oid must be a UUID
+        return str(uuid.uuid4())
+
+    def _generate_coinbase_headers(self, method: str, endpoint: str, body: str = "") -> Dict:
+        """Generate Coinbase authentication headers (base64 HMAC-SHA256 with the decoded secret)"""
+        timestamp = f"{self.timestamp_ms() / 1000:.3f}"
+        str_to_sign = timestamp + method + endpoint + body
+        signature = base64.b64encode(
+            hmac.new(
+                base64.b64decode(self.api_secret),
+                str_to_sign.encode('utf-8'),
+                hashlib.sha256
+            ).digest()
+        ).decode('utf-8')
+        return {
+            "CB-ACCESS-KEY": self.api_key,
+            "CB-ACCESS-SIGN": signature,
+            "CB-ACCESS-TIMESTAMP": timestamp,
+            "CB-ACCESS-PASSPHRASE": self.passphrase,
+            "Content-Type": "application/json"
+        }
+
+    async def _signed(self, method: str, endpoint: str, body: Optional[Dict] = None):
+        payload = json.dumps(body) if body is not None else ""
+        headers = self._generate_coinbase_headers(method, endpoint, payload)
+        return await self._request_json(method, f"{self.base_url}{endpoint}", data=payload or None, headers=headers)
+
+    async def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = "") -> Dict:
+        """Place a market order on Coinbase"""
+        try:
+            status, data = await self._signed("POST", "/orders", {
+                "type": "market",
+                "side": side.lower(),
+                "product_id": symbol,
+                "size": str(quantity),
+                "client_oid": client_order_id or self.generate_client_order_id()
+            })
+            if status == 200:
+                print(f"✅ Coinbase {side} order executed: {quantity} {symbol}")
+                return {
+                    'success': True,
+                    'order_id': data.get('id'),
+                    'status': 'FILLED' if data.get('done_reason') == 'filled' else 'NEW',
+                    'executed_quantity': float(data.get('filled_size') or 0)
+                }
+            print(f"❌ Coinbase order failed: {data}")
+            return {
+                'success': False,
+                'error': data.get('message', 'Unknown error'),
+                'ambiguous': status >= 500
+            }
+        except CircuitOpenError as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            print(f"❌ Coinbase order error: {e}")
+            return {'success': False, 'error': str(e), 'ambiguous': True}
+
+    async def get_balance(self, asset: str) -> float:
+        """Get available balance from Coinbase"""
+        try:
+            status, data = await self._signed("GET", "/accounts")
+            if status == 200:
+                return next((float(a['available']) for a in data if a['currency'] == asset.upper()), 0.0)
+            print(f"❌ Coinbase balance check failed: {data}")
+            return 0.0
+        except Exception as e:
+            print(f"❌ Coinbase balance error: {e}")
+            return 0.0
+
+    async def get_order_status(self, order_id: str, symbol: str = "") -> Dict:
+        """Check order status on Coinbase"""
+        try:
+            status, data = await self._signed("GET", f"/orders/{order_id}")
+            return data
+        except Exception as e:
+            print(f"❌ Coinbase order status error: {e}")
+            return {}
+
+    async def fetch_order_state(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        data = await self.get_order_status(order_id, symbol)
+        if 'status' not in data:
+            return None
+        return self._normalize_order(data)
+
+    async def get_order_by_client_id(self, client_order_id: str, symbol: str = "") -> Optional[Dict]:
+        status, data = await self._signed("GET", f"/orders/client:{client_order_id}")
+        if status == 200:
+            return self._normalize_order(data)
+        if status == 404:
+            return None
+        raise RuntimeError(f"Coinbase order lookup failed ({status}): {data}")
+
+    async def cancel_order(self, order_id: str, symbol: str = "") -> bool:
+        """Cancel an order on Coinbase"""
+        try:
+            endpoint = f"/orders/{order_id}" + (f"?product_id={symbol}" if symbol else "")
+            status, data = await self._signed("DELETE", endpoint)
+            if status == 200:
+                return True
+            print(f"❌ Coinbase cancel failed: {data}")
+            return False
+        except Exception as e:
+            print(f"❌ Coinbase cancel error: {e}")
+            return False
+
+    def _normalize_order(self, order: Dict) -> Dict:
+        filled = float(order.get('filled_size') or 0)
+        if order.get('status') == 'done':
+            status = 'FILLED' if order.get('done_reason') == 'filled' else 'CANCELED'
+        elif order.get('status') == 'rejected':
+            status = 'REJECTED'
+        else:
+            status = 'PARTIALLY_FILLED' if filled > 0 else 'NEW'
+        try:
+            timestamp = datetime.fromisoformat((order.get('done_at') or order['created_at']).replace('Z', '+00:00')).timestamp()
+        except (KeyError, ValueError):
+            timestamp = 0.0
+        return {
+            'type': 'order',
+            'order_id': order['id'],
+            'client_order_id': order.get('client_oid', ''),
+            'symbol': order['product_id'],
+            'side': order['side'],
+            'status': status,
+            'filled_quantity': filled,
+            'last_fill_quantity': 0.0,
+            'last_fill_price': float(order.get('executed_value') or 0) / filled if filled else 0.0,
+            'timestamp': timestamp
+        }
@@ -0,0 +1,237 @@
+import hashlib
+import hmac
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from exchanges.circuit_breaker import CircuitOpenError
+from .base_order import BaseOrderExecutor
+
+class GateIOOrderExecutor(BaseOrderExecutor):
+    """Gate.io (API v4) spot order execution implementation"""
+
+    # text: "t-" plus up to 28 of [0-9A-Za-z_.-]
+    CLIENT_ID_MAX_LENGTH = 30
+    CLIENT_ID_PREFIX = "t-arb"
+    # /spot/batch_orders and /spot/cancel_batch_orders take up to 10 orders
+    BATCH_LIMIT = 10
+    CANCEL_BATCH_LIMIT = 10
+
+    def __init__(self, api_key: str, api_secret: str):
+        super().__init__(api_key, api_secret)
+        self.api_path = "/api/v4"
+        self.base_url = f"https://api.gateio.ws{self.api_path}"
+        self.server_time_url = f"{self.base_url}/spot/time"
+
+    def parse_server_time(self, data) -> Optional[float]:
+        return data['server_time'] / 1000 if 'server_time' in data else None
+
+    def _generate_gateio_headers(self, method: str, endpoint: str, query: str = "", body: str = "") -> Dict:
+        """Sign method, path, query, SHA-512 of the body and the timestamp (seconds)"""
+        timestamp = str(self.timestamp_ms() // 1000)
+        str_to_sign = "\n".join([
+            method, self.api_path + endpoint, query, hashlib.sha512(body.encode('utf-8')).hexdigest(), timestamp
+        ])
+        signature = hmac.new(
+            self.api_secret.encode('utf-8'),
+            str_to_sign.encode('utf-8'),
+            hashlib.sha512
+        ).hexdigest()
+        return {
+            "KEY": self.api_key,
+            "SIGN": signature,
+            "Timestamp": timestamp,
+            "Content-Type": "application/json"
+        }
+
+    async def _signed(self, method: str, endpoint: str, params: Optional[Dict] = None, body=None):
+        query = urlencode(params) if params else ""
+        payload = json.dumps(body) if body is not None else ""
+        headers = self._generate_gateio_headers(method, endpoint, query, payload)
+        url = f"{self.base_url}{endpoint}" + (f"?{query}" if query else "")
+        return await self._request_json(method, url, data=payload or None, headers=headers)
+
+    async def _market_amounts(self, orders: List[Dict]) -> List[str]:
+        """Order amounts: base for sells, quote for buys (Gate.io sizes market buys in quote currency).
+
+        Buys are converted at the current best ask, so the base actually
+        bought can differ slightly from the requested quantity.
+        """
+        asks = {}
+        for order in orders:
+            if order['side'].lower() == 'buy' and order['symbol'] not in asks:
+                status, data = await self._request_json("GET", f"{self.base_url}/spot/tickers",
+                                                        params={'currency_pair': order['symbol']})
+                if status != 200 or not data:
+                    raise RuntimeError(f"Gate.io ticker for {order['symbol']} unavailable: {data}")
+                asks[order['symbol']] = float(data[0]['lowest_ask'])
+        return [
+            f"{order['quantity'] * asks[order['symbol']]:.8f}" if order['side'].lower() == 'buy' else str(order['quantity'])
+            for order in orders
+        ]
+
+    @staticmethod
+    def _order_body(order: Dict, amount: str) -> Dict:
+        return {
+            "currency_pair": order['symbol'],
+            "side": order['side'].lower(),
+            "type": "market",
+            "time_in_force": "ioc",
+            "amount": amount,
+            "text": order['client_order_id']
+        }
+
+    async def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = "") -> Dict:
+        """Place a market order on Gate.io"""
+        try:
+            order = {'symbol': symbol, 'side': side, 'quantity': quantity,
+                     'client_order_id': client_order_id or self.generate_client_order_id()}
+            try:
+                (amount,) = await self._market_amounts([order])
+            except Exception as e:
+                # Nothing was sent yet
+                return {'success': False, 'error': str(e)}
+            status, data = await self._signed("POST", "/spot/orders", body=self._order_body(order, amount))
+            if status in (200, 201):
+                print(f"✅ Gate.io {side} order executed: {quantity} {symbol}")
+                return {
+                    'success': True,
+                    'order_id': data.get('id'),
+                    'status': 'FILLED' if data.get('finish_as') == 'filled' else 'NEW',
+                    'executed_quantity': self._filled(data)
+                }
+            print(f"❌ Gate.io order failed: {data}")
+            return {
+                'success': False,
+                'error': data.get('message', 'Unknown error'),
+                'ambiguous': status >= 500
+            }
+        except CircuitOpenError as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            print(f"❌ Gate.io order error: {e}")
+            return {'success': False, 'error': str(e), 'ambiguous': True}
+
+    async def _place_batch(self, orders: List[Dict]) -> List[Dict]:
+        try:
+            amounts = await self._market_amounts(orders)
+        except Exception as e:
+            return [{'success': False, 'error': str(e)} for _ in orders]
+        body = [self._order_body(order, amount) for order, amount in zip(orders, amounts)]
+        status, data = await self._signed("POST", "/spot/batch_orders", body=body)
+        if status != 200 or not isinstance(data, list):
+            print(f"❌ Gate.io batch order failed: {data}")
+            error = data.get('message', 'Unknown error') if isinstance(data, dict) else 'Unknown error'
+            return [{'success': False, 'error': error, 'ambiguous': status >= 500} for _ in orders]
+        # Each entry echoes its text (our client id)
+        by_client_id = {item.get('text'): item for item in data}
+        results = []
+        for order in orders:
+            item = by_client_id.get(order['client_order_id'])
+            if item is None:
+                results.append({'success': False, 'error': 'Missing from batch response', 'ambiguous': True})
+            elif item.get('succeeded'):
+                results.append({'success': True, 'order_id': item.get('id'),
+                                'status': 'FILLED' if item.get('finish_as') == 'filled' else 'NEW',
+                                'executed_quantity': self._filled(item)})
+            else:
+                results.append({'success': False, 'error': item.get('message', 'Unknown error'), 'ambiguous': False})
+        print(f"✅ Gate.io batch of {len(orders)} orders: {sum(r['success'] for r in results)} accepted")
+        return results
+
+    async def get_balance(self, asset: str) -> float:
+        """Get available spot balance from Gate.io"""
+        try:
+            status, data = await self._signed("GET", "/spot/accounts", params={'currency': asset.upper()})
+            if status == 200:
+                return next((float(a['available']) for a in data if a['currency'] == asset.upper()), 0.0)
+            print(f"❌ Gate.io balance check failed: {data}")
+            return 0.0
+        except Exception as e:
+            print(f"❌ Gate.io balance error: {e}")
+            return 0.0
+
+    async def get_order_status(self, order_id: str, symbol: str = "") -> Dict:
+        """Check order status on Gate.io (order_id may also be the client text id)"""
+        try:
+            status, data = await self._signed("GET", f"/spot/orders/{order_id}", params={'currency_pair': symbol})
+            return data
+        except Exception as e:
+            print(f"❌ Gate.io order status error: {e}")
+            return {}
+
+    async def fetch_order_state(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        data = await self.get_order_status(order_id, symbol)
+        if 'status' not in data:
+            return None
+        return self._normalize_order(data)
+
+    async def get_order_by_client_id(self, client_order_id: str, symbol: str = "") -> Optional[Dict]:
+        status, data = await self._signed("GET", f"/spot/orders/{client_order_id}", params={'currency_pair': symbol})
+        if status == 200:
+            return self._normalize_order(data)
+        if data.get('label') == 'ORDER_NOT_FOUND':
+            return None
+        raise RuntimeError(f"Gate.io order lookup failed ({status}): {data}")
+
+    async def cancel_order(self, order_id: str, symbol: str = "") -> bool:
+        """Cancel an order on Gate.io"""
+        try:
+            status, data = await self._signed("DELETE", f"/spot/orders/{order_id}", params={'currency_pair': symbol})
+            if status == 200:
+                return True
+            print(f"❌ Gate.io cancel failed: {data}")
+            return False
+        except Exception as e:
+            print(f"❌ Gate.io cancel error: {e}")
+            return False
+
+    async def cancel_and_fetch(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        # A successful cancel answers with the order
+        try:
+            status, data = await self._signed("DELETE", f"/spot/orders/{order_id}", params={'currency_pair': symbol})
+            if status == 200:
+                return self._normalize_order(data)
+        except Exception as e:
+            print(f"❌ Gate.io cancel error: {e}")
+        return await self.fetch_order_state(order_id, symbol)
+
+    async def _cancel_batch(self, orders: List[Tuple[str, str]]) -> List[bool]:
+        body = [{'currency_pair': symbol, 'id': order_id} for order_id, symbol in orders]
+        status, data = await self._signed("POST", "/spot/cancel_batch_orders", body=body)
+        if status != 200 or not isinstance(data, list):
+            print(f"❌ Gate.io batch cancel failed: {data}")
+            return [False] * len(orders)
+        cancelled = {item.get('id') for item in data if item.get('succeeded')}
+        return [order_id in cancelled for order_id, _ in orders]
+
+    @staticmethod
+    def _filled(order: Dict) -> float:
+        if order.get('filled_amount') is not None:
+            return float(order['filled_amount'])
+        if order.get('side') == 'buy' and order.get('type') == 'market':
+            # amount and left are in quote currency here
+            price = float(order.get('avg_deal_price') or 0)
+            return float(order.get('filled_total') or 0) / price if price else 0.0
+        return float(order.get('amount') or 0) - float(order.get('left') or 0)
+
+    def _normalize_order(self, order: Dict) -> Dict:
+        filled = self._filled(order)
+        if order.get('status') == 'open':
+            status = 'PARTIALLY_FILLED' if filled > 0 else 'NEW'
+        elif order.get('status') == 'cancelled' or order.get('finish_as') in ('cancelled', 'ioc', 'stp'):
+            status = 'FILLED' if order.get('finish_as') == 'ioc' and filled > 0 else 'CANCELED'
+        else:
+            status = 'FILLED'
+        return {
+            'type': 'order',
+            'order_id': str(order['id']),
+            'client_order_id': order.get('text', ''),
+            'symbol': order['currency_pair'],
+            'side': order['side'],
+            'status': status,
+            'filled_quantity': filled,
+            'last_fill_quantity': 0.0,
+            'last_fill_price': float(order.get('avg_deal_price') or 0),
+            'timestamp': int(order.get('update_time_ms') or time.time() * 1000) / 1000
+        }
@@ -0,0 +1,173 @@
+import base64
+import hashlib
+import hmac
+import json
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from exchanges.circuit_breaker import CircuitOpenError
+from .base_order import BaseOrderExecutor
+
+class KrakenOrderExecutor(BaseOrderExecutor):
+    """Kraken spot order execution implementation"""
+
+    # cl_ord_id: free text up to 18 characters (or a UUID)
+    CLIENT_ID_MAX_LENGTH = 18
+    # AddOrderBatch only takes orders for one pair, so placement fans out;
+    # CancelOrderBatch takes up to 50 orders of any pair
+    CANCEL_BATCH_LIMIT = 50
+    # Kraken prefixes some asset codes in balances (XXBT, ZUSD)
+    ASSET_CODES = {"BTC": ("XXBT", "XBT")}
+
+    def __init__(self, api_key: str, api_secret: str):
+        super().__init__(api_key, api_secret)
+        self.base_url = "https://api.kraken.com"
+        self.server_time_url = f"{self.base_url}/0/public/Time"
+        self.last_nonce = 0
+
+    def parse_server_time(self, data) -> Optional[float]:
+        return float(data['result']['unixtime']) if not data.get('error') and 'result' in data else None
+
+    def _nonce(self) -> int:
+        # Must strictly increase per key, even for requests sent in the same millisecond
+        self.last_nonce = max(self.last_nonce + 1, self.timestamp_ms())
+        return self.last_nonce
+
+    async def _private(self, method: str, params: Optional[Dict] = None, as_json: bool = False):
+        """POST a signed private request: API-Sign = HMAC-SHA512(path + SHA256(nonce + body))"""
+        path = f"/0/private/{method}"
+        params = dict(params or {}, nonce=self._nonce())
+        body = json.dumps(params) if as_json else urlencode(params)
+        digest = hashlib.sha256((str(params['nonce']) + body).encode('utf-8')).digest()
+        signature = base64.b64encode(
+            hmac.new(base64.b64decode(self.api_secret), path.encode('utf-8') + digest, hashlib.sha512).digest()
+        ).decode('utf-8')
+        headers = {
+            "API-Key": self.api_key,
+            "API-Sign": signature,
+            "Content-Type": "application/json" if as_json else "application/x-www-form-urlencoded"
+        }
+        return await self._request_json("POST", f"{self.base_url}{path}", data=body, headers=headers)
+
+    @staticmethod
+    def _unavailable(errors: List[str]) -> bool:
+        """EService/EGeneral:Internal errors leave an order's fate unknown"""
+        return any(error.startswith("EService") or error == "EGeneral:Internal error" for error in errors)
+
+    async def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = "") -> Dict:
+        """Place a market order on Kraken"""
+        try:
+            status, data = await self._private("AddOrder", {
+                'ordertype': 'market',
+                'type': side.lower(),
+                'volume': str(quantity),
+                'pair': symbol,
+                'cl_ord_id': client_order_id or self.generate_client_order_id()
+            })
+            errors = data.get('error') or []
+            if status == 200 and not errors:
+                print(f"✅ Kraken {side} order executed: {quantity} {symbol}")
+                return {
+                    'success': True,
+                    'order_id': data['result']['txid'][0],
+                    'status': 'NEW'  # Kraken only acknowledges; the fill is confirmed by polling
+                }
+            print(f"❌ Kraken order failed: {data}")
+            return {
+                'success': False,
+                'error': ", ".join(errors) or 'Unknown error',
+                'ambiguous': status >= 500 or self._unavailable(errors)
+            }
+        except CircuitOpenError as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            print(f"❌ Kraken order error: {e}")
+            return {'success': False, 'error': str(e), 'ambiguous': True}
+
+    async def get_balance(self, asset: str) -> float:
+        """Get available balance from Kraken (total minus what open orders hold)"""
+        try:
+            status, data = await self._private("BalanceEx")
+            if status == 200 and not data.get('error'):
+                balances = data['result']
+                asset = asset.upper()
+                for code in self.ASSET_CODES.get(asset, ()) + (asset, f"X{asset}", f"Z{asset}"):
+                    if code in balances:
+                        entry = balances[code]
+                        return float(entry.get('balance') or 0) - float(entry.get('hold_trade') or 0)
+                return 0.0
+            print(f"❌ Kraken balance check failed: {data}")
+            return 0.0
+        except Exception as e:
+            print(f"❌ Kraken balance error: {e}")
+            return 0.0
+
+    async def get_order_status(self, order_id: str, symbol: str = "") -> Dict:
+        """Check order status on Kraken"""
+        try:
+            status, data = await self._private("QueryOrders", {'txid': order_id, 'trades': 'false'})
+            return data
+        except Exception as e:
+            print(f"❌ Kraken order status error: {e}")
+            return {}
+
+    async def fetch_order_state(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        data = await self.get_order_status(order_id, symbol)
+        order = (data.get('result') or {}).get(order_id)
+        if data.get('error') or order is None:
+            return None
+        return self._normalize_order(order_id, order)
+
+    async def get_order_by_client_id(self, client_order_id: str, symbol: str = "") -> Optional[Dict]:
+        # Open first, then closed: a market order spends almost no time open
+        for method, key in (("OpenOrders", "open"), ("ClosedOrders", "closed")):
+            status, data = await self._private(method, {'cl_ord_id': client_order_id})
+            if status != 200 or data.get('error'):
+                raise RuntimeError(f"Kraken order lookup failed ({status}): {data}")
+            orders = data['result'].get(key, {})
+            for txid, order in orders.items():
+                return self._normalize_order(txid, order)
+        return None
+
+    async def cancel_order(self, order_id: str, symbol: str = "") -> bool:
+        """Cancel an order on Kraken"""
+        try:
+            status, data = await self._private("CancelOrder", {'txid': order_id})
+            if status == 200 and not data.get('error'):
+                return True
+            print(f"❌ Kraken cancel failed: {data}")
+            return False
+        except Exception as e:
+            print(f"❌ Kraken cancel error: {e}")
+            return False
+
+    async def _cancel_batch(self, orders: List[Tuple[str, str]]) -> List[bool]:
+        status, data = await self._private("CancelOrderBatch", {'orders': [order_id for order_id, _ in orders]},
+                                           as_json=True)
+        if status != 200 or data.get('error'):
+            print(f"❌ Kraken batch cancel failed: {data}")
+            return [False] * len(orders)
+        # Only a count comes back: all or nothing as far as we can tell
+        return [data['result'].get('count', 0) == len(orders)] * len(orders)
+
+    def _normalize_order(self, txid: str, order: Dict) -> Dict:
+        filled = float(order.get('vol_exec') or 0)
+        state = order.get('status')
+        if state in ('pending', 'open'):
+            status = 'PARTIALLY_FILLED' if filled > 0 else 'NEW'
+        elif state == 'closed':
+            status = 'FILLED'
+        else:
+            status = 'CANCELED' if state == 'canceled' else 'EXPIRED'
+        descr = order.get('descr', {})
+        return {
+            'type': 'order',
+            'order_id': txid,
+            'client_order_id': order.get('cl_ord_id', ''),
+            'symbol': descr.get('pair', ''),
+            'side': descr.get('type', ''),
+            'status': status,
+            'filled_quantity': filled,
+            'last_fill_quantity': 0.0,
+            'last_fill_price': float(order.get('price') or 0),
+            'timestamp': float(order.get('closetm') or order.get('opentm') or 0)
+        }
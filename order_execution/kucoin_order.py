@@ -3,21 +3,31 @@ import base64
 import hashlib
 import hmac
 import json
-import time
-from typing import Dict
+from typing import Dict, Optional
+from exchanges.circuit_breaker import CircuitOpenError
 from .base_order import BaseOrderExecutor
+from .user_stream import KuCoinUserStream
 
 class KuCoinOrderExecutor(BaseOrderExecutor):
     """KuCoin order execution implementation"""
     
+    # clientOid: up to 40 letters, digits, '-' and '_'
+    CLIENT_ID_MAX_LENGTH = 40
+    
     def __init__(self, api_key: str, api_secret: str, passphrase: str):
         super().__init__(api_key, api_secret, passphrase)
-        self.base_url = "https://api.kucoin.com/api/v1"
+        self.api_path = "/api/v1"
+        self.base_url = f"https://api.kucoin.com{self.api_path}"
+        self.server_time_url = f"{self.base_url}/timestamp"
+    
+    def parse_server_time(self, data) -> Optional[float]:
+        return data['data'] / 1000 if data.get('code') == '200000' else None
     
     def _generate_kucoin_headers(self, method: str, endpoint: str, body: str = "") -> Dict:
         """Generate KuCoin authentication headers"""
-        timestamp = str(int(time.time() * 1000))
-        str_to_sign = timestamp + method + endpoint + body
+        timestamp = str(self.timestamp_ms())
+        # KuCoin signs the full request path
+        str_to_sign = timestamp + method + self.api_path + endpoint + body
         signature = base64.b64encode(
             hmac.new(
                 self.api_secret.encode('utf-8'),
@@ -43,12 +53,12 @@ class KuCoinOrderExecutor(BaseOrderExecutor):
             "Content-Type": "application/json"
         }
     
-    async def place_market_order(self, symbol: str, side: str, quantity: float) -> Dict:
+    async def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = "") -> Dict:
         """Place a market order on KuCoin"""
         try:
             endpoint = "/orders"
             body = {
-                "clientOid": str(int(time.time() * 1000)),
+                "clientOid": client_order_id or self.generate_client_order_id(),
                 "side": side.lower(),
                 "symbol": symbol,
                 "type": "market",
@@ -57,31 +67,32 @@ class KuCoinOrderExecutor(BaseOrderExecutor):
             
             headers = self._generate_kucoin_headers("POST", endpoint, json.dumps(body))
             
-            session = await self.get_session()
-            async with session.post(
+            status, data = await self._request_json(
+                "POST",
                 f"{self.base_url}{endpoint}",
                 json=body,
                 headers=headers
-            ) as response:
-                data = await response.json()
-                
-                if data.get('code') == '200000':
-                    print(f"✅ KuCoin {side} order executed: {quantity} {symbol}")
-                    return {
-                        'success': True,
-                        'order_id': data['data'].get('orderId'),
-                        'status': 'filled'
-                    }
-                else:
-                    print(f"❌ KuCoin order failed: {data}")
-                    return {
-                        'success': False,
-                        'error': data.get('msg', 'Unknown error')
-                    }
+            )
+            if data.get('code') == '200000':
+                print(f"✅ KuCoin {side} order executed: {quantity} {symbol}")
+                return {
+                    'success': True,
+                    'order_id': data['data'].get('orderId'),
+                    'status': 'NEW'  # KuCoin only acknowledges; the fill arrives on the user stream
+                }
+            else:
+                print(f"❌ KuCoin order failed: {data}")
+                return {
+                    'success': False,
+                    'error': data.get('msg', 'Unknown error'),
+                    'ambiguous': status >= 500
+                }
                     
+        except CircuitOpenError as e:
+            return {'success': False, 'error': str(e)}
         except Exception as e:
             print(f"❌ KuCoin order error: {e}")
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), 'ambiguous': True}
     
     async def get_balance(self, asset: str) -> float:
         """Get account balance from KuCoin"""
@@ -89,42 +100,94 @@ class KuCoinOrderExecutor(BaseOrderExecutor):
             endpoint = "/accounts"
             headers = self._generate_kucoin_headers("GET", endpoint)
             
-            session = await self.get_session()
-            async with session.get(
+            status, data = await self._request_json(
+                "GET",
                 f"{self.base_url}{endpoint}",
                 headers=headers
-            ) as response:
-                data = await response.json()
-                
-                if data.get('code') == '200000':
-                    accounts = data['data']
-                    main_account = next(
-                        (acc for acc in accounts if acc['type'] == 'trade' and acc['currency'] == asset.upper()),
-                        None
-                    )
-                    return float(main_account['balance']) if main_account else 0.0
-                else:
-                    print(f"❌ KuCoin balance check failed: {data}")
-                    return 0.0
+            )
+            if data.get('code') == '200000':
+                accounts = data['data']
+                main_account = next(
+                    (acc for acc in accounts if acc['type'] == 'trade' and acc['currency'] == asset.upper()),
+                    None
+                )
+                # 'balance' includes funds on hold for open orders
+                return float(main_account['available']) if main_account else 0.0
+            else:
+                print(f"❌ KuCoin balance check failed: {data}")
+                return 0.0
                     
         except Exception as e:
             print(f"❌ KuCoin balance error: {e}")
             return 0.0
     
-    async def get_order_status(self, order_id: str) -> Dict:
+    async def get_order_status(self, order_id: str, symbol: str = "") -> Dict:
         """Check order status on KuCoin"""
         try:
             endpoint = f"/orders/{order_id}"
             headers = self._generate_kucoin_headers("GET", endpoint)
             
-            session = await self.get_session()
-            async with session.get(
+            status, data = await self._request_json(
+                "GET",
                 f"{self.base_url}{endpoint}",
                 headers=headers
-            ) as response:
-                data = await response.json()
-                return data
+            )
+            return data
                 
         except Exception as e:
             print(f"❌ KuCoin order status error: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    async def cancel_order(self, order_id: str, symbol: str = "") -> bool:
+        """Cancel an order on KuCoin (its multi-order endpoint takes limit orders only: batches fan out)"""
+        try:
+            endpoint = f"/orders/{order_id}"
+            headers = self._generate_kucoin_headers("DELETE", endpoint)
+            status, data = await self._request_json("DELETE", f"{self.base_url}{endpoint}", headers=headers)
+            if data.get('code') == '200000':
+                return True
+            print(f"❌ KuCoin cancel failed: {data}")
+            return False
+        except Exception as e:
+            print(f"❌ KuCoin cancel error: {e}")
+            return False
+    
+    def create_user_stream(self, exchange_name: str, on_event):
+        return KuCoinUserStream(exchange_name, self, on_event)
+    
+    async def fetch_order_state(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        data = await self.get_order_status(order_id, symbol)
+        if data.get('code') != '200000':
+            return None
+        return self._normalize_order(data['data'])
+    
+    async def get_order_by_client_id(self, client_order_id: str, symbol: str = "") -> Optional[Dict]:
+        endpoint = f"/order/client-order/{client_order_id}"
+        headers = self._generate_kucoin_headers("GET", endpoint)
+        status, data = await self._request_json("GET", f"{self.base_url}{endpoint}", headers=headers)
+        if status == 404 or (data.get('code') == '200000' and not data.get('data')):
+            return None
+        if data.get('code') == '200000':
+            return self._normalize_order(data['data'])
+        raise RuntimeError(f"KuCoin order lookup failed ({status}): {data}")
+    
+    def _normalize_order(self, order: Dict) -> Dict:
+        filled = float(order.get('dealSize', 0))
+        if order.get('isActive'):
+            status = 'PARTIALLY_FILLED' if filled > 0 else 'NEW'
+        elif order.get('cancelExist'):
+            status = 'CANCELED'
+        else:
+            status = 'FILLED'
+        return {
+            'type': 'order',
+            'order_id': order['id'],
+            'client_order_id': order.get('clientOid', ''),
+            'symbol': order['symbol'],
+            'side': order['side'],
+            'status': status,
+            'filled_quantity': filled,
+            'last_fill_quantity': 0.0,
+            'last_fill_price': 0.0,
+            'timestamp': order.get('createdAt', 0) / 1000
+        }
@@ -0,0 +1,180 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from exchanges.circuit_breaker import CircuitOpenError
+from .base_order import BaseOrderExecutor
+
+class OKXOrderExecutor(BaseOrderExecutor):
+    """OKX order execution implementation"""
+
+    # clOrdId: up to 32 letters and digits
+    CLIENT_ID_MAX_LENGTH = 32
+    # /trade/batch-orders and /trade/cancel-batch-orders take up to 20 orders
+    BATCH_LIMIT = 20
+    CANCEL_BATCH_LIMIT = 20
+
+    def __init__(self, api_key: str, api_secret: str, passphrase: str):
+        super().__init__(api_key, api_secret, passphrase)
+        self.api_path = "/api/v5"
+        self.base_url = f"https://www.okx.com{self.api_path}"
+        self.server_time_url = f"{self.base_url}/public/time"
+
+    def parse_server_time(self, data) -> Optional[float]:
+        return int(data['data'][0]['ts']) / 1000 if data.get('code') == '0' else None
+
+    def _generate_okx_headers(self, method: str, endpoint: str, body: str = "") -> Dict:
+        """Generate OKX authentication headers (endpoint includes any query string)"""
+        millis = self.timestamp_ms()
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(millis / 1000)) + f".{millis % 1000:03d}Z"
+        str_to_sign = timestamp + method + self.api_path + endpoint + body
+        signature = base64.b64encode(
+            hmac.new(
+                self.api_secret.encode('utf-8'),
+                str_to_sign.encode('utf-8'),
+                hashlib.sha256
+            ).digest()
+        ).decode('utf-8')
+        return {
+            "OK-ACCESS-KEY": self.api_key,
+            "OK-ACCESS-SIGN": signature,
+            "OK-ACCESS-TIMESTAMP": timestamp,
+            "OK-ACCESS-PASSPHRASE": self.passphrase,
+            "Content-Type": "application/json"
+        }
+
+    async def _signed(self, method: str, endpoint: str, params: Optional[Dict] = None, body=None):
+        if params:
+            endpoint = f"{endpoint}?{urlencode(params)}"
+        payload = json.dumps(body) if body is not None else ""
+        headers = self._generate_okx_headers(method, endpoint, payload)
+        return await self._request_json(method, f"{self.base_url}{endpoint}", data=payload or None, headers=headers)
+
+    @staticmethod
+    def _order_body(order: Dict) -> Dict:
+        return {
+            "instId": order['symbol'],
+            "tdMode": "cash",
+            "side": order['side'].lower(),
+            "ordType": "market",
+            "sz": str(order['quantity']),
+            "tgtCcy": "base_ccy",  # Market buys are sized in quote currency otherwise
+            "clOrdId": order['client_order_id']
+        }
+
+    @staticmethod
+    def _order_result(item: Dict) -> Dict:
+        if item.get('sCode') == '0':
+            return {'success': True, 'order_id': item.get('ordId'), 'status': 'NEW'}
+        return {'success': False, 'error': item.get('sMsg', 'Unknown error'), 'ambiguous': False}
+
+    async def place_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = "") -> Dict:
+        """Place a market order on OKX"""
+        try:
+            order = {'symbol': symbol, 'side': side, 'quantity': quantity,
+                     'client_order_id': client_order_id or self.generate_client_order_id()}
+            status, data = await self._signed("POST", "/trade/order", body=self._order_body(order))
+            if data.get('code') == '0':
+                print(f"✅ OKX {side} order executed: {quantity} {symbol}")
+                # OKX only acknowledges; the fill is confirmed by polling
+                return self._order_result(data['data'][0])
+            print(f"❌ OKX order failed: {data}")
+            items = data.get('data') or [{}]
+            return {
+                'success': False,
+                'error': items[0].get('sMsg') or data.get('msg', 'Unknown error'),
+                'ambiguous': status >= 500
+            }
+        except CircuitOpenError as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            print(f"❌ OKX order error: {e}")
+            return {'success': False, 'error': str(e), 'ambiguous': True}
+
+    async def _place_batch(self, orders: List[Dict]) -> List[Dict]:
+        status, data = await self._signed("POST", "/trade/batch-orders", body=[self._order_body(order) for order in orders])
+        items = data.get('data') or []
+        if len(items) != len(orders):
+            # code 1 = every order failed, with per-order reasons; anything else left nothing to match
+            print(f"❌ OKX batch order failed: {data}")
+            return [{'success': False, 'error': data.get('msg', 'Unknown error'), 'ambiguous': status >= 500}
+                    for _ in orders]
+        print(f"✅ OKX batch of {len(orders)} orders: {sum(item.get('sCode') == '0' for item in items)} accepted")
+        # Items are matched by client id, not position
+        by_client_id = {item.get('clOrdId'): item for item in items}
+        return [self._order_result(by_client_id.get(order['client_order_id'], {})) for order in orders]
+
+    async def get_balance(self, asset: str) -> float:
+        """Get available trading balance from OKX"""
+        try:
+            status, data = await self._signed("GET", "/account/balance", params={'ccy': asset.upper()})
+            if data.get('code') == '0':
+                details = data['data'][0].get('details', []) if data['data'] else []
+                return next((float(d['availBal']) for d in details if d['ccy'] == asset.upper()), 0.0)
+            print(f"❌ OKX balance check failed: {data}")
+            return 0.0
+        except Exception as e:
+            print(f"❌ OKX balance error: {e}")
+            return 0.0
+
+    async def get_order_status(self, order_id: str, symbol: str = "") -> Dict:
+        """Check order status on OKX"""
+        try:
+            status, data = await self._signed("GET", "/trade/order", params={'instId': symbol, 'ordId': order_id})
+            return data
+        except Exception as e:
+            print(f"❌ OKX order status error: {e}")
+            return {}
+
+    async def fetch_order_state(self, order_id: str, symbol: str = "") -> Optional[Dict]:
+        data = await self.get_order_status(order_id, symbol)
+        if data.get('code') != '0' or not data.get('data'):
+            return None
+        return self._normalize_order(data['data'][0])
+
+    async def get_order_by_client_id(self, client_order_id: str, symbol: str = "") -> Optional[Dict]:
+        status, data = await self._signed("GET", "/trade/order", params={'instId': symbol, 'clOrdId': client_order_id})
+        if data.get('code') == '51603':  # Order does not exist
+            return None
+        if data.get('code') == '0' and data.get('data'):
+            return self._normalize_order(data['data'][0])
+        raise RuntimeError(f"OKX order lookup failed ({status}): {data}")
+
+    async def cancel_order(self, order_id: str, symbol: str = "") -> bool:
+        """Cancel an order on OKX"""
+        try:
+            status, data = await self._signed("POST", "/trade/cancel-order", body={'instId': symbol, 'ordId': order_id})
+            if data.get('code') == '0' and data['data'][0].get('sCode') == '0':
+                return True
+            print(f"❌ OKX cancel failed: {data}")
+            return False
+        except Exception as e:
+            print(f"❌ OKX cancel error: {e}")
+            return False
+
+    async def _cancel_batch(self, orders: List[Tuple[str, str]]) -> List[bool]:
+        body = [{'instId': symbol, 'ordId': order_id} for order_id, symbol in orders]
+        status, data = await self._signed("POST", "/trade/cancel-batch-orders", body=body)
+        cancelled = {item.get('ordId') for item in data.get('data') or [] if item.get('sCode') == '0'}
+        if len(cancelled) < len(orders):
+            print(f"❌ OKX batch cancel: {len(orders) - len(cancelled)} of {len(orders)} failed: {data.get('msg')}")
+        return [order_id in cancelled for order_id, _ in orders]
+
+    def _normalize_order(self, order: Dict) -> Dict:
+        statuses = {'live': 'NEW', 'partially_filled': 'PARTIALLY_FILLED', 'filled': 'FILLED',
+                    'canceled': 'CANCELED', 'mmp_canceled': 'CANCELED'}
+        return {
+            'type': 'order',
+            'order_id': order['ordId'],
+            'client_order_id': order.get('clOrdId', ''),
+            'symbol': order['instId'],
+            'side': order['side'],
+            'status': statuses.get(order.get('state'), 'NEW'),
+            'filled_quantity': float(order.get('accFillSz') or 0),
+            'last_fill_quantity': float(order.get('fillSz') or 0),
+            'last_fill_price': float(order.get('fillPx') or 0),
+            'timestamp': int(order.get('uTime') or 0) / 1000
+        }
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import random
+import time
+import aiohttp
+from typing import Callable, Dict, Optional
+
+# Normalised order statuses pushed to the order tracker
+TERMINAL_STATUSES = ("FILLED", "CANCELED", "REJECTED", "EXPIRED")
+
+class UserDataStream:
+    """Base class for a private WebSocket stream pushing order and balance events.
+
+    Subclasses translate exchange messages into normalised events:
+        {"type": "order", "exchange", "order_id", "client_order_id", "symbol", "side",
+         "status", "filled_quantity", "last_fill_quantity", "last_fill_price", "timestamp"}
+        {"type": "balance", "exchange", "asset", "free", "locked", "timestamp"}
+    and hand them to on_event. The stream reconnects with backoff until stopped.
+    """
+
+    def __init__(self, exchange_name: str, executor, on_event: Callable[[Dict], None]):
+        self.exchange_name = exchange_name
+        self.executor = executor
+        self.on_event = on_event
+        self.task: Optional[asyncio.Task] = None
+        self.connected = asyncio.Event()
+        self.last_message_time = 0.0
+        self.reconnects = 0
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.connected.clear()
+
+    async def _run(self):
+        delay = 1.0
+        while True:
+            try:
+                await self._listen()
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  {self.exchange_name} user stream error: {e}")
+            self.connected.clear()
+            self.reconnects += 1
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, 60.0)
+
+    async def _listen(self):
+        raise NotImplementedError
+
+    def _dispatch(self, event: Dict):
+        self.last_message_time = time.time()
+        event["exchange"] = self.exchange_name
+        try:
+            self.on_event(event)
+        except Exception as e:
+            print(f"❌ Error handling {self.exchange_name} user event: {e}")
+
+
+class BinanceUserStream(UserDataStream):
+    """Binance spot user-data stream (listenKey)"""
+
+    WS_URL = "wss://stream.binance.com:9443/ws"
+    KEEPALIVE_INTERVAL = 30 * 60
+
+    async def _listen_key(self, method: str, listen_key: str = "") -> Dict:
+        session = await self.executor.get_session()
+        params = {'listenKey': listen_key} if listen_key else None
+        async with session.request(
+            method,
+            f"{self.executor.base_url}/userDataStream",
+            params=params,
+            headers={'X-MBX-APIKEY': self.executor.api_key}
+        ) as response:
+            data = await response.json()
+            if response.status != 200:
+                raise RuntimeError(f"listenKey {method} failed: {data}")
+            return data
+
+    async def _keepalive(self, listen_key: str):
+        while True:
+            await asyncio.sleep(self.KEEPALIVE_INTERVAL)
+            await self._listen_key("PUT", listen_key)
+
+    async def _listen(self):
+        listen_key = (await self._listen_key("POST"))['listenKey']
+        session = await self.executor.get_session()
+        keepalive = asyncio.create_task(self._keepalive(listen_key))
+        try:
+            async with session.ws_connect(f"{self.WS_URL}/{listen_key}", heartbeat=60) as ws:
+                self.connected.set()
+                async for message in ws:
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        break
+                    self._handle(json.loads(message.data))
+        finally:
+            keepalive.cancel()
+
+    def _handle(self, data: Dict):
+        event_type = data.get('e')
+        if event_type == 'executionReport':
+            self._dispatch({
+                'type': 'order',
+                'order_id': str(data['i']),
+                'client_order_id': data.get('c', ''),
+                'symbol': data['s'],
+                'side': data['S'].lower(),
+                'status': data['X'],
+                'filled_quantity': float(data['z']),
+                'last_fill_quantity': float(data['l']),
+                'last_fill_price': float(data['L']),
+                'timestamp': data['E'] / 1000
+            })
+        elif event_type == 'outboundAccountPosition':
+            for balance in data.get('B', []):
+                self._dispatch({
+                    'type': 'balance',
+                    'asset': balance['a'],
+                    'free': float(balance['f']),
+                    'locked': float(balance['l']),
+                    'timestamp': data['E'] / 1000
+                })
+        elif event_type == 'listenKeyExpired':
+            raise RuntimeError("listenKey expired")
+
+
+class KuCoinUserStream(UserDataStream):
+    """KuCoin private channels (order changes and balance)"""
+
+    TOPICS = ("/spotMarket/tradeOrdersV2", "/account/balance")
+    STATUSES = {"filled": "FILLED", "canceled": "CANCELED", "match": "PARTIALLY_FILLED", "open": "NEW"}
+
+    async def _bullet(self) -> Dict:
+        endpoint = "/bullet-private"
+        headers = self.executor._generate_kucoin_headers("POST", endpoint)
+        session = await self.executor.get_session()
+        async with session.post(f"{self.executor.base_url}{endpoint}", headers=headers) as response:
+            data = await response.json()
+            if data.get('code') != '200000':
+                raise RuntimeError(f"bullet-private failed: {data}")
+            return data['data']
+
+    async def _ping(self, ws, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await ws.send_json({"id": str(int(time.time() * 1000)), "type": "ping"})
+
+    async def _listen(self):
+        bullet = await self._bullet()
+        server = bullet['instanceServers'][0]
+        connect_id = str(int(time.time() * 1000))
+        session = await self.executor.get_session()
+        async with session.ws_connect(f"{server['endpoint']}?token={bullet['token']}&connectId={connect_id}") as ws:
+            for i, topic in enumerate(self.TOPICS):
+                await ws.send_json({
+                    "id": f"{connect_id}-{i}",
+                    "type": "subscribe",
+                    "topic": topic,
+                    "privateChannel": True,
+                    "response": True
+                })
+            self.connected.set()
+            pinger = asyncio.create_task(self._ping(ws, server.get('pingInterval', 18000) / 1000))
+            try:
+                async for message in ws:
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        break
+                    self._handle(json.loads(message.data))
+            finally:
+                pinger.cancel()
+
+    def _handle(self, message: Dict):
+        if message.get('type') != 'message':
+            return
+        data = message.get('data', {})
+        if message.get('topic') == "/spotMarket/tradeOrdersV2":
+            status = self.STATUSES.get(data.get('type'))
+            if status is None:
+                return
+            self._dispatch({
+                'type': 'order',
+                'order_id': data['orderId'],
+                'client_order_id': data.get('clientOid', ''),
+                'symbol': data['symbol'],
+                'side': data['side'],
+                'status': status,
+                'filled_quantity': float(data.get('filledSize', 0)),
+                'last_fill_quantity': float(data.get('matchSize', 0)),
+                'last_fill_price': float(data.get('matchPrice', 0)),
+                'timestamp': data.get('ts', 0) / 1e9
+            })
+        elif message.get('subject') == "account.balance":
+            self._dispatch({
+                'type': 'balance',
+                'asset': data['currency'],
+                'free': float(data['available']),
+                'locked': float(data['hold']),
+                'timestamp': float(data.get('time', 0)) / 1000
+            })
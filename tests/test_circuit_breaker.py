@@ -0,0 +1,85 @@
+import pytest
+from exchanges import circuit_breaker
+from exchanges.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic, and jitter pinned to the full delay"""
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(circuit_breaker.random, "uniform", lambda low, high: high)
+    return now
+
+
+def test_trips_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, base_delay=1.0)
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.allow_request()
+    assert breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+    assert breaker.retry_in() == 1.0
+    assert breaker.describe() == "open (1.0s)"
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    assert not breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, base_delay=1.0)
+    breaker.record_failure()
+    clock[0] += 1.0
+    assert not breaker.is_open()
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.trips == 0
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_failed_trial_reopens_with_a_longer_delay(clock):
+    breaker = CircuitBreaker(failure_threshold=1, base_delay=1.0, max_delay=3.0)
+    breaker.record_failure()
+    for expected in (2.0, 3.0, 3.0):
+        clock[0] += breaker.retry_in()
+        assert breaker.allow_request()
+        assert breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.retry_in() == expected
+
+
+def test_jitter_stays_within_half_to_full_delay(monkeypatch):
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: 1000.0)
+    for _ in range(50):
+        breaker = CircuitBreaker(failure_threshold=1, base_delay=4.0)
+        breaker.record_failure()
+        assert 2.0 <= breaker.retry_in() <= 4.0
+
+
+def test_retry_after_is_honoured(clock):
+    breaker = CircuitBreaker(failure_threshold=1, base_delay=1.0)
+    breaker.record_failure(retry_after=30.0)
+    assert breaker.retry_in() == 30.0
+    clock[0] += 29.0
+    assert not breaker.allow_request()
+
+
+def test_release_frees_the_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, base_delay=1.0)
+    breaker.record_failure()
+    clock[0] += 1.0
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
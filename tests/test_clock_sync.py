@@ -0,0 +1,64 @@
+from email.utils import formatdate
+import pytest
+from order_execution.clock_sync import ClockSync
+
+
+def test_offset_from_one_sample():
+    clock = ClockSync()
+    clock.observe(sent=100.0, received=100.2, server_time=100.6)
+    assert clock.offset == pytest.approx(0.5)
+    assert clock.rtt == pytest.approx(0.2)
+    assert clock.synced
+
+
+def test_minimum_round_trip_sample_wins():
+    clock = ClockSync(window=4)
+    clock.observe(100.0, 100.1, 100.55)   # offset 0.5, rtt 0.1
+    clock.observe(101.0, 101.8, 102.9)    # offset 1.5, rtt 0.8: a queued response
+    assert clock.offset == pytest.approx(0.5)
+    clock.observe(102.0, 102.02, 102.21)  # offset 0.2, rtt 0.02
+    assert clock.offset == pytest.approx(0.2)
+    assert clock.rtt == pytest.approx(0.02)
+
+
+def test_best_sample_leaves_the_window():
+    clock = ClockSync(window=2)
+    clock.observe(100.0, 100.01, 100.505)  # rtt 0.01
+    clock.observe(101.0, 101.3, 101.45)    # rtt 0.3
+    clock.observe(102.0, 102.2, 102.4)     # rtt 0.2, pushes the best one out
+    assert clock.rtt == pytest.approx(0.2)
+    assert clock.offset == pytest.approx(0.3)
+
+
+def test_old_samples_expire_after_max_age():
+    clock = ClockSync(window=8, max_age=60)
+    clock.observe(100.0, 100.01, 100.505)  # precise but old
+    clock.observe(200.0, 200.4, 201.2)     # 100s later, rtt 0.4
+    assert clock.rtt == pytest.approx(0.4)
+    assert clock.offset == pytest.approx(1.0)
+
+
+def test_date_header_samples_until_a_precise_one_exists():
+    clock = ClockSync()
+    assert not clock.synced
+    clock.observe_date_header(100.0, 100.2, formatdate(102.0, usegmt=True))
+    # Second resolution: centred half a second later, with a 1s round-trip penalty
+    assert clock.offset == pytest.approx(102.5 - 100.1)
+    assert clock.rtt == pytest.approx(1.2)
+    assert not clock.synced
+
+    clock.observe(101.0, 101.1, 101.55)
+    assert clock.synced
+    assert clock.offset == pytest.approx(0.5)
+    # Once synced, Date headers are ignored entirely
+    clock.observe_date_header(102.0, 102.1, formatdate(200.0, usegmt=True))
+    assert len(clock.samples) == 2
+    assert clock.offset == pytest.approx(0.5)
+
+
+def test_bad_date_headers_are_ignored():
+    clock = ClockSync()
+    clock.observe_date_header(100.0, 100.1, None)
+    clock.observe_date_header(100.0, 100.1, "not a date")
+    assert not clock.samples
+    assert clock.describe() == "unsynced (local clock)"
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+from core.arbitrage_bot import ArbitrageBot
+from core.config_watcher import ConfigWatcher
+from exchanges.circuit_breaker import CircuitBreaker
+from exchanges.response_cache import ResponseCache
+
+BASE_CONFIG = {
+    "exchanges": {"binance": {"enabled": True}, "kraken": {"enabled": True}, "okx": {"enabled": False}},
+    "trading_pairs": ["BTC-USDT", "ETH-USDT"],
+    "min_spread_percentage": 0.5,
+    "update_interval": 5,
+    "max_opportunities": 10,
+    "live_trading": {"enabled": False, "max_trade_size": 100},
+    "state": {"enabled": False},
+}
+
+
+def write_config(path, config, mtime=None):
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def edited(**changes):
+    config = json.loads(json.dumps(BASE_CONFIG))
+    config.update(changes)
+    return config
+
+
+class FakeExchange:
+    FILTER_THRESHOLD = 50
+
+    def __init__(self, name):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self.response_cache = ResponseCache()
+        self.closed = False
+        self.warmed_up = False
+
+    async def warm_up(self):
+        self.warmed_up = True
+
+    async def close_session(self):
+        self.closed = True
+
+
+def make_bot(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    write_config(path, BASE_CONFIG)
+    monkeypatch.setattr(ArbitrageBot, "create_exchange", lambda self, name, config: FakeExchange(name))
+    bot = ArbitrageBot(str(path))
+    bot.engine = bot.create_engine()
+    return bot
+
+
+# --- ConfigWatcher --------------------------------------------------------
+
+def test_poll_returns_a_changed_file_once(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, BASE_CONFIG, mtime=1000)
+    watcher = ConfigWatcher(str(path), interval=0)
+    assert watcher.poll() is None
+
+    write_config(path, edited(min_spread_percentage=0.7), mtime=1001)
+    assert watcher.poll()["min_spread_percentage"] == 0.7
+    assert watcher.poll() is None
+    assert watcher.reloads == 1
+
+
+def test_poll_waits_for_the_interval(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, BASE_CONFIG, mtime=1000)
+    watcher = ConfigWatcher(str(path), interval=3600)
+    watcher.poll()
+    write_config(path, edited(update_interval=3), mtime=1001)
+    assert watcher.poll() is None
+
+
+def test_poll_ignores_invalid_json_until_the_next_save(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, BASE_CONFIG, mtime=1000)
+    watcher = ConfigWatcher(str(path), interval=0)
+    path.write_text('{"exchanges": ')
+    os.utime(path, (1001, 1001))
+    assert watcher.poll() is None
+    assert watcher.poll() is None
+    write_config(path, edited(update_interval=3), mtime=1002)
+    assert watcher.poll()["update_interval"] == 3
+
+
+def test_poll_ignores_a_config_missing_required_keys(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, BASE_CONFIG, mtime=1000)
+    watcher = ConfigWatcher(str(path), interval=0)
+    broken = edited()
+    del broken["trading_pairs"]
+    write_config(path, broken, mtime=1001)
+    assert watcher.poll() is None
+    assert watcher.reloads == 0
+
+
+def test_validate():
+    assert ConfigWatcher.validate(BASE_CONFIG) == []
+    missing = edited()
+    del missing["min_spread_percentage"]
+    assert ConfigWatcher.validate(missing) == ["min_spread_percentage is missing"]
+    assert ConfigWatcher.validate(edited(update_interval="5")) == ["update_interval has the wrong type (str)"]
+    assert ConfigWatcher.validate(edited(max_opportunities=True))
+    assert ConfigWatcher.validate(edited(trading_pairs=["BTC-USDT", 5]))
+    assert ConfigWatcher.validate(edited(exchanges={"binance": True}))
+    assert ConfigWatcher.validate(edited(live_trading="yes"))
+    assert ConfigWatcher.validate([]) == ["not a JSON object"]
+
+
+def test_changed_sections():
+    new = edited(min_spread_percentage=0.7, scheduler={"enabled": True})
+    assert ConfigWatcher.changed_sections(BASE_CONFIG, new) == ["min_spread_percentage", "scheduler"]
+    assert ConfigWatcher.changed_sections(BASE_CONFIG, edited()) == []
+
+
+def test_needs_restart():
+    new = edited(runtime={"event_loop": "uvloop"}, live_trading={"enabled": False, "max_trade_size": 50},
+                 min_spread_percentage=0.7)
+    sections = ConfigWatcher.changed_sections(BASE_CONFIG, new)
+    # live_trading is reloadable apart from its enabled flag
+    assert ConfigWatcher.needs_restart(sections, BASE_CONFIG, new) == ["runtime"]
+
+    going_live = edited(live_trading={"enabled": True, "max_trade_size": 100})
+    sections = ConfigWatcher.changed_sections(BASE_CONFIG, going_live)
+    assert ConfigWatcher.needs_restart(sections, BASE_CONFIG, going_live) == ["live_trading.enabled"]
+
+
+# --- ArbitrageBot.reload_config -------------------------------------------
+
+def test_reload_adds_and_removes_exchanges_and_pairs(tmp_path, monkeypatch):
+    bot = make_bot(tmp_path, monkeypatch)
+    kraken = bot.exchanges["kraken"]
+    new = edited(exchanges={"binance": {"enabled": True}, "kraken": {"enabled": False}, "okx": {"enabled": True}},
+                 trading_pairs=["BTC-USDT", "SOL-USDT"], circuit_breaker={"failure_threshold": 7})
+    asyncio.run(bot.reload_config(new))
+
+    assert set(bot.exchanges) == {"binance", "okx"}
+    assert kraken.closed
+    assert bot.exchanges["okx"].warmed_up
+    assert bot.config["trading_pairs"] == ["BTC-USDT", "SOL-USDT"]
+    assert all(exchange.breaker.failure_threshold == 7 for exchange in bot.exchanges.values())
+
+
+def test_reload_keeps_live_trading_off_until_restart(tmp_path, monkeypatch):
+    bot = make_bot(tmp_path, monkeypatch)
+    asyncio.run(bot.reload_config(edited(live_trading={"enabled": True, "max_trade_size": 25})))
+    assert bot.config["live_trading"] == {"enabled": False, "max_trade_size": 25}
+    assert bot.live_trader.max_trade_size == 25
+
+
+def test_reload_refuses_an_invalid_config(tmp_path, monkeypatch):
+    bot = make_bot(tmp_path, monkeypatch)
+    running = bot.config
+    broken = edited(update_interval="5", exchanges={"okx": {"enabled": True}})
+    del broken["min_spread_percentage"]
+    asyncio.run(bot.reload_config(broken))
+    assert bot.config is running
+    assert set(bot.exchanges) == {"binance", "kraken"}
+    assert bot.engine.min_spread == 0.5
+
+
+def test_reload_rolls_back_when_applying_fails(tmp_path, monkeypatch):
+    bot = make_bot(tmp_path, monkeypatch)
+    running = bot.config
+    kraken = bot.exchanges["kraken"]
+    apply_config = bot.engine.apply_config
+
+    def apply_running_config_only(old_config):
+        if bot.config is not running:
+            raise KeyError("boom")
+        apply_config(old_config)
+
+    monkeypatch.setattr(bot.engine, "apply_config", apply_running_config_only)
+    new = edited(exchanges={"binance": {"enabled": True}, "okx": {"enabled": True}},
+                 circuit_breaker={"failure_threshold": 7})
+    asyncio.run(bot.reload_config(new))
+
+    assert bot.config is running
+    assert set(bot.exchanges) == {"binance", "kraken"}
+    assert bot.exchanges["kraken"] is kraken and not kraken.closed
+    assert bot.engine.min_spread == 0.5
+    assert all(exchange.breaker.failure_threshold == 3 for exchange in bot.exchanges.values())
@@ -0,0 +1,68 @@
+import pytest
+from core.depth_sizer import NO_SIZE, max_executable_size
+from models.order_book import OrderBook
+
+
+def book(bids=(), asks=(), exchange="binance"):
+    return OrderBook.from_levels(exchange, "BTC-USDT", bids, asks, timestamp=1.0)
+
+
+def test_from_levels_sorts_parses_and_drops_empty_levels():
+    # REST payloads: strings, unsorted, extra fields (Kraken's timestamp), zero-size levels
+    ob = book(bids=[["99.5", "1.0"], ["100", "2", 1700000000], ["98", "0"]],
+              asks=[["101.5", "3"], ["101", "0.5", 1700000000], ["102", "0.0"]])
+    assert list(ob.bid_prices) == [100.0, 99.5] and list(ob.bid_sizes) == [2.0, 1.0]
+    assert list(ob.ask_prices) == [101.0, 101.5] and list(ob.ask_sizes) == [0.5, 3.0]
+    assert (ob.best_bid, ob.best_ask) == (100.0, 101.0)
+    assert len(ob) == 2
+    empty = book()
+    assert (empty.best_bid, empty.best_ask, len(empty)) == (0.0, 0.0, 0)
+
+
+def test_walks_every_profitable_level():
+    buy = book(asks=[[100, 1], [101, 1], [102, 5]])
+    sell = book(bids=[[103, 0.5], [102, 2]], exchange="kraken")
+    size = max_executable_size(buy, sell, 0.0, 0.0, 0.0)
+    # 0.5 @100/103, 0.5 @100/102, 1 @101/102, then 0.5 @102/102 until the bids run out
+    assert size.quantity == pytest.approx(2.5)
+    assert size.notional == pytest.approx(50 + 50 + 101 + 51)
+    assert size.buy_vwap == pytest.approx(252 / 2.5)
+    assert size.sell_vwap == pytest.approx(255.5 / 2.5)
+
+
+def test_stops_exactly_where_the_margin_runs_out():
+    buy = book(asks=[[100, 1], [104, 10]])
+    sell = book(bids=[[103, 10]], exchange="kraken")
+    size = max_executable_size(buy, sell, 0.0, 0.0, 0.0)
+    # +3 on the first unit is spent by 3 units at -1 each
+    assert size.quantity == pytest.approx(4.0)
+    assert size.buy_vwap == pytest.approx(size.sell_vwap)
+
+
+def test_fees_and_threshold_bound_the_vwap_spread():
+    buy = book(asks=[[100, 1], [100.5, 2], [102, 5]])
+    sell = book(bids=[[102, 1], [101.2, 3], [100.8, 5]], exchange="kraken")
+    buy_fee, sell_fee, min_net = 0.001, 0.001, 0.1
+    size = max_executable_size(buy, sell, buy_fee, sell_fee, min_net)
+    assert 0 < size.quantity < 8
+    revenue, cost = size.sell_vwap * size.quantity, size.notional
+    assert revenue * (1 - sell_fee) - cost * (1 + buy_fee + min_net / 100) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_notional_cap():
+    buy = book(asks=[[100, 1], [101, 1]])
+    sell = book(bids=[[110, 5]], exchange="kraken")
+    size = max_executable_size(buy, sell, 0.0, 0.0, 0.0, max_notional=150)
+    assert size.notional == pytest.approx(150)
+    assert size.quantity == pytest.approx(1 + 50 / 101)
+
+
+@pytest.mark.parametrize("buy, sell", [
+    (book(), book(bids=[[110, 1]])),
+    (book(asks=[[100, 1]]), book()),
+    (book(bids=[[99, 1]]), book(asks=[[110, 1]])),   # one-sided: no asks to buy, no bids to sell
+    (book(asks=[[100, 1]]), book(bids=[[99, 1]])),   # no spread
+    (book(asks=[[100, 1]]), book(bids=[[100.15, 1]])),  # spread smaller than the fees
+])
+def test_nothing_executable(buy, sell):
+    assert max_executable_size(buy, sell, 0.001, 0.001, 0.0) == NO_SIZE
@@ -0,0 +1,189 @@
+import asyncio
+import time
+from core.execution_scheduler import ExecutionScheduler
+from models.data_models import ArbitrageOpportunity
+
+
+class FakeTrader:
+    """Stand-in for LiveTrader whose trades stay in flight until released.
+
+    Balances are per (exchange, asset). While `gate` is set to an unset
+    event every trade waits on it, so tests can look at reservations while
+    trades run; then each succeeds or raises its pair's error.
+    """
+
+    def __init__(self, balances, trade_size=100.0, stale=()):
+        self.balances = balances
+        self.trade_size = trade_size
+        self.stale = set(stale)
+        self.executed = []
+        self.gate = None
+        self.errors = {}
+
+    async def check_balance(self, exchange_name, asset):
+        return self.balances.get((exchange_name, asset), 0.0)
+
+    def quotes_fresh(self, opportunity, quiet=False):
+        return opportunity.pair not in self.stale
+
+    def trade_size_for(self, opportunity):
+        return self.trade_size
+
+    async def execute_live_trade(self, opportunity, manual_approval=True, trade_size=None):
+        self.executed.append((opportunity.pair, opportunity.buy_exchange, opportunity.sell_exchange, trade_size))
+        if self.gate is not None:
+            await self.gate.wait()
+        if opportunity.pair in self.errors:
+            raise RuntimeError(self.errors[opportunity.pair])
+        return True
+
+
+def opportunity(pair, buy="binance", sell="kraken", profit=1.0, buy_price=100.0):
+    return ArbitrageOpportunity(
+        pair=pair, buy_exchange=buy, sell_exchange=sell,
+        buy_price=buy_price, sell_price=buy_price * 1.01, spread=buy_price * 0.01, spread_percentage=1.0,
+        timestamp=time.time(), actual_profit_percentage=profit
+    )
+
+
+def plenty(*exchanges, assets=("USDT", "BTC", "ETH", "SOL")):
+    return {(exchange, asset): 1000.0 for exchange in exchanges for asset in assets}
+
+
+async def finish_all(scheduler, trader):
+    if trader.gate is not None:
+        trader.gate.set()
+    await scheduler.drain()
+
+
+def test_reserves_while_in_flight_and_releases_on_success():
+    trader = FakeTrader(plenty("binance", "kraken"))
+    scheduler = ExecutionScheduler(trader, max_in_flight=3, max_exposure=1000)
+
+    async def run():
+        trader.gate = asyncio.Event()
+        assert await scheduler.schedule([opportunity("BTC-USDT", buy_price=50.0)], manual_approval=False) == 1
+        await asyncio.sleep(0)
+        assert scheduler.reservations.reserved == {("binance", "USDT"): 100.0, ("kraken", "BTC"): 2.0}
+        assert scheduler.exposure == 100.0
+        assert scheduler.busy_legs == {("binance", "BTC-USDT"), ("kraken", "BTC-USDT")}
+        await finish_all(scheduler, trader)
+
+    asyncio.run(run())
+    assert trader.executed == [("BTC-USDT", "binance", "kraken", 100.0)]
+    assert scheduler.reservations.reserved == {}
+    assert scheduler.exposure == 0.0
+    assert scheduler.busy_legs == set() and scheduler.in_flight == {}
+
+
+def test_releases_when_the_trade_fails():
+    trader = FakeTrader(plenty("binance", "kraken"))
+    trader.errors["BTC-USDT"] = "exchange down"
+    scheduler = ExecutionScheduler(trader, max_exposure=1000)
+
+    async def run():
+        trader.gate = asyncio.Event()
+        await scheduler.schedule([opportunity("BTC-USDT")], manual_approval=False)
+        await asyncio.sleep(0)
+        assert scheduler.reservations.reserved
+        await finish_all(scheduler, trader)
+
+    asyncio.run(run())
+    assert scheduler.reservations.reserved == {}
+    assert scheduler.exposure == 0.0
+    assert scheduler.busy_legs == set() and scheduler.in_flight == {}
+
+
+def test_trades_sharing_a_leg_do_not_run_together():
+    trader = FakeTrader(plenty("binance", "kraken", "okx"))
+    scheduler = ExecutionScheduler(trader, max_exposure=1000)
+    opportunities = [opportunity("BTC-USDT", "binance", "kraken"), opportunity("BTC-USDT", "okx", "kraken"),
+                     opportunity("ETH-USDT", "binance", "kraken")]
+
+    async def run():
+        trader.gate = asyncio.Event()
+        started = await scheduler.schedule(opportunities, manual_approval=False)
+        await finish_all(scheduler, trader)
+        return started
+
+    assert asyncio.run(run()) == 2
+    assert [(pair, buy) for pair, buy, _, _ in trader.executed] == [("BTC-USDT", "binance"), ("ETH-USDT", "binance")]
+
+
+def test_trades_sharing_an_asset_only_get_what_is_left():
+    # 150 USDT on binance: the first trade reserves 100, the second would need another 100
+    trader = FakeTrader({("binance", "USDT"): 150.0, ("kraken", "BTC"): 10.0, ("kraken", "ETH"): 10.0,
+                         ("okx", "SOL"): 10.0, ("bybit", "USDT"): 500.0})
+    scheduler = ExecutionScheduler(trader, max_exposure=1000)
+    opportunities = [opportunity("BTC-USDT", "binance", "kraken"), opportunity("ETH-USDT", "binance", "kraken"),
+                     opportunity("SOL-USDT", "bybit", "okx")]
+
+    async def run():
+        trader.gate = asyncio.Event()
+        started = await scheduler.schedule(opportunities, manual_approval=False)
+        await asyncio.sleep(0)
+        reserved = dict(scheduler.reservations.reserved)
+        await finish_all(scheduler, trader)
+        return started, reserved
+
+    started, reserved = asyncio.run(run())
+    assert started == 2
+    assert [pair for pair, *_ in trader.executed] == ["BTC-USDT", "SOL-USDT"]
+    assert reserved[("binance", "USDT")] == 100.0
+
+
+def test_short_base_on_the_sell_exchange_is_skipped():
+    trader = FakeTrader({("binance", "USDT"): 1000.0, ("kraken", "BTC"): 0.5})
+    scheduler = ExecutionScheduler(trader, max_exposure=1000)
+
+    async def run():
+        return await scheduler.schedule([opportunity("BTC-USDT")], manual_approval=False)
+
+    assert asyncio.run(run()) == 0
+    assert scheduler.reservations.reserved == {}
+
+
+def test_max_exposure_and_max_in_flight_cap_admissions():
+    trader = FakeTrader(plenty("binance", "kraken", "okx", "bybit"))
+    opportunities = [opportunity("BTC-USDT", "binance", "kraken"), opportunity("ETH-USDT", "okx", "bybit"),
+                     opportunity("SOL-USDT", "binance", "okx")]
+
+    async def run(scheduler):
+        trader.gate = asyncio.Event()
+        started = await scheduler.schedule(opportunities, manual_approval=False)
+        exposure = scheduler.exposure
+        await finish_all(scheduler, trader)
+        return started, exposure
+
+    assert asyncio.run(run(ExecutionScheduler(trader, max_in_flight=3, max_exposure=250))) == (2, 200.0)
+    assert asyncio.run(run(ExecutionScheduler(trader, max_in_flight=1, max_exposure=1000))) == (1, 100.0)
+
+
+def test_stale_and_unprofitable_opportunities_reserve_nothing():
+    trader = FakeTrader(plenty("binance", "kraken"), stale=["BTC-USDT"])
+    scheduler = ExecutionScheduler(trader, max_exposure=1000, min_profit_percentage=0.3)
+    opportunities = [opportunity("BTC-USDT"), opportunity("ETH-USDT", profit=0.1), opportunity("SOL-USDT")]
+
+    async def run():
+        trader.gate = asyncio.Event()
+        started = await scheduler.schedule(opportunities, manual_approval=False)
+        reserved = dict(scheduler.reservations.reserved)
+        await finish_all(scheduler, trader)
+        return started, reserved
+
+    started, reserved = asyncio.run(run())
+    assert started == 1
+    assert [pair for pair, *_ in trader.executed] == ["SOL-USDT"]
+    assert set(reserved) == {("binance", "USDT"), ("kraken", "SOL")}
+
+
+def test_manual_approval_runs_one_trade_at_a_time():
+    trader = FakeTrader(plenty("binance", "kraken", "okx", "bybit"))
+    scheduler = ExecutionScheduler(trader, max_exposure=1000)
+
+    async def run():
+        return await scheduler.schedule([opportunity("BTC-USDT", "binance", "kraken"),
+                                         opportunity("ETH-USDT", "okx", "bybit")], manual_approval=True)
+
+    assert asyncio.run(run()) == 2
+    assert scheduler.in_flight == {} and scheduler.exposure == 0.0
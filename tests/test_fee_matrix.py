@@ -0,0 +1,68 @@
+import pytest
+from core.fee_calculator import FeeSchedule
+
+EXCHANGES = ("binance", "kucoin", "okx", "newexchange")
+PAIRS = ("BTC-USDT", "ETH-USDT", "SOL-USDT")
+
+
+def test_defaults_follow_exchange_fees():
+    matrix = FeeSchedule().compile(EXCHANGES, PAIRS)
+    assert matrix.taker_fee("binance", "BTC-USDT") == 0.0010
+    assert matrix.maker_fee("okx", "SOL-USDT") == 0.0008
+    assert matrix.taker_fee("newexchange", "ETH-USDT") == 0.002
+
+
+def test_tiers_volume_discount_and_overrides():
+    schedule = FeeSchedule({
+        "binance": {
+            "volume_30d": 2500000,
+            "tiers": [[1000000, 0.0009, 0.0010], [0, 0.0010, 0.0010], [5000000, 0.0008, 0.0009]],
+            "use_discount_token": True,
+            "pair_overrides": {"BTC-USDT": {"maker": 0.0, "taker": 0.0004}},
+        },
+        "kucoin": {"use_discount_token": True},
+    })
+    matrix = schedule.compile(EXCHANGES, PAIRS)
+    # Second tier (unsorted in config), then the 25% BNB discount
+    assert matrix.maker_fee("binance", "ETH-USDT") == pytest.approx(0.0009 * 0.75)
+    assert matrix.taker_fee("binance", "ETH-USDT") == pytest.approx(0.0010 * 0.75)
+    assert matrix.maker_fee("binance", "BTC-USDT") == 0.0
+    assert matrix.taker_fee("binance", "BTC-USDT") == pytest.approx(0.0004 * 0.75)
+    assert matrix.taker_fee("kucoin", "SOL-USDT") == pytest.approx(0.0010 * 0.80)
+    # Every entry agrees with the slow path
+    for exchange in EXCHANGES:
+        for pair in PAIRS:
+            assert (matrix.maker_fee(exchange, pair), matrix.taker_fee(exchange, pair)) == \
+                pytest.approx(schedule.get_fees(exchange, pair))
+
+
+def test_every_change_bumps_the_version():
+    schedule = FeeSchedule({"binance": {}})
+    versions = [schedule.version]
+    schedule.set_volume("binance", 6000000)
+    versions.append(schedule.version)
+    schedule.set_discount_token("okx", True)
+    versions.append(schedule.version)
+    schedule.set_pair_override("binance", "ETH-USDT", 0.0, 0.0)
+    versions.append(schedule.version)
+    assert versions == sorted(set(versions))
+    matrix = schedule.compile(EXCHANGES, PAIRS)
+    assert matrix.version == schedule.version
+    assert matrix.taker_fee("binance", "ETH-USDT") == 0.0
+    # okx has no discount token
+    assert matrix.taker_fee("okx", "BTC-USDT") == 0.0008
+
+
+def test_subset_keeps_the_fees_of_its_pairs():
+    schedule = FeeSchedule({"binance": {"pair_overrides": {"SOL-USDT": {"maker": 0.0001, "taker": 0.0002}}}})
+    matrix = schedule.compile(EXCHANGES, PAIRS)
+    subset = matrix.subset(["SOL-USDT", "BTC-USDT"])
+    assert subset.pairs == ("SOL-USDT", "BTC-USDT")
+    assert subset.version == matrix.version
+    assert len(subset.taker) == len(EXCHANGES) * 2
+    for exchange in EXCHANGES:
+        for pair in subset.pairs:
+            assert subset.maker_fee(exchange, pair) == matrix.maker_fee(exchange, pair)
+            assert subset.taker_fee(exchange, pair) == matrix.taker_fee(exchange, pair)
+    with pytest.raises(KeyError):
+        subset.taker_fee("binance", "ETH-USDT")
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from order_execution.base_order import BaseOrderExecutor
+
+
+class SlowExchange(BaseOrderExecutor):
+    """Fake exchange whose order requests land `land_after` seconds after being sent.
+
+    Like Binance's newClientOrderId, a client id only blocks a resubmit while
+    the order is open, so every landed request is a separate fill.
+    """
+
+    def __init__(self, response_time, land_after, lookup_error=None):
+        super().__init__("key", "secret")
+        self.response_time = response_time
+        self.land_after = land_after
+        self.lookup_error = lookup_error
+        self.sent = []
+        self.fills = []
+        self.lookups = 0
+
+    async def place_market_order(self, symbol, side, quantity, client_order_id=""):
+        self.sent.append(time.monotonic())
+        asyncio.get_running_loop().call_later(self.land_after, self.fills.append, client_order_id)
+        await asyncio.sleep(self.response_time)
+        return {'success': True, 'order_id': len(self.sent), 'status': 'FILLED'}
+
+    async def get_order_by_client_id(self, client_order_id, symbol=""):
+        self.lookups += 1
+        if self.lookup_error:
+            raise RuntimeError(self.lookup_error)
+        if client_order_id not in self.fills:
+            return None
+        return {'order_id': '1', 'status': 'FILLED', 'filled_quantity': 1.0}
+
+    async def get_balance(self, asset):
+        return 0.0
+
+    async def get_order_status(self, order_id, symbol=""):
+        return {}
+
+
+async def settle_pending(executor):
+    # Let any request still in flight land before counting fills
+    await asyncio.sleep(executor.land_after + 0.05)
+
+
+def test_fast_order_is_placed_once():
+    async def run():
+        executor = SlowExchange(response_time=0.0, land_after=0.0)
+        result = await executor.place_order_idempotent("BTCUSDT", "buy", 1.0, latency_budget=1.0)
+        return executor, result
+
+    executor, result = asyncio.run(run())
+    assert result['success'] and result['attempts'] == 1
+    assert executor.lookups == 0
+
+
+def test_timed_out_order_that_lands_late_is_not_resubmitted():
+    async def run():
+        # The response never arrives in time, the order lands 0.15s after it was sent
+        executor = SlowExchange(response_time=10.0, land_after=0.15)
+        result = await executor.place_order_idempotent("BTCUSDT", "buy", 1.0, latency_budget=0.1,
+                                                       retry_delay=0.01, lookup_grace=0.5)
+        await settle_pending(executor)
+        return executor, result
+
+    executor, result = asyncio.run(run())
+    assert result['success']
+    assert len(executor.sent) == 1
+    assert len(executor.fills) == 1
+
+
+def test_rejected_request_is_resubmitted_after_grace():
+    async def run():
+        executor = SlowExchange(response_time=0.0, land_after=0.0)
+        original = executor.place_market_order
+
+        async def first_gets_a_502(symbol, side, quantity, client_order_id=""):
+            if not executor.sent:
+                executor.sent.append(time.monotonic())
+                return {'success': False, 'error': '502 Bad Gateway', 'ambiguous': True}
+            return await original(symbol, side, quantity, client_order_id=client_order_id)
+
+        executor.place_market_order = first_gets_a_502
+        result = await executor.place_order_idempotent("BTCUSDT", "buy", 1.0, latency_budget=1.0,
+                                                       retry_delay=0.01, lookup_grace=0.1)
+        await settle_pending(executor)
+        return executor, result
+
+    executor, result = asyncio.run(run())
+    assert result['success'] and result['attempts'] == 2
+    assert executor.lookups >= 2  # kept looking for the whole grace period
+    assert len(executor.fills) == 1
+
+
+def test_gives_up_once_the_budget_is_spent():
+    async def run():
+        executor = SlowExchange(response_time=10.0, land_after=100.0)
+        start = time.monotonic()
+        result = await executor.place_order_idempotent("BTCUSDT", "buy", 1.0, latency_budget=0.2,
+                                                       retry_delay=0.01, lookup_grace=0.1)
+        return executor, result, time.monotonic() - start
+
+    executor, result, elapsed = asyncio.run(run())
+    assert not result['success'] and not result['ambiguous']
+    # The first attempt used the whole budget: only the lookup grace may follow it
+    assert len(executor.sent) == 1
+    assert elapsed < 0.2 + 0.1 + 0.1
+
+
+def test_attempts_are_clamped_to_the_budget():
+    async def run():
+        executor = SlowExchange(response_time=10.0, land_after=100.0)
+        start = time.monotonic()
+        await executor._place_with_deadline("BTCUSDT", "buy", 1.0, "arb1", start + 0.05)
+        first = time.monotonic() - start
+        result = await executor._place_with_deadline("BTCUSDT", "buy", 1.0, "arb1", start)
+        return executor, first, result
+
+    executor, first, result = asyncio.run(run())
+    assert first < 0.1
+    # A spent budget sends nothing
+    assert len(executor.sent) == 1
+    assert not result['success'] and not result['ambiguous']
+
+
+def test_failed_lookup_reports_ambiguous_instead_of_resubmitting():
+    async def run():
+        executor = SlowExchange(response_time=10.0, land_after=100.0, lookup_error="503")
+        return executor, await executor.place_order_idempotent("BTCUSDT", "buy", 1.0, latency_budget=0.05)
+
+    executor, result = asyncio.run(run())
+    assert result['ambiguous']
+    assert len(executor.sent) == 1
+
+
+def test_batch_settles_each_ambiguous_order():
+    async def run():
+        executor = SlowExchange(response_time=10.0, land_after=0.1)
+        orders = [{'symbol': 'BTCUSDT', 'side': 'buy', 'quantity': 1.0},
+                  {'symbol': 'ETHUSDT', 'side': 'buy', 'quantity': 1.0}]
+        results = await executor.place_orders_idempotent(orders, latency_budget=0.05, lookup_grace=0.5)
+        await settle_pending(executor)
+        return executor, results
+
+    executor, results = asyncio.run(run())
+    assert all(result['success'] for result in results)
+    assert len(executor.sent) == 2
+    assert len(executor.fills) == 2
@@ -0,0 +1,47 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from core.live_trader import LiveTrader
+from models.data_models import ArbitrageOpportunity
+
+
+def make_bot(live_trading):
+    return SimpleNamespace(config={"exchanges": {}, "live_trading": live_trading})
+
+
+def test_limits_come_from_config():
+    trader = LiveTrader(make_bot({"max_trade_size": 25, "daily_loss_limit": 10}))
+    assert trader.max_trade_size == 25
+    assert trader.daily_loss_limit == 10
+
+
+def test_limits_follow_config_reload():
+    bot = make_bot({})
+    trader = LiveTrader(bot)
+    assert (trader.max_trade_size, trader.daily_loss_limit) == (100, 50)
+    bot.config["live_trading"] = {"max_trade_size": 40, "daily_loss_limit": 5}
+    trader.apply_config()
+    assert (trader.max_trade_size, trader.daily_loss_limit) == (40, 5)
+
+
+def test_balance_check_uses_the_pairs_quote_asset():
+    trader = LiveTrader(make_bot({}))
+    trader.is_live = True
+    checked = []
+
+    async def safety_checks(opportunity):
+        return True
+
+    async def check_balance(exchange_name, asset):
+        checked.append((exchange_name, asset))
+        return 0.0
+
+    trader.safety_checks = safety_checks
+    trader.check_balance = check_balance
+    opportunity = ArbitrageOpportunity(
+        pair="ETH-BTC", buy_exchange="binance", sell_exchange="kraken",
+        buy_price=0.05, sell_price=0.051, spread=0.001, spread_percentage=2.0,
+        timestamp=time.time(), actual_profit_percentage=1.5
+    )
+    assert not asyncio.run(trader.execute_live_trade(opportunity, manual_approval=False, trade_size=0.01))
+    assert checked == [("binance", "BTC")]
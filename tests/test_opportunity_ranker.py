@@ -0,0 +1,81 @@
+import time
+from core.opportunity_ranker import OpportunityRanker
+from models.data_models import ArbitrageOpportunity
+
+
+def opportunity(pair, profit_percentage, buy="binance", sell="kraken", timestamp=None):
+    return ArbitrageOpportunity(
+        pair=pair, buy_exchange=buy, sell_exchange=sell,
+        buy_price=100.0, sell_price=101.0, spread=1.0, spread_percentage=1.0,
+        timestamp=time.time() if timestamp is None else timestamp,
+        actual_profit_percentage=profit_percentage
+    )
+
+
+def pairs(ranker):
+    return [(opp.pair, opp.actual_profit_percentage) for opp in ranker.top()]
+
+
+def test_top_k_best_first():
+    ranker = OpportunityRanker(k=2)
+    for pair, profit in (("A", 1.0), ("B", 3.0), ("C", 2.0)):
+        ranker.push(opportunity(pair, profit))
+    assert pairs(ranker) == [("B", 3.0), ("C", 2.0)]
+
+
+def test_push_updates_existing_route():
+    ranker = OpportunityRanker(k=2)
+    ranker.push(opportunity("A", 1.0))
+    ranker.push(opportunity("A", 4.0))
+    assert pairs(ranker) == [("A", 4.0)]
+    assert len(ranker) == 1
+
+
+def test_expected_profit_uses_executable_notional():
+    ranker = OpportunityRanker(k=2, default_size=100)
+    small = opportunity("A", 2.0)
+    small.executable_notional = 10
+    ranker.push(small)
+    ranker.push(opportunity("B", 1.0))
+    assert pairs(ranker) == [("B", 1.0), ("A", 2.0)]
+
+
+def test_stale_entry_does_not_evict_fresh_candidate_across_cycles():
+    ranker = OpportunityRanker(k=1)
+    ranker.replace_pairs({"A": [], "B": [opportunity("B", 10.0)]})
+    # B's route is gone, A has a new one: A must survive
+    ranker.replace_pairs({"A": [opportunity("A", 5.0)], "B": []})
+    assert pairs(ranker) == [("A", 5.0)]
+
+
+def test_unscanned_pairs_are_kept():
+    ranker = OpportunityRanker(k=3)
+    ranker.replace_pairs({"A": [opportunity("A", 1.0)], "B": [opportunity("B", 2.0)]})
+    ranker.replace_pairs({"A": []})
+    assert pairs(ranker) == [("B", 2.0)]
+
+
+def test_evicted_candidate_returns_on_rescan():
+    ranker = OpportunityRanker(k=1)
+    ranker.replace_pairs({"A": [opportunity("A", 1.0)], "B": [opportunity("B", 2.0)]})
+    assert pairs(ranker) == [("B", 2.0)]
+    ranker.replace_pairs({"A": [opportunity("A", 1.0)], "B": []})
+    assert pairs(ranker) == [("A", 1.0)]
+
+
+def test_expire_drops_old_entries():
+    ranker = OpportunityRanker(k=2)
+    ranker.push(opportunity("A", 1.0, timestamp=100.0))
+    ranker.push(opportunity("B", 2.0, timestamp=200.0))
+    ranker.expire(150.0)
+    assert pairs(ranker) == [("B", 2.0)]
+
+
+def test_heap_stays_bounded_under_churn():
+    ranker = OpportunityRanker(k=3)
+    for i in range(1000):
+        ranker.replace_pairs({f"P{i % 7}": [opportunity(f"P{i % 7}", (i * 37) % 11)]})
+    assert len(ranker) <= 3
+    assert len(ranker._heap) <= 2 * 3 + 16
+    top = [opp.actual_profit_percentage for opp in ranker.top()]
+    assert top == sorted(top, reverse=True)
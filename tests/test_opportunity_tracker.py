@@ -0,0 +1,91 @@
+import time
+from core.opportunity_tracker import OpportunityTracker
+from models.data_models import ArbitrageOpportunity
+
+EPISODE_FIELDS = ("opened_at", "last_seen", "peak_spread", "peak_time", "last_spread", "observations", "executed")
+
+
+def opportunity(pair, profit_percentage=1.0, buy="binance", sell="kraken"):
+    return ArbitrageOpportunity(
+        pair=pair, buy_exchange=buy, sell_exchange=sell,
+        buy_price=100.0, sell_price=101.0, spread=1.0, spread_percentage=1.0,
+        timestamp=time.time(), actual_profit_percentage=profit_percentage
+    )
+
+
+def run_episodes(tracker, count, start=1000.0):
+    """Open and close `count` episodes of BTC-USDT, the n-th lasting n seconds"""
+    now = start
+    for n in range(count):
+        tracker.observe(["BTC-USDT"], [opportunity("BTC-USDT", 1.0 + n)], now)
+        now += n
+        tracker.observe(["BTC-USDT"], [], now)
+        now += 1
+    return now
+
+
+def test_episode_lifetime_and_claim():
+    tracker = OpportunityTracker(capacity=4)
+    opp = opportunity("BTC-USDT", 0.5)
+    tracker.observe(["BTC-USDT"], [opp], 100.0)
+    tracker.observe(["BTC-USDT"], [opportunity("BTC-USDT", 0.8)], 102.0)
+    assert tracker.claim(opp)
+    assert not tracker.claim(opp)
+    # Skipped pairs do not close anything
+    tracker.observe(["ETH-USDT"], [], 103.0)
+    assert tracker.age(opp, 104.0) == 4.0
+    tracker.observe(["BTC-USDT"], [], 105.0)
+    assert not tracker.claim(opp)
+    stats = tracker.distribution()
+    assert stats['episodes'] == 1 and stats['active'] == 0
+    assert stats['lifetime'][0.5] == 5.0
+    assert stats['peak_spread'][0.5] == 0.8
+    assert stats['duplicates_skipped'] == 1
+
+
+def test_dump_and_load_round_trip_with_open_episodes():
+    tracker = OpportunityTracker(capacity=4)
+    now = run_episodes(tracker, 6)
+    opp = opportunity("ETH-USDT", 0.7, buy="okx", sell="bybit")
+    tracker.observe(["ETH-USDT"], [opp], now)
+    tracker.claim(opp)
+    tracker.claim(opp)
+
+    restored = OpportunityTracker(capacity=4)
+    restored.load_state(tracker.dump_state())
+    assert restored.distribution() == tracker.distribution()
+    assert restored.closed == tracker.closed
+    episode, original = restored.active[("ETH-USDT", "okx", "bybit")], tracker.active[("ETH-USDT", "okx", "bybit")]
+    for field in EPISODE_FIELDS:
+        assert getattr(episode, field) == getattr(original, field)
+    # Still claimed: a restart must not trade the same episode again
+    assert not restored.claim(opp)
+
+
+def test_load_without_open_episodes():
+    tracker = OpportunityTracker(capacity=4)
+    now = run_episodes(tracker, 2)
+    tracker.observe(["ETH-USDT"], [opportunity("ETH-USDT")], now)
+
+    restored = OpportunityTracker(capacity=4)
+    restored.load_state(tracker.dump_state(), open_episodes=False)
+    assert restored.active == {}
+    assert restored.distribution()['episodes'] == 2
+
+
+def test_load_into_a_different_capacity_keeps_the_most_recent_episodes():
+    tracker = OpportunityTracker(capacity=4)
+    run_episodes(tracker, 7)  # Lifetimes 0..6, the ring holds 3..6
+
+    smaller = OpportunityTracker(capacity=2)
+    smaller.load_state(tracker.dump_state())
+    assert smaller.closed == 2
+    assert list(smaller.lifetimes) == [5.0, 6.0]
+
+    larger = OpportunityTracker(capacity=8)
+    larger.load_state(tracker.dump_state())
+    assert larger.closed == 4
+    assert list(larger.lifetimes[:4]) == [3.0, 4.0, 5.0, 6.0]
+    # New episodes continue after the restored ones
+    run_episodes(larger, 1)
+    assert larger.closed == 5
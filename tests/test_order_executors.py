@@ -0,0 +1,47 @@
+import asyncio
+from order_execution.kraken_order import KrakenOrderExecutor
+from order_execution.kucoin_order import KuCoinOrderExecutor
+
+
+def kraken_with(response):
+    executor = KrakenOrderExecutor("key", "c2VjcmV0")
+    calls = []
+
+    async def private(method, params=None, as_json=False):
+        calls.append(method)
+        return 200, response
+
+    executor._private = private
+    return executor, calls
+
+
+def test_kraken_balance_excludes_funds_held_by_open_orders():
+    executor, calls = kraken_with({'error': [], 'result': {
+        'ZUSD': {'balance': '1000.0', 'hold_trade': '250.0'},
+        'XXBT': {'balance': '0.5', 'hold_trade': '0'},
+        'USDT': {'balance': '300.0'}
+    }})
+    assert asyncio.run(executor.get_balance('USD')) == 750.0
+    assert asyncio.run(executor.get_balance('BTC')) == 0.5
+    assert asyncio.run(executor.get_balance('usdt')) == 300.0
+    assert asyncio.run(executor.get_balance('ETH')) == 0.0
+    assert set(calls) == {'BalanceEx'}
+
+
+def test_kraken_balance_error_is_zero():
+    executor, _ = kraken_with({'error': ['EAPI:Invalid key']})
+    assert asyncio.run(executor.get_balance('USD')) == 0.0
+
+
+def test_kucoin_balance_is_the_available_amount():
+    executor = KuCoinOrderExecutor("key", "secret", "passphrase")
+
+    async def request_json(method, url, **kwargs):
+        return 200, {'code': '200000', 'data': [
+            {'type': 'main', 'currency': 'USDT', 'balance': '500', 'available': '500'},
+            {'type': 'trade', 'currency': 'USDT', 'balance': '1000', 'available': '600', 'holds': '400'},
+        ]}
+
+    executor._request_json = request_json
+    assert asyncio.run(executor.get_balance('usdt')) == 600.0
+    assert asyncio.run(executor.get_balance('BTC')) == 0.0
@@ -0,0 +1,104 @@
+import asyncio
+from core.order_tracker import OrderTracker
+
+
+def order_state(status, filled=0.0, order_id="1"):
+    return {
+        'type': 'order',
+        'exchange': 'bybit',
+        'order_id': order_id,
+        'client_order_id': 'arb1',
+        'symbol': 'BTCUSDT',
+        'side': 'buy',
+        'status': status,
+        'filled_quantity': filled,
+        'last_fill_quantity': 0.0,
+        'last_fill_price': 0.0,
+        'timestamp': 0.0
+    }
+
+
+class PollingExecutor:
+    """Executor without a user stream whose order state moves through a script"""
+
+    def __init__(self, states, cancel_state=None):
+        self.states = list(states)
+        self.cancel_state = cancel_state
+        self.fetches = 0
+        self.cancels = 0
+
+    async def fetch_order_state(self, order_id, symbol=""):
+        self.fetches += 1
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return dict(state) if state else None
+
+    async def cancel_and_fetch(self, order_id, symbol=""):
+        self.cancels += 1
+        return dict(self.cancel_state) if self.cancel_state else None
+
+
+def test_polls_until_filled():
+    tracker = OrderTracker(fill_timeout=2.0, poll_interval=0.001)
+    executor = PollingExecutor([order_state('NEW'), order_state('NEW'), order_state('FILLED', 0.5)])
+
+    state = asyncio.run(tracker.wait_for_fill('bybit', executor, '1', 'BTCUSDT'))
+
+    assert state['status'] == 'FILLED'
+    assert state['filled_quantity'] == 0.5
+    assert executor.fetches == 3
+    assert executor.cancels == 0
+
+
+def test_unknown_order_keeps_polling():
+    # Some exchanges 404 an order for a moment after accepting it
+    tracker = OrderTracker(fill_timeout=2.0, poll_interval=0.001)
+    executor = PollingExecutor([None, order_state('PARTIALLY_FILLED', 0.2), order_state('FILLED', 0.5)])
+
+    state = asyncio.run(tracker.wait_for_fill('bybit', executor, '1', 'BTCUSDT'))
+
+    assert state['status'] == 'FILLED'
+    assert state['filled_quantity'] == 0.5
+
+
+def test_cancels_at_timeout_and_reports_partial_fill():
+    tracker = OrderTracker(fill_timeout=0.05, poll_interval=0.01)
+    executor = PollingExecutor([order_state('PARTIALLY_FILLED', 0.2)],
+                               cancel_state=order_state('CANCELED', 0.3))
+
+    state = asyncio.run(tracker.wait_for_fill('bybit', executor, '1', 'BTCUSDT'))
+
+    assert executor.cancels == 1
+    assert state['status'] == 'CANCELED'
+    assert state['filled_quantity'] == 0.3
+    assert tracker.stats['timeout_cancels'] == 1
+
+
+def test_cancel_that_loses_the_race_returns_the_fill():
+    tracker = OrderTracker(fill_timeout=0.02, poll_interval=0.01)
+    executor = PollingExecutor([order_state('NEW')], cancel_state=order_state('FILLED', 0.5))
+
+    state = asyncio.run(tracker.wait_for_fill('bybit', executor, '1', 'BTCUSDT'))
+
+    assert state['status'] == 'FILLED'
+    assert state['filled_quantity'] == 0.5
+
+
+def test_polling_backs_off():
+    tracker = OrderTracker(fill_timeout=0.3, poll_interval=0.01, max_poll_interval=0.04)
+    executor = PollingExecutor([order_state('NEW')], cancel_state=order_state('CANCELED'))
+
+    asyncio.run(tracker.wait_for_fill('bybit', executor, '1', 'BTCUSDT'))
+
+    # 10, 20, 40, 40, ... ms: far fewer requests than a fixed 10 ms poll
+    assert 4 <= executor.fetches <= 12
+
+
+def test_repeated_poll_states_notify_listeners_once():
+    tracker = OrderTracker(fill_timeout=2.0, poll_interval=0.001)
+    events = []
+    tracker.add_listener(events.append)
+    executor = PollingExecutor([order_state('NEW')] * 4 + [order_state('FILLED', 0.5)])
+
+    asyncio.run(tracker.wait_for_fill('bybit', executor, '1', 'BTCUSDT'))
+
+    assert [event['status'] for event in events] == ['NEW', 'FILLED']
@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from core import quote_bus
+from core.quote_bus import QuotePublisher, QuoteSubscriber, encode_frame, read_frame
+
+
+def read_all(data: bytes):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        frames = []
+        try:
+            while True:
+                frames.append(await read_frame(reader))
+        except asyncio.IncompleteReadError as e:
+            if e.partial:  # EOF inside a frame
+                raise
+        return frames
+    return asyncio.run(run())
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.frames = b""
+        self.transport = self
+
+    def write(self, data):
+        self.frames += data
+
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return 0
+
+
+def test_frame_round_trip():
+    payload = quote_bus.TIMESTAMP.pack(12.5)
+    data = encode_frame(quote_bus.PING, 1, 0, 1700000000.25, payload) + encode_frame(quote_bus.QUOTES, 0, 7, 3.0)
+    assert read_all(data) == [
+        (quote_bus.PING, 1, 0, 1700000000.25, payload),
+        (quote_bus.QUOTES, 0, 7, 3.0, b""),
+    ]
+
+
+def test_bad_frames_are_rejected():
+    frame = bytearray(encode_frame(quote_bus.HELLO, 4, 0, 0.0, b"node"))
+    frame[4] = quote_bus.VERSION + 1
+    with pytest.raises(ValueError):
+        read_all(bytes(frame))
+    oversized = quote_bus.HEADER.pack(quote_bus.MAX_FRAME + 1, quote_bus.VERSION, quote_bus.QUOTES, 0, 1, 0.0)
+    with pytest.raises(ValueError):
+        read_all(oversized)
+    with pytest.raises(asyncio.IncompleteReadError):
+        read_all(encode_frame(quote_bus.HELLO, 4, 0, 0.0, b"node")[:-1])
+
+
+def test_published_quotes_reach_the_subscriber():
+    publisher = QuotePublisher("tcp://127.0.0.1:0", node="collector-1")
+    writer = RecordingWriter()
+    publisher.clients[writer] = None
+    publisher.publish("binance", {"BTC-USDT": 50000.0, "ETH-USDT": 3000.0},
+                      {"fetched_at": 100.0, "quote_times": {"BTC-USDT": 99.5}, "exchange_times": {"BTC-USDT": 99.0}})
+    publisher.publish("kraken", {"BTC-USDT": 50010.0}, {"fetched_at": 101.0})
+    # Names are only sent once
+    publisher.publish("binance", {"BTC-USDT": 50001.0}, {"fetched_at": 102.0})
+    frames = read_all(writer.frames)
+    assert [kind for kind, *_ in frames] == [quote_bus.SYMBOLS, quote_bus.QUOTES, quote_bus.SYMBOLS,
+                                             quote_bus.QUOTES, quote_bus.QUOTES]
+    assert [seq for kind, _, seq, _, _ in frames if kind == quote_bus.QUOTES] == [1, 2, 3]
+
+    subscriber = QuoteSubscriber(["tcp://127.0.0.1:0"])
+    feed = subscriber.feeds["tcp://127.0.0.1:0"]
+    for frame in frames:
+        subscriber._handle(feed, None, *frame)
+    assert feed.symbols == {0: "binance", 1: "BTC-USDT", 2: "ETH-USDT", 3: "kraken"}
+    assert feed.frames == 3 and feed.gaps == 0
+    prices, meta = subscriber.prices_with_meta("binance", ["BTC-USDT", "ETH-USDT", "SOL-USDT"])
+    assert prices == {"BTC-USDT": 50001.0, "ETH-USDT": 3000.0}
+    assert meta["quote_times"] == {"BTC-USDT": 102.0, "ETH-USDT": 100.0}
+    assert subscriber.quotes["binance"]["ETH-USDT"].exchange_time is None
+    assert subscriber.prices_with_meta("kraken", ["BTC-USDT"])[0] == {"BTC-USDT": 50010.0}
+    assert subscriber.updated.is_set()
+
+
+def test_exchange_time_survives_the_wire():
+    publisher = QuotePublisher("tcp://127.0.0.1:0")
+    writer = RecordingWriter()
+    publisher.clients[writer] = None
+    publisher.publish("binance", {"BTC-USDT": 50000.0}, {"fetched_at": 100.0, "exchange_times": {"BTC-USDT": 99.0}})
+    subscriber = QuoteSubscriber(["tcp://127.0.0.1:0"])
+    feed = subscriber.feeds["tcp://127.0.0.1:0"]
+    for frame in read_all(writer.frames):
+        subscriber._handle(feed, None, *frame)
+    quote = subscriber.quotes["binance"]["BTC-USDT"]
+    assert quote.exchange_time == 99.0 - feed.clock.offset
+    assert feed.hops["exchange"].quantile(0.5) == pytest.approx(1.0)
+
+
+def test_sequence_gaps_and_restarts():
+    subscriber = QuoteSubscriber(["tcp://127.0.0.1:0"])
+    feed = subscriber.feeds["tcp://127.0.0.1:0"]
+    for seq in (1, 2, 5, 6):
+        subscriber._check_seq(feed, seq)
+    assert feed.gaps == 2 and feed.resets == 0
+    # Publisher restarted and counts from 1 again
+    subscriber._check_seq(feed, 1)
+    subscriber._check_seq(feed, 2)
+    assert feed.gaps == 2 and feed.resets == 1
+    assert feed.expected_seq == 3
+
+
+def test_slow_subscriber_misses_quotes_not_symbols():
+    class FullWriter(RecordingWriter):
+        def get_write_buffer_size(self):
+            return publisher.max_buffer + 1
+
+    publisher = QuotePublisher("tcp://127.0.0.1:0", max_buffer=10)
+    writer = FullWriter()
+    publisher.clients[writer] = None
+    publisher.publish("binance", {"BTC-USDT": 50000.0})
+    assert [kind for kind, *_ in read_all(writer.frames)] == [quote_bus.SYMBOLS]
+    assert publisher.frames_dropped == 1
+    assert publisher.seq == 1
@@ -0,0 +1,69 @@
+from core.quote_snapshot import Quote, QuoteSnapshot
+
+
+def snapshot(**kwargs):
+    quotes = QuoteSnapshot(max_skew=1.0, max_age=5.0, **kwargs)
+    quotes.update("binance", {"BTC-USDT": 100.0, "ETH-USDT": 10.0}, {"fetched_at": 100.0})
+    return quotes
+
+
+def test_aligned_quotes():
+    quotes = snapshot()
+    quotes.update("kraken", {"BTC-USDT": 101.0}, {"fetched_at": 99.5})
+    assert quotes.align("BTC-USDT", "binance", "kraken", now=102.0) == (2.0, 2.5, 0.5)
+    assert not quotes.rejected
+
+
+def test_stale_and_skewed_quotes_are_counted():
+    quotes = snapshot()
+    quotes.update("kraken", {"BTC-USDT": 101.0}, {"fetched_at": 98.0})
+    assert quotes.align("BTC-USDT", "binance", "kraken", now=100.5) is None
+    assert quotes.rejected == {"skew": 1}
+    quotes.update("kraken", {"BTC-USDT": 101.0}, {"fetched_at": 99.5})
+    assert quotes.align("BTC-USDT", "binance", "kraken", now=105.2) is None
+    assert quotes.rejected == {"skew": 1, "stale": 1}
+    # Staleness wins when both apply
+    quotes.update("kraken", {"BTC-USDT": 101.0}, {"fetched_at": 90.0})
+    assert quotes.align("BTC-USDT", "binance", "kraken", now=100.5) is None
+    assert quotes.rejected == {"skew": 1, "stale": 2}
+
+
+def test_missing_quote_is_not_a_rejection():
+    quotes = snapshot()
+    assert quotes.align("BTC-USDT", "binance", "kraken", now=100.0) is None
+    assert quotes.align("SOL-USDT", "binance", "binance", now=100.0) is None
+    assert not quotes.rejected
+
+
+def test_exchange_time_is_preferred_over_received_at():
+    quotes = snapshot()
+    # Received in the same cycle, but kraken's own timestamp says the quote is 3s old
+    quotes.update("kraken", {"BTC-USDT": 101.0},
+                  {"fetched_at": 100.0, "exchange_times": {"BTC-USDT": 97.0}})
+    assert quotes.quotes["kraken"]["BTC-USDT"] == Quote(101.0, 100.0, 97.0)
+    assert quotes.align("BTC-USDT", "binance", "kraken", now=100.0) is None
+    assert quotes.rejected == {"skew": 1}
+    assert Quote(1.0, 100.0).time == 100.0
+
+
+def test_per_pair_receive_times():
+    quotes = QuoteSnapshot(max_skew=1.0, max_age=5.0)
+    quotes.update("coinbase", {"BTC-USDT": 100.0, "ETH-USDT": 10.0},
+                  {"fetched_at": 100.0, "quote_times": {"BTC-USDT": 97.0}})
+    assert quotes.quotes["coinbase"]["BTC-USDT"].received_at == 97.0
+    assert quotes.quotes["coinbase"]["ETH-USDT"].received_at == 100.0
+
+
+def test_subset_for_shard_workers():
+    quotes = snapshot()
+    quotes.update("kraken", {"BTC-USDT": 101.0, "SOL-USDT": 20.0}, {"fetched_at": 100.0})
+    quotes.rejected["stale"] = 3
+    shard = quotes.subset(["BTC-USDT"])
+    assert shard.quotes == {"binance": {"BTC-USDT": quotes.quotes["binance"]["BTC-USDT"]},
+                            "kraken": {"BTC-USDT": quotes.quotes["kraken"]["BTC-USDT"]}}
+    assert (shard.max_skew, shard.max_age) == (1.0, 5.0)
+    assert not shard.rejected
+    # The copy is independent of the original
+    shard.quotes["kraken"].clear()
+    assert "BTC-USDT" in quotes.quotes["kraken"]
+    assert shard.align("BTC-USDT", "binance", "kraken", now=100.0) is None
@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from exchanges import response_cache
+from exchanges.response_cache import ResponseCache
+
+
+class CountingFetch:
+    """Fetch that answers after `delay` with `status`, or raises `error`"""
+
+    def __init__(self, status=200, delay=0.01, error=None):
+        self.status = status
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.status, {"call": self.calls}
+
+
+def test_concurrent_requests_share_one_fetch():
+    cache = ResponseCache(ttl=1.0)
+    fetch = CountingFetch()
+
+    async def run():
+        return await asyncio.gather(cache.get("ticker", fetch), cache.get("ticker", fetch))
+
+    first, second = asyncio.run(run())
+    assert fetch.calls == 1
+    assert first.data is second.data
+    assert cache.stats == {"hits": 0, "coalesced": 1, "fetches": 1}
+    assert cache.in_flight == {}
+
+
+def test_different_keys_fetch_separately():
+    cache = ResponseCache(ttl=1.0)
+    fetch = CountingFetch()
+
+    async def run():
+        return await asyncio.gather(cache.get("a", fetch), cache.get("b", fetch))
+
+    asyncio.run(run())
+    assert fetch.calls == 2
+
+
+def test_responses_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(ttl=1.0)
+    fetch = CountingFetch(delay=0)
+
+    async def get():
+        return await cache.get("ticker", fetch)
+
+    assert not asyncio.run(get()).from_cache
+    now[0] += 0.5
+    cached = asyncio.run(get())
+    assert cached.from_cache and cached.age == 0.5
+    now[0] += 0.6
+    assert not asyncio.run(get()).from_cache
+    assert fetch.calls == 2
+    # A per-call ttl of 0 always fetches
+    assert not asyncio.run(cache.get("ticker", fetch, ttl=0)).from_cache
+    assert fetch.calls == 3
+
+
+def test_errors_are_shared_but_not_cached():
+    cache = ResponseCache(ttl=10.0)
+    failing = CountingFetch(error=RuntimeError("timeout"))
+
+    async def run():
+        return await asyncio.gather(cache.get("ticker", failing), cache.get("ticker", failing),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert failing.calls == 1
+    assert cache.entries == {} and cache.in_flight == {}
+
+    working = CountingFetch()
+    assert asyncio.run(cache.get("ticker", working)).data == {"call": 1}
+    assert working.calls == 1
+
+
+def test_non_200_responses_are_not_cached():
+    cache = ResponseCache(ttl=10.0)
+    fetch = CountingFetch(status=429, delay=0)
+    for _ in range(2):
+        assert asyncio.run(cache.get("ticker", fetch)).status == 429
+    assert fetch.calls == 2
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_fetch():
+    cache = ResponseCache(ttl=1.0)
+    fetch = CountingFetch(delay=0.05)
+
+    async def run():
+        impatient = asyncio.create_task(cache.get("ticker", fetch))
+        patient = asyncio.create_task(cache.get("ticker", fetch))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(run()).data == {"call": 1}
+    assert fetch.calls == 1
+
+
+def test_oldest_entry_is_evicted_past_max_entries():
+    cache = ResponseCache(ttl=10.0, max_entries=2)
+    fetch = CountingFetch(delay=0)
+    for key in ("a", "b", "c"):
+        asyncio.run(cache.get(key, fetch))
+    assert list(cache.entries) == ["b", "c"]
@@ -0,0 +1,142 @@
+import asyncio
+import random
+import time
+from core.arbitrage_engine import ArbitrageEngine
+from core.fee_calculator import FeeSchedule
+from core.sharded_engine import ShardedArbitrageEngine
+
+PAIRS = [f"COIN{i}-USDT" for i in range(40)]
+EXCHANGES = ["binance", "okx", "bybit"]
+
+
+class FakeBot:
+    def __init__(self):
+        self.config = {"min_spread_percentage": 0.3, "trading_pairs": PAIRS, "max_opportunities": 100,
+                       "spread_stats": {"enabled": False}}
+        self.exchanges = {}
+        self.universe = None
+        self.scheduler = None
+        self.fee_schedule = FeeSchedule()
+
+
+def feed_engine(base, cycles, **kwargs):
+    class FedEngine(base):
+        async def collect_prices(self):
+            exchange_prices = cycles.pop(0)
+            for exchange_name, prices in exchange_prices.items():
+                self.price_meta[exchange_name] = {"fetched_at": time.time()}
+                self.quotes.update(exchange_name, prices, self.price_meta[exchange_name])
+            return exchange_prices
+    return FedEngine(FakeBot(), **kwargs)
+
+
+def random_cycles(count, seed=7):
+    rng = random.Random(seed)
+    cycles = []
+    for _ in range(count):
+        cycles.append({
+            exchange: {pair: 100 * rng.uniform(0.99, 1.01) for pair in PAIRS if rng.random() > 0.1}
+            for exchange in EXCHANGES if rng.random() > 0.1
+        })
+    return cycles
+
+
+def routes(opportunities):
+    return sorted((opp.pair, opp.buy_exchange, opp.sell_exchange, round(opp.buy_price, 9), round(opp.sell_price, 9))
+                  for opp in opportunities)
+
+
+def test_sharded_scan_matches_single_process():
+    cycles = random_cycles(4)
+    single = feed_engine(ArbitrageEngine, list(cycles))
+    sharded = feed_engine(ShardedArbitrageEngine, list(cycles), workers=2)
+
+    async def run():
+        results = []
+        for _ in cycles:
+            await single.find_opportunities()
+            await sharded.find_opportunities()
+            results.append((routes(single.last_scan), routes(sharded.last_scan)))
+        return results
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        sharded.shutdown()
+    assert any(expected for expected, _ in results)
+    for expected, actual in results:
+        assert actual == expected
+
+
+def test_only_changed_prices_are_shipped():
+    engine = ShardedArbitrageEngine(FakeBot(), workers=2)
+    try:
+        prices = {"binance": {pair: 100.0 for pair in PAIRS}, "okx": {pair: 101.0 for pair in PAIRS}}
+        engine.refresh_fee_matrix()
+        engine.rebalance(PAIRS, prices)
+
+        first = [engine._price_delta(i, prices) for i in range(len(engine.shards))]
+        for i, delta in enumerate(first):
+            engine._commit_delta(i, delta)
+        assert sum(len(delta["binance"][0]) for delta in first) == len(PAIRS)
+
+        prices["binance"]["COIN3-USDT"] = 99.0
+        del prices["okx"]["COIN5-USDT"]
+        second = [engine._price_delta(i, prices) for i in range(len(engine.shards))]
+        for i, delta in enumerate(second):
+            engine._commit_delta(i, delta)
+        changed = {(exchange, pair): price for delta in second for exchange, (diff, _) in delta.items()
+                   for pair, price in diff.items()}
+        assert changed == {("binance", "COIN3-USDT"): 99.0, ("okx", "COIN5-USDT"): None}
+
+        del prices["okx"]
+        third = [engine._price_delta(i, prices) for i in range(len(engine.shards))]
+        assert all(set(delta) == {"binance"} for delta in third)
+    finally:
+        engine.shutdown()
+
+
+def test_uncommitted_delta_is_shipped_again():
+    engine = ShardedArbitrageEngine(FakeBot(), workers=2)
+    try:
+        prices = {"binance": {pair: 100.0 for pair in PAIRS}}
+        engine.refresh_fee_matrix()
+        engine.rebalance(PAIRS, prices)
+        engine._commit_delta(0, engine._price_delta(0, prices))
+        prices["binance"][engine.shards[0][0]] = 99.0
+        # The worker never answered: the same change must go out again
+        lost = engine._price_delta(0, prices)
+        assert lost["binance"][0] == {engine.shards[0][0]: 99.0}
+        assert engine._price_delta(0, prices)["binance"][0] == lost["binance"][0]
+    finally:
+        engine.shutdown()
+
+
+def test_crashed_worker_is_scanned_in_process_and_restarted():
+    cycles = random_cycles(3, seed=11)
+    single = feed_engine(ArbitrageEngine, list(cycles))
+    sharded = feed_engine(ShardedArbitrageEngine, list(cycles), workers=2)
+
+    async def run():
+        results = []
+        for cycle in range(len(cycles)):
+            if cycle == 1:
+                for process in list(sharded.pools[0]._processes.values()):
+                    process.kill()
+                    process.join()
+            await single.find_opportunities()
+            await sharded.find_opportunities()
+            results.append((routes(single.last_scan), routes(sharded.last_scan)))
+            if cycle == 1:
+                assert sharded._sharded_pairs == ()
+                assert sharded._sent_prices[0] != {}  # still the cycle-0 prices, nothing committed
+        return results
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        sharded.shutdown()
+    assert any(expected for expected, _ in results)
+    for expected, actual in results:
+        assert actual == expected
+    assert sharded._sharded_pairs == tuple(PAIRS)
@@ -0,0 +1,90 @@
+import random
+import numpy as np
+import pytest
+from core.spread_stats import SpreadStats
+
+EXCHANGES = ("binance", "kraken", "okx")
+PAIRS = ("BTC-USDT", "ETH-USDT")
+
+
+def random_cycles(count, seed=1):
+    rng = random.Random(seed)
+    cycles = []
+    for _ in range(count):
+        cycle = {}
+        for exchange in EXCHANGES:
+            # The odd missing quote exercises the NaN paths
+            cycle[exchange] = {pair: 100 * rng.uniform(0.98, 1.02) for pair in PAIRS if rng.random() > 0.1}
+        cycles.append(cycle)
+    return cycles
+
+
+def spread(cycle, pair, buy, sell):
+    buy_price = cycle.get(buy, {}).get(pair)
+    sell_price = cycle.get(sell, {}).get(pair)
+    if buy_price is None or sell_price is None:
+        return None
+    return (sell_price - buy_price) / buy_price * 100
+
+
+def test_windowed_welford_matches_numpy_after_wraparound():
+    window = 8
+    stats = SpreadStats(EXCHANGES, PAIRS, window=window)
+    cycles = random_cycles(window * 3 + 5)
+    for now, cycle in enumerate(cycles):
+        stats.update(cycle, now)
+
+    for pair in PAIRS:
+        for buy in EXCHANGES:
+            for sell in EXCHANGES:
+                if buy == sell:
+                    continue
+                expected = [s for s in (spread(cycle, pair, buy, sell) for cycle in cycles[-window:]) if s is not None]
+                result = stats.stats(pair, buy, sell)
+                assert result['samples'] == len(expected)
+                assert result['mean'] == pytest.approx(np.mean(expected), abs=1e-9)
+                assert result['std'] == pytest.approx(np.std(expected, ddof=1), abs=1e-9)
+
+
+def test_latest_spread_and_zscore():
+    stats = SpreadStats(EXCHANGES, PAIRS, window=4)
+    for price in (100.0, 100.1, 100.2, 100.3, 101.0):
+        stats.update({"binance": {"BTC-USDT": 100.0}, "kraken": {"BTC-USDT": price}})
+    result = stats.stats("BTC-USDT", "binance", "kraken")
+    assert result['last'] == pytest.approx(1.0)
+    window = [0.1, 0.2, 0.3, 1.0]
+    assert result['zscore'] == pytest.approx((1.0 - np.mean(window)) / np.std(window, ddof=1))
+    # No quotes on okx yet
+    assert stats.stats("BTC-USDT", "binance", "okx")['samples'] == 0
+    assert stats.stats("DOGE-USDT", "binance", "kraken") is None
+
+
+def test_dump_and_load_round_trip():
+    stats = SpreadStats(EXCHANGES, PAIRS, window=5)
+    cycles = random_cycles(12)
+    for now, cycle in enumerate(cycles[:7]):
+        stats.update(cycle, now)
+
+    restored = SpreadStats(EXCHANGES, PAIRS, window=5)
+    assert restored.load_state(stats.dump_state())
+    assert restored.head == stats.head and restored.updates == stats.updates
+    # Both keep evolving identically from the restored window
+    for now, cycle in enumerate(cycles[7:], start=7):
+        stats.update(cycle, now)
+        restored.update(cycle, now)
+    for name in SpreadStats._ARRAYS:
+        np.testing.assert_array_equal(getattr(restored, name), getattr(stats, name))
+
+
+@pytest.mark.parametrize("exchanges, pairs, window", [
+    (EXCHANGES, PAIRS, 6),
+    (EXCHANGES[:2], PAIRS, 5),
+    (EXCHANGES, PAIRS + ("SOL-USDT",), 5),
+])
+def test_load_rejects_a_different_shape(exchanges, pairs, window):
+    stats = SpreadStats(EXCHANGES, PAIRS, window=5)
+    stats.update(random_cycles(1)[0])
+    other = SpreadStats(exchanges, pairs, window=window)
+    assert not other.load_state(stats.dump_state())
+    assert other.updates == 0
+    assert np.isnan(other.last).all()
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from core.opportunity_tracker import OpportunityTracker
+from core.spread_stats import SpreadStats
+from core.state_snapshot import StateSnapshot
+from models.data_models import ArbitrageOpportunity
+
+
+def make_bot(engine=None):
+    live = SimpleNamespace(total_pnl=0.0, daily_pnl=0.0, pnl_day=20000, trade_history=[],
+                           current_day=lambda: 20000)
+    paper = SimpleNamespace(initial_balance=1000.0, balance=1000.0, total_trades=0, profitable_trades=0,
+                            trade_history=[])
+    return SimpleNamespace(live_trader=live, paper_trader=paper, engine=engine)
+
+
+def make_engine():
+    lifetimes = OpportunityTracker(capacity=8)
+    opp = ArbitrageOpportunity(
+        pair="BTC-USDT", buy_exchange="binance", sell_exchange="kraken",
+        buy_price=100.0, sell_price=101.0, spread=1.0, spread_percentage=1.0,
+        timestamp=time.time(), actual_profit_percentage=0.6
+    )
+    lifetimes.observe(["BTC-USDT"], [opp], 100.0)
+    lifetimes.observe(["BTC-USDT"], [], 103.0)
+    lifetimes.observe(["BTC-USDT"], [opp], 104.0)
+    spread_stats = SpreadStats(("binance", "kraken"), ("BTC-USDT",), window=4)
+    for price in (100.5, 100.7, 101.0):
+        spread_stats.update({"binance": {"BTC-USDT": 100.0}, "kraken": {"BTC-USDT": price}})
+    return SimpleNamespace(lifetimes=lifetimes, spread_stats=spread_stats)
+
+
+def saved_bot(path):
+    bot = make_bot(make_engine())
+    bot.live_trader.total_pnl, bot.live_trader.daily_pnl = 12.5, -3.25
+    bot.live_trader.trade_history = [{"pair": "BTC-USDT", "profit": 12.5}]
+    bot.paper_trader.balance, bot.paper_trader.total_trades, bot.paper_trader.profitable_trades = 1010.0, 4, 3
+    bot.paper_trader.trade_history = [{"pair": "ETH-USDT", "profit": 2.5}]
+    snapshot = StateSnapshot(path=str(path))
+    asyncio.run(snapshot.save(bot))
+    assert snapshot.saves == 1
+    return bot
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "state.bin"
+    original = saved_bot(path)
+
+    bot = make_bot()
+    snapshot = StateSnapshot(path=str(path))
+    assert snapshot.restore(bot)
+    assert (bot.live_trader.total_pnl, bot.live_trader.daily_pnl) == (12.5, -3.25)
+    assert bot.live_trader.trade_history == original.live_trader.trade_history
+    assert (bot.paper_trader.balance, bot.paper_trader.total_trades, bot.paper_trader.profitable_trades) == (1010.0, 4, 3)
+    assert bot.paper_trader.trade_history == original.paper_trader.trade_history
+    assert set(snapshot.pending) == {b"TRCK", b"SPRD"}
+
+    engine = SimpleNamespace(lifetimes=OpportunityTracker(capacity=8),
+                             spread_stats=SpreadStats(("binance", "kraken"), ("BTC-USDT",), window=4))
+    snapshot.restore_engine(engine)
+    assert snapshot.pending == {}
+    assert engine.lifetimes.distribution() == original.engine.lifetimes.distribution()
+    assert ("BTC-USDT", "binance", "kraken") in engine.lifetimes.active
+    assert engine.spread_stats.stats("BTC-USDT", "binance", "kraken") == \
+        original.engine.spread_stats.stats("BTC-USDT", "binance", "kraken")
+
+
+def test_yesterdays_loss_is_not_restored(tmp_path):
+    path = tmp_path / "state.bin"
+    saved_bot(path)
+    bot = make_bot()
+    bot.live_trader.current_day = lambda: 20001
+    assert StateSnapshot(path=str(path)).restore(bot)
+    assert bot.live_trader.total_pnl == 12.5
+    assert bot.live_trader.daily_pnl == 0.0
+
+
+def test_old_snapshot_drops_open_episodes(tmp_path):
+    path = tmp_path / "state.bin"
+    saved_bot(path)
+    snapshot = StateSnapshot(path=str(path), resume_window=60)
+    assert snapshot.restore(make_bot())
+    snapshot.saved_at -= 120
+    engine = SimpleNamespace(lifetimes=OpportunityTracker(capacity=8), spread_stats=None)
+    snapshot.restore_engine(engine)
+    assert engine.lifetimes.active == {}
+    assert engine.lifetimes.distribution()['episodes'] == 1
+
+
+def test_unbuilt_engine_keeps_restored_sections(tmp_path):
+    path = tmp_path / "state.bin"
+    saved_bot(path)
+    snapshot = StateSnapshot(path=str(path))
+    snapshot.restore(make_bot())
+    pending = dict(snapshot.pending)
+    # Saving again before the engine exists must not lose them
+    asyncio.run(snapshot.save(make_bot()))
+    assert StateSnapshot(path=str(path)).read().keys() >= pending.keys()
+
+
+def test_corrupt_or_missing_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "state.bin"
+    assert StateSnapshot(path=str(path)).read() is None
+    saved_bot(path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    bot = make_bot()
+    assert not StateSnapshot(path=str(path)).restore(bot)
+    assert bot.live_trader.total_pnl == 0.0
+
+    path.write_bytes(b"NOPE" + bytes(data[4:]))
+    assert StateSnapshot(path=str(path)).read() is None
+    path.write_bytes(bytes(data[:10]))
+    assert StateSnapshot(path=str(path)).read() is None
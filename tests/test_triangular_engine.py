@@ -0,0 +1,129 @@
+import math
+import time
+import pytest
+from types import SimpleNamespace
+from core.triangular_engine import LogPriceGraph, TriangularArbitrageEngine
+
+
+def rate_edge(graph, source, target, rate):
+    graph.set_edge(source, target, -math.log(rate))
+
+
+def cycle_assets(graph, cycle):
+    return {graph.nodes[node_id] for node_id in cycle}
+
+
+def test_no_cycle_in_consistent_rates():
+    graph = LogPriceGraph()
+    rate_edge(graph, "USD", "BTC", 1 / 100)
+    rate_edge(graph, "BTC", "USD", 99)
+    assert graph.find_negative_cycles() == []
+
+
+def test_finds_profitable_triangle():
+    graph = LogPriceGraph()
+    rate_edge(graph, "USD", "BTC", 1 / 100)
+    rate_edge(graph, "BTC", "ETH", 20)
+    rate_edge(graph, "ETH", "USD", 5.1)  # 1 USD -> 0.01 BTC -> 0.2 ETH -> 1.02 USD
+    cycles = graph.find_negative_cycles()
+    assert len(cycles) == 1
+    assert cycle_assets(graph, cycles[0]) == {"USD", "BTC", "ETH"}
+    assert graph.cycle_weight(cycles[0]) == pytest.approx(-math.log(1.02))
+
+
+def test_incremental_update_detects_new_cycle_and_removal_clears_it():
+    graph = LogPriceGraph()
+    rate_edge(graph, "USD", "BTC", 1 / 100)
+    rate_edge(graph, "BTC", "ETH", 20)
+    rate_edge(graph, "ETH", "USD", 4.9)
+    assert graph.find_negative_cycles() == []
+    assert not graph.needs_full
+
+    rate_edge(graph, "ETH", "USD", 5.2)  # Cheaper edge: only its source is re-relaxed
+    assert len(graph.find_negative_cycles()) == 1
+
+    graph.remove_edge("ETH", "USD")
+    assert graph.find_negative_cycles() == []
+
+
+def test_max_cycles_limits_results():
+    graph = LogPriceGraph()
+    for i in range(5):
+        rate_edge(graph, f"USD{i}", f"X{i}", 1.0)
+        rate_edge(graph, f"X{i}", f"USD{i}", 1.01)
+    assert len(graph.find_negative_cycles(max_cycles=2)) == 2
+    assert len(graph.find_negative_cycles(max_cycles=10)) == 5
+
+
+def test_cycles_sharing_a_node_are_reported_once():
+    # Nodes of a found cycle are blocked for the rest of the search
+    graph = LogPriceGraph()
+    for i in range(3):
+        rate_edge(graph, "USD", f"X{i}", 1.0)
+        rate_edge(graph, f"X{i}", "USD", 1.01)
+    assert len(graph.find_negative_cycles()) == 1
+
+
+class FakeExchange:
+    def __init__(self, name, tickers):
+        self.name = name
+        self.book_tickers = tickers
+        self.book_tickers_time = time.time()
+        self.keep_book_tickers = False
+
+    def denormalize_symbol(self, symbol):
+        return symbol.replace("/", "-")
+
+
+def make_engine(exchanges, **settings):
+    bot = SimpleNamespace(
+        exchanges={exchange.name: exchange for exchange in exchanges},
+        config={"update_interval": 5, "triangular": dict({"min_profit_percentage": 0.0}, **settings)},
+        fee_schedule=SimpleNamespace(version=0, get_fees=lambda exchange, pair: (0.0, 0.0))
+    )
+    return TriangularArbitrageEngine(bot)
+
+
+PROFITABLE = {"BTC/USDT": (99.9, 100.0), "ETH/BTC": (0.0499, 0.05), "ETH/USDT": (5.2, 5.21)}
+
+
+def test_engine_reports_profitable_cycle():
+    engine = make_engine([FakeExchange("binance", dict(PROFITABLE))])
+    opportunities = engine.find_opportunities()
+    assert opportunities and opportunities[0].pair.startswith("USDT")
+    assert opportunities[0].actual_profit_percentage > 0
+
+
+def test_vanished_symbol_loses_its_edges():
+    exchange = FakeExchange("binance", dict(PROFITABLE))
+    engine = make_engine([exchange])
+    assert engine.find_opportunities()
+
+    exchange.book_tickers = {symbol: quote for symbol, quote in PROFITABLE.items() if symbol != "ETH/USDT"}
+    exchange.book_tickers_time += 1
+    assert engine.find_opportunities() == []
+
+
+def test_stale_exchange_is_dropped_until_it_refreshes():
+    exchange = FakeExchange("binance", dict(PROFITABLE))
+    engine = make_engine([exchange], max_ticker_age=10)
+    assert engine.find_opportunities()
+
+    exchange.book_tickers_time = time.time() - 60
+    assert engine.find_opportunities() == []
+    assert engine.graph.edges and all(not edges for edges in engine.graph.edges)
+
+    exchange.book_tickers_time = time.time()
+    assert engine.find_opportunities()
+
+
+def test_stale_exchange_drops_transfer_edges():
+    binance = FakeExchange("binance", {"BTC/USDT": (100.0, 100.1)})
+    kraken = FakeExchange("kraken", {"BTC/USDT": (101.0, 101.1)})
+    engine = make_engine([binance, kraken], cross_exchange=True, transfer_cost_percentage=0.0)
+    assert engine.find_opportunities()
+
+    kraken.book_tickers_time = time.time() - 60
+    assert engine.find_opportunities() == []
+    kraken_nodes = {engine.graph.node_ids[("kraken", asset)] for asset in ("BTC", "USDT")}
+    assert not any(v in kraken_nodes for edges in engine.graph.edges for v in edges)
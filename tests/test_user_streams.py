@@ -0,0 +1,202 @@
+import asyncio
+import pytest
+from core.order_tracker import OrderTracker
+from order_execution.user_stream import BinanceUserStream, KuCoinUserStream
+
+# Recorded Binance executionReport messages for one market buy, partially then fully filled
+BINANCE_NEW = {
+    "e": "executionReport", "E": 1700000000100, "s": "BTCUSDT", "c": "arbk8x2a1b2c3d4e5f6a7b8", "S": "BUY",
+    "o": "MARKET", "q": "0.00200000", "X": "NEW", "x": "NEW", "i": 4242, "l": "0.00000000",
+    "z": "0.00000000", "L": "0.00000000", "T": 1700000000099
+}
+BINANCE_PARTIAL = dict(BINANCE_NEW, E=1700000000101, X="PARTIALLY_FILLED", x="TRADE",
+                       l="0.00150000", z="0.00150000", L="37000.10000000")
+BINANCE_FILLED = dict(BINANCE_NEW, E=1700000000102, X="FILLED", x="TRADE",
+                      l="0.00050000", z="0.00200000", L="37000.20000000")
+BINANCE_BALANCE = {
+    "e": "outboundAccountPosition", "E": 1700000000103, "u": 1700000000102,
+    "B": [{"a": "USDT", "f": "926.00100000", "l": "0.00000000"}, {"a": "BTC", "f": "0.00200000", "l": "0.00000000"}]
+}
+
+# Recorded KuCoin private channel messages
+KUCOIN_MATCH = {
+    "type": "message", "topic": "/spotMarket/tradeOrdersV2", "subject": "orderChange", "channelType": "private",
+    "data": {"orderId": "6553a3f1c0c9a70007a1b2c3", "clientOid": "arb1", "symbol": "ETH-USDT", "side": "sell",
+             "orderType": "market", "type": "match", "status": "match", "filledSize": "0.4", "matchSize": "0.4",
+             "matchPrice": "2001.5", "ts": 1700000000200000000}
+}
+KUCOIN_FILLED = {
+    "type": "message", "topic": "/spotMarket/tradeOrdersV2", "subject": "orderChange", "channelType": "private",
+    "data": dict(KUCOIN_MATCH["data"], type="filled", status="done", filledSize="1.0", matchSize="0.6",
+                 ts=1700000000300000000)
+}
+KUCOIN_BALANCE = {
+    "type": "message", "topic": "/account/balance", "subject": "account.balance", "channelType": "private",
+    "data": {"currency": "USDT", "available": "2001.5", "hold": "0", "total": "2001.5", "time": "1700000000301"}
+}
+
+
+def binance_stream(tracker):
+    stream = BinanceUserStream("binance", None, tracker.handle_event)
+    tracker.streams["binance"] = stream
+    return stream
+
+
+class RestExecutor:
+    def __init__(self, state=None):
+        self.state = state
+        self.fetches = 0
+
+    async def fetch_order_state(self, order_id, symbol=""):
+        self.fetches += 1
+        return dict(self.state) if self.state else None
+
+    async def cancel_and_fetch(self, order_id, symbol=""):
+        return dict(self.state, status="CANCELED") if self.state else None
+
+
+def test_binance_messages_translate_to_normalised_events():
+    events = []
+    stream = BinanceUserStream("binance", None, events.append)
+    for message in (BINANCE_NEW, BINANCE_PARTIAL, BINANCE_FILLED, BINANCE_BALANCE):
+        stream._handle(message)
+
+    orders = [event for event in events if event["type"] == "order"]
+    assert [event["status"] for event in orders] == ["NEW", "PARTIALLY_FILLED", "FILLED"]
+    assert orders[-1] == {
+        "type": "order", "exchange": "binance", "order_id": "4242", "client_order_id": "arbk8x2a1b2c3d4e5f6a7b8",
+        "symbol": "BTCUSDT", "side": "buy", "status": "FILLED", "filled_quantity": 0.002,
+        "last_fill_quantity": 0.0005, "last_fill_price": 37000.2, "timestamp": 1700000000.102
+    }
+    balances = {event["asset"]: event["free"] for event in events if event["type"] == "balance"}
+    assert balances == {"USDT": 926.001, "BTC": 0.002}
+
+
+def test_binance_expired_listen_key_forces_reconnect():
+    stream = BinanceUserStream("binance", None, lambda event: None)
+    with pytest.raises(RuntimeError):
+        stream._handle({"e": "listenKeyExpired", "E": 1700000000000})
+
+
+def test_kucoin_messages_translate_to_normalised_events():
+    events = []
+    stream = KuCoinUserStream("kucoin", None, events.append)
+    stream._handle({"type": "welcome", "id": "x"})
+    stream._handle({"type": "ack", "id": "x-0"})
+    for message in (KUCOIN_MATCH, KUCOIN_FILLED, KUCOIN_BALANCE):
+        stream._handle(message)
+
+    assert [event["status"] for event in events if event["type"] == "order"] == ["PARTIALLY_FILLED", "FILLED"]
+    filled = events[1]
+    assert filled["order_id"] == "6553a3f1c0c9a70007a1b2c3"
+    assert filled["filled_quantity"] == 1.0 and filled["last_fill_quantity"] == 0.6
+    assert filled["timestamp"] == pytest.approx(1700000000.3)
+    assert events[2] == {"type": "balance", "exchange": "kucoin", "asset": "USDT", "free": 2001.5, "locked": 0.0,
+                         "timestamp": 1700000000.301}
+
+
+def test_listener_errors_do_not_break_the_stream():
+    def broken(event):
+        raise ValueError("boom")
+    stream = BinanceUserStream("binance", None, broken)
+    stream._handle(BINANCE_FILLED)
+    assert stream.last_message_time > 0
+
+
+def test_stream_fill_wakes_waiter():
+    async def run():
+        tracker = OrderTracker(fill_timeout=5.0)
+        stream = binance_stream(tracker)
+        executor = RestExecutor()
+        loop = asyncio.get_running_loop()
+        for delay, message in ((0.01, BINANCE_NEW), (0.02, BINANCE_PARTIAL), (0.03, BINANCE_FILLED)):
+            loop.call_later(delay, stream._handle, message)
+        state = await asyncio.wait_for(tracker.wait_for_fill("binance", executor, "4242", "BTCUSDT"), 1.0)
+        return tracker, executor, state
+
+    tracker, executor, state = asyncio.run(run())
+    assert state["status"] == "FILLED" and state["filled_quantity"] == 0.002
+    assert executor.fetches == 0
+    assert tracker.stats["stream_fills"] == 1
+    assert not tracker.waiters
+
+
+def test_fill_pushed_before_waiting_is_returned_at_once():
+    async def run():
+        tracker = OrderTracker(fill_timeout=5.0)
+        binance_stream(tracker)._handle(BINANCE_FILLED)
+        return await tracker.wait_for_fill("binance", RestExecutor(), "4242", "BTCUSDT")
+
+    assert asyncio.run(run())["status"] == "FILLED"
+
+
+def test_out_of_order_events_never_leave_a_terminal_state():
+    tracker = OrderTracker()
+    stream = binance_stream(tracker)
+    stream._handle(BINANCE_FILLED)
+    stream._handle(BINANCE_PARTIAL)
+    assert tracker.orders[("binance", "4242")]["status"] == "FILLED"
+
+
+def test_silent_stream_falls_back_to_rest():
+    rest_state = {
+        "type": "order", "order_id": "4242", "client_order_id": "", "symbol": "BTCUSDT", "side": "buy",
+        "status": "FILLED", "filled_quantity": 0.002, "last_fill_quantity": 0.0, "last_fill_price": 0.0,
+        "timestamp": 0.0
+    }
+
+    async def run():
+        tracker = OrderTracker(fill_timeout=0.05)
+        binance_stream(tracker)
+        executor = RestExecutor(rest_state)
+        state = await tracker.wait_for_fill("binance", executor, "4242", "BTCUSDT")
+        return tracker, executor, state
+
+    tracker, executor, state = asyncio.run(run())
+    assert state["status"] == "FILLED" and state["exchange"] == "binance"
+    assert executor.fetches == 1
+    assert tracker.stats["rest_reconciliations"] == 1
+    assert not tracker.waiters
+
+
+def test_record_result_seeds_filled_market_orders():
+    tracker = OrderTracker()
+    tracker.record_result("binance", {"order_id": 4242, "status": "FILLED", "executed_quantity": 0.002},
+                          "BTCUSDT", "buy")
+    tracker.record_result("binance", {"order_id": 4243, "status": "NEW"}, "BTCUSDT", "buy")
+    assert tracker.orders[("binance", "4242")]["filled_quantity"] == 0.002
+    assert ("binance", "4243") not in tracker.orders
+
+
+def test_pushed_balances_expire():
+    tracker = OrderTracker(balance_max_age=60)
+    binance_stream(tracker)._handle(BINANCE_BALANCE)
+    assert tracker.get_balance("binance", "usdt") == 926.001
+    tracker.balances[("binance", "USDT")] = (926.001, 0.0)
+    assert tracker.get_balance("binance", "USDT") is None
+
+
+def test_order_history_is_bounded():
+    tracker = OrderTracker(max_orders=3)
+    stream = binance_stream(tracker)
+    for order_id in range(5):
+        stream._handle(dict(BINANCE_FILLED, i=order_id))
+    assert list(tracker.orders) == [("binance", "2"), ("binance", "3"), ("binance", "4")]
+
+
+def test_stop_cancels_waiters():
+    async def run():
+        tracker = OrderTracker(fill_timeout=5.0)
+
+        class IdleStream:
+            async def stop(self):
+                pass
+
+        tracker.streams["binance"] = IdleStream()
+        waiter = asyncio.create_task(tracker.wait_for_fill("binance", RestExecutor(), "1", "BTCUSDT"))
+        await asyncio.sleep(0.01)
+        await tracker.stop()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(run())